@@ -0,0 +1,30 @@
+"""Event-driven celery_job_log: stage column and status indexes
+
+Job state is now written by worker-side task signals (celery_job_events.py)
+instead of being synced from the result backend on every job monitor request.
+The current PROGRESS stage label is stored alongside progress, and the monitor's
+reads (active jobs by created_at, recent jobs by updated_at) get indexes.
+
+Revision ID: g027_celery_job_log_events
+Revises: g026_whiteboard_captures
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'g027_celery_job_log_events'
+down_revision = 'g026_whiteboard_captures'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('celery_job_log', sa.Column('stage', sa.String(length=255), nullable=True))
+    op.create_index('ix_celery_job_log_status_created', 'celery_job_log', ['status', 'created_at'])
+    op.create_index('ix_celery_job_log_status_updated', 'celery_job_log', ['status', 'updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_celery_job_log_status_updated', table_name='celery_job_log')
+    op.drop_index('ix_celery_job_log_status_created', table_name='celery_job_log')
+    op.drop_column('celery_job_log', 'stage')
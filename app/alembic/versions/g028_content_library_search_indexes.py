@@ -0,0 +1,42 @@
+"""Content library search and listing indexes
+
+The library picker (ads/sponsors during rundown building) searches with
+ILIKE '%term%' on title and customer_name, which was a sequential scan. pg_trgm
+GIN indexes serve those substring matches directly. The listing is ordered and
+keyset-paginated on (title, id), and active placement counts are aggregated per
+page from a partial index on live placements.
+
+Revision ID: g028_content_library_search_indexes
+Revises: g027_celery_job_log_events
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+revision = 'g028_content_library_search_indexes'
+down_revision = 'g027_celery_job_log_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_content_library_title_trgm "
+        "ON content_library USING gin (title gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_content_library_customer_trgm "
+        "ON content_library USING gin (customer_name gin_trgm_ops)"
+    )
+    op.create_index('ix_content_library_title_id', 'content_library', ['title', 'id'])
+    op.create_index(
+        'ix_content_placements_live_item', 'content_placements', ['library_item_id'],
+        postgresql_where="removed_at IS NULL",
+    )
+
+
+def downgrade():
+    op.drop_index('ix_content_placements_live_item', table_name='content_placements')
+    op.drop_index('ix_content_library_title_id', table_name='content_library')
+    op.execute("DROP INDEX IF EXISTS ix_content_library_customer_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_content_library_title_trgm")
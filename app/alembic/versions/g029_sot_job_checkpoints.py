@@ -0,0 +1,25 @@
+"""Checkpoint column on sot_processing_jobs
+
+Each phase of the SOT chain records its verified output artifacts and the
+chain context here, so cleanup_orphaned_jobs can re-enqueue a job lost with
+its worker from the last completed phase instead of failing it.
+
+Revision ID: g029_sot_job_checkpoints
+Revises: g028_content_library_search_indexes
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'g029_sot_job_checkpoints'
+down_revision = 'g028_content_library_search_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('sot_processing_jobs', sa.Column('checkpoint', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('sot_processing_jobs', 'checkpoint')
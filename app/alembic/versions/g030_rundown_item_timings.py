@@ -0,0 +1,48 @@
+"""Materialized rundown timing
+
+rundown_item_timings holds each item's script analysis (word counts, cue
+durations) and its position in the rundown (running time, backtime to the
+episode's hard out); rundowns.timing_summary holds the rundown and per-block
+totals. Both are maintained on item save by services/rundown_timing, so live
+timing is a read instead of a re-parse of every script in the episode.
+Existing items are picked up on their next save or by
+POST /api/estimateDuration/timing/{episode_number}/rebuild.
+
+Revision ID: g030_rundown_item_timings
+Revises: g029_sot_job_checkpoints
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'g030_rundown_item_timings'
+down_revision = 'g029_sot_job_checkpoints'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'rundown_item_timings',
+        sa.Column('item_id', sa.Integer(), sa.ForeignKey('rundown_items.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('content_hash', sa.String(64), nullable=True),
+        sa.Column('word_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('fsq_word_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('speech_seconds', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('sot_seconds', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('fsq_seconds', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('adlib_seconds', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('script_seconds', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('planned_seconds', sa.Float(), nullable=True),
+        sa.Column('estimated_seconds', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('start_seconds', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('backtime_seconds', sa.Float(), nullable=True),
+        sa.Column('analyzed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.add_column('rundowns', sa.Column('timing_summary', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('rundowns', 'timing_summary')
+    op.drop_table('rundown_item_timings')
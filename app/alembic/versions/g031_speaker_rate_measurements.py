@@ -0,0 +1,43 @@
+"""Speaker reading-rate measurements and timing uncertainty
+
+Every WPM measurement (audio analysis, read timer, voice sample) is kept
+instead of overwriting speakers.wpm, so services/speaker_rates can estimate
+each speaker's rate, its spread, and per segment-type rates. Item timing
+gains the standard deviation of its speech estimate.
+
+Revision ID: g031_speaker_rate_measurements
+Revises: g030_rundown_item_timings
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'g031_speaker_rate_measurements'
+down_revision = 'g030_rundown_item_timings'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'speaker_rate_measurements',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('speaker_id', sa.Integer(), sa.ForeignKey('speakers.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('wpm', sa.Float(), nullable=False),
+        sa.Column('word_count', sa.Integer(), nullable=False),
+        sa.Column('duration_seconds', sa.Float(), nullable=False),
+        sa.Column('segment_type', sa.String(50), nullable=True),
+        sa.Column('source', sa.String(50), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index('ix_speaker_rate_measurements_id', 'speaker_rate_measurements', ['id'])
+    op.create_index('ix_speaker_rate_measurements_speaker_id', 'speaker_rate_measurements', ['speaker_id'])
+    op.add_column('rundown_item_timings',
+                  sa.Column('speech_stddev_seconds', sa.Float(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    op.drop_column('rundown_item_timings', 'speech_stddev_seconds')
+    op.drop_index('ix_speaker_rate_measurements_speaker_id', table_name='speaker_rate_measurements')
+    op.drop_index('ix_speaker_rate_measurements_id', table_name='speaker_rate_measurements')
+    op.drop_table('speaker_rate_measurements')
@@ -0,0 +1,60 @@
+"""Structured cue rows for rundown item scripts
+
+Cue blocks only existed as bracketed text inside rundown_items.script_content.
+rundown_item_cues holds one row per cue (type, slug, asset id, media URLs,
+duration, processing status, order and the block's offsets in the script),
+rewritten from the script whenever it is saved (services/rundown_cues), so
+"SOT cues of an episode still processing" is an indexed query (a partial index
+on exactly that predicate). Existing scripts are backfilled with
+POST /episodes/{episode_number}/cues/rebuild.
+
+Revision ID: g032_rundown_item_cues
+Revises: g031_speaker_rate_measurements
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = 'g032_rundown_item_cues'
+down_revision = 'g031_speaker_rate_measurements'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'rundown_item_cues',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('item_id', sa.Integer(), sa.ForeignKey('rundown_items.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+        sa.Column('cue_type', sa.String(20), nullable=True),
+        sa.Column('slug', sa.String(255), nullable=True),
+        sa.Column('asset_id', sa.String(100), nullable=True),
+        sa.Column('media_url', sa.Text(), nullable=True),
+        sa.Column('thumbnail_url', sa.Text(), nullable=True),
+        sa.Column('audio_url', sa.Text(), nullable=True),
+        sa.Column('duration', sa.String(20), nullable=True),
+        sa.Column('processing_status', sa.String(100), nullable=True),
+        sa.Column('fields', sa.JSON(), nullable=True),
+        sa.Column('span_start', sa.Integer(), nullable=False),
+        sa.Column('span_end', sa.Integer(), nullable=False),
+        sa.Column('collapsed', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index('ix_rundown_item_cues_item_position', 'rundown_item_cues', ['item_id', 'position'])
+    op.create_index('ix_rundown_item_cues_type_status', 'rundown_item_cues', ['cue_type', 'processing_status'])
+    # Cues still processing: the predicate of services/rundown_cues.still_processing()
+    op.create_index(
+        'ix_rundown_item_cues_processing', 'rundown_item_cues', ['cue_type'],
+        postgresql_where="processing_status IS NOT NULL AND processing_status <> 'Complete' "
+                         "AND processing_status NOT LIKE '❌%'",
+    )
+    op.create_index('ix_rundown_item_cues_asset_id', 'rundown_item_cues', ['asset_id'])
+
+
+def downgrade():
+    op.drop_index('ix_rundown_item_cues_asset_id', table_name='rundown_item_cues')
+    op.drop_index('ix_rundown_item_cues_processing', table_name='rundown_item_cues')
+    op.drop_index('ix_rundown_item_cues_type_status', table_name='rundown_item_cues')
+    op.drop_index('ix_rundown_item_cues_item_position', table_name='rundown_item_cues')
+    op.drop_table('rundown_item_cues')
@@ -33,8 +33,11 @@ celery_app = Celery(
     "showbuild",
     broker=REDIS_URL,
     backend=REDIS_URL,
+    # Base task class: records state transitions in celery_job_log as they happen
+    task_cls="celery_job_events:TrackedTask",
     include=[
         "services.script_compilation",
+        "services.script_generation_tasks",  # Host script HTML/PDF rendering
         "services.quote_extraction",
         "services.asset_processing",
         "services.ffmpeg_tasks",
@@ -72,6 +75,32 @@ def route_fsq_task(name, args, kwargs, options, task=None, **kw):
     return None
 
 
+# Video-encoding tasks that should land on a GPU host while one has a free
+# NVENC session (see services/nvenc_sessions.py)
+GPU_ENCODE_TASKS = {
+    'services.ffmpeg_tasks.sot_prepare',
+    'services.ffmpeg_tasks.sot_finalize',
+    'services.ffmpeg_tasks.process_vo_video',
+}
+
+
+def route_gpu_encode_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Send a video encode to a GPU worker if it can start there right away.
+
+    GPU workers additionally consume the media_gpu queue. Each encode claims
+    one free NVENC session from an in-memory snapshot (no Redis on the publish
+    path); once the media_gpu backlog covers the free sessions, or no live
+    worker advertises nvenc, encodes stay on the shared media queue where CPU
+    workers pick them up instead of queueing behind the GPU hosts.
+    """
+    if name in GPU_ENCODE_TASKS:
+        from services.nvenc_sessions import GPU_QUEUE, claim_gpu_slot
+        if claim_gpu_slot():
+            return {'queue': GPU_QUEUE}
+    return None
+
+
 # Celery configuration
 celery_app.conf.update(
     task_serializer="json",
@@ -83,8 +112,10 @@ celery_app.conf.update(
     # Task routing with priority support
     task_routes=[
         route_fsq_task,  # Dynamic router for FSQ priority
+        route_gpu_encode_task,  # GPU hosts with free NVENC sessions first
         {
             "services.script_compilation.*": {"queue": "compilation"},
+            "services.script_generation_tasks.*": {"queue": "compilation"},
             "services.quote_extraction.*": {"queue": "quotes"},
             "services.asset_processing.*": {"queue": "assets"},  # Default for other asset tasks
             "services.ffmpeg_tasks.*": {"queue": "media"},
@@ -132,6 +163,10 @@ celery_app.conf.update(
             'exchange': 'whisper',
             'routing_key': 'whisper',
         },
+        'media_gpu': {
+            'exchange': 'media_gpu',
+            'routing_key': 'media_gpu',
+        },
         'fsq': {
             'exchange': 'fsq',
             'routing_key': 'fsq',
@@ -151,6 +186,7 @@ celery_app.conf.update(
 
     # Task execution settings
     task_acks_late=True,
+    task_track_started=True,  # a running task reads STARTED, not PENDING, before its first PROGRESS
     worker_prefetch_multiplier=1,
 
     # Monitoring
@@ -167,6 +203,16 @@ celery_app.conf.update(
             'task': 'cleanup_orphaned_jobs',
             'schedule': 300.0,
         },
+        # Job monitor: catch up celery_job_log rows the workers never reported on
+        'reconcile-celery-jobs-every-60s': {
+            'task': 'reconcile_stale_celery_jobs',
+            'schedule': 60.0,
+        },
+        # Encodes routed to media_gpu go back to media if every GPU host is gone
+        'requeue-stranded-gpu-tasks-every-60s': {
+            'task': 'requeue_stranded_gpu_tasks',
+            'schedule': 60.0,
+        },
         'cleanup-old-jobs-daily': {
             'task': 'cleanup_old_completed_jobs',
             'schedule': 86400.0,
@@ -258,4 +304,41 @@ def _dispose_engine_on_fork(**kwargs):
         engine.dispose()
         print("[celery] worker_process_init: disposed inherited DB engine (fresh pool per child)")
     except Exception as e:  # never block worker startup on this
-        print(f"[celery] worker_process_init engine.dispose() skipped: {e}")
\ No newline at end of file
+        print(f"[celery] worker_process_init engine.dispose() skipped: {e}")
+
+
+# ---------------------------------------------------------------------------
+# Capability profile: detected once at worker boot (platform_utils caches it),
+# re-detected on a slow interval and published to Redis under the worker's
+# nodename so the API and routers schedule by what each worker can do.
+# ---------------------------------------------------------------------------
+from celery.signals import celeryd_after_setup
+
+
+@celeryd_after_setup.connect
+def _publish_worker_capabilities(sender, instance, **kwargs):
+    """Start publishing this worker's capability profile."""
+    try:
+        from services.worker_capabilities import start_capability_publisher
+        start_capability_publisher(sender)
+    except Exception as e:  # never block worker startup on this
+        print(f"[celery] capability publishing disabled: {e}")
+
+
+# ---------------------------------------------------------------------------
+# NVENC admission control: a worker on a GPU host publishes its session
+# capacity (heartbeat) and also consumes media_gpu, the queue the router uses
+# while a GPU host has free sessions. CPU-only hosts (capacity 0) do neither.
+# ---------------------------------------------------------------------------
+@celeryd_after_setup.connect
+def _register_nvenc_capacity(sender, instance, **kwargs):
+    """Advertise this host's NVENC sessions and subscribe it to media_gpu."""
+    try:
+        from services.nvenc_sessions import GPU_QUEUE, get_session_pool
+        pool = get_session_pool()
+        if pool.capacity > 0:
+            pool.start_heartbeat()
+            instance.app.amqp.queues.select_add(GPU_QUEUE)
+            print(f"[celery] NVENC: {pool.host} offers {pool.capacity} sessions, consuming {GPU_QUEUE}")
+    except Exception as e:  # never block worker startup on this
+        print(f"[celery] NVENC admission control disabled: {e}")
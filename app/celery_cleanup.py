@@ -1,49 +1,168 @@
 """
 Celery Background Tasks - Job Cleanup and Monitoring
-Handles orphaned jobs, stuck tasks, and automatic retries
+Handles orphaned jobs, stuck tasks, automatic retries and celery_job_log
+rows the workers never reported on
 """
 from datetime import datetime, timedelta, timezone
-from celery_app import celery_app
+from celery.result import AsyncResult
+from celery_app import REDIS_URL, celery_app
+from celery_job_events import job_to_dict, publish_job_event, summarize_result
 from database import SessionLocal
-from models_v2 import SOTProcessingJob
-from sqlalchemy import func
+from models_v2 import CeleryJobLog, SOTProcessingJob
+from sqlalchemy import func, or_
+import base64
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# Stale this long with no status update = orphaned (unless a worker still holds it)
+ORPHAN_AFTER = timedelta(minutes=10)
+MAX_RECOVERY_ATTEMPTS = 3
+RESUMABLE_JOB_TYPES = ('single_trim', 'full_process')
+# Broker queues the SOT chain runs on (media_gpu: see services/nvenc_sessions)
+SOT_QUEUES = ('media', 'media_gpu', 'whisper')
+
+# Active celery_job_log rows with no recorded transition for this long are
+# checked against the result backend (covers tasks dispatched before the
+# worker-side events existed, workers that died mid-task, and very short tasks
+# that finished before their row was registered). Each check bumps updated_at,
+# so a quiet job costs at most one backend lookup per interval.
+RECONCILE_AFTER = timedelta(seconds=60)
+
+# The backend answers PENDING both for a task still queued and for one it has
+# never heard of. Once a row is older than result_expires the second reading
+# is the only one left (the result has been dropped), so the job is closed
+# out as lost instead of being polled on every beat.
+_expires = celery_app.conf.result_expires
+RESULT_TTL = _expires if isinstance(_expires, timedelta) else timedelta(seconds=_expires or 86400)
+
+
+def _jobs_held_by_workers(temp_job_ids):
+    """
+    temp_job_ids that some worker is still running, has reserved or scheduled.
+
+    Long encodes (phase 6) can go 10+ minutes without a status update, so a
+    stale updated_at alone doesn't prove the worker is gone. scheduled() covers
+    countdown/ETA tasks, including retries and our own resumes. Returns None if
+    the workers couldn't be asked.
+    """
+    try:
+        inspector = celery_app.control.inspect(timeout=2)
+        held = []
+        for tasks_by_worker in (inspector.active() or {}, inspector.reserved() or {}, inspector.scheduled() or {}):
+            for tasks in tasks_by_worker.values():
+                for task in tasks:
+                    task = task.get('request', task)  # scheduled() wraps the request with its eta
+                    held.append(f"{task.get('args')} {task.get('kwargs')}")
+    except Exception as e:
+        logger.warning(f"Could not inspect workers for orphan check: {e}")
+        return None
+    return {job_id for job_id in temp_job_ids if any(job_id in task for task in held)}
+
+
+def _jobs_queued_in_broker(temp_job_ids):
+    """
+    temp_job_ids with a task still waiting in one of the SOT queues.
+
+    A backlogged job hasn't been picked up by anyone, so the workers don't
+    report it; resuming it would run it twice once its message is consumed.
+    Matches on the raw and decoded message bodies. Returns None if the broker
+    couldn't be read.
+    """
+    try:
+        import redis
+        client = redis.Redis.from_url(REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+        queued = []
+        for queue in SOT_QUEUES:
+            for raw in client.lrange(queue, 0, -1):
+                raw = raw.decode(errors='replace')
+                queued.append(raw)
+                try:
+                    message = json.loads(raw)
+                    if message.get('properties', {}).get('body_encoding') == 'base64':
+                        queued.append(base64.b64decode(message['body']).decode(errors='replace'))
+                except (ValueError, KeyError, TypeError):
+                    pass
+    except Exception as e:
+        logger.warning(f"Could not read the broker queues for orphan check: {e}")
+        return None
+    return {job_id for job_id in temp_job_ids if any(job_id in message for message in queued)}
+
+
+def _resume_job(job, checkpoint):
+    """
+    Re-enqueue an orphaned single_trim/full_process job from its last checkpoint.
+
+    Routing uses the last recorded phase; sot_finalize itself re-verifies the
+    artifacts on the media worker (the beat host may not mount the NAS) and
+    falls back to an earlier phase if a later output is gone. Returns a short
+    description of the resume point, or None if there is nothing to resume from.
+    """
+    from celery import chain
+    from services.ffmpeg_tasks import process_sot_video_multi_phase, sot_finalize, transcribe_sot_audio
+
+    last_phase = checkpoint.last_phase
+    if last_phase >= 4 and checkpoint.ctx:
+        sot_finalize.apply_async(args=[checkpoint.ctx], countdown=30)
+        return f"sot_finalize after phase {last_phase}"
+    if last_phase == 3 and checkpoint.ctx:
+        chain(transcribe_sot_audio.s(checkpoint.ctx), sot_finalize.s()).apply_async(countdown=30)
+        return "transcription after phase 3"
+    if checkpoint.args:
+        process_sot_video_multi_phase.apply_async(kwargs=checkpoint.args, countdown=30)
+        return "phase 1"
+    return None
+
+
 @celery_app.task(name='cleanup_orphaned_jobs')
 def cleanup_orphaned_jobs():
     """
-    Find and cleanup orphaned SOT processing jobs
+    Find orphaned SOT processing jobs and resume or fail them
 
     A job is considered orphaned if:
     - Status is 'processing'
     - No updates for 10+ minutes (updated_at is stale)
-    - Worker likely crashed or lost connection
+    - No worker is running, holding or scheduling one of its tasks, and none
+      is still waiting in the broker queues
 
     Actions taken:
-    - Mark job as 'failed' with appropriate error message
-    - Log the orphaned job for monitoring
-    - Optionally: Auto-retry if retry_count < 3
+    - single_trim/full_process jobs with retry_count < MAX_RECOVERY_ATTEMPTS are
+      re-enqueued (any healthy media worker picks them up) from the last
+      completed phase recorded in their checkpoint, so trim, whisper and encode
+      outputs that survived the crash are reused
+    - everything else is marked 'failed' with an explanatory error message
     """
+    from services.sot_checkpoints import load_checkpoint
+
     db = SessionLocal()
     try:
         # Find jobs stuck in 'processing' with no recent updates
-        cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=10)
+        cutoff_time = datetime.now(timezone.utc) - ORPHAN_AFTER
 
-        orphaned_jobs = db.query(SOTProcessingJob).filter(
+        stale_jobs = db.query(SOTProcessingJob).filter(
             SOTProcessingJob.status == 'processing',
             SOTProcessingJob.updated_at < cutoff_time
         ).all()
 
-        if not orphaned_jobs:
+        if not stale_jobs:
             logger.debug("No orphaned jobs found")
-            return {"orphaned_count": 0, "cleaned": 0}
+            return {"orphaned_count": 0, "cleaned": 0, "resumed": 0}
+
+        stale_ids = [job.temp_job_id for job in stale_jobs]
+        held = _jobs_held_by_workers(stale_ids)
+        queued = _jobs_queued_in_broker(stale_ids) if held is not None else None
+        if held is None or queued is None:
+            # Can't tell stale from orphaned right now; try again next run
+            return {"orphaned_count": 0, "cleaned": 0, "resumed": 0, "skipped": len(stale_jobs)}
+        held |= queued
+        orphaned_jobs = [job for job in stale_jobs if job.temp_job_id not in held]
 
-        logger.warning(f"Found {len(orphaned_jobs)} orphaned jobs")
+        logger.warning(f"Found {len(orphaned_jobs)} orphaned jobs ({len(held)} stale but still held by a worker)")
 
         cleaned_count = 0
+        resumed_count = 0
         for job in orphaned_jobs:
             logger.warning(
                 f"Orphaned job detected: {job.temp_job_id} "
@@ -51,32 +170,40 @@ def cleanup_orphaned_jobs():
                 f"last update: {job.updated_at})"
             )
 
+            if job.job_type in RESUMABLE_JOB_TYPES and (job.retry_count or 0) < MAX_RECOVERY_ATTEMPTS:
+                try:
+                    resumed_at = _resume_job(job, load_checkpoint(job.temp_job_id, db))
+                except Exception as e:
+                    logger.error(f"Could not re-enqueue orphaned job {job.temp_job_id}: {e}")
+                    resumed_at = None
+
+                if resumed_at:
+                    job.retry_count = (job.retry_count or 0) + 1
+                    job.status = 'queued'
+                    job.error_message = (
+                        f'Job orphaned at {job.current_phase} (no updates since {job.updated_at}); '
+                        f'resumed from {resumed_at}, attempt {job.retry_count}/{MAX_RECOVERY_ATTEMPTS}.'
+                    )
+                    db.commit()
+                    logger.info(f"Resumed orphaned job {job.temp_job_id} from {resumed_at}")
+                    resumed_count += 1
+                    continue
+
             # Mark as failed
             job.status = 'failed'
             job.error_message = (
                 f'Job orphaned - no updates since {job.updated_at}. '
                 f'Worker likely crashed or lost connection.'
+                + (f' Gave up after {job.retry_count} recovery attempts.' if job.retry_count else '')
             )
-
+            db.commit()
             cleaned_count += 1
 
-            # TODO: Implement auto-retry logic if needed
-            # if job.retry_count < 3:
-            #     job.retry_count += 1
-            #     job.status = 'queued'
-            #     # Re-queue the task
-            #     from services.ffmpeg_tasks import process_sot_video_multi_phase
-            #     process_sot_video_multi_phase.apply_async(
-            #         args=[job.temp_job_id, job.episode, job.slug, ...],
-            #         countdown=30
-            #     )
-
-        db.commit()
-
-        logger.info(f"Cleaned up {cleaned_count} orphaned jobs")
+        logger.info(f"Orphaned jobs: {resumed_count} resumed, {cleaned_count} failed")
         return {
             "orphaned_count": len(orphaned_jobs),
             "cleaned": cleaned_count,
+            "resumed": resumed_count,
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
 
@@ -88,6 +215,13 @@ def cleanup_orphaned_jobs():
         db.close()
 
 
+@celery_app.task(name='requeue_stranded_gpu_tasks')
+def requeue_stranded_gpu_tasks():
+    """Hand media_gpu's backlog to the CPU workers once no GPU host is registered"""
+    from services.nvenc_sessions import requeue_stranded_gpu_tasks as requeue
+    return {"requeued": requeue()}
+
+
 @celery_app.task(name='cleanup_old_completed_jobs')
 def cleanup_old_completed_jobs(days_to_keep=30):
     """
@@ -122,4 +256,90 @@ def cleanup_old_completed_jobs(days_to_keep=30):
         db.close()
 
 
+def _created_before(job: CeleryJobLog, cutoff: datetime) -> bool:
+    created_at = job.created_at
+    if created_at is None:
+        return False
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at < cutoff
+
+
+def _reconcile_job(job: CeleryJobLog, now: datetime):
+    """Bring a quiet active job up to date from the Celery result backend."""
+    try:
+        result = AsyncResult(job.task_id, app=celery_app)
+
+        celery_status = result.status
+        # PENDING is left out on purpose: a queued task, and a running one
+        # that hasn't reported yet, both read PENDING, so it never moves a
+        # job backwards
+        status_map = {
+            'STARTED': 'running',
+            'PROGRESS': 'running',
+            'SUCCESS': 'completed',
+            'FAILURE': 'failed',
+            'REVOKED': 'failed',
+            'RETRY': 'running',
+        }
+        job.status = status_map.get(celery_status, job.status)
+
+        if celery_status == 'PENDING' and _created_before(job, now - RESULT_TTL):
+            job.status = 'failed'
+            job.stage = None
+            job.result_summary = 'Lost: the result backend has no record of this task'
+        elif celery_status in ('STARTED', 'PROGRESS') and isinstance(result.info, dict):
+            job.progress = result.info.get('progress', job.progress)
+            job.stage = result.info.get('stage', job.stage)
+        elif celery_status == 'SUCCESS':
+            job.progress = 100
+            job.stage = None
+            job.result_summary = summarize_result(result.result) or job.result_summary
+        elif celery_status in ('FAILURE', 'REVOKED'):
+            job.stage = None
+            job.result_summary = str(result.info)[:500] if result.info else 'Task failed'
+    except Exception as e:
+        logger.warning(f"Failed to reconcile status for task {job.task_id}: {e}")
+
+    # Touch even when nothing changed so the job isn't re-checked on every run
+    job.updated_at = now
+
+
+@celery_app.task(name='reconcile_stale_celery_jobs')
+def reconcile_stale_celery_jobs():
+    """
+    Catch up quiet pending/running celery_job_log rows from the result backend
+
+    Runs from beat so the job monitor endpoints stay plain reads: each stale
+    row gets one AsyncResult lookup, the changes are committed together and
+    published on the job events channel like a worker-side transition.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        cutoff = now - RECONCILE_AFTER
+        stale = db.query(CeleryJobLog).filter(
+            CeleryJobLog.status.in_(['pending', 'running']),
+            or_(CeleryJobLog.updated_at.is_(None), CeleryJobLog.updated_at < cutoff)
+        ).all()
+        if not stale:
+            return {"reconciled": 0}
+
+        for job in stale:
+            _reconcile_job(job, now)
+        db.commit()
+        for job in stale:
+            publish_job_event(job_to_dict(job))
+
+        logger.info(f"Reconciled {len(stale)} quiet celery jobs")
+        return {"reconciled": len(stale)}
+
+    except Exception as e:
+        logger.error(f"Error in reconcile_stale_celery_jobs: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 # Beat schedule moved to celery_app.py so it loads when beat starts
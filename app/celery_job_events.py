@@ -0,0 +1,195 @@
+"""
+Celery Job Events - keep celery_job_log current from the workers.
+
+Task signals fire inside the worker when a task starts, retries, succeeds,
+fails or is revoked, and TrackedTask.update_state (the base class of every
+celery_app task) sees each PROGRESS update. Each transition is written to
+celery_job_log once, as a single UPDATE by task_id, and published on the Redis
+channel JOB_EVENTS_CHANNEL. The job monitor then reads the table and listens
+on the channel instead of polling the result backend per job per request.
+
+Tasks that were never registered with register_celery_job have no row, so the
+UPDATE is a no-op and nothing is published for them.
+"""
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from celery import Task
+from celery.signals import task_failure, task_prerun, task_retry, task_revoked, task_success
+
+logger = logging.getLogger(__name__)
+
+JOB_EVENTS_CHANNEL = "celery_jobs:events"
+# Progress writes per task are throttled to this interval (stage changes and 100% always go through)
+PROGRESS_MIN_INTERVAL = 1.0
+
+_redis = None
+_progress_seen: Dict[str, tuple] = {}
+_progress_lock = threading.Lock()
+
+
+def job_to_dict(job) -> Dict[str, Any]:
+    """Serialize a CeleryJobLog (or a row with the same columns) for the job monitor."""
+    return {
+        "id": job.id,
+        "task_id": job.task_id,
+        "task_name": job.task_name,
+        "display_name": job.display_name,
+        "category": job.category,
+        "episode": job.episode,
+        "status": job.status,
+        "progress": job.progress,
+        "stage": job.stage,
+        "result_summary": job.result_summary,
+        "worker": job.worker,
+        "queue": job.queue,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+    }
+
+
+def summarize_result(result: Any) -> Optional[str]:
+    """Short result_summary for a successful task's return value."""
+    if isinstance(result, dict):
+        return result.get('message', str(result)[:200])
+    if result:
+        return str(result)[:200]
+    return None
+
+
+def _get_redis():
+    global _redis
+    if _redis is None:
+        import redis
+        from celery_app import REDIS_URL
+        _redis = redis.Redis.from_url(REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+    return _redis
+
+
+def publish_job_event(job_data: Dict[str, Any]):
+    """Push a job's current state to job monitor clients (best effort)."""
+    try:
+        _get_redis().publish(JOB_EVENTS_CHANNEL, json.dumps({"type": "job_update", "job": job_data}))
+    except Exception as e:
+        logger.debug(f"Could not publish job event for {job_data.get('task_id')}: {e}")
+
+
+def record_job_event(
+    task_id: str,
+    status: Optional[str] = None,
+    progress: Optional[int] = None,
+    stage: Optional[str] = None,
+    result_summary: Optional[str] = None,
+    worker: Optional[str] = None,
+    clear_stage: bool = False
+):
+    """Apply one state transition to celery_job_log and publish it."""
+    from sqlalchemy import text
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        row = db.execute(text("""
+            UPDATE celery_job_log SET
+                status = COALESCE(:status, status),
+                progress = COALESCE(:progress, progress),
+                stage = CASE WHEN :clear_stage THEN NULL ELSE COALESCE(:stage, stage) END,
+                result_summary = COALESCE(:result_summary, result_summary),
+                worker = COALESCE(:worker, worker),
+                updated_at = now()
+            WHERE task_id = :task_id
+            RETURNING id, task_id, task_name, display_name, category, episode, status,
+                      progress, stage, result_summary, worker, queue, created_at, updated_at
+        """), {
+            "task_id": task_id,
+            "status": status,
+            "progress": progress,
+            "stage": stage[:255] if stage else None,
+            "result_summary": result_summary,
+            "worker": worker[:100] if worker else None,
+            "clear_stage": clear_stage,
+        }).fetchone()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Could not record job event for {task_id}: {e}")
+        return
+    finally:
+        db.close()
+
+    if row is not None:
+        publish_job_event(job_to_dict(row))
+
+
+class TrackedTask(Task):
+    """Base task class: mirrors PROGRESS updates into celery_job_log."""
+
+    def update_state(self, task_id=None, state=None, meta=None, **kwargs):
+        super().update_state(task_id=task_id, state=state, meta=meta, **kwargs)
+
+        task_id = task_id or self.request.id
+        if state != 'PROGRESS' or not task_id or not isinstance(meta, dict):
+            return
+
+        progress = meta.get('progress')
+        stage = meta.get('stage')
+        now = time.monotonic()
+        with _progress_lock:
+            last = _progress_seen.get(task_id)
+            if last and last[1] == stage and progress != 100 and now - last[0] < PROGRESS_MIN_INTERVAL:
+                return
+            _progress_seen[task_id] = (now, stage)
+
+        record_job_event(
+            task_id,
+            status='running',
+            progress=int(progress) if isinstance(progress, (int, float)) else None,
+            stage=str(stage) if stage else None,
+        )
+
+
+def _forget_progress(task_id: Optional[str]):
+    with _progress_lock:
+        _progress_seen.pop(task_id, None)
+
+
+@task_prerun.connect
+def _on_task_prerun(sender=None, task_id=None, task=None, **kwargs):
+    record_job_event(task_id, status='running', worker=getattr(task.request, 'hostname', None))
+
+
+@task_retry.connect
+def _on_task_retry(sender=None, request=None, reason=None, **kwargs):
+    record_job_event(request.id, status='running', stage=f"Retrying: {reason}" if reason else "Retrying")
+
+
+@task_success.connect
+def _on_task_success(sender=None, result=None, **kwargs):
+    task_id = sender.request.id
+    _forget_progress(task_id)
+    record_job_event(
+        task_id, status='completed', progress=100,
+        result_summary=summarize_result(result), clear_stage=True
+    )
+
+
+@task_failure.connect
+def _on_task_failure(sender=None, task_id=None, exception=None, **kwargs):
+    _forget_progress(task_id)
+    record_job_event(
+        task_id, status='failed',
+        result_summary=str(exception)[:500] if exception else 'Task failed', clear_stage=True
+    )
+
+
+@task_revoked.connect
+def _on_task_revoked(sender=None, request=None, terminated=None, expired=None, **kwargs):
+    task_id = getattr(request, 'id', None)
+    if not task_id:
+        return
+    _forget_progress(task_id)
+    reason = 'Task expired' if expired else 'Task revoked'
+    record_job_event(task_id, status='failed', result_summary=reason, clear_stage=True)
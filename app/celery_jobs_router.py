@@ -2,20 +2,24 @@
 Celery Jobs API Router
 
 Provides unified job monitoring for all celery tasks dispatched from show-build.
-Tracks tasks in celery_job_log table and syncs status from Celery backend.
+Tasks are tracked in the celery_job_log table. Workers write state transitions
+there as they happen (celery_job_events.py), so reads are plain indexed queries;
+/ws pushes the same transitions to connected job monitors. Jobs the workers
+never reported on are caught up by the reconcile_stale_celery_jobs beat task
+(celery_cleanup.py), never by a read.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from starlette.status import WS_1008_POLICY_VIOLATION
 from sqlalchemy.orm import Session
-from sqlalchemy import text
-from typing import Optional, List
-from datetime import datetime, timezone, timedelta
+from typing import Optional
+import asyncio
 import logging
 
 from database import get_db
 from auth.utils import get_current_user_or_key
-from celery_app import celery_app
-from celery.result import AsyncResult
+from celery_app import REDIS_URL
+from celery_job_events import JOB_EVENTS_CHANNEL, job_to_dict, publish_job_event
 from models_v2 import CeleryJobLog
 
 logger = logging.getLogger(__name__)
@@ -47,103 +51,22 @@ def register_celery_job(
     )
     db.add(job)
     db.commit()
+    publish_job_event(job_to_dict(job))
     return job
 
 
-def _sync_job_status(job: CeleryJobLog) -> dict:
-    """Sync a job's status from Celery backend and return dict."""
-    try:
-        result = AsyncResult(job.task_id, app=celery_app)
-
-        celery_status = result.status
-        status_map = {
-            'PENDING': 'pending',
-            'STARTED': 'running',
-            'PROGRESS': 'running',
-            'SUCCESS': 'completed',
-            'FAILURE': 'failed',
-            'REVOKED': 'failed',
-            'RETRY': 'running',
-        }
-        new_status = status_map.get(celery_status, job.status)
-
-        progress = None
-        stage = None
-        result_summary = job.result_summary
-
-        if celery_status in ('STARTED', 'PROGRESS') and isinstance(result.info, dict):
-            progress = result.info.get('progress')
-            stage = result.info.get('stage')
-        elif celery_status == 'SUCCESS':
-            progress = 100
-            if isinstance(result.result, dict):
-                result_summary = result.result.get('message', str(result.result)[:200])
-            elif result.result:
-                result_summary = str(result.result)[:200]
-        elif celery_status == 'FAILURE':
-            result_summary = str(result.info)[:500] if result.info else 'Task failed'
-
-        return {
-            "id": job.id,
-            "task_id": job.task_id,
-            "task_name": job.task_name,
-            "display_name": job.display_name,
-            "category": job.category,
-            "episode": job.episode,
-            "status": new_status,
-            "progress": progress,
-            "stage": stage,
-            "result_summary": result_summary,
-            "worker": job.worker,
-            "queue": job.queue,
-            "created_at": job.created_at.isoformat() if job.created_at else None,
-            "updated_at": job.updated_at.isoformat() if job.updated_at else None,
-        }
-    except Exception as e:
-        logger.warning(f"Failed to sync status for task {job.task_id}: {e}")
-        return {
-            "id": job.id,
-            "task_id": job.task_id,
-            "task_name": job.task_name,
-            "display_name": job.display_name,
-            "category": job.category,
-            "episode": job.episode,
-            "status": job.status,
-            "progress": job.progress,
-            "result_summary": job.result_summary,
-            "worker": job.worker,
-            "queue": job.queue,
-            "created_at": job.created_at.isoformat() if job.created_at else None,
-            "updated_at": job.updated_at.isoformat() if job.updated_at else None,
-        }
-
-
 @router.get("/active")
 async def get_active_celery_jobs(
     db: Session = Depends(get_db),
     current_user=Depends(get_current_user_or_key)
 ):
-    """Get all active (pending/running) celery jobs with live status from Celery backend."""
+    """Get all active (pending/running) celery jobs."""
     try:
         jobs = db.query(CeleryJobLog).filter(
             CeleryJobLog.status.in_(['pending', 'running'])
         ).order_by(CeleryJobLog.created_at.desc()).all()
 
-        jobs_data = []
-        for job in jobs:
-            job_data = _sync_job_status(job)
-
-            # Update DB if status changed
-            if job_data["status"] != job.status:
-                job.status = job_data["status"]
-                if job_data["progress"] is not None:
-                    job.progress = job_data["progress"]
-                if job_data["result_summary"] and job_data["result_summary"] != job.result_summary:
-                    job.result_summary = job_data["result_summary"]
-
-            jobs_data.append(job_data)
-
-        db.commit()
+        jobs_data = [job_to_dict(job) for job in jobs]
 
         return {
             "active_count": len(jobs_data),
@@ -167,23 +90,7 @@ async def get_recent_celery_jobs(
             CeleryJobLog.status.in_(['completed', 'failed'])
         ).order_by(CeleryJobLog.updated_at.desc()).limit(limit).all()
 
-        jobs_data = []
-        for job in jobs:
-            jobs_data.append({
-                "id": job.id,
-                "task_id": job.task_id,
-                "task_name": job.task_name,
-                "display_name": job.display_name,
-                "category": job.category,
-                "episode": job.episode,
-                "status": job.status,
-                "progress": job.progress,
-                "result_summary": job.result_summary,
-                "worker": job.worker,
-                "queue": job.queue,
-                "created_at": job.created_at.isoformat() if job.created_at else None,
-                "updated_at": job.updated_at.isoformat() if job.updated_at else None,
-            })
+        jobs_data = [job_to_dict(job) for job in jobs]
 
         return {
             "count": len(jobs_data),
@@ -210,35 +117,7 @@ async def get_all_celery_jobs(
 
         jobs = query.order_by(CeleryJobLog.created_at.desc()).limit(limit).all()
 
-        jobs_data = []
-        for job in jobs:
-            if job.status in ('pending', 'running'):
-                job_data = _sync_job_status(job)
-                if job_data["status"] != job.status:
-                    job.status = job_data["status"]
-                    if job_data["progress"] is not None:
-                        job.progress = job_data["progress"]
-                    if job_data["result_summary"]:
-                        job.result_summary = job_data["result_summary"]
-                jobs_data.append(job_data)
-            else:
-                jobs_data.append({
-                    "id": job.id,
-                    "task_id": job.task_id,
-                    "task_name": job.task_name,
-                    "display_name": job.display_name,
-                    "category": job.category,
-                    "episode": job.episode,
-                    "status": job.status,
-                    "progress": job.progress,
-                    "result_summary": job.result_summary,
-                    "worker": job.worker,
-                    "queue": job.queue,
-                    "created_at": job.created_at.isoformat() if job.created_at else None,
-                    "updated_at": job.updated_at.isoformat() if job.updated_at else None,
-                })
-
-        db.commit()
+        jobs_data = [job_to_dict(job) for job in jobs]
 
         active = [j for j in jobs_data if j["status"] in ("pending", "running")]
         completed = [j for j in jobs_data if j["status"] not in ("pending", "running")]
@@ -255,6 +134,67 @@ async def get_all_celery_jobs(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _websocket_user(websocket: WebSocket) -> Optional[dict]:
+    """
+    get_current_user_or_key for a websocket handshake.
+
+    The HTTP security dependencies need a Request, and browsers can't set
+    headers on a websocket, so the API key / bearer token may also come as
+    ?api_key= / ?token=. Returns None when neither authenticates.
+    """
+    api_key = websocket.headers.get("X-API-Key") or websocket.query_params.get("api_key")
+    scheme, _, token = websocket.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer":
+        token = websocket.query_params.get("token")
+    try:
+        return await get_current_user_or_key(api_key=api_key or None, token=token or None)
+    except HTTPException:
+        return None
+
+
+@router.websocket("/ws")
+async def celery_jobs_websocket(websocket: WebSocket):
+    """
+    Push job state transitions to a job monitor.
+
+    Each message is {"type": "job_update", "job": {...}} with the same job
+    shape as the REST endpoints. Load the initial list from /active or /all,
+    then apply updates as they arrive. Authenticates like the HTTP endpoints.
+    """
+    import redis.asyncio as aioredis
+
+    if await _websocket_user(websocket) is None:
+        await websocket.close(code=WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    client = aioredis.Redis.from_url(REDIS_URL)
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(JOB_EVENTS_CHANNEL)
+
+        async def forward():
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    data = message["data"]
+                    await websocket.send_text(data.decode() if isinstance(data, bytes) else data)
+
+        forwarder = asyncio.create_task(forward())
+        try:
+            # Client messages are only keepalives; this returns when the socket closes
+            while True:
+                await websocket.receive_text()
+        finally:
+            forwarder.cancel()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning(f"Celery jobs websocket closed: {e}")
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
+
+
 @router.delete("/clear")
 async def clear_celery_jobs(
     status: Optional[str] = Query(default=None, description="Clear only jobs with this status (completed, failed). Omit to clear all non-active."),
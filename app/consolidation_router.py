@@ -8,12 +8,15 @@ import os
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from database import get_db
 from auth.utils import get_current_user_or_key
 from services.google_drive_service import get_drive_service_from_config
+from services.drive_mirror import DriveMirror, GoogleDriveApi, get_drive_mirror
 from services.canonical_structure_parser import get_required_structure
+from services.file_index import get_file_index
 from api_config import APIConfigManager
 
 logger = logging.getLogger(__name__)
@@ -90,6 +93,9 @@ def build_syncthing_tree(episode_path: Path) -> tuple[List[Dict[str, Any]], int,
     """
     Build directory tree structure for Syncthing episode directory.
 
+    The tree is assembled from the persistent file index, which is refreshed
+    incrementally rather than re-walking the whole episode on every compare.
+
     Args:
         episode_path: Path to episode directory
 
@@ -103,52 +109,43 @@ def build_syncthing_tree(episode_path: Path) -> tuple[List[Dict[str, Any]], int,
     total_size = 0
     file_count = 0
 
-    def _build_tree_recursive(path: Path, relative_to: Path) -> Dict[str, Any]:
-        """Recursively build tree structure."""
-        nonlocal total_size, file_count
-
-        rel_path = path.relative_to(relative_to)
-        node = {
-            'title': path.name,
-            'path': str(rel_path),
-            'type': 'folder' if path.is_dir() else 'file'
-        }
+    try:
+        file_index = get_file_index()
+        file_index.refresh(episode_path)
+        entries = file_index.entries(episode_path, include_dirs=True)
 
-        if path.is_file():
-            try:
-                size = path.stat().st_size
-                node['size'] = size
-                total_size += size
-                file_count += 1
-            except Exception as e:
-                logger.warning(f"Could not stat file {path}: {e}")
-                node['size'] = 0
-
-        if path.is_dir():
-            children = []
-            try:
-                # Sort directories first, then files, alphabetically
-                entries = sorted(path.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower()))
-                for entry in entries:
-                    # Skip hidden files and system files
-                    if entry.name.startswith('.'):
-                        continue
-                    children.append(_build_tree_recursive(entry, relative_to))
-                node['children'] = children
-            except PermissionError:
-                logger.warning(f"Permission denied reading directory: {path}")
+        # Index nodes by relative path, then attach each to its parent
+        nodes: Dict[str, Dict[str, Any]] = {}
+        for entry in entries:
+            node = {
+                'title': entry.name,
+                'path': entry.rel_path,
+                'type': 'folder' if entry.is_dir else 'file'
+            }
+            if entry.is_dir:
                 node['children'] = []
+            else:
+                node['size'] = entry.size
+                total_size += entry.size
+                file_count += 1
+            nodes[entry.rel_path] = node
 
-        return node
-
-    # Build tree starting from episode root
-    try:
         tree_list = []
-        entries = sorted(episode_path.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower()))
-        for entry in entries:
-            if entry.name.startswith('.'):
-                continue
-            tree_list.append(_build_tree_recursive(entry, episode_path))
+        for rel_path, node in nodes.items():
+            parent_path = rel_path.rpartition('/')[0]
+            if not parent_path:
+                tree_list.append(node)
+            elif parent_path in nodes:
+                nodes[parent_path]['children'].append(node)
+
+        # Sort directories first, then files, alphabetically
+        def _sort_key(n: Dict[str, Any]):
+            return (n['type'] != 'folder', n['title'].lower())
+
+        for node in nodes.values():
+            if 'children' in node:
+                node['children'].sort(key=_sort_key)
+        tree_list.sort(key=_sort_key)
 
         return tree_list, total_size, file_count
     except Exception as e:
@@ -156,12 +153,12 @@ def build_syncthing_tree(episode_path: Path) -> tuple[List[Dict[str, Any]], int,
         return [], 0, 0
 
 
-def validate_drive_structure(drive_service, folder_id: str) -> Dict[str, Any]:
+def validate_drive_structure(mirror: DriveMirror, folder_id: str) -> Dict[str, Any]:
     """
     Validate Google Drive folder structure against EPISODE_DIRECTORY_STANDARD.md.
 
     Args:
-        drive_service: Authenticated GoogleDriveService instance
+        mirror: Synced DriveMirror containing the folder
         folder_id: Google Drive folder ID to validate
 
     Returns:
@@ -175,32 +172,7 @@ def validate_drive_structure(drive_service, folder_id: str) -> Dict[str, Any]:
     extra_folders = []
 
     try:
-        # Build a map of all folders and files in the Drive folder
-        drive_items = {}
-
-        def _map_drive_items(parent_id: str, parent_path: str = ""):
-            """Recursively map all items in Drive."""
-            try:
-                items = drive_service.list_files(folder_id=parent_id, order_by="folder,name")
-                for item in items:
-                    is_folder = item.get('mimeType') == 'application/vnd.google-apps.folder'
-                    item_name = item['name']
-                    item_path = f"{parent_path}/{item_name}" if parent_path else item_name
-
-                    drive_items[item_path] = {
-                        'type': 'folder' if is_folder else 'file',
-                        'id': item['id'],
-                        'name': item_name
-                    }
-
-                    # Recurse into folders
-                    if is_folder:
-                        _map_drive_items(item['id'], item_path)
-            except Exception as e:
-                logger.warning(f"Error mapping Drive items in {parent_id}: {e}")
-
-        # Map all Drive items
-        _map_drive_items(folder_id)
+        drive_items = mirror.path_map(folder_id)
 
         # Check required folders
         for folder in required_folders:
@@ -240,62 +212,69 @@ def validate_drive_structure(drive_service, folder_id: str) -> Dict[str, Any]:
         }
 
 
-def build_drive_tree(drive_service, folder_id: str) -> tuple[List[Dict[str, Any]], int, int]:
+def build_drive_tree(mirror: DriveMirror, folder_id: str) -> tuple[List[Dict[str, Any]], int, int]:
     """
     Build directory tree structure for Google Drive folder.
 
     Args:
-        drive_service: Authenticated GoogleDriveService instance
+        mirror: Synced DriveMirror containing the folder
         folder_id: Google Drive folder ID to start from
 
     Returns:
         Tuple of (tree structure, total size in bytes, file count)
     """
-    total_size = 0
-    file_count = 0
-
-    def _build_tree_recursive(parent_id: str) -> List[Dict[str, Any]]:
-        """Recursively build tree structure."""
-        nonlocal total_size, file_count
-
-        try:
-            # Get all items in this folder
-            items = drive_service.list_files(folder_id=parent_id, order_by="folder,name")
-
-            tree_nodes = []
-            for item in items:
-                is_folder = item.get('mimeType') == 'application/vnd.google-apps.folder'
-
-                node = {
-                    'title': item['name'],
-                    'id': item['id'],
-                    'type': 'folder' if is_folder else 'file'
-                }
-
-                if not is_folder:
-                    # Regular file - get size
-                    size = int(item.get('size', 0))
-                    node['size'] = size
-                    total_size += size
-                    file_count += 1
-                else:
-                    # Folder - recurse into children
-                    node['children'] = _build_tree_recursive(item['id'])
-
-                tree_nodes.append(node)
+    try:
+        return mirror.tree(folder_id)
+    except Exception as e:
+        logger.error(f"Error building Drive tree: {e}")
+        return [], 0, 0
 
-            return tree_nodes
 
-        except Exception as e:
-            logger.error(f"Error listing Google Drive folder {parent_id}: {e}")
-            return []
+def _compare_drive_side(episode_number: str) -> Dict[str, Any]:
+    """Drive tree and validation for an episode, served from the Drive mirror (blocking)."""
+    result = {
+        "drive_tree": [],
+        "drive_total_size": 0,
+        "drive_file_count": 0,
+        "drive_folder_id": None,
+        "drive_validation": None
+    }
 
     try:
-        tree = _build_tree_recursive(folder_id)
-        return tree, total_size, file_count
+        api_config_manager = APIConfigManager()
+        drive_service = get_drive_service_from_config(api_config_manager)
+
+        # Get episodes root folder ID from config
+        episodes_root_id = drive_service.get_episodes_folder_id()
+        if not episodes_root_id:
+            logger.warning("⚠️  Episodes root folder ID not configured")
+            return result
+
+        # The whole episodes root is mirrored, so every episode's compare after
+        # the first crawl costs one changes() call at most
+        mirror = get_drive_mirror(GoogleDriveApi(drive_service))
+        mirror.sync(episodes_root_id)
+
+        matching_folder = mirror.find_child(episodes_root_id, episode_number, folders_only=True)
+        if matching_folder:
+            drive_folder_id = matching_folder['id']
+            result["drive_folder_id"] = drive_folder_id
+            (result["drive_tree"], result["drive_total_size"],
+             result["drive_file_count"]) = build_drive_tree(mirror, drive_folder_id)
+
+            # Validate Drive structure
+            result["drive_validation"] = validate_drive_structure(mirror, drive_folder_id)
+
+            logger.info(f"✅ Found Google Drive folder for episode {episode_number}")
+        else:
+            logger.warning(f"⚠️  Episode folder {episode_number} not found in Google Drive")
+
+    except ValueError as e:
+        logger.warning(f"⚠️  Google Drive not configured: {e}")
     except Exception as e:
-        logger.error(f"Error building Drive tree: {e}")
-        return [], 0, 0
+        logger.error(f"❌ Error accessing Google Drive: {e}")
+
+    return result
 
 
 @router.get("/consolidation/compare/{episode_number}")
@@ -312,57 +291,13 @@ async def compare_episode_directories(
     try:
         # Build Syncthing tree
         syncthing_path = Path(SYNCTHING_BASE) / episode_number
-        syncthing_tree, syncthing_size, syncthing_count = build_syncthing_tree(syncthing_path)
+        syncthing_tree, syncthing_size, syncthing_count = await run_in_threadpool(build_syncthing_tree, syncthing_path)
 
         # Validate canonical structure
         validation = validate_canonical_structure(syncthing_path)
 
-        # Initialize Drive variables
-        drive_tree = []
-        drive_size = 0
-        drive_count = 0
-        drive_folder_id = None
-        drive_validation = None
-
-        # Try to build Google Drive tree
-        try:
-            api_config_manager = APIConfigManager()
-            drive_service = get_drive_service_from_config(api_config_manager)
-
-            # Get episodes root folder ID from config
-            episodes_root_id = drive_service.get_episodes_folder_id()
-
-            if episodes_root_id:
-                # Look for episode folder within episodes root
-                episode_folders = drive_service.search_files(name_contains=episode_number)
-
-                # Filter to exact match within episodes root
-                matching_folder = None
-                for folder in episode_folders:
-                    if folder['name'] == episode_number and folder.get('mimeType') == 'application/vnd.google-apps.folder':
-                        # Check if parent is episodes root
-                        parents = folder.get('parents', [])
-                        if episodes_root_id in parents:
-                            matching_folder = folder
-                            break
-
-                if matching_folder:
-                    drive_folder_id = matching_folder['id']
-                    drive_tree, drive_size, drive_count = build_drive_tree(drive_service, drive_folder_id)
-
-                    # Validate Drive structure
-                    drive_validation = validate_drive_structure(drive_service, drive_folder_id)
-
-                    logger.info(f"✅ Found Google Drive folder for episode {episode_number}")
-                else:
-                    logger.warning(f"⚠️  Episode folder {episode_number} not found in Google Drive")
-            else:
-                logger.warning("⚠️  Episodes root folder ID not configured")
-
-        except ValueError as e:
-            logger.warning(f"⚠️  Google Drive not configured: {e}")
-        except Exception as e:
-            logger.error(f"❌ Error accessing Google Drive: {e}")
+        # Drive side runs off the event loop (mirror sync may hit the API)
+        drive = await run_in_threadpool(_compare_drive_side, episode_number)
 
         return {
             "episode": episode_number,
@@ -371,11 +306,11 @@ async def compare_episode_directories(
             "syncthing_total_size": syncthing_size,
             "syncthing_file_count": syncthing_count,
             "syncthing_validation": validation,
-            "drive_tree": drive_tree,
-            "drive_total_size": drive_size,
-            "drive_file_count": drive_count,
-            "drive_folder_id": drive_folder_id or "Not found",
-            "drive_validation": drive_validation
+            "drive_tree": drive["drive_tree"],
+            "drive_total_size": drive["drive_total_size"],
+            "drive_file_count": drive["drive_file_count"],
+            "drive_folder_id": drive["drive_folder_id"] or "Not found",
+            "drive_validation": drive["drive_validation"]
         }
 
     except Exception as e:
@@ -4,9 +4,11 @@ Handles library CRUD, placements, and type settings.
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, tuple_
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+import base64
+import json
 from pydantic import BaseModel, Field
 
 from database import get_db
@@ -89,6 +91,18 @@ class CustomTypeCreate(BaseModel):
 # Library CRUD Endpoints
 # =====================
 
+def _encode_cursor(title: str, item_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([title, item_id]).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        title, item_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(title), int(item_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/")
 async def list_library_items(
     item_type: Optional[str] = Query(None, description="Filter by content type"),
@@ -98,13 +112,36 @@ async def list_library_items(
     include_test_data: bool = Query(False, description="Include test data"),
     limit: int = Query(100, le=500),
     offset: int = Query(0),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (keyset; overrides offset)"),
     current_user: dict = Depends(get_current_user_or_key),
     db: Session = Depends(get_db)
 ):
-    """List library items with optional filters."""
-    from models_content_library import ContentLibrary
+    """
+    List library items with optional filters.
+
+    Ordered by (title, id). Pass the returned next_cursor to fetch the next page
+    without an OFFSET scan; offset is still accepted for existing callers.
+    Search is a substring match served by the trigram indexes on title and
+    customer_name (migration g028).
+    """
+    from models_content_library import ContentLibrary, ContentPlacement
 
-    query = db.query(ContentLibrary)
+    query = db.query(
+        ContentLibrary.id,
+        ContentLibrary.asset_id,
+        ContentLibrary.item_type,
+        ContentLibrary.title,
+        ContentLibrary.slug,
+        ContentLibrary.duration,
+        ContentLibrary.valid_from,
+        ContentLibrary.valid_until,
+        ContentLibrary.customer_name,
+        ContentLibrary.priority,
+        ContentLibrary.is_active,
+        ContentLibrary.created_at,
+        # Total matching rows, computed in the same query (window runs before LIMIT)
+        func.count().over().label("total"),
+    )
 
     # Filter by active status
     if is_active is not None:
@@ -137,34 +174,66 @@ async def list_library_items(
     if not include_test_data:
         query = query.filter(ContentLibrary.is_test_data == False)
 
-    # Get total count before pagination
-    total = query.count()
+    # Keyset pagination: rows strictly after the cursor in (title, id) order
+    if cursor:
+        after_title, after_id = _decode_cursor(cursor)
+        query = query.filter(tuple_(ContentLibrary.title, ContentLibrary.id) > tuple_(after_title, after_id))
+        offset = 0
+
+    rows = query.order_by(ContentLibrary.title, ContentLibrary.id).offset(offset).limit(limit).all()
+
+    # Active placement counts for the whole page in one aggregate query
+    placement_counts = {}
+    if rows:
+        placement_counts = dict(
+            db.query(ContentPlacement.library_item_id, func.count(ContentPlacement.id))
+            .filter(
+                ContentPlacement.library_item_id.in_([row.id for row in rows]),
+                ContentPlacement.removed_at == None
+            )
+            .group_by(ContentPlacement.library_item_id)
+            .all()
+        )
+
+    # With a cursor the window only counts rows after it, so report that as
+    # "remaining"; total is only known (for free) on the first/offset path.
+    remaining = None
+    if cursor:
+        total = None
+        remaining = rows[0].total if rows else 0
+    elif rows:
+        total = rows[0].total
+    elif offset:
+        total = query.order_by(None).with_entities(func.count()).scalar() or 0
+    else:
+        total = 0
 
-    # Apply pagination and ordering
-    items = query.order_by(ContentLibrary.title).offset(offset).limit(limit).all()
+    next_cursor = _encode_cursor(rows[-1].title, rows[-1].id) if len(rows) == limit else None
 
     return {
         "items": [
             {
-                "id": item.id,
-                "asset_id": item.asset_id,
-                "item_type": item.item_type,
-                "title": item.title,
-                "slug": item.slug,
-                "duration": item.duration,
-                "valid_from": item.valid_from.isoformat() if item.valid_from else None,
-                "valid_until": item.valid_until.isoformat() if item.valid_until else None,
-                "customer_name": item.customer_name,
-                "priority": item.priority,
-                "is_active": item.is_active,
-                "created_at": item.created_at.isoformat() if item.created_at else None,
-                "placement_count": len([p for p in item.placements if p.removed_at is None])
+                "id": row.id,
+                "asset_id": row.asset_id,
+                "item_type": row.item_type,
+                "title": row.title,
+                "slug": row.slug,
+                "duration": row.duration,
+                "valid_from": row.valid_from.isoformat() if row.valid_from else None,
+                "valid_until": row.valid_until.isoformat() if row.valid_until else None,
+                "customer_name": row.customer_name,
+                "priority": row.priority,
+                "is_active": row.is_active,
+                "created_at": row.created_at.isoformat() if row.created_at else None,
+                "placement_count": placement_counts.get(row.id, 0)
             }
-            for item in items
+            for row in rows
         ],
         "total": total,
+        "remaining": remaining,
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_cursor": next_cursor
     }
 
 
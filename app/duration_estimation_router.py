@@ -16,20 +16,22 @@ from pathlib import Path
 
 # Import file management utilities
 from convert_assetid_router import FileManager
+from services.cue_parser import Cue, parse_script
+from services.rundown_timing import (
+    ScriptTiming, analyze_script, count_words, get_rundown_timing, rebuild_episode_timing, refresh_item_timing
+)
+from services.speaker_rates import FSQ_SEGMENT_TYPE, get_rate_model
+from services.rundown_items import WITH_SCRIPT
 
 router = APIRouter(tags=["Duration Estimation"])
 logger = logging.getLogger(__name__)
 
 # Configuration
 EPISODES_ROOT = Path("/home/episodes")
-DEFAULT_WPM = 150  # Default words per minute for speech
-DEFAULT_FSQ_WPM = 120  # Slightly slower for full-screen quotes (more dramatic)
 
 
 class DurationSettings(BaseModel):
-    """Settings for duration calculation."""
-    speech_wpm: int = DEFAULT_WPM
-    fsq_wpm: int = DEFAULT_FSQ_WPM
+    """Settings for duration calculation (reading rates come from services/speaker_rates)."""
     include_adlibs: bool = True
     include_sots: bool = True
     include_fsqs: bool = True
@@ -103,7 +105,7 @@ class DurationEstimator:
 
         try:
             # Database-first: find by asset_id
-            db_item = self.db.query(RundownItem).filter(
+            db_item = self.db.query(RundownItem).options(WITH_SCRIPT).filter(
                 RundownItem.asset_id == str(asset_id)
             ).first()
 
@@ -121,7 +123,9 @@ class DurationEstimator:
                     segment_file_info['file_path'],
                     segment_file_info['segment_name'],
                     segment_file_info['episode_number'],
-                    update_file
+                    update_file,
+                    db_item.speaker_id,
+                    db_item.item_type
                 )
 
             raise HTTPException(status_code=404, detail=f"Segment with AssetID {asset_id} has no content in DB or filesystem")
@@ -151,62 +155,41 @@ class DurationEstimator:
             logger.error(f"Failed to estimate duration for segment {segment_name}: {e}")
             raise HTTPException(status_code=500, detail=f"Duration estimation failed: {str(e)}")
     
-    def _estimate_from_db_item(self, db_item, update_db: bool = True) -> SegmentDurationResult:
-        """Estimate duration from a database RundownItem's script_content."""
-        from models_v2 import RundownItem, Rundown, Episode
+    def _estimate_from_db_item(self, db_item, update_db: bool = True,
+                               commit: bool = True) -> SegmentDurationResult:
+        """Estimate duration from a database RundownItem's script_content.
 
+        The item's `duration` is its planned time and is left alone: with
+        update_db the estimate is stored in its rundown_item_timings row
+        instead (re-analyzed and rolled up). With commit=False nothing is
+        written; the caller stores the estimates (estimate_episode_duration
+        does one batch per episode).
+        """
         content = db_item.script_content or ''
         segment_name = db_item.slug or db_item.title or f"item-{db_item.id}"
         original_duration = db_item.duration
 
-        # Find episode number for the result
-        episode_number = "unknown"
-        if db_item.rundown:
-            rundown = db_item.rundown
-            if rundown.episode:
-                episode_number = rundown.episode.episode_number or "unknown"
-
-        # Parse content into body and cue blocks
-        body_content, cue_blocks = self._parse_segment_content(content)
-
-        # Calculate speech duration
-        speech_word_count = self._count_words(body_content)
-        speech_duration = speech_word_count / self.settings.speech_wpm * 60
-
-        # Analyze cue blocks
-        cue_analyses = []
-        sot_duration = 0.0
-        fsq_duration = 0.0
-        adlib_duration = 0.0
-
-        for cue_data in cue_blocks:
-            analysis = self._analyze_cue_block(cue_data)
-            cue_analyses.append(analysis)
-
-            if analysis.cue_type == "SOT" and self.settings.include_sots:
-                if analysis.calculated_duration:
-                    sot_duration += self._parse_duration_to_seconds(analysis.calculated_duration)
-            elif analysis.cue_type == "FSQ" and self.settings.include_fsqs:
-                if analysis.calculated_duration:
-                    fsq_duration += self._parse_duration_to_seconds(analysis.calculated_duration)
-            elif analysis.cue_type == "ADLIB" and self.settings.include_adlibs:
-                if analysis.calculated_duration:
-                    adlib_duration += self._parse_duration_to_seconds(analysis.calculated_duration)
+        # Time the script at its readers' rates
+        timing, cue_analyses = self._analyze_content(content, db_item.speaker_id, db_item.item_type)
+        speech_word_count = timing.word_count
+        speech_duration, sot_duration, fsq_duration, adlib_duration = self._included_seconds(timing)
 
         total_seconds = speech_duration + sot_duration + fsq_duration + adlib_duration
         total_duration_formatted = self._seconds_to_duration_string(total_seconds)
 
-        # Update duration in database
+        # Store the estimate in the item's timing row (never in the planned duration)
         duration_updated = False
         if update_db:
-            try:
-                db_item.duration = total_duration_formatted
-                self.db.commit()
-                duration_updated = True
-                logger.info(f"Updated duration in DB for {segment_name}: {total_duration_formatted}")
-            except Exception as e:
-                logger.error(f"Failed to update duration in DB: {e}")
-                self.db.rollback()
+            duration_updated = True
+            if commit:
+                try:
+                    duration_updated = refresh_item_timing(self.db.connection(), [db_item.id], force=True)
+                    self.db.commit()
+                    logger.info(f"Updated timing in DB for {segment_name}: {total_duration_formatted}")
+                except Exception as e:
+                    logger.error(f"Failed to update timing in DB: {e}")
+                    self.db.rollback()
+                    duration_updated = False
 
         return SegmentDurationResult(
             success=True,
@@ -261,9 +244,11 @@ class DurationEstimator:
         
         return None
     
-    def _estimate_segment_duration_common(self, segment_file: Path, segment_name: str, 
-                                        episode_number: str, update_file: bool) -> SegmentDurationResult:
-        """Common logic for segment duration estimation."""
+    def _estimate_segment_duration_common(self, segment_file: Path, segment_name: str,
+                                        episode_number: str, update_file: bool,
+                                        speaker_id: Optional[int] = None,
+                                        item_type: Optional[str] = None) -> SegmentDurationResult:
+        """Common logic for segment duration estimation (speaker_id / item_type pick the reading rate)."""
         try:
             # Read segment content
             content = FileManager.read_file(segment_file)
@@ -271,34 +256,10 @@ class DurationEstimator:
             # Extract original duration from frontmatter
             original_duration = self._extract_duration_from_frontmatter(content)
             
-            # Parse content into body and cue blocks
-            body_content, cue_blocks = self._parse_segment_content(content)
-            
-            # Calculate speech duration (body content excluding cue blocks)
-            speech_word_count = self._count_words(body_content)
-            speech_duration = speech_word_count / self.settings.speech_wpm * 60  # seconds
-            
-            # Analyze cue blocks
-            cue_analyses = []
-            sot_duration = 0.0
-            fsq_duration = 0.0
-            adlib_duration = 0.0
-            
-            for cue_data in cue_blocks:
-                analysis = self._analyze_cue_block(cue_data)
-                cue_analyses.append(analysis)
-                
-                if analysis.cue_type == "SOT" and self.settings.include_sots:
-                    if analysis.calculated_duration:
-                        sot_duration += self._parse_duration_to_seconds(analysis.calculated_duration)
-                
-                elif analysis.cue_type == "FSQ" and self.settings.include_fsqs:
-                    if analysis.calculated_duration:
-                        fsq_duration += self._parse_duration_to_seconds(analysis.calculated_duration)
-                
-                elif analysis.cue_type == "ADLIB" and self.settings.include_adlibs:
-                    if analysis.calculated_duration:
-                        adlib_duration += self._parse_duration_to_seconds(analysis.calculated_duration)
+            # Time the script at its readers' rates (body text outside cue blocks, plus cues)
+            timing, cue_analyses = self._analyze_content(content, speaker_id, item_type)
+            speech_word_count = timing.word_count
+            speech_duration, sot_duration, fsq_duration, adlib_duration = self._included_seconds(timing)
             
             # Calculate total duration
             total_seconds = speech_duration + sot_duration + fsq_duration + adlib_duration
@@ -358,24 +319,42 @@ class DurationEstimator:
                     Rundown.episode_id == episode.id
                 ).first()
                 if rundown:
-                    db_items = self.db.query(RundownItem).filter(
+                    db_items = self.db.query(RundownItem).options(WITH_SCRIPT).filter(
                         RundownItem.rundown_id == rundown.id
                     ).order_by(RundownItem.order_in_rundown).all()
 
             if db_items:
                 # Process from database
+                estimated_ids = []
                 for db_item in db_items:
                     if not db_item.script_content:
                         continue
                     try:
-                        result = self._estimate_from_db_item(db_item, update_files)
+                        result = self._estimate_from_db_item(db_item, update_files, commit=False)
                         segment_results.append(result)
                         total_episode_seconds += result.total_duration_seconds
                         if result.duration_updated:
                             segments_updated += 1
+                            estimated_ids.append(db_item.id)
                     except Exception as e:
                         logger.warning(f"Failed to process DB item {db_item.asset_id}: {e}")
                         continue
+
+                # One batch and one transaction for the whole episode (the
+                # rundown is rolled up once instead of once per item)
+                if segments_updated:
+                    try:
+                        stored = refresh_item_timing(self.db.connection(), estimated_ids, force=True)
+                        if not stored:
+                            raise RuntimeError("timing rows not written")
+                        self.db.commit()
+                        logger.info(f"Updated timing of {segments_updated} items in DB for episode {episode_number}")
+                    except Exception as e:
+                        logger.error(f"Failed to update timing in DB: {e}")
+                        self.db.rollback()
+                        segments_updated = 0
+                        for result in segment_results:
+                            result.duration_updated = False
             else:
                 # Filesystem fallback
                 episode_path = EPISODES_ROOT / episode_number
@@ -417,90 +396,56 @@ class DurationEstimator:
             logger.error(f"Failed to estimate episode duration for {episode_number}: {e}")
             raise HTTPException(status_code=500, detail=f"Episode duration estimation failed: {str(e)}")
     
+    def _analyze_content(self, content: str, speaker_id: Optional[int] = None,
+                         item_type: Optional[str] = None) -> tuple[ScriptTiming, List[CueAnalysis]]:
+        """Timing of a script at its readers' speaker rates (as rundown_timing stores it), plus a per-cue breakdown."""
+        rates = get_rate_model(self.db.connection())
+        timing = analyze_script(content, speaker_id, item_type, rates)
+        fsq_wpm = rates.rate(speaker_id, FSQ_SEGMENT_TYPE).wpm
+        _, cue_blocks = self._parse_segment_content(content)
+        return timing, [self._analyze_cue_block(cue_data, fsq_wpm) for cue_data in cue_blocks]
+
+    def _included_seconds(self, timing: ScriptTiming) -> tuple[float, float, float, float]:
+        """(speech, SOT, FSQ, ad-lib) seconds, leaving out the cue types the settings exclude."""
+        return (
+            timing.speech_seconds,
+            timing.sot_seconds if self.settings.include_sots else 0.0,
+            timing.fsq_seconds if self.settings.include_fsqs else 0.0,
+            timing.adlib_seconds if self.settings.include_adlibs else 0.0,
+        )
+
     def _parse_segment_content(self, content: str) -> tuple[str, List[Dict[str, Any]]]:
-        """Parse segment content into body text and cue blocks."""
-        lines = content.split('\n')
-        
+        """Parse segment content into body text (outside frontmatter and cue blocks) and cue blocks."""
+        script = parse_script(content)
+        cue_blocks = [cue_data for cue_data in map(self._parse_cue_block, script.cues) if cue_data]
+
         # Skip frontmatter
         in_frontmatter = False
         body_lines = []
-        cue_blocks = []
-        
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            
-            # Handle frontmatter
+        for line in script.text().split('\n'):
             if line.strip() == '---':
-                if not in_frontmatter:
-                    in_frontmatter = True
-                else:
-                    in_frontmatter = False
-                i += 1
-                continue
-            
-            if in_frontmatter:
-                i += 1
+                in_frontmatter = not in_frontmatter
                 continue
-            
-            # Check for cue block start (expanded or collapsed marker)
-            if '<!-- Begin Cue -->' in line or '<!-- Begin Cue collapsed -->' in line:
-                # Extract cue block
-                cue_lines = [line]
-                i += 1
-                
-                while i < len(lines) and '<!-- End Cue -->' not in lines[i]:
-                    cue_lines.append(lines[i])
-                    i += 1
-                
-                if i < len(lines):
-                    cue_lines.append(lines[i])  # Include end comment
-                
-                # Parse cue block
-                cue_data = self._parse_cue_block('\n'.join(cue_lines))
-                if cue_data:
-                    cue_blocks.append(cue_data)
-                
-                i += 1
-                continue
-            
-            # Regular body content
-            body_lines.append(line)
-            i += 1
-        
-        body_content = '\n'.join(body_lines)
-        return body_content, cue_blocks
-    
-    def _parse_cue_block(self, cue_text: str) -> Optional[Dict[str, Any]]:
-        """Parse a cue block and extract field data."""
-        cue_data = {}
-        
-        for line in cue_text.split('\n'):
-            line = line.strip()
-            # Match [Field: Value] pattern
-            field_match = re.match(r'^\[([^:]+):\s*(.*)\]$', line)
-            if field_match:
-                field_name = field_match.group(1).strip()
-                field_value = field_match.group(2).strip()
-                
-                # Map common field names
-                if field_name.lower() == 'type':
-                    cue_data['type'] = field_value
-                elif field_name.lower() == 'assetid':
-                    cue_data['AssetID'] = field_value
-                elif field_name.lower() == 'duration':
-                    cue_data['duration'] = field_value
-                elif field_name.lower() == 'quote':
-                    cue_data['quote'] = field_value
-                elif field_name.lower() == 'slug':
-                    cue_data['slug'] = field_value
-                else:
-                    cue_data[field_name.lower()] = field_value
-        
-        return cue_data if cue_data else None
-    
-    def _analyze_cue_block(self, cue_data: Dict[str, Any]) -> CueAnalysis:
-        """Analyze a single cue block and calculate its duration."""
+            if not in_frontmatter:
+                body_lines.append(line)
+
+        return '\n'.join(body_lines), cue_blocks
+
+    def _parse_cue_block(self, cue: Cue) -> Optional[Dict[str, Any]]:
+        """Field data of a parsed cue block (common fields under fixed keys, the rest lowercased)."""
+        if not cue.fields:
+            return None
+        cue_data = {field.name.lower(): field.value for field in reversed(cue.fields)}
+        for key, name in (('type', 'Type'), ('AssetID', 'Asset Id'), ('duration', 'Duration'),
+                          ('quote', 'Quote'), ('slug', 'Slug')):
+            field = cue.field(name)
+            if field is not None:
+                cue_data.pop(field.name.lower(), None)
+                cue_data[key] = field.value
+        return cue_data
+    
+    def _analyze_cue_block(self, cue_data: Dict[str, Any], fsq_wpm: float) -> CueAnalysis:
+        """Analyze a single cue block and calculate its duration (FSQ quotes read at fsq_wpm)."""
         cue_type = cue_data.get('type', 'UNKNOWN')
         asset_id = cue_data.get('AssetID')
         original_duration = cue_data.get('duration')
@@ -518,9 +463,9 @@ class DurationEstimator:
             quote_text = cue_data.get('quote', '')
             if quote_text:
                 word_count = self._count_words(quote_text)
-                duration_seconds = word_count / self.settings.fsq_wpm * 60
+                duration_seconds = word_count / fsq_wpm * 60
                 calculated_duration = self._seconds_to_duration_string(duration_seconds)
-                notes = f"Calculated from {word_count} words at {self.settings.fsq_wpm} WPM"
+                notes = f"Calculated from {word_count} words at {fsq_wpm:.0f} WPM"
             else:
                 calculated_duration = "00:00:10"  # Default for empty quotes
                 notes = "No quote text found, using default duration"
@@ -545,28 +490,7 @@ class DurationEstimator:
     
     def _count_words(self, text: str) -> int:
         """Count words in text, excluding markdown formatting."""
-        if not text:
-            return 0
-        
-        # Remove markdown formatting
-        # Remove headers (# ## ###)
-        text = re.sub(r'^#+\s*', '', text, flags=re.MULTILINE)
-        
-        # Remove bold/italic markers
-        text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)  # **bold**
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)        # *italic*
-        text = re.sub(r'__([^_]+)__', r'\1', text)          # __bold__
-        text = re.sub(r'_([^_]+)_', r'\1', text)            # _italic_
-        
-        # Remove links [text](url)
-        text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)
-        
-        # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
-        
-        # Split into words and count
-        words = text.split()
-        return len(words)
+        return count_words(text)
     
     def _parse_duration_to_seconds(self, duration_str: str) -> float:
         """Parse duration string (HH:MM:SS or MM:SS) to seconds."""
@@ -614,15 +538,23 @@ class DurationEstimator:
     def _update_segment_duration(self, content: str, new_duration: str, 
                                 cue_analyses: List[CueAnalysis]) -> str:
         """Update duration in frontmatter and FSQ durations in cue blocks."""
+        # FSQ durations first, spliced in by offset (each cue keeps its
+        # Begin marker, collapsed or not)
+        script = parse_script(content)
+        edits = []
+        for cue in script.of_type("FSQ"):
+            analysis = self._match_cue_analysis(cue, cue_analyses)
+            if analysis and analysis.calculated_duration:
+                edits.append((cue, {'Duration': analysis.calculated_duration}))
+        if edits:
+            content = script.edit_fields(edits)
+
         lines = content.split('\n')
         updated_lines = []
         in_frontmatter = False
         duration_updated = False
         
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            
+        for line in lines:
             # Handle frontmatter
             if line.strip() == '---':
                 updated_lines.append(line)
@@ -634,105 +566,34 @@ class DurationEstimator:
                     if not duration_updated:
                         updated_lines.insert(-1, f"duration: {new_duration}")
                         duration_updated = True
-                i += 1
                 continue
             
-            if in_frontmatter:
+            if in_frontmatter and line.strip().startswith('duration:'):
                 # Update duration field
-                if line.strip().startswith('duration:'):
-                    updated_lines.append(f"duration: {new_duration}")
-                    duration_updated = True
-                else:
-                    updated_lines.append(line)
-                i += 1
-                continue
-            
-            # Handle cue blocks - update FSQ durations (expanded or collapsed).
-            # The original Begin line is carried through verbatim in cue_lines,
-            # so the collapsed marker is preserved.
-            if '<!-- Begin Cue -->' in line or '<!-- Begin Cue collapsed -->' in line:
-                cue_start = i
-                cue_lines = [line]
-                i += 1
-                
-                while i < len(lines) and '<!-- End Cue -->' not in lines[i]:
-                    cue_lines.append(lines[i])
-                    i += 1
-                
-                if i < len(lines):
-                    cue_lines.append(lines[i])  # Include end comment
-                
-                # Update FSQ duration if applicable
-                updated_cue_lines = self._update_cue_block_duration(cue_lines, cue_analyses)
-                updated_lines.extend(updated_cue_lines)
-                
-                i += 1
+                updated_lines.append(f"duration: {new_duration}")
+                duration_updated = True
                 continue
             
-            # Regular content
             updated_lines.append(line)
-            i += 1
         
         return '\n'.join(updated_lines)
     
-    def _update_cue_block_duration(self, cue_lines: List[str], 
-                                  cue_analyses: List[CueAnalysis]) -> List[str]:
-        """Update duration field in FSQ cue blocks."""
-        # Extract cue type to find matching analysis
-        cue_type = None
-        asset_id = None
-        
-        for line in cue_lines:
-            type_match = re.search(r'^\[Type:\s*(.+)\]$', line.strip())
-            if type_match:
-                cue_type = type_match.group(1).strip()
-            
-            id_match = re.search(r'^\[AssetID:\s*(.+)\]$', line.strip())
-            if id_match:
-                asset_id = id_match.group(1).strip()
-        
-        # Find matching analysis
-        matching_analysis = None
+    def _match_cue_analysis(self, cue: Cue, cue_analyses: List[CueAnalysis]) -> Optional[CueAnalysis]:
+        """The analysis of a cue block: same type and AssetID, or the first of its type if it has no AssetID."""
+        asset_id = cue.asset_id
         for analysis in cue_analyses:
-            if analysis.cue_type == cue_type:
+            if analysis.cue_type == cue.get('Type'):
                 if asset_id and analysis.asset_id == asset_id:
-                    matching_analysis = analysis
-                    break
+                    return analysis
                 elif not asset_id:  # Match by type if no AssetID
-                    matching_analysis = analysis
-                    break
-        
-        # Update duration field for FSQ cues
-        if matching_analysis and cue_type == "FSQ" and matching_analysis.calculated_duration:
-            updated_lines = []
-            duration_updated = False
-            
-            for line in cue_lines:
-                if re.match(r'^\[Duration:\s*.*\]$', line.strip()):
-                    updated_lines.append(f"[Duration: {matching_analysis.calculated_duration}]")
-                    duration_updated = True
-                else:
-                    updated_lines.append(line)
-            
-            # Add duration field if not found
-            if not duration_updated and cue_type == "FSQ":
-                # Insert before the end comment
-                for i, line in enumerate(updated_lines):
-                    if '<!-- End Cue -->' in line:
-                        updated_lines.insert(i, f"[Duration: {matching_analysis.calculated_duration}]")
-                        break
-            
-            return updated_lines
-        
-        return cue_lines
+                    return analysis
+        return None
 
 
 @router.post("/estimateDuration/assetid/{asset_id}")
 async def estimate_segment_duration_by_assetid(
     asset_id: str,
     update_file: bool = Query(True, description="Whether to update the segment file with calculated duration"),
-    speech_wpm: int = Query(DEFAULT_WPM, description="Words per minute for speech"),
-    fsq_wpm: int = Query(DEFAULT_FSQ_WPM, description="Words per minute for full-screen quotes"),
     include_adlibs: bool = Query(True, description="Include ad-lib durations"),
     include_sots: bool = Query(True, description="Include SOT durations"),
     include_fsqs: bool = Query(True, description="Include FSQ durations"),
@@ -753,7 +614,7 @@ async def estimate_segment_duration_by_assetid(
     **Process:**
     1. Locate segment file by scanning filesystem for AssetID
     2. Count words in segment body (speech content)
-    3. Calculate speech duration using WPM
+    3. Time speech at each reader's rate (services/speaker_rates)
     4. Add SOT durations from cue blocks
     5. Calculate FSQ durations from quote word counts
     6. Add ad-lib durations
@@ -762,8 +623,6 @@ async def estimate_segment_duration_by_assetid(
     user_id = current_user.get("username", current_user.get("client_name", "api_user"))
     
     settings = DurationSettings(
-        speech_wpm=speech_wpm,
-        fsq_wpm=fsq_wpm,
         include_adlibs=include_adlibs,
         include_sots=include_sots,
         include_fsqs=include_fsqs
@@ -778,8 +637,6 @@ async def estimate_segment_duration(
     episode_number: str,
     segment_name: str,
     update_file: bool = Query(True, description="Whether to update the segment file with calculated duration"),
-    speech_wpm: int = Query(DEFAULT_WPM, description="Words per minute for speech"),
-    fsq_wpm: int = Query(DEFAULT_FSQ_WPM, description="Words per minute for full-screen quotes"),
     include_adlibs: bool = Query(True, description="Include ad-lib durations"),
     include_sots: bool = Query(True, description="Include SOT durations"),
     include_fsqs: bool = Query(True, description="Include FSQ durations"),
@@ -797,7 +654,7 @@ async def estimate_segment_duration(
     
     **Process:**
     1. Count words in segment body (speech content)
-    2. Calculate speech duration using WPM
+    2. Time speech at each reader's rate (services/speaker_rates)
     3. Add SOT durations from cue blocks
     4. Calculate FSQ durations from quote word counts
     5. Add ad-lib durations
@@ -806,8 +663,6 @@ async def estimate_segment_duration(
     user_id = current_user.get("username", current_user.get("client_name", "api_user"))
     
     settings = DurationSettings(
-        speech_wpm=speech_wpm,
-        fsq_wpm=fsq_wpm,
         include_adlibs=include_adlibs,
         include_sots=include_sots,
         include_fsqs=include_fsqs
@@ -821,8 +676,6 @@ async def estimate_segment_duration(
 async def estimate_episode_duration(
     episode_number: str,
     update_files: bool = Query(True, description="Whether to update segment files with calculated durations"),
-    speech_wpm: int = Query(DEFAULT_WPM, description="Words per minute for speech"),
-    fsq_wpm: int = Query(DEFAULT_FSQ_WPM, description="Words per minute for full-screen quotes"),
     include_adlibs: bool = Query(True, description="Include ad-lib durations"),
     include_sots: bool = Query(True, description="Include SOT durations"), 
     include_fsqs: bool = Query(True, description="Include FSQ durations"),
@@ -841,8 +694,6 @@ async def estimate_episode_duration(
     user_id = current_user.get("username", current_user.get("client_name", "api_user"))
     
     settings = DurationSettings(
-        speech_wpm=speech_wpm,
-        fsq_wpm=fsq_wpm,
         include_adlibs=include_adlibs,
         include_sots=include_sots,
         include_fsqs=include_fsqs
@@ -855,8 +706,6 @@ async def estimate_episode_duration(
 @router.get("/estimateDuration/preview/assetid/{asset_id}")
 async def preview_segment_duration_by_assetid(
     asset_id: str,
-    speech_wpm: int = Query(DEFAULT_WPM, description="Words per minute for speech"),
-    fsq_wpm: int = Query(DEFAULT_FSQ_WPM, description="Words per minute for full-screen quotes"),
     include_adlibs: bool = Query(True, description="Include ad-lib durations"),
     include_sots: bool = Query(True, description="Include SOT durations"),
     include_fsqs: bool = Query(True, description="Include FSQ durations"),
@@ -872,8 +721,6 @@ async def preview_segment_duration_by_assetid(
     user_id = current_user.get("username", current_user.get("client_name", "api_user"))
     
     settings = DurationSettings(
-        speech_wpm=speech_wpm,
-        fsq_wpm=fsq_wpm,
         include_adlibs=include_adlibs,
         include_sots=include_sots,
         include_fsqs=include_fsqs
@@ -887,8 +734,6 @@ async def preview_segment_duration_by_assetid(
 async def preview_segment_duration(
     episode_number: str,
     segment_name: str,
-    speech_wpm: int = Query(DEFAULT_WPM, description="Words per minute for speech"),
-    fsq_wpm: int = Query(DEFAULT_FSQ_WPM, description="Words per minute for full-screen quotes"),
     include_adlibs: bool = Query(True, description="Include ad-lib durations"),
     include_sots: bool = Query(True, description="Include SOT durations"),
     include_fsqs: bool = Query(True, description="Include FSQ durations"),
@@ -903,12 +748,90 @@ async def preview_segment_duration(
     user_id = current_user.get("username", current_user.get("client_name", "api_user"))
     
     settings = DurationSettings(
-        speech_wpm=speech_wpm,
-        fsq_wpm=fsq_wpm,
         include_adlibs=include_adlibs,
         include_sots=include_sots,
         include_fsqs=include_fsqs
     )
     
     estimator = DurationEstimator(db, user_id, settings)
-    return estimator.estimate_segment_duration(episode_number, segment_name, update_file=False)
\ No newline at end of file
+    return estimator.estimate_segment_duration(episode_number, segment_name, update_file=False)
+
+
+@router.get("/estimateDuration/timing/{episode_number}")
+async def get_episode_timing(
+    episode_number: str,
+    current_user: dict = Depends(get_current_user_or_key),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Live timing of an episode's rundowns: running time, backtime and over/under.
+
+    **Read-only, no recompute.** Served from the timing maintained on every
+    item save (see services/rundown_timing):
+    - summary: estimated vs planned totals, over/under against the hard out
+      (episode target_duration), and per-block start/estimated/planned/over-under
+    - items: start_seconds (running time), backtime_seconds (latest start that
+      still makes the hard out), estimated vs planned seconds
+
+    Items with `analyzed: false` pre-date the timing table; POST .../rebuild
+    once to backfill them.
+    """
+    from models_v2 import Episode, Rundown
+
+    try:
+        episode_num_int = int(episode_number)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid episode number format")
+
+    episode = db.query(Episode.id).filter(Episode.episode_number == episode_num_int).first()
+    if not episode:
+        raise HTTPException(status_code=404, detail=f"Episode {episode_number} not found")
+
+    rundowns = db.query(Rundown.id, Rundown.name).filter(
+        Rundown.episode_id == episode.id
+    ).order_by(Rundown.order_in_episode, Rundown.id).all()
+
+    return {
+        "episode_number": episode_number,
+        "rundowns": [
+            {"rundown_id": rundown.id, "name": rundown.name, **get_rundown_timing(db, rundown.id)}
+            for rundown in rundowns
+        ],
+    }
+
+
+@router.post("/estimateDuration/timing/{episode_number}/rebuild")
+async def rebuild_timing(
+    episode_number: str,
+    force: bool = Query(False, description="Re-estimate unchanged scripts too (e.g. after speaker rates changed)"),
+    current_user: dict = Depends(get_current_user_or_key),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """
+    Re-estimate every script of an episode and recompute its timing.
+
+    Backfills items saved before timing was materialized; scripts whose
+    content hash is unchanged are skipped unless `force`. All of the
+    episode's paragraphs are timed in one batch with the current speaker
+    reading rates (services/speaker_rates).
+    """
+    from models_v2 import Episode
+
+    try:
+        episode_num_int = int(episode_number)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid episode number format")
+
+    episode = db.query(Episode.id).filter(Episode.episode_number == episode_num_int).first()
+    if not episode:
+        raise HTTPException(status_code=404, detail=f"Episode {episode_number} not found")
+
+    try:
+        summaries = rebuild_episode_timing(db, episode.id, force=force)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to rebuild timing for episode {episode_number}: {e}")
+        raise HTTPException(status_code=500, detail=f"Timing rebuild failed: {str(e)}")
+
+    return {"episode_number": episode_number, "rundowns": summaries}
@@ -87,6 +87,31 @@ async def create_episode(
         logger.error(f"Error creating episode: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to create episode: {str(e)}")
 
+@router.post("/create-batch", response_model=List[BlueprintResponse])
+async def create_episodes(
+    requests: List[BlueprintCreate],
+    service: EpisodeScaffoldService = Depends(get_episode_service),
+    current_user: dict = Depends(get_current_user_or_key)
+):
+    """Create several episodes from blueprint templates in one transaction (all or nothing)"""
+    if not requests:
+        raise HTTPException(status_code=400, detail="No episodes to create")
+    try:
+        user_id = current_user.get('id') or current_user.get('user_id')
+        organization_id = current_user.get('organization_id', None)
+
+        return await service.create_episodes(
+            requests=requests,
+            user_id=user_id,
+            organization_id=organization_id
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating episodes: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to create episodes: {str(e)}")
+
 @router.get("/validate-number/{episode_number}")
 async def validate_episode_number(
     episode_number: str,
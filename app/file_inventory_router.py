@@ -4,6 +4,7 @@ Endpoints for scanning episode directories and generating semantic file inventor
 """
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from pathlib import Path
 from typing import Optional
@@ -314,7 +315,7 @@ async def scan_episode_inventory(
 
         # Step 1: Scan directory recursively
         logger.info("Scanning directory tree...")
-        files = scan_directory_recursive(episode_path)
+        files = await run_in_threadpool(scan_directory_recursive, episode_path)
         logger.info(f"Found {len(files)} files")
 
         if len(files) == 0:
@@ -559,6 +560,11 @@ async def scan_episode_batched(
             if first_key:
                 logger.info(f"First slot '{first_key}' value type: {type(slot_results[first_key])}, value: {slot_results[first_key]}")
 
+        # Only slots the pre-matcher couldn't settle (and weren't cached) cost an LLM call
+        llm_slots = sum(1 for r in slot_results.values() if isinstance(r, dict) and r.get('matched_by') == 'llm')
+        rule_slots = sum(1 for r in slot_results.values() if isinstance(r, dict) and r.get('matched_by') == 'rules')
+        llm_calls_made = (llm_slots + batch_size - 1) // batch_size
+
         # Generate mapping
         scan_metadata = {
             "llm_model": f"{llm_service.provider}:{getattr(llm_service, 'model', 'unknown')}",
@@ -593,7 +599,8 @@ async def scan_episode_batched(
                 "slots_filled": sum(1 for r in slot_results.values() if isinstance(r, dict) and r.get('matches')),
                 "slots_empty": len(slot_results) - sum(1 for r in slot_results.values() if isinstance(r, dict) and r.get('matches')),
                 "files_matched": len(set([f for r in slot_results.values() if isinstance(r, dict) for f in r.get('matches', [])])),
-                "llm_calls_made": (len(slot_results) + batch_size - 1) // batch_size
+                "llm_calls_made": llm_calls_made,
+                "slots_resolved_by_rules": rule_slots
             },
             "slot_results": slot_results
         }
@@ -628,7 +635,8 @@ async def scan_episode_batched(
                 "slots_filled": slots_filled,
                 "slots_empty": len(slot_results) - slots_filled,
                 "files_matched": files_matched,
-                "llm_calls_made": (len(slot_results) + batch_size - 1) // batch_size
+                "llm_calls_made": llm_calls_made,
+                "slots_resolved_by_rules": rule_slots
             },
             "slot_results": slot_results
         }
@@ -17,7 +17,7 @@ Endpoints:
 
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional
 from pathlib import Path
 from datetime import datetime
 
@@ -25,6 +25,8 @@ from auth.router import get_current_user_or_key
 from core.paths import ShowBuildPaths
 from services.asset_processing import generate_fsq_png
 from services.asset_id import AssetIDService
+from services.cue_parser import parse_script
+from services.rundown_items import WITH_SCRIPT
 from database import get_db
 from sqlalchemy.orm import Session
 from celery_jobs_router import register_celery_job
@@ -494,7 +496,6 @@ async def regenerate_all_fsq_assets(
         Summary of batch generation with task IDs for monitoring
     """
     from models_v2 import RundownItem, Rundown, Episode
-    import re
 
     # Extract regenerate_existing from request body (default False)
     regenerate_existing = request.regenerate_existing if request else False
@@ -543,7 +544,7 @@ async def regenerate_all_fsq_assets(
             )
 
         # Get all rundown items for this rundown
-        rundown_items = db.query(RundownItem).filter(
+        rundown_items = db.query(RundownItem).options(WITH_SCRIPT).filter(
             RundownItem.rundown_id == rundown.id
         ).order_by(RundownItem.order_in_rundown).all()
 
@@ -562,22 +563,13 @@ async def regenerate_all_fsq_assets(
 
         # Parse FSQ cue blocks from script content
         fsq_cues = []
-        fsq_pattern = re.compile(
-            r'<!-- Begin Cue(?: collapsed)? -->.*?'
-            r'\[Type:\s*FSQ\].*?'
-            r'<!-- End Cue -->',
-            re.DOTALL | re.IGNORECASE
-        )
-
         for item in rundown_items:
             if not item.script_content:
                 continue
 
-            matches = fsq_pattern.findall(item.script_content)
-            for match in matches:
-                # Extract cue data from match
-                cue_data = _parse_cue_block(match)
-                if cue_data and cue_data.get('quote'):
+            for cue in parse_script(item.script_content).of_type('FSQ'):
+                cue_data = cue.field_map()
+                if cue_data.get('quote'):
                     cue_data['rundown_order'] = item.order_in_rundown
                     cue_data['rundown_item_id'] = item.id
                     fsq_cues.append(cue_data)
@@ -721,56 +713,3 @@ async def regenerate_all_fsq_assets(
             status_code=500,
             detail=f"Batch FSQ generation failed: {str(e)}"
         )
-
-
-def _parse_cue_block(cue_content: str) -> Dict[str, Any]:
-    """
-    Parse FSQ cue block content into a dictionary.
-
-    Args:
-        cue_content: Raw cue block content between Begin/End Cue markers
-
-    Returns:
-        dict: Parsed cue data
-    """
-    import re
-
-    cue_data = {}
-
-    # Parse field lines [Field: Value] line-by-line
-    # Use greedy (.*) to match to the LAST ] on each line, so that
-    # square brackets inside quote text (e.g. "[I am] interested...")
-    # are preserved instead of being treated as field terminators.
-    field_pattern = re.compile(r'^\s*\[([^:]+):\s*(.*)\]\s*$')
-
-    for line in cue_content.split('\n'):
-        match = field_pattern.match(line)
-        if not match:
-            continue
-        field_name = match.group(1).strip()
-        field_value = match.group(2).strip()
-
-        # Convert field names to camelCase
-        camel_field = _to_camel_case(field_name)
-
-        # Strip quotes from quote field
-        if camel_field.lower() == 'quote' and field_value:
-            if field_value.startswith('"') or field_value.startswith("'"):
-                field_value = field_value[1:]
-            if field_value.endswith('"') or field_value.endswith("'"):
-                field_value = field_value[:-1]
-
-        cue_data[camel_field] = field_value
-
-    return cue_data
-
-
-def _to_camel_case(field_name: str) -> str:
-    """Convert field name to camelCase."""
-    words = field_name.replace('-', ' ').replace('_', ' ').split()
-    if not words:
-        return field_name
-    result = words[0].lower()
-    for word in words[1:]:
-        result += word.capitalize()
-    return result
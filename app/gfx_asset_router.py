@@ -21,6 +21,7 @@ from datetime import datetime, timezone
 from auth.router import get_current_user_or_key
 from services.asset_processing import generate_gfx_png
 from services.xpost_renderer import generate_xpost_png
+from services.rundown_items import WITH_SCRIPT
 from models.settings import GfxXpostCue
 from database import get_db
 from sqlalchemy.orm import Session
@@ -299,7 +300,7 @@ async def regenerate_all_gfx_assets(
                 message="No rundown found for this episode"
             )
 
-        rundown_items = db.query(RundownItem).filter(
+        rundown_items = db.query(RundownItem).options(WITH_SCRIPT).filter(
             RundownItem.rundown_id == rundown.id
         ).order_by(RundownItem.order_in_rundown).all()
 
@@ -1,2 +1,2 @@
 # Moved to services/link_preview_service.py — this shim preserves existing imports
-from services.link_preview_service import get_twitter_bearer_token, get_cached_preview, cache_preview, fetch_link_preview
+from services.link_preview_service import get_twitter_bearer_token, get_cached_preview, get_cached_previews, cache_preview, fetch_link_preview, fetch_link_preview_async, fetch_link_previews_async, invalidate_preview
@@ -6,9 +6,10 @@ Every entity has an AssetID from central service.
 Split into domain-focused modules:
   - enums.py: RundownItemType, ElementType, CueType
   - organization.py: Organization, Show, Season, Customer
-  - episode.py: Episode, Break, Rundown, Region, RundownItem
+  - episode.py: Episode, Break, Rundown, Region, RundownItem, RundownItemTiming,
+    RundownItemCue
   - content.py: Segment, Script, Element, Cue, ContentVersion, SegmentLock
-  - production.py: Speaker, ProductionRole, AssetLink, AssetMessage
+  - production.py: Speaker, SpeakerRateMeasurement, ProductionRole, AssetLink, AssetMessage
   - settings.py: Settings, PromptOverride, GfxXpostCue
   - jobs.py: CeleryJobLog, SOTProcessingJob
 """
@@ -20,13 +21,13 @@ from models.enums import RundownItemType, ElementType, CueType
 from models.organization import Organization, Show, Season, Customer
 
 # Episode domain
-from models.episode import Episode, Break, Rundown, Region, RundownItem
+from models.episode import Episode, Break, Rundown, Region, RundownItem, RundownItemTiming, RundownItemCue
 
 # Content domain
 from models.content import Segment, Script, Element, Cue, ContentVersion, SegmentLock
 
 # Production domain
-from models.production import Speaker, ProductionRole, AssetLink, AssetMessage
+from models.production import Speaker, SpeakerRateMeasurement, ProductionRole, AssetLink, AssetMessage
 
 # Settings domain
 from models.settings import Settings, PromptOverride, GfxXpostCue, WorkerDefinition
@@ -45,11 +46,11 @@ __all__ = [
     # Organization
     "Organization", "Show", "Season", "Customer",
     # Episode
-    "Episode", "Break", "Rundown", "Region", "RundownItem",
+    "Episode", "Break", "Rundown", "Region", "RundownItem", "RundownItemTiming", "RundownItemCue",
     # Content
     "Segment", "Script", "Element", "Cue", "ContentVersion", "SegmentLock",
     # Production
-    "Speaker", "ProductionRole", "AssetLink", "AssetMessage",
+    "Speaker", "SpeakerRateMeasurement", "ProductionRole", "AssetLink", "AssetMessage",
     # Settings
     "Settings", "PromptOverride", "GfxXpostCue", "WorkerDefinition",
     # Jobs
@@ -57,3 +58,8 @@ __all__ = [
     # Recording (showtime writeback)
     "RecordingSession", "RecordingTake", "TakeMarker", "TakeCueFire",
 ]
+
+# Save hooks keeping rundown_item_timings / rundowns.timing_summary and
+# rundown_item_cues current
+import services.rundown_timing  # noqa: E402,F401
+import services.rundown_cues  # noqa: E402,F401
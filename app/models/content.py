@@ -2,7 +2,7 @@
 Segment, Script, Element, Cue, ContentVersion, and SegmentLock models.
 """
 from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, JSON, Float, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from database import Base
 from models.enums import RundownItemType, ElementType, CueType
@@ -41,7 +41,7 @@ class ContentVersion(Base):
 
     # Version tracking
     version_number = Column(Integer, nullable=False)
-    script_content = Column(Text, nullable=False)
+    script_content = deferred(Column(Text, nullable=False))  # Loaded on access; version lists use content_length
     content_hash = Column(String(64), nullable=False, index=True)  # SHA256 for deduplication
     content_length = Column(Integer, nullable=False)  # Quick reference without loading content
 
@@ -1,8 +1,8 @@
 """
 Episode, Break, Rundown, Region, and RundownItem models.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, JSON, Float
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey, JSON, Float, Index, text
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from database import Base
 
@@ -164,6 +164,9 @@ class Rundown(Base):
     # Ordering and timing
     order_in_episode = Column(Integer, default=0)
     estimated_duration = Column(String(20), nullable=True)  # "00:15:30"
+    # Rollup maintained by services/rundown_timing on every item save:
+    # {estimated_seconds, planned_seconds, hard_out_seconds, over_under_seconds, blocks: {...}}
+    timing_summary = Column(JSON, nullable=True)
 
     # Status and workflow
     status = Column(String(50), default="draft")  # draft, approved, live, archived
@@ -254,7 +257,10 @@ class RundownItem(Base):
     # Segment-specific fields (nullable for other types)
     subtitle = Column(String(255), nullable=True)
     description = Column(Text, nullable=True)  # Metadata description only
-    script_content = Column(Text, nullable=True)  # Actual script content (separate from description)
+    # Actual script content (separate from description). Deferred: loaded on first
+    # access, so item lists don't pull script bodies; queries that read it
+    # across many items undefer it (services/rundown_items.WITH_SCRIPT).
+    script_content = deferred(Column(Text, nullable=True))
     airdate = Column(DateTime, nullable=True)
     guests = Column(String(500), nullable=True)
     resources = Column(Text, nullable=True)
@@ -295,3 +301,76 @@ class RundownItem(Base):
     segment = relationship("Segment", back_populates="rundown_items")
     speaker = relationship("Speaker")
     content_versions = relationship("ContentVersion", back_populates="rundown_item", cascade="all, delete-orphan", order_by="ContentVersion.version_number.desc()")
+
+
+class RundownItemTiming(Base):
+    """Derived timing of one rundown item, kept current by services/rundown_timing.
+
+    The script analysis (word counts, cue durations) is redone only when the
+    script's hash changes; the running-time columns are rewritten for the whole
+    rundown whenever any item's timing, duration, order or block changes.
+    """
+    __tablename__ = "rundown_item_timings"
+
+    item_id = Column(Integer, ForeignKey("rundown_items.id", ondelete="CASCADE"), primary_key=True)
+
+    # Script analysis
+    content_hash = Column(String(64), nullable=True)  # SHA256 of the analyzed script_content
+    word_count = Column(Integer, nullable=False, default=0)  # Spoken words outside cue blocks
+    fsq_word_count = Column(Integer, nullable=False, default=0)
+    speech_seconds = Column(Float, nullable=False, default=0.0)
+    speech_stddev_seconds = Column(Float, nullable=False, default=0.0)  # From the speakers' rate spread
+    sot_seconds = Column(Float, nullable=False, default=0.0)
+    fsq_seconds = Column(Float, nullable=False, default=0.0)
+    adlib_seconds = Column(Float, nullable=False, default=0.0)
+    script_seconds = Column(Float, nullable=False, default=0.0)  # speech + cues
+
+    # Rundown position (seconds from the top of the rundown)
+    planned_seconds = Column(Float, nullable=True)  # From rundown_items.duration
+    estimated_seconds = Column(Float, nullable=False, default=0.0)  # script_seconds, else planned
+    start_seconds = Column(Float, nullable=False, default=0.0)  # Running time at the top of the item
+    backtime_seconds = Column(Float, nullable=True)  # Latest start that still makes the hard out
+
+    analyzed_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class RundownItemCue(Base):
+    """One cue block of a rundown item's script, kept current by services/rundown_cues.
+
+    script_content stays the source of truth; these rows are rewritten from it
+    (through services/cue_parser) in the transaction that saves the script, so
+    cues can be found by type, asset or processing status with an indexed
+    query instead of re-parsing every script. Unrelated to the legacy `cues`
+    table, which hangs off segments.
+    """
+    __tablename__ = "rundown_item_cues"
+    __table_args__ = (
+        Index("ix_rundown_item_cues_item_position", "item_id", "position"),
+        Index("ix_rundown_item_cues_type_status", "cue_type", "processing_status"),
+        # Exactly the rundown_cues.still_processing() predicate
+        Index("ix_rundown_item_cues_processing", "cue_type",
+              postgresql_where=text("processing_status IS NOT NULL AND processing_status <> 'Complete' "
+                                    "AND processing_status NOT LIKE '❌%'")),
+    )
+
+    id = Column(Integer, primary_key=True)
+    item_id = Column(Integer, ForeignKey("rundown_items.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)  # 0-based order within the script
+
+    cue_type = Column(String(20), nullable=True)  # [Type:], upper-cased: SOT, FSQ, GFX, ...
+    slug = Column(String(255), nullable=True)
+    asset_id = Column(String(100), nullable=True, index=True)  # [Asset Id:] - may be shared by several cues
+    media_url = Column(Text, nullable=True)
+    thumbnail_url = Column(Text, nullable=True)
+    audio_url = Column(Text, nullable=True)
+    duration = Column(String(20), nullable=True)  # [Duration:] as written, "00:00:45"
+    processing_status = Column(String(100), nullable=True)  # [ProcessingStatus:] written by the SOT pipeline
+    fields = Column(JSON, nullable=True)  # Every field, camelCase (cue_parser field_map shape)
+
+    # Character offsets of the block (Begin through End marker) in script_content
+    span_start = Column(Integer, nullable=False)
+    span_end = Column(Integer, nullable=False)
+    collapsed = Column(Boolean, nullable=False, default=False)
+
+    updated_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,7 +1,7 @@
 """
 CeleryJobLog and SOTProcessingJob models.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index
 from sqlalchemy.sql import func
 from database import Base
 
@@ -18,12 +18,18 @@ class CeleryJobLog(Base):
     episode = Column(String(10), nullable=True)
     status = Column(String(20), nullable=False, server_default='pending')  # pending, running, completed, failed
     progress = Column(Integer, nullable=True)
+    stage = Column(String(255), nullable=True)  # Current PROGRESS stage label while running
     result_summary = Column(Text, nullable=True)  # Brief result or error message
     worker = Column(String(100), nullable=True)  # Which worker picked it up
     queue = Column(String(50), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_celery_job_log_status_created", "status", "created_at"),
+        Index("ix_celery_job_log_status_updated", "status", "updated_at"),
+    )
+
 
 class SOTProcessingJob(Base):
     """Tracks multi-phase SOT video processing pipeline."""
@@ -54,6 +60,7 @@ class SOTProcessingJob(Base):
     post_analysis = Column(JSON, nullable=True)  # Technical analysis of final processed file
     processing_report = Column(JSON, nullable=True)  # Comprehensive success/failure/warning report
     transcription = Column(Text, nullable=True)  # Whisper transcription from phase 0.5
+    checkpoint = Column(JSON, nullable=True)  # Per-phase resume points (services/sot_checkpoints.py)
 
     # Parent/child asset tracking (added 2025-10-26)
     source_asset_id = Column(String(50), nullable=True)  # Source (original upload) AssetID
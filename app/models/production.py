@@ -76,6 +76,22 @@ class Speaker(Base):
         }
 
 
+class SpeakerRateMeasurement(Base):
+    """One measured reading rate of a speaker (audio analysis, read timer, voice sample)."""
+    __tablename__ = "speaker_rate_measurements"
+
+    id = Column(Integer, primary_key=True, index=True)
+    speaker_id = Column(Integer, ForeignKey("speakers.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    wpm = Column(Float, nullable=False)
+    word_count = Column(Integer, nullable=False)
+    duration_seconds = Column(Float, nullable=False)
+    segment_type = Column(String(50), nullable=True)  # rundown item_type read ('segment', 'promo', ...) or 'fsq'; NULL = general
+    source = Column(String(50), nullable=False)  # 'audio_analysis', 'read_timer', 'voice_sample'
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class ProductionRole(Base):
     """Production roles for note assignment (e.g., Host, Director, Teleprompter)."""
     __tablename__ = "production_roles"
@@ -59,6 +59,9 @@ class ContentLibrary(Base):
     organization = relationship("Organization")
     placements = relationship("ContentPlacement", back_populates="library_item", cascade="all, delete-orphan")
 
+    # Search/listing indexes (trigram GIN on title and customer_name, (title, id)
+    # for keyset pagination) live in migration g028 - they need pg_trgm.
+
 
 class ContentPlacement(Base):
     """
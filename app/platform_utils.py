@@ -12,17 +12,35 @@ Usage:
     subprocess.run([ffmpeg, "-i", str(input_file), ...])
 """
 
+import logging
 import os
 import platform
+import re
+import shutil
 import subprocess
+import threading
+import time
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 
 # Platform detection
 IS_WINDOWS = platform.system() == 'Windows'
 IS_LINUX = platform.system() == 'Linux'
 
+VAAPI_DEVICE = '/dev/dri/renderD128'
+
+# Capability profile refresh interval (seconds). Hardware and the ffmpeg build
+# don't change under a running worker; the slow refresh catches driver
+# recovery and media mounts coming and going.
+CAPABILITY_REFRESH_SECONDS = int(os.getenv('WORKER_CAPABILITY_REFRESH', '600'))
+
+# Filters tasks depend on; reported so the API can tell which hosts can run what
+REQUIRED_FILTERS = ('loudnorm', 'astats', 'acompressor', 'anullsrc', 'scale', 'signalstats', 'convolution', 'pan')
+
 
 def get_media_root() -> Path:
     """
@@ -125,27 +143,122 @@ def get_ffprobe_binary() -> str:
         return 'ffprobe'
 
 
+def _run_probe(cmd: list, timeout: int = 5) -> Optional[str]:
+    """stdout of a probe command, or None if it is missing, fails or hangs."""
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def detect_capabilities() -> dict:
+    """
+    Probe this host: GPU, hardware encoders, ffmpeg build and media root access.
+
+    Expensive (nvidia-smi, three ffmpeg invocations, a write test on the media
+    root) - use get_capabilities(), which caches the result.
+    """
+    ffmpeg = get_ffmpeg_binary()
+
+    gpu_name = None
+    if shutil.which('nvidia-smi'):
+        output = _run_probe(['nvidia-smi', '--query-gpu=name', '--format=csv,noheader'])
+        gpu_name = output.strip().splitlines()[0] if output and output.strip() else None
+
+    version_output = _run_probe([ffmpeg, '-hide_banner', '-version']) or ''
+    version_match = re.match(r'ffmpeg version (\S+)', version_output)
+
+    # "-encoders" / "-filters" rows: " V....D h264_nvenc  NVIDIA NVENC ..." / " ... loudnorm  A->A ..."
+    encoders = set(re.findall(r'^\s*[VAS][\w.]{5}\s+(\S+)', _run_probe([ffmpeg, '-hide_banner', '-encoders']) or '', re.M))
+    filters = set(re.findall(r'^\s*[T.][S.][C.]?\s+(\S+)\s+\S+->\S+', _run_probe([ffmpeg, '-hide_banner', '-filters']) or '', re.M))
+
+    return {
+        'hostname': platform.node(),
+        'platform': platform.system(),
+        'nvidia_gpu': gpu_name is not None,
+        'gpu_name': gpu_name,
+        'nvenc': gpu_name is not None and 'h264_nvenc' in encoders,
+        'vaapi': Path(VAAPI_DEVICE).exists() and 'h264_vaapi' in encoders,
+        'ffmpeg_available': bool(version_match),
+        'ffmpeg_version': version_match.group(1) if version_match else None,
+        'encoders': sorted(e for e in encoders if e in ('libx264', 'libx265', 'h264_nvenc', 'hevc_nvenc',
+                                                        'h264_vaapi', 'aac', 'libmp3lame', 'pcm_s16le')),
+        'filters': sorted(f for f in REQUIRED_FILTERS if f in filters),
+        'missing_filters': sorted(f for f in REQUIRED_FILTERS if f not in filters),
+        'media': test_media_access(),
+        'detected_at': datetime.now(timezone.utc).isoformat(),
+    }
+
+
+_capabilities: Optional[dict] = None
+_capabilities_at = 0.0
+_capabilities_lock = threading.Lock()
+_refreshing = threading.Event()
+
+
+def _log_capabilities(profile: dict) -> None:
+    """Platform summary, once per process (visible in Celery worker logs)."""
+    media = profile['media']
+    logger.info(f"Platform Utils Initialized: {profile['platform']} on {profile['hostname']}")
+    logger.info(f"Media Root: {media['media_root']} (accessible: {media['exists']})")
+
+    if profile['nvenc']:
+        logger.info(f"NVENC Available: {profile['gpu_name'] or 'Unknown GPU'}")
+    elif IS_LINUX and profile['vaapi']:
+        logger.info("VAAPI Hardware Acceleration Available")
+    else:
+        logger.info("Using CPU encoding (no hardware acceleration detected)")
+
+    if not media['readable']:
+        logger.warning(f"⚠️  Media root not accessible: {media.get('error', 'Unknown error')}")
+
+
+def _refresh_capabilities() -> dict:
+    global _capabilities, _capabilities_at
+    try:
+        profile = detect_capabilities()
+        with _capabilities_lock:
+            first, _capabilities, _capabilities_at = _capabilities is None, profile, time.monotonic()
+        if first:
+            _log_capabilities(profile)
+        return profile
+    finally:
+        _refreshing.clear()
+
+
+def get_capabilities(refresh: bool = False) -> dict:
+    """
+    This host's capability profile, detected once and cached.
+
+    Nothing is probed at import: workers detect at boot (the capability
+    publisher), other processes on first use. The first call detects
+    synchronously; once the profile is older than
+    CAPABILITY_REFRESH_SECONDS it is re-detected in the background and the
+    cached one is returned meanwhile, so callers never wait on nvidia-smi.
+    """
+    with _capabilities_lock:
+        profile, age = _capabilities, time.monotonic() - _capabilities_at
+    if profile is None or refresh:
+        _refreshing.set()
+        return _refresh_capabilities()
+    if age > CAPABILITY_REFRESH_SECONDS and not _refreshing.is_set():
+        _refreshing.set()
+        threading.Thread(target=_refresh_capabilities, name='capability-refresh', daemon=True).start()
+    return profile
+
+
 def has_nvidia_gpu() -> bool:
     """
-    Check if NVIDIA GPU with NVENC support is available (Windows).
+    Check if NVIDIA GPU with NVENC support is available.
+
+    Reads the cached capability profile (GPU visible to nvidia-smi AND the
+    ffmpeg build has h264_nvenc), so it is cheap to call per job.
 
     Returns:
         bool: True if NVENC hardware encoder is available
     """
-    if not IS_WINDOWS:
-        return False
-
-    try:
-        # Check for nvidia-smi on Windows
-        result = subprocess.run(
-            ['nvidia-smi', '--query-gpu=name', '--format=csv,noheader'],
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        return result.returncode == 0 and len(result.stdout.strip()) > 0
-    except (subprocess.TimeoutExpired, FileNotFoundError):
-        return False
+    return get_capabilities()['nvenc']
 
 
 def has_vaapi() -> bool:
@@ -153,13 +266,12 @@ def has_vaapi() -> bool:
     Check if VAAPI hardware encoding is available (Linux).
 
     Returns:
-        bool: True if VAAPI device exists
+        bool: True if the VAAPI device exists and ffmpeg has h264_vaapi
     """
     if not IS_LINUX:
         return False
 
-    # Check for VAAPI device
-    return Path('/dev/dri/renderD128').exists()
+    return get_capabilities()['vaapi']
 
 
 def get_video_encoder_flags(quality: str = 'high') -> list:
@@ -202,7 +314,7 @@ def get_video_encoder_flags(quality: str = 'high') -> list:
     if IS_LINUX and has_vaapi():
         return [
             '-hwaccel', 'vaapi',
-            '-vaapi_device', '/dev/dri/renderD128',
+            '-vaapi_device', VAAPI_DEVICE,
             '-c:v', 'h264_vaapi',
             '-qp', str(params['crf'])
         ]
@@ -233,22 +345,13 @@ def get_platform_info() -> dict:
         'ffmpeg_binary': get_ffmpeg_binary()
     }
 
-    # Add GPU info
-    if IS_WINDOWS:
-        info['has_nvenc'] = has_nvidia_gpu()
-        if info['has_nvenc']:
-            try:
-                result = subprocess.run(
-                    ['nvidia-smi', '--query-gpu=name', '--format=csv,noheader'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                info['gpu_name'] = result.stdout.strip()
-            except:
-                info['gpu_name'] = 'Unknown NVIDIA GPU'
-    elif IS_LINUX:
-        info['has_vaapi'] = has_vaapi()
+    # Add GPU info (from the cached capability profile)
+    capabilities = get_capabilities()
+    info['has_nvenc'] = capabilities['nvenc']
+    if capabilities['nvidia_gpu']:
+        info['gpu_name'] = capabilities['gpu_name']
+    if IS_LINUX:
+        info['has_vaapi'] = capabilities['vaapi']
 
     return info
 
@@ -302,25 +405,3 @@ def test_media_access() -> dict:
             result['error'] = str(e)
 
     return result
-
-
-# Module-level diagnostics on import
-_platform_info = get_platform_info()
-_media_access = test_media_access()
-
-# Log platform info on import (visible in Celery worker logs)
-import logging
-logger = logging.getLogger(__name__)
-
-logger.info(f"Platform Utils Initialized: {_platform_info['platform']} on {_platform_info['hostname']}")
-logger.info(f"Media Root: {_platform_info['media_root']} (accessible: {_media_access['exists']})")
-
-if IS_WINDOWS and _platform_info.get('has_nvenc'):
-    logger.info(f"NVENC Available: {_platform_info.get('gpu_name', 'Unknown GPU')}")
-elif IS_LINUX and _platform_info.get('has_vaapi'):
-    logger.info("VAAPI Hardware Acceleration Available")
-else:
-    logger.info("Using CPU encoding (no hardware acceleration detected)")
-
-if not _media_access['readable']:
-    logger.warning(f"⚠️  Media root not accessible: {_media_access.get('error', 'Unknown error')}")
@@ -208,6 +208,13 @@ class ReorderRequest(BaseModel):
     segments: List[Dict[str, Any]] = Field(..., description="List of segments with filename and new order")
 
 
+class MoveItemRequest(BaseModel):
+    """Request model for moving one rundown item (drag and drop)"""
+    asset_id: str = Field(..., description="asset_id of the item being moved")
+    after_asset_id: Optional[str] = Field(None, description="Place the item right after this item")
+    before_asset_id: Optional[str] = Field(None, description="Place the item right before this item (if no after_asset_id); neither = top")
+
+
 class ConvertThumbnailRequest(BaseModel):
     """Request body for converting a thumbnail to PNG."""
     url: str = Field(..., description="The URL path of the non-PNG thumbnail (e.g., /episodes/0257/thumbnails/poster16x9.jpg)")
@@ -1,9 +1,10 @@
 """
 Cue enumeration router.
-Handles cue block enumeration for episodes.
+Handles cue block enumeration for episodes, and queries over the structured
+cue rows (rundown_item_cues) kept alongside the scripts.
 """
-from fastapi import APIRouter, Depends, HTTPException
-from typing import Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Dict, Any, Optional
 from pathlib import Path
 import re
 from auth.utils import get_current_user_or_key
@@ -17,10 +18,65 @@ from services.cue_extractor import (
     CUE_BLOCK_RE_MARKER,
     rebuild_cue,
 )
+from services.rundown_cues import find_cues, rebuild_episode_cues
+from services.rundown_items import WITH_SCRIPT
 
 router = APIRouter()
 
 
+def _episode_id(db: Session, episode_number: str) -> int:
+    from models_v2 import Episode
+
+    try:
+        episode_num_int = int(episode_number)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid episode number format")
+
+    episode = db.query(Episode.id).filter(Episode.episode_number == episode_num_int).first()
+    if not episode:
+        raise HTTPException(status_code=404, detail=f"Episode {episode_number} not found")
+    return episode.id
+
+
+@router.get("/{episode_number}/cues")
+async def list_cues(
+    episode_number: str,
+    type: Optional[str] = Query(None, description="Only cues of this type (SOT, FSQ, GFX, ...)"),
+    asset_id: Optional[str] = Query(None, description="Only cues carrying this AssetID"),
+    processing: Optional[bool] = Query(None, description="true = only cues whose media is still processing"),
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_or_key)
+):
+    """
+    Cues of an episode in running order, from rundown_item_cues.
+
+    Served from the cue rows rewritten on every script save; no script is
+    loaded or parsed. `processing=true` returns cues with a ProcessingStatus
+    that is neither Complete nor a failure. Scripts saved before the table
+    existed show up after POST .../cues/rebuild.
+    """
+    cues = find_cues(db, _episode_id(db, episode_number), cue_type=type, asset_id=asset_id, processing=processing)
+    return {"episode_number": episode_number, "count": len(cues), "cues": cues}
+
+
+@router.post("/{episode_number}/cues/rebuild")
+async def rebuild_cues(
+    episode_number: str,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_current_user_or_key)
+):
+    """Rewrite the cue rows of every item of an episode from its script (backfill / repair)."""
+    episode_id = _episode_id(db, episode_number)
+    try:
+        written = rebuild_episode_cues(db, episode_id)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to rebuild cues for episode {episode_number}: {e}")
+        raise HTTPException(status_code=500, detail=f"Cue rebuild failed: {str(e)}")
+    return {"episode_number": episode_number, "cues": written}
+
+
 @router.post("/{episode_number}/enumerate-cues")
 async def enumerate_cue_blocks(
     episode_number: str,
@@ -74,7 +130,7 @@ async def enumerate_cue_blocks(
             raise HTTPException(status_code=404, detail=f"Rundown not found for episode {episode_number}")
 
         # Get all rundown items in order
-        rundown_items = db.query(RundownItem).filter(
+        rundown_items = db.query(RundownItem).options(WITH_SCRIPT).filter(
             RundownItem.rundown_id == rundown.id
         ).order_by(RundownItem.order_in_rundown).all()
 
@@ -186,7 +242,7 @@ async def enumerate_cue_blocks(
         logger.info(f"Phase 2: Re-enumerating media cues for episode {episode_number}")
 
         # Re-fetch items to get updated content
-        rundown_items = db.query(RundownItem).filter(
+        rundown_items = db.query(RundownItem).options(WITH_SCRIPT).filter(
             RundownItem.rundown_id == rundown.id
         ).order_by(RundownItem.order_in_rundown).all()
 
@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 import logging
 
 from ._shared import logger
+from services.rundown_items import WITH_SCRIPT
 
 router = APIRouter()
 
@@ -119,7 +120,7 @@ async def force_episode_snapshot(
     if not rundown:
         raise HTTPException(status_code=404, detail=f"No rundown found for episode {ep_num}")
 
-    all_items = db.query(RundownItem).filter(
+    all_items = db.query(RundownItem).options(WITH_SCRIPT).filter(
         RundownItem.rundown_id == rundown.id
     ).order_by(RundownItem.order_in_rundown).all()
 
@@ -3,6 +3,7 @@ Media gathering and graphics packages router.
 Handles media gathering for show and graphics package creation/download.
 """
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from typing import Dict, Any
 from pathlib import Path
 import re
@@ -13,6 +14,8 @@ from sqlalchemy.orm import Session
 
 from ._shared import logger
 from services.cue_extractor import CUE_BLOCK_RE
+from services.file_index import get_file_index
+from services.rundown_items import WITH_SCRIPT
 
 router = APIRouter()
 
@@ -74,8 +77,14 @@ async def gather_media_for_show(
         media_list_dir.mkdir(parents=True, exist_ok=True)
         print(f"   Rundown media directory: {media_list_dir}")
 
+        # One incremental index refresh up front (a NAS walk: off the event
+        # loop); the slug glob fallbacks below query the index instead of
+        # re-listing asset directories.
+        file_index = get_file_index()
+        await run_in_threadpool(file_index.refresh, episode_path)
+
         # Get all rundown items with script content
-        items = db.query(RundownItem).filter(
+        items = db.query(RundownItem).options(WITH_SCRIPT).filter(
             RundownItem.rundown_id == rundown.id
         ).order_by(RundownItem.order_in_rundown).all()
 
@@ -201,7 +210,10 @@ async def gather_media_for_show(
                             search_dir = episode_path / "assets" / asset_folder
                             if search_dir.exists():
                                 for ext in extensions:
-                                    matches = sorted(search_dir.glob(f"*-{clean_slug}{ext}"))
+                                    matches = file_index.find(
+                                        episode_path, f"*-{clean_slug}{ext}",
+                                        prefix=f"assets/{asset_folder}", max_age=None, recursive=False
+                                    )
                                     if matches:
                                         matched_file = matches[0]
                                         media_url = f"episodes/{episode_id}/assets/{asset_folder}/{matched_file.name}"
@@ -301,7 +313,18 @@ async def gather_media_for_show(
                         base_slug = enum_prefix_match.group(2)  # e.g., "united-airlines-is.png"
                         parent_dir = source_path.parent
                         if parent_dir.exists():
-                            matches = sorted(parent_dir.glob(f"*-{base_slug}"))
+                            try:
+                                rel_parent = str(parent_dir.resolve().relative_to(episode_path.resolve()))
+                                matches = [
+                                    m.path for m in file_index.find(
+                                        episode_path, f"*-{base_slug}",
+                                        prefix=rel_parent if rel_parent != '.' else None,
+                                        max_age=None, recursive=False
+                                    )
+                                ]
+                            except ValueError:
+                                # Outside this episode's tree - not indexed
+                                matches = sorted(parent_dir.glob(f"*-{base_slug}"))
                             if matches:
                                 source_path = matches[0]
                                 fallback_found = True
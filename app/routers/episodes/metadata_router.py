@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from ._shared import EPISODES_ROOT, logger
+from services.rundown_items import WITH_SCRIPT
 
 router = APIRouter()
 
@@ -56,7 +57,7 @@ async def get_episode_script(
         compiled_script = []
 
         for rundown in rundowns:
-            items = db.query(RundownItem).filter(
+            items = db.query(RundownItem).options(WITH_SCRIPT).filter(
                 RundownItem.rundown_id == rundown.id
             ).order_by(RundownItem.order_in_rundown).all()
 
@@ -587,7 +588,7 @@ async def get_episode_readiness(episode_number: str, db: Session = Depends(get_d
             r.id for r in db.query(Rundown).filter(Rundown.episode_id == episode.id).all()
         ]
         items = (
-            db.query(RundownItem).filter(RundownItem.rundown_id.in_(rundown_ids)).all()
+            db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.rundown_id.in_(rundown_ids)).all()
             if rundown_ids else []
         )
 
@@ -2,7 +2,7 @@
 Rundown item CRUD and management router.
 Handles rundown listing, item creation/update/delete, reordering, and normalization.
 """
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Body
 from typing import Optional, List, Dict, Any
 from pathlib import Path
 import yaml
@@ -14,9 +14,10 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from ._shared import (
-    EPISODES_ROOT, ReorderRequest, create_content_version,
+    EPISODES_ROOT, MoveItemRequest, ReorderRequest, create_content_version,
     normalize_rundown_items, logger
 )
+from services.rundown_items import WITH_SCRIPT
 
 router = APIRouter()
 
@@ -100,14 +101,19 @@ async def regenerate_slug_endpoint(
 async def reorder_rundown(
     episode_number: str,
     payload: ReorderRequest,
+    background_tasks: BackgroundTasks,
     current_user: Optional[dict] = None,
     db: Session = Depends(get_db)
-) -> Dict[str, str]:
+) -> Dict[str, Any]:
     """Update order_in_rundown in database for each rundown segment.
 
     Accepts segments with either 'asset_id' or 'filename' to identify items.
+    The orders are read as a running order (services/rundown_order): an
+    unchanged sequence writes nothing and one moved item usually one row.
+    Every order written is returned in 'orders'.
     """
     from models_v2 import Episode, Rundown, RundownItem
+    from services.rundown_order import apply_orders, settle_rundown
 
     try:
         episode_num_int = int(episode_number)
@@ -119,7 +125,18 @@ async def reorder_rundown(
         if not rundown:
             raise HTTPException(status_code=404, detail=f"No rundown found for episode {episode_number}")
 
-        updated_count = 0
+        # One query for the whole rundown, only the columns needed to find items
+        items = db.query(
+            RundownItem.id, RundownItem.asset_id, RundownItem.slug, RundownItem.order_in_rundown
+        ).filter(RundownItem.rundown_id == rundown.id).all()
+        by_asset_id = {item.asset_id: item for item in items}
+        # Items have generated filenames like "010-slug.md" based on order + slug,
+        # taken before any item of this request is moved
+        by_filename = {}
+        for candidate in items:
+            by_filename.setdefault(f"{(candidate.order_in_rundown or 0):03d}-{candidate.slug}.md", candidate)
+
+        requested = {}
         for segment in payload.segments:
             new_order = segment.get("order")
             if new_order is None:
@@ -128,34 +145,29 @@ async def reorder_rundown(
             asset_id = segment.get("asset_id")
             filename = segment.get("filename")
 
-            item = None
-            if asset_id:
-                item = db.query(RundownItem).filter(
-                    RundownItem.asset_id == asset_id,
-                    RundownItem.rundown_id == rundown.id
-                ).first()
-
+            item = by_asset_id.get(asset_id) if asset_id else None
             if not item and filename:
-                # Try to match by filename pattern — items have generated filenames
-                # like "010-slug.md" based on order + slug
-                items = db.query(RundownItem).filter(
-                    RundownItem.rundown_id == rundown.id
-                ).all()
-                for candidate in items:
-                    candidate_filename = f"{(candidate.order_in_rundown or 0):03d}-{candidate.slug}.md"
-                    if candidate_filename == filename:
-                        item = candidate
-                        break
+                item = by_filename.get(filename)
 
             if item:
-                item.order_in_rundown = new_order
-                item.updated_at = datetime.now()
-                updated_count += 1
+                requested[item.id] = int(new_order)
 
+        result = apply_orders(db.connection(), rundown.id, requested)
         db.commit()
-        logger.info(f"Reordered {updated_count} items for episode {episode_number}")
+        if result["orders"]:
+            background_tasks.add_task(settle_rundown, [rundown.id])
 
-        return {"status": "success", "message": f"Rundown order updated ({updated_count} items)"}
+        asset_ids = {item.id: item.asset_id for item in items}
+        updated_count = len(result["orders"])
+        logger.info(f"Reordered {updated_count} items for episode {episode_number}"
+                    f"{' (renumbered)' if result['renumbered'] else ''}")
+
+        return {
+            "status": "success",
+            "message": f"Rundown order updated ({updated_count} items)",
+            "renumbered": result["renumbered"],
+            "orders": {asset_ids[item_id]: order for item_id, order in result["orders"].items()},
+        }
 
     except HTTPException:
         raise
@@ -165,6 +177,77 @@ async def reorder_rundown(
         raise HTTPException(status_code=500, detail=f"Failed to reorder rundown: {str(e)}")
 
 
+@router.post("/rundown/{episode_number}/move")
+async def move_rundown_item(
+    episode_number: str,
+    payload: MoveItemRequest,
+    background_tasks: BackgroundTasks,
+    current_user: dict = Depends(get_current_user_or_key),
+    db: Session = Depends(get_db)
+) -> Dict[str, Any]:
+    """Move one rundown item next to another (drag and drop).
+
+    Writes only the moved item's order_in_rundown unless its new neighbours
+    leave no free number, in which case the rundown is renumbered in one
+    statement. 'orders' holds every order written, by asset_id. Timing is
+    rolled up after the response, in its own transaction.
+    """
+    from models_v2 import Episode, Rundown, RundownItem
+    from services.rundown_order import move_item, settle_rundown
+
+    try:
+        episode_num_int = int(episode_number)
+        episode = db.query(Episode).filter(Episode.episode_number == episode_num_int).first()
+        if not episode:
+            raise HTTPException(status_code=404, detail=f"Episode {episode_number} not found")
+
+        wanted = [payload.asset_id, payload.after_asset_id, payload.before_asset_id]
+        items = db.query(RundownItem.id, RundownItem.asset_id, RundownItem.rundown_id).join(
+            Rundown, Rundown.id == RundownItem.rundown_id
+        ).filter(
+            Rundown.episode_id == episode.id,
+            RundownItem.asset_id.in_([asset_id for asset_id in wanted if asset_id])
+        ).all()
+        by_asset_id = {item.asset_id: item for item in items}
+        for asset_id in wanted:
+            if asset_id and asset_id not in by_asset_id:
+                raise HTTPException(status_code=404, detail=f"Rundown item {asset_id} not found in episode {episode_number}")
+
+        item = by_asset_id[payload.asset_id]
+        after = by_asset_id.get(payload.after_asset_id)
+        before = by_asset_id.get(payload.before_asset_id)
+        result = move_item(db.connection(), item.rundown_id, item.id,
+                           after_id=after.id if after else None,
+                           before_id=before.id if before and not after else None)
+        db.commit()
+        if result["orders"]:
+            background_tasks.add_task(settle_rundown, [item.rundown_id])
+
+        asset_ids = dict(db.query(RundownItem.id, RundownItem.asset_id).filter(
+            RundownItem.id.in_(list(result["orders"]))
+        ).all()) if result["orders"] else {}
+        logger.info(f"Moved {payload.asset_id} to order {result['order']} in episode {episode_number}"
+                    f"{' (renumbered)' if result['renumbered'] else ''}")
+
+        return {
+            "status": "success",
+            "asset_id": payload.asset_id,
+            "order": result["order"],
+            "renumbered": result["renumbered"],
+            "orders": {asset_ids[item_id]: order for item_id, order in result["orders"].items()},
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to move rundown item {payload.asset_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to move rundown item: {str(e)}")
+
+
 @router.get("/rundown-item/{asset_id}")
 async def get_rundown_item_by_asset_id(asset_id: str, db: Session = Depends(get_db)):
     """Get a single rundown item by asset_id (used for live refresh after LLM updates)."""
@@ -213,7 +296,7 @@ async def get_episode_rundown(episode_number: str, db: Session = Depends(get_db)
         rundown_items = []
         for rundown in rundowns:
             # Get regular rundown items
-            items = db.query(RundownItem).filter(RundownItem.rundown_id == rundown.id).order_by(RundownItem.order_in_rundown).all()
+            items = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.rundown_id == rundown.id).order_by(RundownItem.order_in_rundown).all()
 
             for item in items:
                 order_value = item.order_in_rundown or 0
@@ -332,35 +415,58 @@ async def get_episode_rundown(episode_number: str, db: Session = Depends(get_db)
 @router.post("/{episode_number}/rundown/normalize")
 async def normalize_rundown_order(
     episode_number: str,
-    current_user: dict = Depends(get_current_user_or_key)
+    current_user: dict = Depends(get_current_user_or_key),
+    db: Session = Depends(get_db)
 ):
     """
     Normalize rundown item order and index numbers.
 
-    Rules:
+    Database items are renumbered 10, 20, 30, ... in running order, one
+    statement per rundown writing only the rows that change.
+
+    Rundown files, when the episode has a rundown directory:
     1. Index numbers from filenames take precedence
     2. Round non-multiple-of-10 indexes up to next multiple of 10
     3. Handle conflicts by cascading bumps
     4. Sync order fields in frontmatter to match index numbers
     5. Rename files to match new index numbers
     """
+    from models_v2 import Episode, Rundown
+    from services.rundown_order import renumber_rundown
+
     try:
         logger.info(f"Starting rundown normalization for episode {episode_number}")
 
+        episode = db.query(Episode).filter(Episode.episode_number == int(episode_number)).first()
+
         # Get episode directory
         episode_dir = Path(f"/home/episodes/{episode_number}")
         rundown_dir = episode_dir / "rundown"
 
-        if not rundown_dir.exists():
+        if not episode and not rundown_dir.exists():
             raise HTTPException(status_code=404, detail=f"Episode {episode_number} rundown directory not found")
 
+        renumbered = 0
+        if episode:
+            conn = db.connection()
+            for (rundown_id,) in db.query(Rundown.id).filter(Rundown.episode_id == episode.id).all():
+                renumbered += renumber_rundown(conn, rundown_id)
+            db.commit()
+
         # Execute normalization
-        result = await normalize_rundown_items(rundown_dir, episode_number)
+        if rundown_dir.exists():
+            result = await normalize_rundown_items(rundown_dir, episode_number)
+        else:
+            result = {"success": True, "episode_number": episode_number}
+        result["database_items_renumbered"] = renumbered
 
-        logger.info(f"Rundown normalization completed for episode {episode_number}")
+        logger.info(f"Rundown normalization completed for episode {episode_number} ({renumbered} items renumbered)")
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
+        db.rollback()
         logger.error(f"Failed to normalize rundown for episode {episode_number}: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to normalize rundown: {str(e)}")
 
@@ -477,7 +583,7 @@ async def update_rundown_item(
         from models_v2 import RundownItem
 
         # Find the item by asset_id
-        item = db.query(RundownItem).filter(RundownItem.asset_id == item_id).first()
+        item = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.asset_id == item_id).first()
         if not item:
             raise HTTPException(status_code=404, detail=f"Rundown item {item_id} not found")
 
@@ -743,6 +849,7 @@ async def save_rundown_item(
 @router.put("/{episode_number}/save-rundown")
 async def save_rundown_items(
     episode_number: str,
+    background_tasks: BackgroundTasks,
     rundown_data: Dict[str, Any] = Body(...),
     current_user: dict = Depends(get_current_user_or_key),
     db: Session = Depends(get_db)
@@ -755,6 +862,7 @@ async def save_rundown_items(
     2. Single item save: { "item": {...}, "asset_id": "..." }
     """
     from models_v2 import Episode, Rundown, RundownItem
+    from services.rundown_order import apply_orders, settle_rundown
 
     try:
         # Convert episode number to int
@@ -795,6 +903,8 @@ async def save_rundown_items(
             # FULL RUNDOWN MODE
             items = rundown_data.get('items', [])
         saved_count = 0
+        created_count = 0
+        requested_orders = {}
 
         for i, item_data in enumerate(items):
             logger.info(f"Processing item {i}: {type(item_data)} - {item_data}")
@@ -812,13 +922,18 @@ async def save_rundown_items(
 
             if asset_id:
                 # Try to find existing item
-                rundown_item = db.query(RundownItem).filter(RundownItem.asset_id == str(asset_id)).first()
+                rundown_item = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.asset_id == str(asset_id)).first()
 
                 if rundown_item:
                     # Update existing item
                     # Use proper null checking - 0 is a valid order value!
                     order_value = item_data.get('order') if item_data.get('order') is not None else item_data.get('index')
-                    rundown_item.order_in_rundown = order_value if order_value is not None else 0
+                    order_value = order_value if order_value is not None else 0
+                    if rundown_item.rundown_id == rundown.id:
+                        # Ranked against the rest of the rundown below
+                        requested_orders[rundown_item.id] = int(order_value)
+                    else:
+                        rundown_item.order_in_rundown = order_value
                     rundown_item.title = item_data.get('title', rundown_item.title)
                     rundown_item.item_type = item_data.get('type', rundown_item.item_type)
                     rundown_item.duration = item_data.get('duration', rundown_item.duration)
@@ -1000,6 +1115,7 @@ async def save_rundown_items(
                     )
                     db.add(new_item)
                     saved_count += 1
+                    created_count += 1
                     logger.info(f"Created new rundown item with asset_id: {asset_id}")
             else:
                 # Create completely new item without asset_id
@@ -1039,12 +1155,20 @@ async def save_rundown_items(
                 )
                 db.add(new_item)
                 saved_count += 1
+                created_count += 1
                 logger.info(f"Created completely new rundown item with new asset_id: {new_asset_id}")
 
         # Calculate and store total duration on the episode
         # Includes both item-level durations AND embedded cue durations (RIF, SOT, VOX, etc.)
+        # Orders go through the gap numbering (services/rundown_order): an
+        # unchanged running order writes nothing, one dragged item usually one row
+        db.flush()
+        order_result = apply_orders(db.connection(), rundown.id, requested_orders)
+
         import re as re_mod
-        all_items = db.query(RundownItem).filter(RundownItem.rundown_id == rundown.id).all()
+        all_items = db.query(RundownItem).options(WITH_SCRIPT).populate_existing().filter(
+            RundownItem.rundown_id == rundown.id
+        ).all()
         total_duration_seconds = 0
 
         def _parse_dur(dur_str):
@@ -1081,15 +1205,34 @@ async def save_rundown_items(
         s = total_duration_seconds % 60
         episode.duration_formatted = f"{h:02d}:{m:02d}:{s:02d}"
 
+        # Snapshot fields taken before commit expires the items (re-reading them
+        # afterwards would cost a refresh plus a script load per item)
+        snapshot_items = [
+            {
+                "id": ri.id,
+                "asset_id": ri.asset_id,
+                "title": ri.title,
+                "item_type": ri.item_type,
+                "order_in_rundown": ri.order_in_rundown,
+                "script_content": ri.script_content,
+            }
+            for ri in all_items
+        ]
+        episode_title = episode.title or ""
+
         db.commit()
+        # A new item keeps the order the client sent, which can tie with an
+        # existing key (the UI falls back to (index+1)*10); settle renumbers it
+        if order_result["orders"] or created_count:
+            background_tasks.add_task(settle_rundown, [rundown.id])
 
         # Write episode snapshot to filesystem (throttled by interval setting)
         try:
             from services.autosave_history import write_episode_snapshot
             write_episode_snapshot(
                 episode_number=episode_number,
-                episode_title=episode.title or "",
-                rundown_items=all_items,
+                episode_title=episode_title,
+                rundown_items=snapshot_items,
             )
         except Exception as e:
             logger.warning(f"Autosave history episode snapshot failed: {e}")
@@ -1464,7 +1607,7 @@ async def get_rundown_item_by_id(
     from models_v2 import RundownItem
 
     # Find the rundown item
-    item = db.query(RundownItem).filter(RundownItem.id == item_id).first()
+    item = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.id == item_id).first()
     if not item:
         raise HTTPException(status_code=404, detail=f"Rundown item {item_id} not found")
 
@@ -1510,7 +1653,7 @@ async def get_rundown_item_by_asset_id(
     logger.info(f"Single-item fetch requested for asset_id: {asset_id}")
 
     # Find the rundown item by asset_id
-    item = db.query(RundownItem).filter(RundownItem.asset_id == asset_id).first()
+    item = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.asset_id == asset_id).first()
 
     if not item:
         raise HTTPException(status_code=404, detail=f"Rundown item {asset_id} not found")
@@ -11,6 +11,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from ._shared import EPISODES_ROOT, create_content_version, logger
+from services.rundown_items import WITH_SCRIPT, WITH_VERSION_CONTENT
 
 router = APIRouter()
 
@@ -156,7 +157,7 @@ async def get_content_version_detail(
         raise HTTPException(status_code=404, detail=f"Rundown item {asset_id} not found")
 
     # Get specific version
-    version = db.query(ContentVersion).filter(
+    version = db.query(ContentVersion).options(WITH_VERSION_CONTENT).filter(
         ContentVersion.rundown_item_id == item.id,
         ContentVersion.version_number == version_number
     ).first()
@@ -190,12 +191,12 @@ async def restore_content_version(
     from datetime import datetime
 
     # Find the rundown item
-    item = db.query(RundownItem).filter(RundownItem.asset_id == asset_id).first()
+    item = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.asset_id == asset_id).first()
     if not item:
         raise HTTPException(status_code=404, detail=f"Rundown item {asset_id} not found")
 
     # Get version to restore
-    version = db.query(ContentVersion).filter(
+    version = db.query(ContentVersion).options(WITH_VERSION_CONTENT).filter(
         ContentVersion.rundown_item_id == item.id,
         ContentVersion.version_number == version_number
     ).first()
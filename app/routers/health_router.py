@@ -364,6 +364,21 @@ async def health():
         health_status["services"]["celery"]["status"] = "error"
         health_status["services"]["celery"]["error"] = str(e)[:50]
 
+    # NVENC session utilization per GPU host (admission-control leases)
+    try:
+        from services.nvenc_sessions import get_cluster_view
+        hosts = get_cluster_view().utilization()
+        capacity = sum(h["capacity"] for h in hosts.values())
+        in_use = sum(h["in_use"] for h in hosts.values())
+        health_status["services"]["nvenc"] = {
+            "status": ("saturated" if in_use >= capacity else "ok") if hosts else "no_gpu_hosts",
+            "capacity": capacity,
+            "in_use": in_use,
+            "hosts": hosts,
+        }
+    except Exception as e:
+        health_status["services"]["nvenc"] = {"status": "error", "error": str(e)[:50]}
+
     # Test NFS/shared storage connectivity
     try:
         episodes_dir = Path("/home/episodes")
@@ -37,6 +37,8 @@ from services.cue_media_import import (
     save_image_from_path,
     save_audio_from_path,
 )
+from services.rundown_cues import scripts_written
+from services.rundown_timing import refresh_item_timing
 
 logger = logging.getLogger(__name__)
 
@@ -1011,6 +1013,9 @@ async def persist_conversion(
     db.execute(text(
         "UPDATE rundown_items SET script_content = :c, updated_at = now() WHERE id = :i"
     ), {"c": new_content, "i": item_id})
+    # Raw UPDATE bypasses the save hooks: keep the cue and timing rows in step
+    scripts_written(db.connection(), {item_id: new_content})
+    refresh_item_timing(db.connection(), [item_id])
     db.commit()
     logger.info(
         f"[persist-conversion] item {item_id}: replaced {len(wanted)} paragraph(s) "
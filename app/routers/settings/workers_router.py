@@ -3,7 +3,7 @@ Worker fleet settings endpoints.
 
 CRUD over worker_definitions (the DB-backed worker fleet config) plus a live
 status endpoint that reports which workers are actually online via Celery's
-inspect API. v1 STORES definitions + shows status — it does NOT remotely deploy.
+inspect API (through services/worker_inspector). v1 STORES definitions + shows status — it does NOT remotely deploy.
 """
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
@@ -124,24 +124,21 @@ async def delete_worker(
 async def workers_status(db: Session = Depends(get_db)) -> Dict[str, Any]:
     """Cross-reference defined workers against Celery's live worker list.
 
-    Returns each online worker (from `celery inspect ping/active_queues`) and,
-    for each DB-defined worker, whether a matching live worker is present.
+    Returns each online worker (from the shared worker inspector snapshot of
+    `celery inspect ping/active_queues`) and, for each DB-defined worker,
+    whether a matching live worker is present.
     Read-only: never starts/stops anything.
     """
-    online: Dict[str, Any] = {}
-    try:
-        from celery_app import celery_app
-        insp = celery_app.control.inspect(timeout=2.0)
-        ping = insp.ping() or {}
-        queues = insp.active_queues() or {}
-        for node, _ in ping.items():
-            online[node] = {
-                "node": node,
-                "queues": sorted({q.get("name") for q in queues.get(node, [])}),
-            }
-    except Exception as exc:  # noqa: BLE001
-        logger.warning("worker status inspect failed: %s", exc)
-        return {"online": [], "defined": [], "error": str(exc)}
+    from services.worker_inspector import current_snapshot
+
+    snapshot = await current_snapshot()
+    if snapshot.error and not snapshot.ping:
+        return {"online": [], "defined": [], "error": snapshot.error}
+
+    online: Dict[str, Any] = {
+        node: {"node": node, "queues": snapshot.worker_queues(node)}
+        for node in snapshot.ping
+    }
 
     defined = []
     for w in db.query(WorkerDefinition).all():
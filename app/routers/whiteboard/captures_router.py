@@ -19,7 +19,6 @@ from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 from pathlib import Path
 from urllib.parse import urlparse
-import asyncio
 import logging
 import mimetypes
 import re
@@ -31,6 +30,7 @@ from auth.utils import get_current_user_or_key
 from models_capture import WhiteboardCapture
 from models_whiteboard import AssetPoolFile, AssetTag
 from services.asset_id import AssetIDService
+from services.http_fetch import run_sync
 
 logger = logging.getLogger(__name__)
 
@@ -366,9 +366,9 @@ def _enrich(db: Session, capture: WhiteboardCapture, tags: Optional[str]):
 
     if service and capture.capture_kind in ("link", "page", "video"):
         if service == "twitter":
-            result = asyncio.run(_download_twitter_media(capture.episode_number, url, tags, username, db))
+            result = run_sync(_download_twitter_media(capture.episode_number, url, tags, username, db))
         else:
-            result = asyncio.run(_download_via_ytdlp(capture.episode_number, url, tags, username, db))
+            result = run_sync(_download_via_ytdlp(capture.episode_number, url, tags, username, db))
 
         if result.get("success") and result.get("assets"):
             # yt-dlp downloads often include a thumbnail image alongside the
@@ -534,7 +534,6 @@ def _dispatch_cue_processing(db: Session, capture: WhiteboardCapture):
         from services.ffmpeg_tasks import process_vo_video
         task = process_vo_video.apply_async(
             args=[temp_job_id, capture.episode_number, slug, "00:00:00", "00:00:00", None],
-            queue="media", routing_key="media", exchange="media",
         )
 
     job.celery_task_id = task.id
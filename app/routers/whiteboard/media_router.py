@@ -1,9 +1,10 @@
 """
-Whiteboard media endpoints: upload media, fetch link preview, analyze URL.
+Whiteboard media endpoints: upload media, fetch link preview(s), analyze URL.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from sqlalchemy.orm import Session
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+from pydantic import BaseModel
 import os
 import shutil
 import mimetypes
@@ -16,7 +17,7 @@ from database import get_db
 from auth.utils import get_current_user_or_key
 from models_whiteboard import AssetPoolFile, AssetTag
 from services.asset_id import AssetIDService
-from link_preview_service import fetch_link_preview
+from link_preview_service import fetch_link_preview_async, fetch_link_previews_async, invalidate_preview
 
 logger = logging.getLogger(__name__)
 
@@ -41,20 +42,41 @@ async def fetch_link_preview_endpoint(
     try:
         if bypass_cache:
             # Skip cache lookup, delete existing cache entry if present
-            from sqlalchemy import text
-            import hashlib
-            url_hash = hashlib.sha256(url.encode()).hexdigest()
-            db.execute(text("DELETE FROM link_preview_cache WHERE url_hash = :url_hash"), {"url_hash": url_hash})
-            db.commit()
+            invalidate_preview(url, db)
             logger.info(f"🔄 Cache bypassed for {url}")
 
-        preview_data = fetch_link_preview(url, db=db)
+        preview_data = await fetch_link_preview_async(url, db=db)
         return preview_data
     except Exception as e:
         logger.error(f"Error fetching link preview for {url}: {e}")
         return {"error": str(e)}
 
 
+class LinkPreviewBatchRequest(BaseModel):
+    urls: List[str]
+
+
+@router.post("/fetch-link-previews")
+async def fetch_link_previews_endpoint(
+    request: LinkPreviewBatchRequest,
+    current_user: dict = Depends(get_current_user_or_key),
+    db: Session = Depends(get_db)
+):
+    """
+    Fetch previews for many URLs in one call (e.g. every link card on a whiteboard).
+    Cached previews resolve in a single bulk lookup; misses are fetched concurrently.
+
+    Returns:
+        Dict with previews keyed by URL
+    """
+    urls = [u for u in request.urls if u and u.startswith(('http://', 'https://'))]
+    if len(urls) > 500:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Too many URLs (max 500)")
+
+    previews = await fetch_link_previews_async(urls, db=db)
+    return {"previews": previews}
+
+
 @router.get("/analyze-url")
 async def analyze_url(
     url: str,
@@ -53,7 +53,9 @@ async def _download_twitter_media(
     username: str, db: Session
 ):
     """Download media from Twitter/X using API v2 directly."""
-    import requests as http_requests
+    import asyncio
+    import uuid
+    from services.http_fetch import get_fetcher
 
     # Extract tweet ID from URL
     url_match = re.match(
@@ -69,7 +71,7 @@ async def _download_twitter_media(
     tweet_id = url_match.group(3)
 
     # Fetch tweet data - try v2 API first, syndication as fallback
-    from services.social_media import fetch_tweet_via_syndication, fetch_tweet_from_api, get_twitter_oauth_credentials
+    from services.social_media import fetch_tweet_via_syndication_async, fetch_tweet_from_api, get_twitter_oauth_credentials
     from link_preview_service import get_twitter_bearer_token
 
     oauth_creds = get_twitter_oauth_credentials(db)
@@ -77,13 +79,15 @@ async def _download_twitter_media(
 
     tweet_data = None
     if oauth_creds or bearer_token:
-        tweet_data = fetch_tweet_from_api(tweet_id, bearer_token=bearer_token, oauth_creds=oauth_creds)
+        tweet_data = await asyncio.to_thread(
+            fetch_tweet_from_api, tweet_id, bearer_token=bearer_token, oauth_creds=oauth_creds
+        )
 
     # If v2 API failed or returned error, try syndication as fallback
     if not tweet_data or (isinstance(tweet_data, dict) and tweet_data.get('_error')):
         v2_error = tweet_data  # preserve error info
         logger.info(f"v2 API failed for tweet {tweet_id}, trying syndication fallback")
-        tweet_data = fetch_tweet_via_syndication(tweet_id)
+        tweet_data = await fetch_tweet_via_syndication_async(tweet_id)
         if tweet_data:
             logger.info(f"Syndication fallback succeeded for tweet {tweet_id}")
 
@@ -135,6 +139,7 @@ async def _download_twitter_media(
     media_dir.mkdir(parents=True, exist_ok=True)
 
     asset_records = []
+    fetcher = get_fetcher()
 
     for media_obj in media_objects:
         media_url = media_obj.get('url')
@@ -143,16 +148,16 @@ async def _download_twitter_media(
 
         media_type = media_obj.get('type', 'photo')
 
-        # Download the file
+        # Stream to a scratch name; the final name needs the content-type and an AssetID
+        part_path = media_dir / f".download-{uuid.uuid4().hex}"
         try:
-            resp = http_requests.get(media_url, timeout=30, stream=True)
-            resp.raise_for_status()
+            download = await fetcher.download(media_url, part_path, timeout=30)
         except Exception as e:
             logger.error(f"Failed to download media from {media_url}: {e}")
             continue
 
         # Determine extension from content-type or URL
-        content_type = resp.headers.get('content-type', '')
+        content_type = download.content_type
         if 'jpeg' in content_type or 'jpg' in content_type:
             ext = '.jpg'
         elif 'png' in content_type:
@@ -181,18 +186,19 @@ async def _download_twitter_media(
         # enforced FK to asset_id_registry, so an unregistered generate() ID
         # makes the insert below fail.
         asset_type = f"whiteboard_{media_category}"
-        asset_id = AssetIDService.request_asset_id(
-            db, entity_type=asset_type, reason="create", requested_by=username,
-            context={"source": "twitter", "source_url": url, "tweet_id": tweet_id}
-        )
+        try:
+            asset_id = AssetIDService.request_asset_id(
+                db, entity_type=asset_type, reason="create", requested_by=username,
+                context={"source": "twitter", "source_url": url, "tweet_id": tweet_id}
+            )
+        except Exception:
+            part_path.unlink(missing_ok=True)
+            raise
         file_name = f"{asset_id}{ext}"
         dest_path = media_dir / file_name
+        os.replace(part_path, dest_path)
 
-        with open(dest_path, 'wb') as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        file_size = os.path.getsize(dest_path)
+        file_size = download.bytes_written
 
         if is_episode_wb:
             relative_path = f"whiteboard/{identifier}/{file_name}"
@@ -257,7 +263,7 @@ async def _download_twitter_media(
         try:
             # Get higher-res avatar (replace _normal with _400x400)
             hires_avatar = avatar_url.replace('_normal', '_400x400')
-            resp = http_requests.get(hires_avatar, timeout=10)
+            resp = await fetcher.get(hires_avatar, timeout=10)
             resp.raise_for_status()
             avatar_ext = '.jpg'
             if 'png' in resp.headers.get('content-type', ''):
@@ -295,10 +301,11 @@ async def _download_via_ytdlp(
 ):
     """Download media via yt-dlp for non-Twitter services (TikTok, YouTube, etc.).
     Returns rich metadata for local caching, matching Twitter download pattern."""
+    import asyncio
     import subprocess
     import tempfile
     import json
-    import requests as http_requests
+    from services.http_fetch import get_fetcher
 
     parsed = urlparse(url)
     domain = parsed.netloc.lower()
@@ -320,8 +327,9 @@ async def _download_via_ytdlp(
     oembed_data = None
     if service == 'tiktok':
         try:
-            oembed_resp = http_requests.get(
-                f'https://www.tiktok.com/oembed?url={url}',
+            oembed_resp = await get_fetcher().get(
+                'https://www.tiktok.com/oembed',
+                params={'url': url},
                 timeout=10
             )
             if oembed_resp.status_code == 200:
@@ -343,7 +351,9 @@ async def _download_via_ytdlp(
         ]
 
         try:
-            result = subprocess.run(
+            # Off the event loop: yt-dlp can run for up to two minutes
+            result = await asyncio.to_thread(
+                subprocess.run,
                 yt_dlp_cmd,
                 capture_output=True,
                 text=True,
@@ -572,7 +582,7 @@ async def _download_via_ytdlp(
             # Cache thumbnail
             if thumbnail_url:
                 try:
-                    resp = http_requests.get(thumbnail_url, timeout=10)
+                    resp = await get_fetcher().get(thumbnail_url, timeout=10)
                     resp.raise_for_status()
                     thumb_ext = '.jpg'
                     if 'png' in resp.headers.get('content-type', ''):
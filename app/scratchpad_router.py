@@ -11,7 +11,7 @@ import uuid
 from database import get_db
 from auth.utils import get_current_user_or_key
 from models_scratchpad import Scratchpad, ScratchpadItem
-from link_preview_service import fetch_link_preview
+from link_preview_service import fetch_link_preview_async
 import logging
 
 logger = logging.getLogger(__name__)
@@ -113,7 +113,7 @@ async def fetch_link_preview_endpoint(
     Uses Twitter API if configured for enhanced Twitter/X metadata.
     """
     try:
-        preview_data = fetch_link_preview(url, db=db)
+        preview_data = await fetch_link_preview_async(url, db=db)
         return preview_data
     except Exception as e:
         logger.error(f"Error fetching link preview for {url}: {e}")
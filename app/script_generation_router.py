@@ -10,16 +10,16 @@ Plus:
 - Media list (list of all media cues)
 """
 from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, Dict, Any, List
 from pydantic import BaseModel
 from enum import Enum
 from auth.utils import get_current_user_or_key
 from services.host_script_generator import generate_host_script, ScriptPreset
-from services.cue_extractor import CUE_BLOCK_RE
+from services.compiled_episode import compile_episode
 from pathlib import Path
 from datetime import datetime
 from database import SessionLocal
-from models_v2 import Episode, Rundown, RundownItem
 import logging
 import subprocess
 import shutil
@@ -49,6 +49,8 @@ class ScriptGenerationResponse(BaseModel):
     item_count: Optional[int] = None
     block_count: Optional[int] = None
     revision: Optional[int] = None
+    cached: Optional[bool] = None
+    job_id: Optional[str] = None
     error: Optional[str] = None
 
 
@@ -70,11 +72,66 @@ class MediaListRequest(BaseModel):
     media_items: List[MediaListItem]
 
 
+def _to_response(result: Dict[str, Any], job_id: Optional[str] = None) -> ScriptGenerationResponse:
+    return ScriptGenerationResponse(
+        success=result.get("success", False),
+        output_path=result.get("output_path"),
+        html_path=result.get("html_path"),
+        pdf_path=result.get("pdf_path"),
+        md_path=result.get("md_path"),
+        episode_number=result.get("episode_number"),
+        preset=result.get("preset"),
+        item_count=result.get("item_count"),
+        block_count=result.get("block_count"),
+        revision=result.get("revision"),
+        cached=result.get("cached", False),
+        job_id=job_id,
+        error=result.get("error")
+    )
+
+
+async def _run_script_generation(
+    episode_number: str,
+    preset: ScriptPresetEnum,
+    output_dir: Optional[str],
+    queue: bool,
+    force: bool
+) -> ScriptGenerationResponse:
+    """Render in a worker thread (default) or hand off to the compilation queue."""
+    if queue:
+        from services.script_generation_tasks import generate_host_script_task
+        from celery_jobs_router import register_celery_job
+
+        job = generate_host_script_task.delay(
+            episode_number, output_dir, preset=preset.value, use_cache=not force
+        )
+        db = SessionLocal()
+        try:
+            register_celery_job(
+                db, job.id, "services.script_generation_tasks.generate_host_script_task",
+                f"Script {preset.value.replace('_', ' ').title()}", "scripts", episode_number, "compilation"
+            )
+        finally:
+            db.close()
+
+        return ScriptGenerationResponse(
+            success=True, episode_number=episode_number, preset=preset.value, job_id=job.id
+        )
+
+    # Off the event loop: DB reads, media embedding and wkhtmltopdf take seconds
+    result = await run_in_threadpool(
+        generate_host_script, episode_number, output_dir, preset=preset.value, use_cache=not force
+    )
+    return _to_response(result)
+
+
 @router.post("/generate/{episode_number}", response_model=ScriptGenerationResponse)
 async def generate_script_endpoint(
     episode_number: str,
     preset: ScriptPresetEnum = Query(ScriptPresetEnum.host_full, description="Script preset"),
     output_dir: Optional[str] = Query(None, description="Custom output directory"),
+    queue: bool = Query(False, description="Run as a background job; poll /scripts/jobs/{job_id}"),
+    force: bool = Query(False, description="Re-render even if nothing changed since the last render"),
     current_user: dict = Depends(get_current_user_or_key)
 ) -> ScriptGenerationResponse:
     """
@@ -94,22 +151,13 @@ async def generate_script_endpoint(
     **Output:**
     - HTML and PDF files saved to episode's scripts/current/ folder
     - PDF includes page numbers (Episode XXXX on left, Page X of Y on right)
+    - If no item, asset, transcription or setting changed since the last render
+      of this preset, the previous files are returned (cached=true)
+    - With queue=true the render runs on the compilation worker and the
+      response carries a job_id instead of paths
     """
     try:
-        result = generate_host_script(episode_number, output_dir, preset=preset.value)
-
-        return ScriptGenerationResponse(
-            success=result.get("success", False),
-            output_path=result.get("output_path"),
-            html_path=result.get("html_path"),
-            pdf_path=result.get("pdf_path"),
-            episode_number=result.get("episode_number"),
-            preset=result.get("preset"),
-            item_count=result.get("item_count"),
-            block_count=result.get("block_count"),
-            revision=result.get("revision"),
-            error=result.get("error")
-        )
+        return await _run_script_generation(episode_number, preset, output_dir, queue, force)
 
     except Exception as e:
         logger.error(f"Error generating script for episode {episode_number}: {e}")
@@ -121,6 +169,8 @@ async def generate_host_script_endpoint(
     episode_number: str,
     preset: ScriptPresetEnum = Query(ScriptPresetEnum.host_full, description="Script preset"),
     output_dir: Optional[str] = Query(None, description="Custom output directory"),
+    queue: bool = Query(False, description="Run as a background job; poll /scripts/jobs/{job_id}"),
+    force: bool = Query(False, description="Re-render even if nothing changed since the last render"),
     current_user: dict = Depends(get_current_user_or_key)
 ) -> ScriptGenerationResponse:
     """
@@ -129,26 +179,42 @@ async def generate_host_script_endpoint(
     See /generate/{episode_number} for full documentation.
     """
     try:
-        result = generate_host_script(episode_number, output_dir, preset=preset.value)
-
-        return ScriptGenerationResponse(
-            success=result.get("success", False),
-            output_path=result.get("output_path"),
-            html_path=result.get("html_path"),
-            pdf_path=result.get("pdf_path"),
-            episode_number=result.get("episode_number"),
-            preset=result.get("preset"),
-            item_count=result.get("item_count"),
-            block_count=result.get("block_count"),
-            revision=result.get("revision"),
-            error=result.get("error")
-        )
+        return await _run_script_generation(episode_number, preset, output_dir, queue, force)
 
     except Exception as e:
         logger.error(f"Error generating host script for episode {episode_number}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/jobs/{job_id}")
+async def get_script_job_status(
+    job_id: str,
+    current_user: dict = Depends(get_current_user_or_key)
+) -> Dict[str, Any]:
+    """
+    Status of a queued script generation job.
+
+    Returns state, progress (0-100), current stage, and once finished the
+    same fields as /generate (html_path, pdf_path, ...).
+    """
+    from celery.result import AsyncResult
+    from celery_app import celery_app
+
+    result = AsyncResult(job_id, app=celery_app)
+    response: Dict[str, Any] = {"job_id": job_id, "state": result.status, "progress": 0, "stage": None}
+
+    if result.status == "PROGRESS" and isinstance(result.info, dict):
+        response["progress"] = result.info.get("progress", 0)
+        response["stage"] = result.info.get("stage")
+    elif result.status == "SUCCESS":
+        response["progress"] = 100
+        response["result"] = _to_response(result.result or {}).dict()
+    elif result.status == "FAILURE":
+        response["error"] = str(result.info)
+
+    return response
+
+
 @router.post("/media-list/{episode_number}", response_model=ScriptGenerationResponse)
 async def generate_media_list_endpoint(
     episode_number: str,
@@ -222,52 +288,27 @@ async def generate_media_list_from_db(
     try:
         ep_num = episode_number.zfill(4)
 
-        # Find episode and rundown
-        episode = db.query(Episode).filter(Episode.episode_number == int(episode_number)).first()
-        if not episode:
-            raise HTTPException(status_code=404, detail=f"Episode {episode_number} not found")
-
-        rundown = db.query(Rundown).filter(Rundown.episode_id == episode.id).first()
-        if not rundown:
-            raise HTTPException(status_code=404, detail=f"No rundown found for episode {episode_number}")
-
-        # Get all rundown items ordered by position
-        items = db.query(RundownItem).filter(
-            RundownItem.rundown_id == rundown.id
-        ).order_by(RundownItem.order_in_rundown).all()
+        try:
+            compiled = compile_episode(episode_number, db)
+        except LookupError as e:
+            raise HTTPException(status_code=404, detail=str(e))
 
-        # Extract media cues from script content
+        # Media cues, from the cues parsed at compile time
         media_items = []
         cue_types = ['IMG', 'GFX', 'SOT', 'VO', 'NAT', 'PKG', 'BUMP', 'STING', 'FSQ', 'RIF', 'DIR']
-        cue_pattern = CUE_BLOCK_RE  # matches expanded + collapsed cues
-
-        for item in items:
-            if not item.script_content:
-                continue
-
-            for match in cue_pattern.finditer(item.script_content):
-                cue_content = match.group(1)
-
-                # Extract fields (flexible patterns)
-                type_match = re.search(r'\[Type:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-                slug_match = re.search(r'\[Slug:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-                media_url_match = re.search(r'\[Media\s*[Uu]rl:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-                asset_id_match = re.search(r'\[Asset\s*[Ii][Dd]:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-                duration_match = re.search(r'\[Duration:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
 
-                cue_type = type_match.group(1).strip().upper() if type_match else ''
-
-                if cue_type in cue_types:
-                    media_url = media_url_match.group(1).strip() if media_url_match else ''
+        for item in compiled.items:
+            for cue in compiled.cues.get(item.id, []):
+                if cue.cue_type in cue_types:
                     media_items.append(MediaListItem(
                         segmentSlug=item.slug or item.title or 'Unknown',
                         segmentOrder=item.order_in_rundown,
-                        cueType=cue_type,
-                        slug=slug_match.group(1).strip() if slug_match else '',
-                        mediaUrl=media_url,
-                        assetId=asset_id_match.group(1).strip() if asset_id_match else '',
-                        duration=duration_match.group(1).strip() if duration_match else '',
-                        hasMissingMedia=not media_url
+                        cueType=cue.cue_type,
+                        slug=cue.slug,
+                        mediaUrl=cue.media_url,
+                        assetId=cue.asset_id,
+                        duration=cue.duration,
+                        hasMissingMedia=not cue.media_url
                     ))
 
         logger.info(f"Found {len(media_items)} media cues in episode {episode_number}")
@@ -849,69 +890,36 @@ async def get_ipad_scroll_content(
     - blocks: List of script blocks with compiled HTML content
     - html_content: Full compiled HTML (for direct rendering if needed)
     """
-    from services.host_script_generator import (
-        generate_host_script,
-        _get_episode_info,
-        _detect_blocks,
-        _collect_media_resources,
-        _build_transcription_cache,
-        _generate_html
-    )
+    from services.host_script_generator import _generate_html
 
     db = SessionLocal()
 
     try:
         # Validate preset
         try:
-            from services.host_script_generator import ScriptPreset as GeneratorPreset
-            script_preset = GeneratorPreset(preset.value)
+            script_preset = ScriptPreset(preset.value)
         except ValueError:
-            from services.host_script_generator import ScriptPreset as GeneratorPreset
-            script_preset = GeneratorPreset.HOST_FULL
-
-        # Find episode
-        episode = db.query(Episode).filter(
-            Episode.episode_number == int(episode_number)
-        ).first()
-
-        if not episode:
-            raise HTTPException(status_code=404, detail=f"Episode {episode_number} not found")
-
-        # Get rundown
-        rundown = db.query(Rundown).filter(Rundown.episode_id == episode.id).first()
-        if not rundown:
-            raise HTTPException(status_code=404, detail=f"No rundown found for episode {episode_number}")
-
-        # Get all rundown items ordered by position
-        items = db.query(RundownItem).filter(
-            RundownItem.rundown_id == rundown.id
-        ).order_by(RundownItem.order_in_rundown).all()
+            script_preset = ScriptPreset.HOST_FULL
 
-        if not items:
-            raise HTTPException(status_code=404, detail=f"No rundown items found for episode {episode_number}")
-
-        # Get episode metadata
-        episode_info = _get_episode_info(episode, db, items)
+        # Same compiled episode the PDF presets render from
+        try:
+            compiled = compile_episode(episode_number, db)
+        except LookupError as e:
+            raise HTTPException(status_code=404, detail=str(e))
 
-        # Create temporary resources path for media collection
-        ep_num_padded = episode_number.zfill(4)
+        ep_num_padded = compiled.episode_number
         container_path = Path(f"/home/episodes/{ep_num_padded}/scripts/current")
         host_path = Path(f"/mnt/sync/disaffected/episodes/{ep_num_padded}/scripts/current")
         output_path = container_path if container_path.parent.parent.exists() else host_path
         resources_path = output_path / "resources"
         resources_path.mkdir(parents=True, exist_ok=True)
 
-        # Collect media resources
-        url_mapping = _collect_media_resources(items, resources_path, ep_num_padded)
-
-        # Build transcription cache
-        transcription_cache = _build_transcription_cache(items, db)
-
-        # Detect blocks
-        blocks = _detect_blocks(items)
-
-        # Generate HTML content
-        html_content = _generate_html(episode_info, blocks, script_preset, url_mapping, transcription_cache)
+        episode_info = compiled.episode_info
+        blocks = compiled.blocks
+        html_content = _generate_html(
+            episode_info, blocks, script_preset,
+            compiled.url_mapping(resources_path), compiled.transcription_cache
+        )
 
         # Fix relative image/resource paths to absolute URLs for web viewing
         # Replace resources/ with /episodes/{episode}/scripts/current/resources/
@@ -929,7 +937,7 @@ async def get_ipad_scroll_content(
             "episode_info": episode_info,
             "html_content": html_content,
             "block_count": len(blocks),
-            "item_count": len(items),
+            "item_count": len(compiled.items),
             "preset": preset.value
         }
 
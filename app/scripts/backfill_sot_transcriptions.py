@@ -25,6 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from database import SessionLocal
 from models_v2 import Episode, Rundown, RundownItem, SOTProcessingJob
+from services.rundown_items import WITH_SCRIPT
 
 
 @contextmanager
@@ -152,7 +153,7 @@ def backfill_episode(episode_number: str, dry_run: bool = False) -> dict:
             return stats
 
         # Get all rundown items
-        items = db.query(RundownItem).filter_by(rundown_id=rundown.id).all()
+        items = db.query(RundownItem).options(WITH_SCRIPT).filter_by(rundown_id=rundown.id).all()
 
         # Build transcription cache from SOTProcessingJob records
         jobs = db.query(SOTProcessingJob).all()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared cue parser against the per-subsystem parsers it replaced
+
+Loads every script of the last N episodes and times, per script:
+
+- the legacy parsers, each as its subsystem ran it (cue_extractor field regex,
+  duration estimator line scan, host script generator _extract_field lookups,
+  blueprint renderer / compiled episode field regexes, FSQ router line parse),
+  summed, since every subsystem re-parsed the script on its own
+- services.cue_parser.parse_script cold (cache cleared) and warm (what every
+  subsystem after the first pays)
+
+and reports cue counts so parser disagreements (collapsed cues missed by the
+plain-marker patterns, unterminated cues) show up next to the timings.
+
+Usage:
+    python scripts/benchmark_cue_parser.py
+    python scripts/benchmark_cue_parser.py --episodes 20 --repeat 10
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from database import SessionLocal
+from models_v2 import Episode, Rundown, RundownItem
+from services import cue_parser
+from services.cue_parser import clear_parse_cache, parse_cache_info, parse_script
+
+
+# ---------------------------------------------------------------------------
+# Legacy parsers, as they were before services/cue_parser
+# ---------------------------------------------------------------------------
+
+_BLOCK_RE = re.compile(r"<!-- Begin Cue(?: collapsed)? -->(.*?)<!-- End Cue -->", re.DOTALL)
+_PLAIN_BLOCK_RE = r'<!-- Begin Cue -->(.*?)<!-- End Cue -->'
+_JS_FIELD_RE = re.compile(r"\[([^:\n\[\]]+):\s*([\s\S]*?)\](?=\s*(?:\n\s*\[|\n\s*<!--|$))")
+_BRACKET_FIELDS = {
+    'type': r'\[Type:\s*([^\]]+)\]',
+    'slug': r'\[Slug:\s*([^\]]+)\]',
+    'media_url': r'\[Media\s*[Uu]rl:\s*([^\]]+)\]',
+    'thumbnail_url': r'\[Thumbnail\s*[Uu]rl:\s*([^\]]+)\]',
+    'asset_id': r'\[Asset\s*[Ii][Dd]:\s*([^\]]+)\]',
+    'duration': r'\[Duration:\s*([^\]]+)\]',
+    'quote': r'\[Quote:\s*([^\]]+)\]',
+    'attribution': r'\[Attribution:\s*([^\]]+)\]',
+}
+_HOST_FIELDS = ['Type', 'Slug', 'Duration', r'Media\s*[Uu]rl', r'Asset\s*[Ii][Dd]', 'Transcription', 'Description']
+
+
+def legacy_cue_extractor(content):
+    cues = []
+    for match in _BLOCK_RE.finditer(content):
+        fields = {m.group(1).strip(): m.group(2).strip() for m in _JS_FIELD_RE.finditer(match.group(1))}
+        if fields.get('Type'):
+            cues.append(fields)
+    return len(cues)
+
+
+def legacy_duration_estimator(content):
+    lines = content.split('\n')
+    cues = 0
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if '<!-- Begin Cue -->' in line or '<!-- Begin Cue collapsed -->' in line:
+            cue_lines = [line]
+            i += 1
+            while i < len(lines) and '<!-- End Cue -->' not in lines[i]:
+                cue_lines.append(lines[i])
+                i += 1
+            data = {}
+            for cue_line in cue_lines:
+                field_match = re.match(r'^\[([^:]+):\s*(.*)\]$', cue_line.strip())
+                if field_match:
+                    data[field_match.group(1).strip().lower()] = field_match.group(2).strip()
+            cues += bool(data)
+        i += 1
+    return cues
+
+
+def legacy_host_script(content):
+    cues = 0
+    for cue in re.findall(_PLAIN_BLOCK_RE, content, re.DOTALL):
+        for name in _HOST_FIELDS:
+            re.search(rf'\[{name}:\s*(.*?)\](?=\s*(?:\n\s*\[|\n\s*<!--|\Z))', cue, re.DOTALL | re.IGNORECASE)
+        cues += 1
+    return cues
+
+
+def legacy_bracket_fields(content):
+    """blueprint_renderer._parse_cue / compiled_episode.CueRef.parse."""
+    cues = 0
+    for match in _BLOCK_RE.finditer(content):
+        body = match.group(1)
+        for pattern in _BRACKET_FIELDS.values():
+            re.search(pattern, body, re.IGNORECASE)
+        cues += 1
+    return cues
+
+
+def legacy_fsq_router(content):
+    pattern = re.compile(r'<!-- Begin Cue(?: collapsed)? -->.*?\[Type:\s*FSQ\].*?<!-- End Cue -->', re.DOTALL | re.IGNORECASE)
+    field_pattern = re.compile(r'^\s*\[([^:]+):\s*(.*)\]\s*$')
+    cues = 0
+    for match in pattern.findall(content):
+        for line in match.split('\n'):
+            field_pattern.match(line)
+        cues += 1
+    return cues
+
+
+LEGACY_PARSERS = {
+    'cue_extractor': legacy_cue_extractor,
+    'duration_estimation': legacy_duration_estimator,
+    'host_script_generator': legacy_host_script,
+    'blueprint/compiled_episode': legacy_bracket_fields,
+    'fsq_asset_router': legacy_fsq_router,
+}
+
+
+# ---------------------------------------------------------------------------
+
+
+def load_scripts(episode_count):
+    db = SessionLocal()
+    try:
+        episodes = db.query(Episode.id).order_by(Episode.episode_number.desc().nullslast()).limit(episode_count).all()
+        rows = db.query(RundownItem.script_content).join(Rundown, RundownItem.rundown_id == Rundown.id).filter(
+            Rundown.episode_id.in_([episode.id for episode in episodes]),
+            RundownItem.script_content.isnot(None),
+        ).all()
+        return len(episodes), [row.script_content for row in rows if row.script_content]
+    finally:
+        db.close()
+
+
+def best_of(repeat, fn, scripts, before=None):
+    best = None
+    result = None
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        result = [fn(script) for script in scripts]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the shared cue parser against the legacy parsers')
+    parser.add_argument('--episodes', type=int, default=50, help='Number of most recent episodes (default 50)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per parser; the best is reported (default 5)')
+    args = parser.parse_args()
+
+    episode_count, scripts = load_scripts(args.episodes)
+    total_bytes = sum(len(script.encode('utf-8')) for script in scripts)
+    print(f"\n📦 {len(scripts)} scripts from {episode_count} episodes ({total_bytes / 1024:.0f} KiB)\n")
+    if not scripts:
+        return
+
+    # Hold the whole sample so the cached pass measures hits, not LRU churn
+    cue_parser.PARSE_CACHE_SIZE = max(cue_parser.PARSE_CACHE_SIZE, len(scripts))
+
+    def report(label, seconds, cues):
+        print(f"  {label:<30} {seconds * 1000:9.2f} ms  {seconds / len(scripts) * 1e6:8.1f} µs/script  {cues:6d} cues")
+
+    legacy_total = 0.0
+    for label, fn in LEGACY_PARSERS.items():
+        seconds, counts = best_of(args.repeat, fn, scripts)
+        legacy_total += seconds
+        report(label, seconds, sum(counts))
+    print(f"  {'legacy total':<30} {legacy_total * 1000:9.2f} ms\n")
+
+    cold, parsed = best_of(args.repeat, parse_script, scripts, before=clear_parse_cache)
+    warm, _ = best_of(args.repeat, parse_script, scripts)
+    cues = sum(len(script.cues) for script in parsed)
+    collapsed = sum(cue.collapsed for script in parsed for cue in script.cues)
+    report('cue_parser (cold)', cold, cues)
+    report('cue_parser (cached)', warm, cues)
+    # Every subsystem after the first hits the cache
+    shared = cold + warm * (len(LEGACY_PARSERS) - 1)
+    print(f"  {'cue_parser, all subsystems':<30} {shared * 1000:9.2f} ms  ({legacy_total / shared:.1f}x faster)\n")
+    print(f"  collapsed cues: {collapsed} (not seen by the plain-marker host script patterns)")
+    print(f"  cache: {parse_cache_info()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Benchmark rundown item loading with and without script bodies
+
+For one episode (the largest of the last N by script bytes, or --episode),
+runs each list-style access path twice:
+
+- before: every column loaded, as when RundownItem.script_content and
+  ContentVersion.script_content were plain columns (emulated with undefer)
+- after:  the deferred columns, or the services.rundown_items projections
+
+and reports, per path, the number of SQL statements, the bytes of column data
+they returned and the wall time. Bytes are measured by replaying each captured
+SELECT on the same connection and summing the size of every returned value.
+
+Usage:
+    python scripts/benchmark_item_loading.py
+    python scripts/benchmark_item_loading.py --episode 257 --repeat 10
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import event, func, text
+
+from database import SessionLocal, engine
+from models_v2 import ContentVersion, Episode, Rundown, RundownItem
+from services.rundown_items import WITH_SCRIPT, WITH_VERSION_CONTENT, item_summaries
+
+
+class StatementLog:
+    """Captures the statements run on the engine while active."""
+
+    def __init__(self):
+        self.active = False
+        self.statements = []
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active:
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        self.statements = []
+        self.active = True
+        return self
+
+    def __exit__(self, *exc):
+        self.active = False
+
+
+def _value_bytes(value):
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    return len(str(value))
+
+
+def replay_bytes(db, statements):
+    """Bytes of column data returned by the captured SELECTs."""
+    cursor = db.connection().connection.cursor()
+    total = 0
+    try:
+        for statement, parameters in statements:
+            if not statement.lstrip().upper().startswith('SELECT'):
+                continue
+            cursor.execute(statement, parameters)
+            for row in cursor.fetchall():
+                total += sum(_value_bytes(value) for value in row)
+    finally:
+        cursor.close()
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Access paths: (before, after) per path, each fn(db, rundown_ids, asset_ids)
+# ---------------------------------------------------------------------------
+
+def list_before(db, rundown_ids, asset_ids):
+    items = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.rundown_id.in_(rundown_ids)).all()
+    return [(item.id, item.slug, item.order_in_rundown) for item in items]
+
+
+def list_after(db, rundown_ids, asset_ids):
+    items = db.query(RundownItem).filter(RundownItem.rundown_id.in_(rundown_ids)).all()
+    return [(item.id, item.slug, item.order_in_rundown) for item in items]
+
+
+def summaries_after(db, rundown_ids, asset_ids):
+    return [(row.id, row.slug, row.order_in_rundown, row.script_length) for row in item_summaries(db, rundown_ids)]
+
+
+def summaries_before(db, rundown_ids, asset_ids):
+    items = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.rundown_id.in_(rundown_ids)).all()
+    return [(item.id, item.slug, item.order_in_rundown, len(item.script_content or '')) for item in items]
+
+
+def reorder_before(db, rundown_ids, asset_ids):
+    """The reorder endpoint looked every item up by asset_id, one query each."""
+    moved = 0
+    for asset_id in asset_ids:
+        item = db.query(RundownItem).options(WITH_SCRIPT).filter(
+            RundownItem.asset_id == asset_id,
+            RundownItem.rundown_id.in_(rundown_ids)
+        ).first()
+        moved += item is not None
+    return moved
+
+
+def reorder_after(db, rundown_ids, asset_ids):
+    items = db.query(RundownItem).filter(RundownItem.rundown_id.in_(rundown_ids)).all()
+    by_asset_id = {item.asset_id: item for item in items}
+    return sum(asset_id in by_asset_id for asset_id in asset_ids)
+
+
+def versions_before(db, rundown_ids, asset_ids):
+    item_ids = db.query(RundownItem.id).filter(RundownItem.rundown_id.in_(rundown_ids))
+    versions = db.query(ContentVersion).options(WITH_VERSION_CONTENT).filter(
+        ContentVersion.rundown_item_id.in_(item_ids)
+    ).all()
+    return [(v.version_number, v.content_length) for v in versions]
+
+
+def versions_after(db, rundown_ids, asset_ids):
+    item_ids = db.query(RundownItem.id).filter(RundownItem.rundown_id.in_(rundown_ids))
+    versions = db.query(ContentVersion).filter(ContentVersion.rundown_item_id.in_(item_ids)).all()
+    return [(v.version_number, v.content_length) for v in versions]
+
+
+PATHS = [
+    ('item list (id, slug, order)', list_before, list_after),
+    ('item summaries + script length', summaries_before, summaries_after),
+    ('reorder lookup', reorder_before, reorder_after),
+    ('version history list', versions_before, versions_after),
+]
+
+
+# ---------------------------------------------------------------------------
+
+
+def pick_episode(db, episode_number, episode_count):
+    if episode_number is not None:
+        return db.query(Episode).filter(Episode.episode_number == episode_number).first()
+    recent = db.query(Episode.id).order_by(Episode.episode_number.desc().nullslast()).limit(episode_count).subquery()
+    row = db.query(Rundown.episode_id, func.sum(func.length(func.coalesce(RundownItem.script_content, ''))).label('size')).join(
+        RundownItem, RundownItem.rundown_id == Rundown.id
+    ).filter(Rundown.episode_id.in_(db.query(recent.c.id))).group_by(Rundown.episode_id).order_by(text('size DESC')).first()
+    return db.get(Episode, row.episode_id) if row else None
+
+
+def measure(log, fn, rundown_ids, asset_ids, repeat):
+    best = None
+    statements = []
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            with log:
+                start = time.perf_counter()
+                fn(db, rundown_ids, asset_ids)
+                elapsed = time.perf_counter() - start
+            statements = log.statements
+            best = elapsed if best is None else min(best, elapsed)
+            size = replay_bytes(db, statements)
+        finally:
+            db.rollback()
+            db.close()
+    return len(statements), size, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark rundown item loading with and without script bodies')
+    parser.add_argument('--episode', type=int, default=None, help='Episode number (default: largest recent episode)')
+    parser.add_argument('--episodes', type=int, default=20, help='Recent episodes to pick the largest from (default 20)')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per path; the best time is reported (default 5)')
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        episode = pick_episode(db, args.episode, args.episodes)
+        if not episode:
+            print("No episode found")
+            return
+        rundown_ids = [r.id for r in db.query(Rundown.id).filter(Rundown.episode_id == episode.id)]
+        asset_ids = [a for (a,) in db.query(RundownItem.asset_id).filter(RundownItem.rundown_id.in_(rundown_ids))]
+        script_bytes = db.query(func.sum(func.length(func.coalesce(RundownItem.script_content, '')))).filter(
+            RundownItem.rundown_id.in_(rundown_ids)
+        ).scalar() or 0
+        episode_number = episode.episode_number
+    finally:
+        db.close()
+
+    print(f"\n📦 Episode {episode_number}: {len(asset_ids)} items, {script_bytes / 1024:.0f} KiB of script\n")
+    print(f"  {'':<32} {'queries':^16} {'bytes returned':^24} {'time':^22}")
+
+    log = StatementLog()
+    for label, before, after in PATHS:
+        q0, b0, t0 = measure(log, before, rundown_ids, asset_ids, args.repeat)
+        q1, b1, t1 = measure(log, after, rundown_ids, asset_ids, args.repeat)
+        print(f"  {label:<32} {q0:>6} -> {q1:<6} {b0 / 1024:>9.1f} -> {b1 / 1024:<7.1f} KiB "
+              f"{t0 * 1000:>8.2f} -> {t1 * 1000:<7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -118,64 +118,94 @@ class AssetIDService:
         Returns:
             New AssetID with full tracking in database
         """
+        asset_id = cls.generate(entity_type)
+        cls.register_asset_ids(db, [{
+            "asset_id": asset_id,
+            "entity_type": entity_type,
+            "reason": reason,
+            "requested_by": requested_by,
+            "linked_to": linked_to,
+            "context": context,
+        }])
+        return asset_id
+
+    @classmethod
+    def register_asset_ids(cls, db: Session, entries: List[Dict[str, Any]], commit: bool = True) -> List[str]:
+        """
+        Record pre-generated AssetIDs with full tracking, in bulk.
+
+        Lets a caller plan a whole structure's IDs up front (generate()), link
+        them to each other, and log them all in the same transaction as the
+        rows that use them. Pending messages for the whole batch are looked up
+        with one query.
+
+        Args:
+            db: Database session
+            entries: Dicts with asset_id, entity_type, reason and optionally
+                requested_by, linked_to and context (as for request_asset_id)
+            commit: Commit when done; pass False to leave it to the caller's transaction
+
+        Returns:
+            The registered AssetIDs, in entry order
+        """
         from models_assetid import AssetIDRegistry, AssetIDRelationship, AssetIDPendingMessage
         from models_v2 import AssetMessage
-        
-        # Generate the ID
-        asset_id = cls.generate(entity_type)
-        
-        # Create registry entry
-        registry_entry = AssetIDRegistry(
-            asset_id=asset_id,
-            entity_type=entity_type,
-            request_reason=reason,
-            requested_by=requested_by,
-            request_context=context or {},
-            initial_links=linked_to or []
-        )
-        
-        db.add(registry_entry)
-        
-        # Create relationship entries if linked
-        if linked_to:
+
+        asset_ids = [entry["asset_id"] for entry in entries]
+        if len(set(asset_ids)) != len(asset_ids):
+            raise ValueError("Duplicate AssetIDs in registration batch")
+
+        for entry in entries:
+            linked_to = entry.get("linked_to") or []
+
+            # Create registry entry
+            db.add(AssetIDRegistry(
+                asset_id=entry["asset_id"],
+                entity_type=entry["entity_type"],
+                request_reason=entry["reason"],
+                requested_by=entry.get("requested_by"),
+                request_context=entry.get("context") or {},
+                initial_links=linked_to
+            ))
+
+            # Create relationship entries if linked
             for link in linked_to:
-                relationship = AssetIDRelationship(
-                    source_asset_id=asset_id,
+                db.add(AssetIDRelationship(
+                    source_asset_id=entry["asset_id"],
                     target_asset_id=link.get("asset_id"),
                     relationship_type=link.get("link_type", "related_to"),
-                    created_by=requested_by,
+                    created_by=entry.get("requested_by"),
                     context={"initial_link": True}
-                )
-                db.add(relationship)
-        
-        # Check for pending messages for this AssetID
+                ))
+
+        # Check for pending messages for these AssetIDs
         pending_messages = db.query(AssetIDPendingMessage).filter(
-            AssetIDPendingMessage.pending_asset_id == asset_id,
+            AssetIDPendingMessage.pending_asset_id.in_(asset_ids),
             AssetIDPendingMessage.delivered == "false"
-        ).all()
-        
+        ).all() if asset_ids else []
+
         # Deliver any pending messages
         for pending_msg in pending_messages:
             # Check if not expired
             if pending_msg.expires_at and pending_msg.expires_at < datetime.utcnow():
                 continue
-                
+
             # Create actual message
-            message = AssetMessage(
-                asset_id=asset_id,
+            db.add(AssetMessage(
+                asset_id=pending_msg.pending_asset_id,
                 message_type=pending_msg.message_type,
                 content=pending_msg.content,
                 user_id=pending_msg.created_by
-            )
-            db.add(message)
-            
+            ))
+
             # Mark as delivered
             pending_msg.delivered = "true"
             pending_msg.delivered_at = datetime.utcnow()
-        
-        db.commit()
-        
-        return asset_id
+
+        if commit:
+            db.commit()
+
+        return asset_ids
     
     @classmethod
     def get_asset_history(cls, db: Session, asset_id: str) -> Dict[str, Any]:
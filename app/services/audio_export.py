@@ -0,0 +1,187 @@
+"""
+Episode Audio Export - every MP3 profile from one decode of the master.
+
+generate_episode_mp3 used to run one ffmpeg per profile, each decoding the
+whole exported episode video and applying single-pass loudnorm (which guesses
+at the programme loudness as it goes). Now:
+
+1. Loudness is measured once per source file (loudnorm analysis pass) and the
+   measurement is cached in exports/.loudness.json keyed on the file's size
+   and mtime, so re-exports skip it.
+2. One ffmpeg invocation decodes the audio once, splits it, runs the measured
+   (linear) loudnorm on the branch feeding the profiles that normalize, and
+   writes every profile as a separate MP3 output.
+"""
+import json
+import logging
+import os
+import re
+import subprocess
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# EBU R128 podcast target (same values the single-pass filter used)
+LOUDNESS_TARGET = {"I": -16.0, "LRA": 11.0, "TP": -1.5}
+LOUDNESS_CACHE_NAME = ".loudness.json"
+
+_MEASUREMENT_KEYS = ("input_i", "input_tp", "input_lra", "input_thresh", "target_offset")
+
+
+@dataclass
+class Mp3Profile:
+    """Encoding settings for one MP3 output."""
+    name: str
+    bitrate: str = "192k"
+    sample_rate: int = 44100
+    channels: int = 2
+    quality: Optional[int] = None  # VBR quality; takes precedence over bitrate
+    normalize_audio: bool = False
+    is_default: bool = False
+    id: Optional[int] = None  # mp3_encoding_profiles row, when loaded from the DB
+
+    @classmethod
+    def from_model(cls, profile) -> "Mp3Profile":
+        return cls(
+            name=profile.name,
+            bitrate=profile.bitrate,
+            sample_rate=profile.sample_rate,
+            channels=profile.channels,
+            quality=profile.quality,
+            normalize_audio=profile.normalize_audio,
+            is_default=bool(profile.is_default),
+            id=profile.id,
+        )
+
+    def encoder_args(self) -> List[str]:
+        args = ["-c:a", "libmp3lame"]
+        # VBR mode (quality) takes precedence over CBR (bitrate)
+        if self.quality is not None:
+            args += ["-q:a", str(self.quality)]
+        else:
+            args += ["-b:a", self.bitrate]
+        return args + ["-ar", str(self.sample_rate), "-ac", str(self.channels)]
+
+
+def profile_output_name(episode: str, profile: Mp3Profile, primary: bool) -> str:
+    """
+    {episode}.mp3 for the primary profile, {episode}-{profile-slug}-{id}.mp3 for the rest.
+
+    The id keeps two profiles whose names slugify alike ("Podcast 128k" and
+    "podcast-128k") from writing the same file.
+    """
+    if primary:
+        return f"{episode}.mp3"
+    slug = re.sub(r'[^a-z0-9]+', '-', profile.name.lower()).strip('-') or "profile"
+    if profile.id is not None:
+        slug = f"{slug}-{profile.id}"
+    return f"{episode}-{slug}.mp3"
+
+
+def _target_filter() -> str:
+    return f"loudnorm=I={LOUDNESS_TARGET['I']}:LRA={LOUDNESS_TARGET['LRA']}:TP={LOUDNESS_TARGET['TP']}"
+
+
+def _read_cache(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def measure_loudness(ffmpeg: str, source_path: str) -> Dict[str, str]:
+    """
+    loudnorm analysis of `source_path`'s first audio stream, cached per file version.
+
+    Returns the measured_* values for the second (linear) pass.
+    """
+    stat = os.stat(source_path)
+    cache_path = os.path.join(os.path.dirname(source_path), LOUDNESS_CACHE_NAME)
+    cache = _read_cache(cache_path)
+    key = os.path.basename(source_path)
+    signature = [stat.st_size, stat.st_mtime_ns, LOUDNESS_TARGET]
+
+    entry = cache.get(key)
+    if entry and entry.get("signature") == signature:
+        logger.info(f"Loudness measurement cached for {key}")
+        return entry["measurement"]
+
+    cmd = [
+        ffmpeg, "-hide_banner", "-nostats",
+        "-i", source_path,
+        "-map", "0:a:0", "-vn",
+        "-af", f"{_target_filter()}:print_format=json",
+        "-f", "null", "-"
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, cmd, stderr=result.stderr[-500:])
+
+    # loudnorm prints its JSON block last on stderr
+    match = re.search(r'\{[^{}]*"input_i"[^{}]*\}', result.stderr)
+    if not match:
+        raise ValueError(f"Could not parse loudnorm measurement for {key}")
+    data = json.loads(match.group(0))
+    measurement = {name: str(data[name]) for name in _MEASUREMENT_KEYS}
+    logger.info(f"Measured loudness of {key}: {measurement['input_i']} LUFS, "
+                f"{measurement['input_tp']} dBTP, LRA {measurement['input_lra']}")
+
+    cache[key] = {"signature": signature, "measurement": measurement}
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not write loudness cache {cache_path}: {e}")
+    return measurement
+
+
+def build_export_command(
+    ffmpeg: str,
+    source_path: str,
+    outputs: List[tuple],
+    measurement: Optional[Dict[str, str]] = None
+) -> List[str]:
+    """
+    One ffmpeg command writing every (Mp3Profile, output_path) in `outputs`.
+
+    The audio is decoded once; profiles with normalize_audio take the branch
+    through the measured loudnorm, the rest take the untouched branch.
+    """
+    normalized = [i for i, (profile, _) in enumerate(outputs) if profile.normalize_audio]
+    plain = [i for i, (profile, _) in enumerate(outputs) if not profile.normalize_audio]
+    if normalized and measurement is None:
+        raise ValueError("Loudness measurement required for normalized profiles")
+
+    def split(label: str, indices: List[int], prefix: str) -> str:
+        if len(indices) == 1:
+            return f"[{label}]anull[{prefix}{indices[0]}]"
+        return f"[{label}]asplit={len(indices)}" + "".join(f"[{prefix}{i}]" for i in indices)
+
+    graph = []
+    source_label = "0:a:0"
+    if normalized and plain:
+        graph.append("[0:a:0]asplit=2[raw][tonorm]")
+        source_label, norm_label = "raw", "tonorm"
+    else:
+        norm_label = "0:a:0"
+
+    if normalized:
+        loudnorm = (
+            f"{_target_filter()}"
+            f":measured_I={measurement['input_i']}:measured_TP={measurement['input_tp']}"
+            f":measured_LRA={measurement['input_lra']}:measured_thresh={measurement['input_thresh']}"
+            f":offset={measurement['target_offset']}:linear=true"
+        )
+        graph.append(f"[{norm_label}]{loudnorm}[normed]")
+        graph.append(split("normed", normalized, "o"))
+    if plain:
+        graph.append(split(source_label, plain, "o"))
+
+    cmd = [ffmpeg, "-y", "-hide_banner", "-i", source_path, "-filter_complex", ";".join(graph)]
+    for i, (profile, output_path) in enumerate(outputs):
+        cmd += ["-map", f"[o{i}]", *profile.encoder_args(), "-f", "mp3", output_path]
+    return cmd
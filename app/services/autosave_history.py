@@ -409,6 +409,7 @@ def restore_segment_from_snapshot(
     Returns dict with restoration details or None on failure.
     """
     from models_v2 import RundownItem
+    from services.rundown_items import WITH_SCRIPT
 
     snapshot = read_segment_snapshot(episode_number, filename)
     if not snapshot:
@@ -418,12 +419,12 @@ def restore_segment_from_snapshot(
     if not item_id:
         return None
 
-    item = db.query(RundownItem).filter(RundownItem.id == int(item_id)).first()
+    item = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.id == int(item_id)).first()
     if not item:
         # Fallback: try asset_id
         asset_id = snapshot["frontmatter"].get("asset_id")
         if asset_id:
-            item = db.query(RundownItem).filter(RundownItem.asset_id == asset_id).first()
+            item = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.asset_id == asset_id).first()
 
     if not item:
         return None
@@ -464,6 +465,7 @@ def restore_episode_from_snapshot(
     Returns dict with restoration details or None on failure.
     """
     from models_v2 import RundownItem
+    from services.rundown_items import WITH_SCRIPT
 
     snapshot = read_episode_snapshot(episode_number, filename)
     if not snapshot or not snapshot["items"]:
@@ -478,14 +480,14 @@ def restore_episode_from_snapshot(
 
         if item_id:
             try:
-                item = db.query(RundownItem).filter(RundownItem.id == int(item_id)).first()
+                item = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.id == int(item_id)).first()
             except (ValueError, TypeError):
                 pass
 
         if not item:
             asset_id = snap_item.get("asset_id")
             if asset_id:
-                item = db.query(RundownItem).filter(RundownItem.asset_id == asset_id).first()
+                item = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.asset_id == asset_id).first()
 
         if not item:
             not_found.append(snap_item.get("title", "Unknown"))
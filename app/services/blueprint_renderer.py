@@ -16,8 +16,9 @@ from typing import Dict, Any, List, Optional
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
 from database import SessionLocal
-from models_v2 import Episode, Rundown, RundownItem, Season, Show, SOTProcessingJob
-from services.cue_extractor import CUE_BLOCK_RE
+from models_v2 import RundownItem
+from services.compiled_episode import compile_episode
+from services.cue_parser import Cue, parse_script
 
 logger = logging.getLogger(__name__)
 
@@ -157,35 +158,17 @@ class BlueprintRenderer:
     def _gather_context(self, episode_number: str, db) -> Optional[Dict[str, Any]]:
         """Gather all data needed for template rendering."""
 
-        # Find episode
-        episode = db.query(Episode).filter(
-            Episode.episode_number == int(episode_number)
-        ).first()
-
-        if not episode:
-            return None
-
-        # Get rundown
-        rundown = db.query(Rundown).filter(Rundown.episode_id == episode.id).first()
-        if not rundown:
-            return None
-
-        # Get rundown items
-        items = db.query(RundownItem).filter(
-            RundownItem.rundown_id == rundown.id
-        ).order_by(RundownItem.order_in_rundown).all()
-
-        if not items:
+        # Rundown, episode info and transcriptions are shared with the host script presets
+        try:
+            compiled = compile_episode(episode_number, db)
+        except LookupError:
             return None
 
-        # Build episode info
-        episode_info = self._build_episode_info(episode, db, items)
-
-        # Detect blocks
-        blocks = self._detect_blocks(items)
+        # Detect blocks (blueprints break on ads as well as breaks)
+        blocks = self._detect_blocks(compiled.items)
 
         # Process segments within blocks
-        transcription_cache = self._build_transcription_cache(items, db)
+        transcription_cache = compiled.transcription_cache
         for block in blocks:
             block['items'] = [
                 self._process_segment(item, transcription_cache)
@@ -193,57 +176,11 @@ class BlueprintRenderer:
             ]
 
         return {
-            'episode': episode_info,
+            'episode': compiled.episode_info,
             'blocks': blocks,
             'transcription_cache': transcription_cache
         }
 
-    def _build_episode_info(self, episode: Episode, db, items: List[RundownItem]) -> Dict[str, Any]:
-        """Build episode information dict."""
-        show_name = "DISAFFECTED"
-        if episode.season_id:
-            season = db.query(Season).filter(Season.id == episode.season_id).first()
-            if season and season.show_id:
-                show = db.query(Show).filter(Show.id == season.show_id).first()
-                if show:
-                    show_name = show.name.upper()
-
-        date_str = ""
-        if episode.air_date:
-            date_str = episode.air_date.strftime("%B %d, %Y")
-        elif episode.publish_date:
-            date_str = episode.publish_date.strftime("%B %d, %Y")
-
-        duration = episode.duration_formatted or self._calculate_runtime(items)
-
-        return {
-            "show_name": show_name,
-            "episode_number": str(episode.episode_number).zfill(4),
-            "title": episode.title or f"Episode {episode.episode_number}",
-            "date_str": date_str,
-            "guest_name": episode.guest_name or "",
-            "guest_bio": getattr(episode, 'guest_bio', "") or "",
-            "duration": duration,
-        }
-
-    def _calculate_runtime(self, items: List[RundownItem]) -> str:
-        """Calculate total runtime from rundown items."""
-        total_seconds = 0
-        for item in items:
-            dur = item.duration or '00:00:00'
-            parts = dur.replace('.', ':').split(':')
-            if len(parts) >= 3:
-                try:
-                    h, m, s = int(parts[0]), int(parts[1]), int(parts[2])
-                    total_seconds += h * 3600 + m * 60 + s
-                except ValueError:
-                    pass
-
-        if total_seconds == 0:
-            return ""
-
-        return f"{total_seconds // 3600:02d}:{(total_seconds % 3600) // 60:02d}:{total_seconds % 60:02d}"
-
     def _detect_blocks(self, items: List[RundownItem]) -> List[Dict[str, Any]]:
         """Detect content blocks based on BREAK items."""
         blocks = []
@@ -301,30 +238,18 @@ class BlueprintRenderer:
         elements = []
         last_speaker = None
 
-        # Pattern for cue blocks
-        cue_pattern = CUE_BLOCK_RE  # matches expanded + collapsed cues
-
-        last_end = 0
-        for match in cue_pattern.finditer(content):
-            # Text before cue
-            text_before = content[last_end:match.start()]
-            if text_before.strip():
-                paragraphs, last_speaker = self._parse_paragraphs(text_before, last_speaker)
-                elements.extend(paragraphs)
+        # Text runs and cue blocks (expanded or collapsed) in document order
+        for segment in parse_script(content).segments():
+            if isinstance(segment, str):
+                if segment.strip():
+                    paragraphs, last_speaker = self._parse_paragraphs(segment, last_speaker)
+                    elements.extend(paragraphs)
+                continue
 
-            # Cue block
-            cue = self._parse_cue(match.group(1), transcription_cache)
+            cue = self._parse_cue(segment, transcription_cache)
             if cue:
                 elements.append(cue)
 
-            last_end = match.end()
-
-        # Text after last cue
-        text_after = content[last_end:]
-        if text_after.strip():
-            paragraphs, _ = self._parse_paragraphs(text_after, last_speaker)
-            elements.extend(paragraphs)
-
         return elements
 
     def _parse_paragraphs(self, text: str, last_speaker: Optional[str]) -> tuple:
@@ -363,50 +288,32 @@ class BlueprintRenderer:
 
         return elements, current_speaker
 
-    def _parse_cue(self, cue_content: str, transcription_cache: Dict[str, str]) -> Optional[Dict[str, Any]]:
-        """Parse a cue block into a dict."""
-        type_match = re.search(r'\[Type:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-        if not type_match:
+    def _parse_cue(self, parsed: Cue, transcription_cache: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Template dict of a parsed cue block."""
+        cue_type = parsed.type
+        if not cue_type:
             return None
 
-        cue_type = type_match.group(1).strip().upper()
-
-        # Extract common fields
-        slug_match = re.search(r'\[Slug:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-        slug = slug_match.group(1).strip() if slug_match else 'cue'
-
         cue = {
             'type': 'cue',
             'cue_type': cue_type,
-            'slug': slug
+            'slug': parsed.slug or 'cue'
         }
 
         # Type-specific fields
         if cue_type == 'FSQ':
-            quote_match = re.search(r'\[Quote:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-            cue['quote'] = quote_match.group(1).strip().strip('"\'') if quote_match else ''
-
-            attr_match = re.search(r'\[Attribution:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-            cue['attribution'] = attr_match.group(1).strip() if attr_match else ''
-
-            media_match = re.search(r'\[Media\s*[Uu]rl:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-            cue['media_url'] = media_match.group(1).strip() if media_match else ''
+            cue['quote'] = parsed.get('Quote').strip('"\'')
+            cue['attribution'] = parsed.attribution
+            cue['media_url'] = parsed.media_url
 
         elif cue_type == 'SOT':
-            dur_match = re.search(r'\[Duration:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-            cue['duration'] = dur_match.group(1).strip() if dur_match else ''
-
-            thumb_match = re.search(r'\[Thumbnail\s*[Uu]rl:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-            cue['thumbnail_url'] = thumb_match.group(1).strip() if thumb_match else ''
+            cue['duration'] = parsed.duration
+            cue['thumbnail_url'] = parsed.thumbnail_url
 
             # Get transcription
-            trans_match = re.search(r'\[Transcription:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-            transcription = trans_match.group(1).strip() if trans_match else ''
-
-            if not transcription:
-                asset_match = re.search(r'\[Asset\s*Id:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-                if asset_match:
-                    transcription = transcription_cache.get(asset_match.group(1).strip(), '')
+            transcription = parsed.get('Transcription')
+            if not transcription and parsed.asset_id:
+                transcription = transcription_cache.get(parsed.asset_id, '')
 
             cue['transcription'] = transcription
 
@@ -418,41 +325,11 @@ class BlueprintRenderer:
                 cue['outcue'] = ''
 
         elif cue_type in ('IMG', 'GFX'):
-            media_match = re.search(r'\[Media\s*[Uu]rl:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-            cue['media_url'] = media_match.group(1).strip() if media_match else ''
-
-            desc_match = re.search(r'\[Description:\s*([^\]]+)\]', cue_content, re.IGNORECASE)
-            cue['description'] = desc_match.group(1).strip() if desc_match else ''
+            cue['media_url'] = parsed.media_url
+            cue['description'] = parsed.description
 
         return cue
 
-    def _build_transcription_cache(self, items: List[RundownItem], db) -> Dict[str, str]:
-        """Build cache of transcriptions from SOTProcessingJob records."""
-        cache = {}
-        asset_ids = set()
-
-        for item in items:
-            if not item.script_content:
-                continue
-            for cue in CUE_BLOCK_RE.findall(item.script_content):
-                if '[Type: SOT]' in cue:
-                    asset_match = re.search(r'\[Asset\s*Id:\s*([^\]]+)\]', cue, re.IGNORECASE)
-                    if asset_match:
-                        asset_ids.add(asset_match.group(1).strip())
-
-        if asset_ids:
-            try:
-                jobs = db.query(SOTProcessingJob).filter(
-                    SOTProcessingJob.asset_id.in_(asset_ids)
-                ).all()
-                for job in jobs:
-                    if job.transcription:
-                        cache[job.asset_id] = job.transcription
-            except Exception as e:
-                logger.warning(f"Failed to fetch transcriptions: {e}")
-
-        return cache
-
     def _collect_media(self, blocks: List[Dict], resources_path: Path, episode_number: str) -> Dict[str, str]:
         """Collect and copy media files, return URL mapping."""
         url_mapping = {}
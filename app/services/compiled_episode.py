@@ -0,0 +1,230 @@
+"""
+Compiled Episode - shared intermediate representation for script renderers.
+
+Every host script preset, the blueprint renderer, the iPad scroll view and the
+media list used to load the rundown, parse cues, resolve media and query SOT
+transcriptions on their own. compile_episode() does that once per content
+version and hands all of them the same CompiledEpisode:
+
+- a detached snapshot of the rundown items (safe to use after the session closes)
+- cover-page episode info and the host-script block structure
+- parsed cue references per item
+- resolved media sources and (lazily) their embedded data URIs
+- SOT transcriptions
+
+The content version is an md5 of the episode row and every rundown item row,
+computed in Postgres, so any edit (content, order, timing, deletion) yields a
+new IR while an unchanged episode costs two small queries. Transcriptions and
+still-missing media are refreshed on every hit since they change outside the
+rundown.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import text
+
+from models_v2 import Episode, Rundown, RundownItem
+from services.rundown_items import WITH_SCRIPT
+from services.cue_parser import Cue, parse_script
+
+logger = logging.getLogger(__name__)
+
+MAX_COMPILED_EPISODES = 16
+
+@dataclass(frozen=True)
+class ItemSnapshot:
+    """Detached copy of the RundownItem fields the renderers read."""
+    id: int
+    asset_id: str
+    item_type: str
+    title: str
+    slug: str
+    duration: Optional[str]
+    order_in_rundown: int
+    script_content: Optional[str]
+
+    @classmethod
+    def from_item(cls, item: RundownItem) -> "ItemSnapshot":
+        return cls(
+            id=item.id,
+            asset_id=item.asset_id,
+            item_type=item.item_type,
+            title=item.title,
+            slug=item.slug,
+            duration=item.duration,
+            order_in_rundown=item.order_in_rundown,
+            script_content=item.script_content,
+        )
+
+
+@dataclass(frozen=True)
+class CueRef:
+    """Fields of one cue block, as found in an item's script content."""
+    cue_type: str
+    slug: str = ''
+    media_url: str = ''
+    thumbnail_url: str = ''
+    asset_id: str = ''
+    duration: str = ''
+
+    @classmethod
+    def from_cue(cls, cue: Cue) -> "CueRef":
+        return cls(
+            cue_type=cue.type,
+            slug=cue.slug,
+            media_url=cue.media_url,
+            thumbnail_url=cue.thumbnail_url,
+            asset_id=cue.asset_id,
+            duration=cue.duration,
+        )
+
+
+@dataclass
+class CompiledEpisode:
+    """Everything the script renderers need for one content version of an episode."""
+    episode_number: str  # zero-padded
+    version: str
+    episode_info: Dict[str, Any]
+    items: List[ItemSnapshot]
+    blocks: List[Dict[str, Any]]
+    cues: Dict[int, List[CueRef]]  # item id -> cues in document order
+    media_sources: Dict[str, Optional[Path]]
+    sot_asset_ids: Set[str]
+    transcription_cache: Dict[str, str]
+    _url_mappings: Dict[tuple, Dict[str, str]] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def media_signature(self) -> tuple:
+        """(url, path, size, mtime) for every resolved media source."""
+        signature = []
+        for url, path in sorted(self.media_sources.items()):
+            try:
+                stat = path.stat() if path else None
+                signature.append((url, str(path), stat.st_size, stat.st_mtime_ns) if stat else (url, None))
+            except OSError:
+                signature.append((url, str(path), None))
+        return tuple(signature)
+
+    def url_mapping(self, resources_path: Path) -> Dict[str, str]:
+        """Embedded media (URL -> data URI), built once per media state."""
+        from services.host_script_generator import _collect_media_resources
+
+        key = (str(resources_path), self.media_signature())
+        with self._lock:
+            mapping = self._url_mappings.get(key)
+            if mapping is None:
+                mapping = _collect_media_resources(
+                    self.items, resources_path, self.episode_number, self.media_sources
+                )
+                self._url_mappings = {key: mapping}
+        return mapping
+
+
+_compiled: "OrderedDict[str, CompiledEpisode]" = OrderedDict()
+_compiled_lock = threading.Lock()
+
+
+def _content_version(db, episode_id: int, rundown_id: int) -> str:
+    """md5 over the episode row and all rundown item rows (server-side)."""
+    row = db.execute(text("""
+        SELECT
+            md5(e::text),
+            (SELECT md5(coalesce(string_agg(ri::text, ',' ORDER BY ri.order_in_rundown, ri.id), ''))
+             FROM rundown_items ri
+             WHERE ri.rundown_id = :rundown_id)
+        FROM episodes e
+        WHERE e.id = :episode_id
+    """), {"episode_id": episode_id, "rundown_id": rundown_id}).fetchone()
+    return f"{row[0]}:{row[1]}"
+
+
+def _compile(episode: Episode, rundown: Rundown, version: str, db) -> CompiledEpisode:
+    from services import host_script_generator as generator
+
+    items = [
+        ItemSnapshot.from_item(item)
+        for item in db.query(RundownItem).options(WITH_SCRIPT).filter(
+            RundownItem.rundown_id == rundown.id
+        ).order_by(RundownItem.order_in_rundown).all()
+    ]
+    ep_num_padded = str(episode.episode_number).zfill(4)
+
+    cues = {
+        item.id: [CueRef.from_cue(cue) for cue in parse_script(item.script_content).cues]
+        for item in items
+    }
+    sot_asset_ids = generator._sot_asset_ids(items)
+
+    return CompiledEpisode(
+        episode_number=ep_num_padded,
+        version=version,
+        episode_info=generator._get_episode_info(episode, db, items),
+        items=items,
+        blocks=generator._detect_blocks(items),
+        cues=cues,
+        media_sources=generator._resolve_media_sources(items, ep_num_padded),
+        sot_asset_ids=sot_asset_ids,
+        transcription_cache=generator._fetch_transcriptions(sot_asset_ids, db),
+    )
+
+
+def _refresh(compiled: CompiledEpisode, db):
+    """Pick up state that lives outside the rundown rows."""
+    from services import host_script_generator as generator
+
+    compiled.transcription_cache = generator._fetch_transcriptions(compiled.sot_asset_ids, db)
+
+    # Assets uploaded since compilation resolve now without a rundown edit
+    missing = [url for url, path in compiled.media_sources.items() if path is None]
+    if missing:
+        resolved = generator._resolve_media_sources(compiled.items, compiled.episode_number)
+        compiled.media_sources = {**compiled.media_sources, **{url: resolved.get(url) for url in missing}}
+
+
+def compile_episode(episode_number: str, db, use_cache: bool = True) -> CompiledEpisode:
+    """
+    Return the CompiledEpisode for an episode's current content.
+
+    Raises LookupError (with a user-facing message) when the episode, its
+    rundown or its rundown items don't exist.
+    """
+    episode = db.query(Episode).filter(Episode.episode_number == int(episode_number)).first()
+    if not episode:
+        raise LookupError(f"Episode {episode_number} not found")
+
+    rundown = db.query(Rundown).filter(Rundown.episode_id == episode.id).first()
+    if not rundown:
+        raise LookupError(f"No rundown found for episode {episode_number}")
+
+    version = _content_version(db, episode.id, rundown.id)
+    cache_key = str(episode.episode_number).zfill(4)
+
+    if use_cache:
+        with _compiled_lock:
+            compiled = _compiled.get(cache_key)
+            if compiled is not None and compiled.version == version:
+                _compiled.move_to_end(cache_key)
+            else:
+                compiled = None
+        if compiled is not None:
+            _refresh(compiled, db)
+            logger.debug(f"Compiled episode {cache_key} unchanged (version {version[:8]})")
+            return compiled
+
+    compiled = _compile(episode, rundown, version, db)
+    if not compiled.items:
+        raise LookupError(f"No rundown items found for episode {episode_number}")
+
+    with _compiled_lock:
+        _compiled[cache_key] = compiled
+        _compiled.move_to_end(cache_key)
+        while len(_compiled) > MAX_COMPILED_EPISODES:
+            _compiled.popitem(last=False)
+
+    logger.info(f"Compiled episode {cache_key}: {len(compiled.items)} items, "
+                f"{len(compiled.blocks)} blocks, {len(compiled.media_sources)} media")
+    return compiled
@@ -40,53 +40,30 @@ offset_seconds, status) so consumers can pass the dict straight into
       ...
     ]
 
-Reconstruction (segments → markdown) stays in JS; this module only
-reads. If/when show-build owns full edit lifecycle on the server, mirror
+Parsing is services/cue_parser's (one grammar, memoized per script);
+this module shapes its cues for the API. Reconstruction (segments →
+markdown) stays in JS; this module only reads. If/when show-build owns full edit lifecycle on the server, mirror
 the rest then.
 
 See docs/SHOWTIME_INTEGRATION_ANALYSIS.md Gap A.
 """
 from __future__ import annotations
 
-import re
 from typing import Any, Iterator, NamedTuple
 
-# ---------------------------------------------------------------------------
-# Canonical cue-block markers + scanners (shared across the whole backend).
-#
-# The ProseMirror Script editor serializes a COLLAPSED cue with a different
-# Begin marker — `<!-- Begin Cue collapsed -->` — than an expanded one
-# (`<!-- Begin Cue -->`); see disaffected-ui/src/utils/prosemirror/markdown.js
-# (BEGIN / BEGIN_COLLAPSED / findBegin). The ` collapsed` suffix is the ONLY
-# difference; the End marker and the cue body are identical.
-#
-# CRITICAL: `<!-- Begin Cue collapsed -->` is NOT a prefix-superset of
-# `<!-- Begin Cue -->` (they diverge at "Cue " -> "collapsed" vs "-->"), so a
-# plain `str.find("<!-- Begin Cue -->")` or a regex of the plain marker will
-# NOT match a collapsed cue. Every backend cue scanner must use the helpers
-# below so collapsed cues are seen identically to expanded ones, and every
-# REWRITER must preserve the original marker (use CUE_BLOCK_RE_MARKER +
-# rebuild_cue) so a collapsed cue is never silently expanded.
-# ---------------------------------------------------------------------------
-
-CUE_BEGIN = "<!-- Begin Cue -->"
-CUE_BEGIN_COLLAPSED = "<!-- Begin Cue collapsed -->"
-CUE_END = "<!-- End Cue -->"
-
-# READ/SCAN matcher — group(1) is the cue body, identical for both markers
-# (the " collapsed" suffix is consumed by the non-capturing group).
-CUE_BLOCK_RE = re.compile(
-    r"<!-- Begin Cue(?: collapsed)? -->(.*?)<!-- End Cue -->",
-    re.DOTALL,
+# The markers and scanners live with the grammar in services.cue_parser;
+# they are re-exported here for the many call sites that import them from
+# this module.
+from services.cue_parser import (  # noqa: F401
+    CUE_BEGIN,
+    CUE_BEGIN_COLLAPSED,
+    CUE_BEGIN_RE,
+    CUE_BLOCK_RE,
+    CUE_BLOCK_RE_MARKER,
+    CUE_END,
+    parse_cue_body,
+    parse_script,
 )
-# REWRITE matcher — group(1) is the marker suffix ('' or ' collapsed') to
-# restore on reconstruction; group(2) is the cue body.
-CUE_BLOCK_RE_MARKER = re.compile(
-    r"<!-- Begin Cue( collapsed)? -->(.*?)<!-- End Cue -->",
-    re.DOTALL,
-)
-# Matches just a Begin marker (either variant) — for imperative line scans.
-CUE_BEGIN_RE = re.compile(r"<!-- Begin Cue(?: collapsed)? -->")
 
 
 class CueBlock(NamedTuple):
@@ -103,17 +80,15 @@ class CueBlock(NamedTuple):
 
 def iter_cue_blocks(content: str | None) -> Iterator[CueBlock]:
     """Yield every cue block (both expanded and collapsed) in declared
-    order. Use this instead of re-deriving a regex at each call site."""
-    if not content:
-        return
-    for m in CUE_BLOCK_RE_MARKER.finditer(content):
-        suffix = m.group(1) or ""
+    order. Use this (or cue_parser.parse_script) instead of re-deriving a
+    regex at each call site."""
+    for cue in parse_script(content).cues:
         yield CueBlock(
-            start=m.start(),
-            end=m.end(),
-            marker_suffix=suffix,
-            collapsed=bool(suffix),
-            body=m.group(2),
+            start=cue.start,
+            end=cue.end,
+            marker_suffix=cue.marker_suffix,
+            collapsed=cue.collapsed,
+            body=cue.body,
         )
 
 
@@ -124,56 +99,11 @@ def rebuild_cue(marker_suffix: str, body: str) -> str:
     return f"<!-- Begin Cue{marker_suffix or ''} -->{body}<!-- End Cue -->"
 
 
-# Legacy module-private aliases kept for the imperative scanner below.
-_BEGIN = CUE_BEGIN
-_END = CUE_END
-
-# Field regex mirrors the JS one in cueParser.js:
-#   /\[([^:\n\[\]]+):\s*([\s\S]*?)\](?=\s*(?:\n\s*\[|\n\s*<!--|$))/g
-# Field name: no ':', no newline, no brackets. Value may span multiple
-# lines; terminator is `]` followed by another `[`, an HTML comment
-# (next cue marker), or end of content.
-_FIELD_RE = re.compile(
-    r"\[([^:\n\[\]]+):\s*([\s\S]*?)\](?=\s*(?:\n\s*\[|\n\s*<!--|$))",
-)
-_IMG_RE = re.compile(r'<img[^>]+src="([^"]+)"[^>]*>')
-
-
-def _to_camel(field_name: str) -> str:
-    # Mirror cueParser.js toCamelCase: PascalCase → spaces, then split
-    # on space/_/- and capitalize each piece after the first.
-    spaced = re.sub(r"([a-z])([A-Z])", r"\1 \2", field_name)
-    parts = re.split(r"[\s_\-]+", spaced)
-    parts = [p for p in parts if p]
-    if not parts:
-        return ""
-    out = [parts[0].lower()]
-    for p in parts[1:]:
-        out.append(p[0].upper() + p[1:].lower())
-    return "".join(out)
-
-
 def _parse_cue_block(cue_content: str) -> dict[str, Any] | None:
     """Parse one cue block body (text between Begin/End markers)."""
     if not cue_content:
         return None
-    fields: dict[str, Any] = {}
-    for m in _FIELD_RE.finditer(cue_content):
-        name = m.group(1).strip()
-        value = m.group(2).strip()
-        # Strip surrounding quotes on Quote field (matches JS behavior).
-        if name.lower() == "quote" and value:
-            if value[:1] in ('"', "'"):
-                value = value[1:]
-            if value[-1:] in ('"', "'"):
-                value = value[:-1]
-        fields[_to_camel(name)] = value
-
-    img_match = _IMG_RE.search(cue_content)
-    if img_match:
-        fields["imageTag"] = img_match.group(0)
-        fields["imageSrc"] = img_match.group(1)
-
+    fields = parse_cue_body(cue_content).field_map()
     if not fields.get("type"):
         return None
     return fields
@@ -188,14 +118,11 @@ def extract_cues(script_content: str | None) -> list[dict[str, Any]]:
     cues: list[dict[str, Any]] = []
     order = 0
 
-    # Collapsed and expanded cues are scanned identically via iter_cue_blocks
-    # (the non-greedy body capture stops at the first End marker, so a missing
-    # End / interleaved Begin can't swallow the next cue — same safety the old
-    # imperative malformed-skip provided).
-    for block in iter_cue_blocks(script_content):
-        cue_body = block.body
-        parsed = _parse_cue_block(cue_body)
-        if parsed is not None:
+    # Collapsed and expanded cues are parsed identically, and a Begin
+    # without an End can't swallow the next cue (see cue_parser._parse).
+    for cue in parse_script(script_content).cues:
+        parsed = cue.field_map()
+        if parsed.get("type"):
             cue_type = parsed.get("type")
             slug = parsed.get("slug")
             description = parsed.get("description")
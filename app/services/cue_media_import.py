@@ -195,9 +195,6 @@ def start_vo_processing_from_path(
     # Signature: (temp_job_id, episode, slug, trim_start, trim_end, asset_id)
     task = process_vo_video.apply_async(
         args=[temp_job_id, episode, slug, trim_start or "00:00:00", trim_end or "00:00:00", asset_id],
-        queue='media',
-        routing_key='media',
-        exchange='media',
     )
 
     job.celery_task_id = task.id
@@ -0,0 +1,410 @@
+"""
+Cue Parser - the one cue grammar of the backend.
+
+Scripts (rundown_items.script_content) carry cue blocks between paragraphs:
+
+    <!-- Begin Cue -->                  (or <!-- Begin Cue collapsed -->)
+    [Type: SOT]
+    [Slug: mayor-presser]
+    [Asset Id: CUE...]
+    <!-- End Cue -->
+
+parse_script() walks a script front to back once and returns a ParsedScript:
+the cues in document order, each a Cue carrying the absolute offsets of the
+block, its body and every [Field: value] in it, plus the text between them.
+Results are immutable and memoized by content hash (PARSE_CACHE_SIZE
+entries), so the rundown API, the timing hook, the script renderers and the
+media tasks parse a script once between edits instead of once each.
+
+Field names match loosely: cue.get("Asset Id") finds [AssetID: ...],
+[Asset Id: ...] and [asset_id: ...], because the editor, the import paths and
+hand-edited scripts have never agreed on a spelling. get() returns the first
+occurrence; field_map() (the camelCase shape of the JS cueParser and
+cue_extractor.extract_cues) keeps the last, as the JS does.
+
+Rewriters splice by offset (ParsedScript.with_fields) so a collapsed cue stays
+collapsed and nothing outside the edited fields moves.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+# ---------------------------------------------------------------------------
+# Canonical cue-block markers + scanners (shared across the whole backend;
+# re-exported by services.cue_extractor).
+#
+# The ProseMirror Script editor serializes a COLLAPSED cue with a different
+# Begin marker — `<!-- Begin Cue collapsed -->` — than an expanded one
+# (`<!-- Begin Cue -->`); see disaffected-ui/src/utils/prosemirror/markdown.js
+# (BEGIN / BEGIN_COLLAPSED / findBegin). The ` collapsed` suffix is the ONLY
+# difference; the End marker and the cue body are identical.
+#
+# CRITICAL: `<!-- Begin Cue collapsed -->` is NOT a prefix-superset of
+# `<!-- Begin Cue -->` (they diverge at "Cue " -> "collapsed" vs "-->"), so a
+# plain `str.find("<!-- Begin Cue -->")` or a regex of the plain marker will
+# NOT match a collapsed cue. Scan with parse_script() (or the regexes below)
+# so collapsed cues are seen identically to expanded ones, and make every
+# REWRITER preserve the original marker (ParsedScript.with_fields, or
+# CUE_BLOCK_RE_MARKER + rebuild_cue) so a collapsed cue is never silently
+# expanded.
+# ---------------------------------------------------------------------------
+
+CUE_BEGIN = "<!-- Begin Cue -->"
+CUE_BEGIN_COLLAPSED = "<!-- Begin Cue collapsed -->"
+CUE_END = "<!-- End Cue -->"
+
+# READ/SCAN matcher — group(1) is the cue body, identical for both markers
+# (the " collapsed" suffix is consumed by the non-capturing group).
+CUE_BLOCK_RE = re.compile(
+    r"<!-- Begin Cue(?: collapsed)? -->(.*?)<!-- End Cue -->",
+    re.DOTALL,
+)
+# REWRITE matcher — group(1) is the marker suffix ('' or ' collapsed') to
+# restore on reconstruction; group(2) is the cue body.
+CUE_BLOCK_RE_MARKER = re.compile(
+    r"<!-- Begin Cue( collapsed)? -->(.*?)<!-- End Cue -->",
+    re.DOTALL,
+)
+# Matches just a Begin marker (either variant) — for imperative line scans.
+CUE_BEGIN_RE = re.compile(r"<!-- Begin Cue(?: collapsed)? -->")
+
+# Field regex mirrors the JS one in cueParser.js:
+#   /\[([^:\n\[\]]+):\s*([\s\S]*?)\](?=\s*(?:\n\s*\[|\n\s*<!--|$))/g
+# Field name: no ':', no newline, no brackets. Value may span multiple
+# lines and contain brackets; the terminator is `]` followed by another `[`
+# line, an HTML comment (next cue marker), or the end of the body.
+FIELD_RE = re.compile(
+    r"\[([^:\n\[\]]+):\s*([\s\S]*?)\](?=\s*(?:\n\s*\[|\n\s*<!--|$))",
+)
+IMG_RE = re.compile(r'<img[^>]+src="([^"]+)"[^>]*>')
+
+_BEGIN_PREFIX = "<!-- Begin Cue"
+_KEY_STRIP_RE = re.compile(r"[\s_\-]+")
+
+PARSE_CACHE_SIZE = 512
+
+
+@lru_cache(maxsize=512)
+def field_key(name: str) -> str:
+    """Spelling-insensitive form of a field name ('Asset Id', 'AssetID', 'asset_id' -> 'assetid')."""
+    return _KEY_STRIP_RE.sub("", name).lower()
+
+
+@lru_cache(maxsize=512)
+def to_camel(field_name: str) -> str:
+    """camelCase key of a field name, as cueParser.js toCamelCase ('Media Url' -> 'mediaUrl')."""
+    # PascalCase → spaces, then split on space/_/- and capitalize each
+    # piece after the first.
+    spaced = re.sub(r"([a-z])([A-Z])", r"\1 \2", field_name)
+    parts = [p for p in re.split(r"[\s_\-]+", spaced) if p]
+    if not parts:
+        return ""
+    return parts[0].lower() + "".join(p[0].upper() + p[1:].lower() for p in parts[1:])
+
+
+def _strip_quotes(value: str) -> str:
+    """A Quote value without its surrounding quote marks (matches the JS)."""
+    if value[:1] in ('"', "'"):
+        value = value[1:]
+    if value[-1:] in ('"', "'"):
+        value = value[:-1]
+    return value
+
+
+class CueField(NamedTuple):
+    """One [Name: value] of a cue. `start`/`end` cover the brackets."""
+    name: str
+    value: str
+    start: int
+    end: int
+
+    @property
+    def key(self) -> str:
+        return field_key(self.name)
+
+
+class CueImage(NamedTuple):
+    """An <img> in a cue body (GFX/IMG cues pasted from the editor)."""
+    tag: str
+    src: str
+    start: int
+    end: int
+
+
+class Cue(NamedTuple):
+    """
+    One cue block. `start`/`end` cover the whole block (Begin marker through
+    End marker) and `body_start`/`body_end` the text between the markers;
+    a Cue from parse_cue_body() has offsets into that body instead.
+    """
+    start: int
+    end: int
+    body_start: int
+    body_end: int
+    collapsed: bool
+    body: str
+    fields: Tuple[CueField, ...]
+    images: Tuple[CueImage, ...] = ()
+
+    @property
+    def marker_suffix(self) -> str:
+        return " collapsed" if self.collapsed else ""
+
+    def field(self, name: str) -> Optional[CueField]:
+        key = field_key(name)
+        for f in self.fields:
+            if f.key == key:
+                return f
+        return None
+
+    def get(self, name: str, default: str = "") -> str:
+        """Value of the first `name` field (spelling-insensitive), else `default`."""
+        f = self.field(name)
+        return f.value if f is not None else default
+
+    def values(self, name: str) -> List[str]:
+        """Values of every `name` field, in order."""
+        key = field_key(name)
+        return [f.value for f in self.fields if f.key == key]
+
+    @property
+    def type(self) -> str:
+        return self.get("Type").upper()
+
+    @property
+    def slug(self) -> str:
+        return self.get("Slug")
+
+    @property
+    def asset_id(self) -> str:
+        return self.get("Asset Id")
+
+    @property
+    def duration(self) -> str:
+        return self.get("Duration")
+
+    @property
+    def media_url(self) -> str:
+        return self.get("Media Url")
+
+    @property
+    def thumbnail_url(self) -> str:
+        return self.get("Thumbnail Url")
+
+    @property
+    def quote(self) -> str:
+        return _strip_quotes(self.get("Quote"))
+
+    @property
+    def attribution(self) -> str:
+        return self.get("Attribution")
+
+    @property
+    def description(self) -> str:
+        return self.get("Description")
+
+    @property
+    def image_src(self) -> str:
+        return self.images[0].src if self.images else ""
+
+    def field_map(self) -> Dict[str, Any]:
+        """
+        camelCase field name -> value (the JS cueParser shape): later
+        duplicates win, Quote loses its surrounding quotes, and the first
+        <img> adds imageTag/imageSrc. A new dict; callers may mutate it.
+        """
+        fields: Dict[str, Any] = {}
+        for f in self.fields:
+            fields[to_camel(f.name)] = _strip_quotes(f.value) if f.key == "quote" and f.value else f.value
+        if self.images:
+            fields["imageTag"] = self.images[0].tag
+            fields["imageSrc"] = self.images[0].src
+        return fields
+
+
+def _scan_body(content: str, body_start: int, body_end: int) -> Tuple[Tuple[CueField, ...], Tuple[CueImage, ...]]:
+    fields = tuple(
+        CueField(m.group(1).strip(), m.group(2).strip(), m.start(), m.end())
+        for m in FIELD_RE.finditer(content, body_start, body_end)
+    )
+    images = ()
+    if content.find("<img", body_start, body_end) != -1:
+        images = tuple(
+            CueImage(m.group(0), m.group(1), m.start(), m.end())
+            for m in IMG_RE.finditer(content, body_start, body_end)
+        )
+    return fields, images
+
+
+@dataclass(frozen=True)
+class ParsedScript:
+    """A script's cues in document order; text is everything outside them."""
+    content: str
+    cues: Tuple[Cue, ...]
+
+    def segments(self) -> Iterator[Union[str, Cue]]:
+        """Text runs and cues in document order (empty text runs are skipped)."""
+        last_end = 0
+        for cue in self.cues:
+            if cue.start > last_end:
+                yield self.content[last_end:cue.start]
+            yield cue
+            last_end = cue.end
+        if last_end < len(self.content):
+            yield self.content[last_end:]
+
+    def text(self, separator: str = "\n") -> str:
+        """The script with every cue block replaced by `separator`."""
+        if not self.cues:
+            return self.content
+        pieces = []
+        last_end = 0
+        for cue in self.cues:
+            pieces.append(self.content[last_end:cue.start])
+            last_end = cue.end
+        pieces.append(self.content[last_end:])
+        return separator.join(pieces)
+
+    def of_type(self, cue_type: str) -> List[Cue]:
+        cue_type = cue_type.upper()
+        return [cue for cue in self.cues if cue.type == cue_type]
+
+    def find(self, cue_type: Optional[str] = None, **fields: str) -> Optional[Cue]:
+        """
+        First cue of `cue_type` whose fields match (values compared
+        case-insensitively; keyword names are field names,
+        e.g. find("SOT", asset_id="CUE123")).
+        """
+        wanted = [(name, value.strip().lower()) for name, value in fields.items()]
+        for cue in self.cues:
+            if cue_type and cue.type != cue_type.upper():
+                continue
+            if all(cue.get(name).lower() == value for name, value in wanted):
+                return cue
+        return None
+
+    def with_fields(self, cue: Cue, updates: Mapping[str, Any]) -> str:
+        """
+        The content with `cue`'s fields set: every existing occurrence of an
+        updated field is rewritten as [name: value], missing ones are added
+        before the End marker. The markers and everything else are kept.
+        """
+        return self.edit_fields([(cue, updates)])
+
+    def edit_fields(self, edits: Iterable[Tuple[Cue, Mapping[str, Any]]]) -> str:
+        """with_fields() for several cues of this script in one splice."""
+        splices: List[Tuple[int, int, str]] = []
+        for cue, updates in edits:
+            added = []
+            for name, value in updates.items():
+                key = field_key(name)
+                matches = [f for f in cue.fields if f.key == key]
+                for f in matches:
+                    splices.append((f.start, f.end, f"[{name}: {value}]"))
+                if not matches:
+                    added.append(f"[{name}: {value}]\n")
+            if added:
+                splices.append((cue.body_end, cue.body_end, "".join(added)))
+        splices.sort(key=lambda splice: splice[0])
+
+        pieces = []
+        last = 0
+        for start, end, replacement in splices:
+            pieces.append(self.content[last:start])
+            pieces.append(replacement)
+            last = end
+        pieces.append(self.content[last:])
+        return "".join(pieces)
+
+
+def _parse(content: str) -> ParsedScript:
+    cues = []
+    pos = 0
+    while True:
+        m = CUE_BLOCK_RE_MARKER.search(content, pos)
+        if m is None:
+            break
+        body_start, body_end = m.start(2), m.end(2)
+        # A Begin without an End must not swallow the next cue: restart the
+        # block at the last Begin inside the body (the first one is text).
+        if content.find(_BEGIN_PREFIX, body_start, body_end) != -1:
+            inner = None
+            for inner in CUE_BEGIN_RE.finditer(content, body_start, body_end):
+                pass
+            if inner is not None:
+                m = CUE_BLOCK_RE_MARKER.match(content, inner.start())
+                body_start, body_end = m.start(2), m.end(2)
+        fields, images = _scan_body(content, body_start, body_end)
+        cues.append(Cue(
+            start=m.start(),
+            end=m.end(),
+            body_start=body_start,
+            body_end=body_end,
+            collapsed=bool(m.group(1)),
+            body=m.group(2),
+            fields=fields,
+            images=images,
+        ))
+        pos = m.end()
+    return ParsedScript(content, tuple(cues))
+
+
+def _parse_body(body: str) -> Cue:
+    fields, images = _scan_body(body, 0, len(body))
+    return Cue(start=0, end=len(body), body_start=0, body_end=len(body),
+               collapsed=False, body=body, fields=fields, images=images)
+
+
+_EMPTY = ParsedScript("", ())
+_cache: "OrderedDict[bytes, Union[ParsedScript, Cue]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _memoized(kind: bytes, text: str, parse):
+    key = kind + hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return cached
+        _cache_stats["misses"] += 1
+    parsed = parse(text)
+    with _cache_lock:
+        _cache[key] = parsed
+        while len(_cache) > PARSE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return parsed
+
+
+def parse_script(content: Optional[str]) -> ParsedScript:
+    """Cues of a script (memoized by content hash)."""
+    if not content or not isinstance(content, str):
+        return _EMPTY
+    return _memoized(b"s", content, _parse)
+
+
+def parse_cue_body(body: Optional[str]) -> Cue:
+    """
+    Fields of a lone cue body (the text between the markers), for callers
+    handed a body rather than a script. Offsets are into `body`.
+    """
+    return _memoized(b"b", body or "", _parse_body)
+
+
+def parse_cache_info() -> Dict[str, int]:
+    with _cache_lock:
+        return dict(_cache_stats, size=len(_cache), max_size=PARSE_CACHE_SIZE)
+
+
+def clear_parse_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+        _cache_stats.update(hits=0, misses=0)
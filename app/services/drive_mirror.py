@@ -0,0 +1,472 @@
+"""
+Drive Mirror - local metadata copy of Google Drive folder trees.
+
+Consolidation compares used to walk an episode's Drive folder with one
+sequential files().list call per folder (first page only), twice per compare.
+The mirror instead:
+
+- crawls a root breadth-first, one level at a time; each level's folders are
+  listed in batches ('a' in parents or 'b' in parents ...) and the batches are
+  fetched concurrently, following nextPageToken with 1000-item pages
+- records a Drive changes() start token before the first crawl and afterwards
+  applies only the changes since that token (adds, renames, moves, trashes)
+- answers tree / path-map queries from a local SQLite file
+
+Drive access goes through the small DriveApi interface (one page of children,
+the start token, one page of changes). GoogleDriveApi is the real
+implementation; an in-memory fake with the same three methods is enough to
+exercise crawling and change application offline.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# Override with DRIVE_MIRROR_DB; default lives next to the other app caches.
+_DEFAULT_DB_PATH = (
+    "/app/cache/drive_mirror.sqlite3" if Path('/app').exists()
+    else "/tmp/show-build/drive_mirror.sqlite3"
+)
+
+CRAWL_WORKERS = int(os.getenv("DRIVE_MIRROR_WORKERS", "8"))
+# Parent ids per files().list query; keeps the q string well under Drive's limit
+PARENTS_PER_QUERY = 20
+PAGE_SIZE = 1000
+# Changes are pulled at most this often per process; compares in between read the mirror as-is
+SYNC_INTERVAL = float(os.getenv("DRIVE_MIRROR_SYNC_INTERVAL", "30"))
+
+_FILE_FIELDS = "id, name, mimeType, size, modifiedTime, md5Checksum, parents, trashed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS drive_items (
+    id TEXT PRIMARY KEY,
+    parent_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_folder INTEGER NOT NULL DEFAULT 0,
+    mime_type TEXT,
+    size INTEGER NOT NULL DEFAULT 0,
+    modified_time TEXT,
+    md5 TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_drive_items_parent ON drive_items (parent_id, name);
+CREATE TABLE IF NOT EXISTS drive_mirror_roots (
+    root_id TEXT PRIMARY KEY,
+    crawled_at REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS drive_mirror_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_SUBTREE_SQL = """
+WITH RECURSIVE subtree(id) AS (
+    SELECT id FROM drive_items WHERE parent_id = ?
+    UNION ALL
+    SELECT d.id FROM drive_items d JOIN subtree s ON d.parent_id = s.id
+)
+"""
+
+
+class DriveApi:
+    """The Drive calls the mirror needs; subclass for the real API or a fake."""
+
+    def list_children(
+        self, parent_ids: List[str], page_token: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """One page of non-trashed children of any of `parent_ids` -> (files, next_page_token)."""
+        raise NotImplementedError
+
+    def start_page_token(self) -> str:
+        raise NotImplementedError
+
+    def list_changes(self, page_token: str) -> Dict[str, Any]:
+        """One page of changes: {'changes': [...], 'nextPageToken' | 'newStartPageToken': ...}."""
+        raise NotImplementedError
+
+
+class GoogleDriveApi(DriveApi):
+    """DriveApi over a GoogleDriveService's credentials.
+
+    googleapiclient service objects share one httplib2 connection and are not
+    thread-safe, so each crawl thread builds its own.
+    """
+
+    def __init__(self, drive_service):
+        self.credentials = drive_service.credentials
+        self._local = threading.local()
+
+    def _service(self):
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            from googleapiclient.discovery import build
+            service = build('drive', 'v3', credentials=self.credentials, cache_discovery=False)
+            self._local.service = service
+        return service
+
+    def list_children(self, parent_ids, page_token=None):
+        parents = " or ".join(f"'{parent_id}' in parents" for parent_id in parent_ids)
+        response = self._service().files().list(
+            q=f"({parents}) and trashed = false",
+            pageSize=PAGE_SIZE,
+            pageToken=page_token,
+            fields=f"nextPageToken, files({_FILE_FIELDS})",
+            includeItemsFromAllDrives=True,
+            supportsAllDrives=True,
+            corpora='allDrives'
+        ).execute()
+        return response.get('files', []), response.get('nextPageToken')
+
+    def start_page_token(self):
+        return self._service().changes().getStartPageToken(supportsAllDrives=True).execute()['startPageToken']
+
+    def list_changes(self, page_token):
+        return self._service().changes().list(
+            pageToken=page_token,
+            pageSize=PAGE_SIZE,
+            fields=f"nextPageToken, newStartPageToken, changes(fileId, removed, file({_FILE_FIELDS}))",
+            includeItemsFromAllDrives=True,
+            supportsAllDrives=True,
+            includeRemoved=True
+        ).execute()
+
+
+def _item_row(item: Dict[str, Any], parent_id: str) -> tuple:
+    return (
+        item['id'],
+        parent_id,
+        item.get('name', ''),
+        1 if item.get('mimeType') == FOLDER_MIME_TYPE else 0,
+        item.get('mimeType'),
+        int(item.get('size') or 0),
+        item.get('modifiedTime'),
+        item.get('md5Checksum'),
+    )
+
+
+class DriveMirror:
+    """SQLite mirror of the Drive folder trees under one or more roots."""
+
+    def __init__(self, api: Optional[DriveApi] = None, db_path: Optional[str] = None):
+        self.api = api
+        self.db_path = Path(db_path or os.getenv("DRIVE_MIRROR_DB", _DEFAULT_DB_PATH))
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._initialized = False
+        self._last_sync = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._initialized = True
+        return conn
+
+    # ------------------------------------------------------------------
+    # Crawling
+    # ------------------------------------------------------------------
+
+    def _list_all(self, parent_ids: List[str]) -> List[Dict[str, Any]]:
+        files, token = self.api.list_children(parent_ids)
+        while token:
+            page, token = self.api.list_children(parent_ids, token)
+            files.extend(page)
+        return files
+
+    def _crawl_levels(self, folder_ids: Iterable[str]) -> List[tuple]:
+        """Rows for everything below `folder_ids`, fetched breadth-first."""
+        rows: List[tuple] = []
+        frontier = list(dict.fromkeys(folder_ids))
+        seen = set(frontier)
+        with ThreadPoolExecutor(max_workers=CRAWL_WORKERS) as pool:
+            while frontier:
+                batches = [frontier[i:i + PARENTS_PER_QUERY] for i in range(0, len(frontier), PARENTS_PER_QUERY)]
+                frontier = []
+                for batch, files in zip(batches, pool.map(self._list_all, batches)):
+                    wanted = set(batch)
+                    for item in files:
+                        # A shortcut-style multi-parent file can match more than one batch member
+                        parent_id = next((p for p in item.get('parents') or [] if p in wanted), None)
+                        if parent_id is None or item['id'] in seen:
+                            continue
+                        seen.add(item['id'])
+                        rows.append(_item_row(item, parent_id))
+                        if item.get('mimeType') == FOLDER_MIME_TYPE:
+                            frontier.append(item['id'])
+        return rows
+
+    def crawl(self, root_id: str) -> int:
+        """Full breadth-first crawl of `root_id`, replacing its mirrored subtree."""
+        started = time.time()
+        # Taken before listing so nothing that changes mid-crawl is missed;
+        # replaying a change is harmless since changes carry current metadata.
+        token = self.api.start_page_token()
+        rows = self._crawl_levels([root_id])
+
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(f"{_SUBTREE_SQL} DELETE FROM drive_items WHERE id IN (SELECT id FROM subtree)", (root_id,))
+                conn.executemany("INSERT OR REPLACE INTO drive_items VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.execute(
+                    "INSERT OR REPLACE INTO drive_mirror_roots (root_id, crawled_at) VALUES (?, ?)",
+                    (root_id, time.time())
+                )
+                # Keep an older token: replaying from it also covers the other roots
+                conn.execute(
+                    "INSERT OR IGNORE INTO drive_mirror_state (key, value) VALUES ('page_token', ?)", (token,)
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+        logger.info(f"Drive mirror crawled {root_id}: {len(rows)} items in {time.time() - started:.1f}s")
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Incremental sync
+    # ------------------------------------------------------------------
+
+    def _state(self, conn: sqlite3.Connection, key: str) -> Optional[str]:
+        row = conn.execute("SELECT value FROM drive_mirror_state WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _roots(self, conn: sqlite3.Connection) -> List[str]:
+        return [row["root_id"] for row in conn.execute("SELECT root_id FROM drive_mirror_roots")]
+
+    def _delete_subtree(self, conn: sqlite3.Connection, item_id: str):
+        conn.execute(f"{_SUBTREE_SQL} DELETE FROM drive_items WHERE id IN (SELECT id FROM subtree)", (item_id,))
+        conn.execute("DELETE FROM drive_items WHERE id = ?", (item_id,))
+
+    def apply_changes(self) -> int:
+        """Apply Drive changes since the stored token; returns how many touched the mirror."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                token = self._state(conn, 'page_token')
+            finally:
+                conn.close()
+        if not token:
+            return 0
+
+        changes: List[Dict[str, Any]] = []
+        while True:
+            response = self.api.list_changes(token)
+            changes.extend(response.get('changes', []))
+            if response.get('nextPageToken'):
+                token = response['nextPageToken']
+                continue
+            token = response.get('newStartPageToken') or token
+            break
+
+        applied = 0
+        new_folders: List[str] = []
+        with self._lock:
+            conn = self._connect()
+            try:
+                roots = set(self._roots(conn))
+                pending = []
+                for change in changes:
+                    item = change.get('file') or {}
+                    item_id = change.get('fileId') or item.get('id')
+                    if not item_id or item_id in roots:
+                        continue
+                    if change.get('removed') or item.get('trashed'):
+                        if conn.execute("SELECT 1 FROM drive_items WHERE id = ?", (item_id,)).fetchone():
+                            self._delete_subtree(conn, item_id)
+                            applied += 1
+                        continue
+                    pending.append(item)
+
+                # Changes are per file, not per event, so a child can arrive before
+                # the folder it was created in; resolve parents until nothing moves.
+                progress = True
+                while pending and progress:
+                    progress = False
+                    unresolved = []
+                    for item in pending:
+                        parent_id = next(
+                            (p for p in item.get('parents') or [] if p in roots or conn.execute(
+                                "SELECT 1 FROM drive_items WHERE id = ? AND is_folder = 1", (p,)
+                            ).fetchone()),
+                            None
+                        )
+                        if parent_id is None:
+                            unresolved.append(item)
+                            continue
+                        known = conn.execute("SELECT 1 FROM drive_items WHERE id = ?", (item['id'],)).fetchone()
+                        conn.execute("INSERT OR REPLACE INTO drive_items VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                     _item_row(item, parent_id))
+                        if not known and item.get('mimeType') == FOLDER_MIME_TYPE:
+                            new_folders.append(item['id'])
+                        applied += 1
+                        progress = True
+                    pending = unresolved
+
+                # Whatever is left now lives outside every mirrored root
+                for item in pending:
+                    if conn.execute("SELECT 1 FROM drive_items WHERE id = ?", (item['id'],)).fetchone():
+                        self._delete_subtree(conn, item['id'])
+                        applied += 1
+
+                conn.execute(
+                    "INSERT OR REPLACE INTO drive_mirror_state (key, value) VALUES ('page_token', ?)", (token,)
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+        if new_folders:
+            # A folder moved in from outside brings contents that produce no changes of their own
+            rows = self._crawl_levels(new_folders)
+            with self._lock:
+                conn = self._connect()
+                try:
+                    conn.executemany("INSERT OR REPLACE INTO drive_items VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                    conn.commit()
+                finally:
+                    conn.close()
+
+        if applied:
+            logger.info(f"Drive mirror applied {applied} of {len(changes)} changes")
+        return applied
+
+    def sync(self, root_id: str, max_age: float = SYNC_INTERVAL):
+        """Make sure `root_id` is mirrored and no more than `max_age` seconds behind Drive."""
+        with self._sync_lock:
+            with self._lock:
+                conn = self._connect()
+                try:
+                    crawled = root_id in self._roots(conn)
+                finally:
+                    conn.close()
+
+            if not crawled:
+                self.crawl(root_id)
+                return
+            if time.monotonic() - self._last_sync < max_age:
+                return
+            try:
+                self.apply_changes()
+            except Exception as e:
+                # Expired/invalid token: start over from a fresh crawl
+                logger.warning(f"Drive change sync failed ({e}); recrawling mirrored roots")
+                with self._lock:
+                    conn = self._connect()
+                    try:
+                        roots = self._roots(conn)
+                        conn.execute("DELETE FROM drive_mirror_state WHERE key = 'page_token'")
+                        conn.commit()
+                    finally:
+                        conn.close()
+                for root in roots:
+                    self.crawl(root)
+            self._last_sync = time.monotonic()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _subtree_rows(self, root_id: str) -> List[sqlite3.Row]:
+        with self._lock:
+            conn = self._connect()
+            try:
+                return conn.execute(
+                    f"{_SUBTREE_SQL} SELECT d.* FROM drive_items d JOIN subtree s ON d.id = s.id "
+                    "ORDER BY d.is_folder DESC, d.name COLLATE NOCASE",
+                    (root_id,)
+                ).fetchall()
+            finally:
+                conn.close()
+
+    def find_child(self, parent_id: str, name: str, folders_only: bool = False) -> Optional[Dict[str, Any]]:
+        """The child of `parent_id` called `name`, from the mirror."""
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT id, name, is_folder FROM drive_items WHERE parent_id = ? AND name = ?"
+                    + (" AND is_folder = 1" if folders_only else "") + " LIMIT 1",
+                    (parent_id, name)
+                ).fetchone()
+            finally:
+                conn.close()
+        return dict(row) if row else None
+
+    def tree(self, root_id: str) -> Tuple[List[Dict[str, Any]], int, int]:
+        """(nested nodes, total size, file count) below `root_id`, folders first then by name."""
+        children: Dict[str, List[sqlite3.Row]] = {}
+        for row in self._subtree_rows(root_id):
+            children.setdefault(row["parent_id"], []).append(row)
+
+        total_size = 0
+        file_count = 0
+
+        def _nodes(parent_id: str) -> List[Dict[str, Any]]:
+            nonlocal total_size, file_count
+            nodes = []
+            for row in children.get(parent_id, []):
+                node = {
+                    'title': row["name"],
+                    'id': row["id"],
+                    'type': 'folder' if row["is_folder"] else 'file'
+                }
+                if row["is_folder"]:
+                    node['children'] = _nodes(row["id"])
+                else:
+                    node['size'] = row["size"]
+                    total_size += row["size"]
+                    file_count += 1
+                nodes.append(node)
+            return nodes
+
+        return _nodes(root_id), total_size, file_count
+
+    def path_map(self, root_id: str) -> Dict[str, Dict[str, Any]]:
+        """Relative path -> {type, id, name} for everything below `root_id`."""
+        rows = self._subtree_rows(root_id)
+        names = {row["id"]: (row["parent_id"], row["name"]) for row in rows}
+
+        def _path(item_id: str) -> str:
+            parts = []
+            while item_id in names:
+                item_id, name = names[item_id]
+                parts.append(name)
+            return "/".join(reversed(parts))
+
+        return {
+            _path(row["id"]): {
+                'type': 'folder' if row["is_folder"] else 'file',
+                'id': row["id"],
+                'name': row["name"]
+            }
+            for row in rows
+        }
+
+
+_mirror: Optional[DriveMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_drive_mirror(api: Optional[DriveApi] = None) -> DriveMirror:
+    """Process-wide DriveMirror; `api` (re)binds the Drive client it syncs through."""
+    global _mirror
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = DriveMirror()
+        if api is not None:
+            _mirror.api = api
+        return _mirror
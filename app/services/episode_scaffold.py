@@ -1,21 +1,52 @@
 """
 Episode scaffolding service - Creates new episodes from blueprint templates
+
+Creation is planned first (episode numbers, AssetIDs, rundown, items,
+directories, info.md) with no side effects, then applied: every DB row -
+AssetID registry entries included - goes in one transaction, and the
+directory trees are built in parallel before that transaction commits.
+Batches (a season calendar) are all-or-nothing.
 """
 import os
 import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, Callable
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 
 from models_episode import BlueprintTemplate, BlueprintNode
 from models_episode import BlueprintCreate, BlueprintResponse, BlueprintTemplateResponse
 from core.media_paths import MediaPathManager
+from services.asset_id import AssetIDService
 import logging
 
 logger = logging.getLogger(__name__)
 
+SCAFFOLD_FS_WORKERS = int(os.getenv("SCAFFOLD_FS_WORKERS", "8"))
+
+
+@dataclass
+class EpisodePlan:
+    """Everything one new episode needs, computed before anything is written"""
+    episode_number: str
+    template: BlueprintTemplate
+    title: str
+    episode_path: Path
+    asset_id: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    asset_entries: List[Dict[str, Any]] = field(default_factory=list)  # for AssetIDService.register_asset_ids
+    rundown: Optional[Dict[str, Any]] = None  # Rundown columns (minus episode_id)
+    items: List[Dict[str, Any]] = field(default_factory=list)  # RundownItem columns (minus rundown_id)
+    directories: List[Path] = field(default_factory=list)
+    files: Dict[Path, str] = field(default_factory=dict)
+
+
 class EpisodeScaffoldService:
     """Service for creating new episodes from blueprint templates"""
     
@@ -161,50 +192,73 @@ class EpisodeScaffoldService:
             "episode_number": episode_number
         }
     
+    def _plan_directory_structure(self, template: BlueprintTemplate, episode_path: Path,
+                                  directories: List[Path], files: Dict[Path, str]) -> None:
+        """Add the template's directory/file nodes under episode_path to the plan"""
+        # One query for the whole node tree instead of one per directory
+        nodes = self.db.query(BlueprintNode).filter(
+            BlueprintNode.template_id == template.id
+        ).order_by(BlueprintNode.sort_order).all()
+
+        children: Dict[Optional[int], List[BlueprintNode]] = {}
+        for node in nodes:
+            children.setdefault(node.parent_id, []).append(node)
+
+        directories.append(episode_path)
+        pending = [(None, episode_path)]
+        while pending:
+            parent_id, parent_path = pending.pop()
+            for node in children.get(parent_id, []):
+                node_path = parent_path / node.name
+                if node.node_type == "directory":
+                    directories.append(node_path)
+                    pending.append((node.id, node_path))
+                elif node.node_type == "file":
+                    files[node_path] = node.content or ""
+
+    @staticmethod
+    def _build_directories(directories: List[Path], files: Dict[Path, str],
+                           roots: Optional[List[Path]] = None, created: Optional[List[Path]] = None) -> None:
+        """Create planned directories and files on the NAS in parallel
+
+        Each of `roots` (episode directories) must not exist yet: it is made
+        first and appended to `created`, so a failed build can remove exactly
+        the trees it started and never one that was already there.
+        """
+        for root in roots or []:
+            root.mkdir(parents=True, exist_ok=False)
+            if created is not None:
+                created.append(root)
+
+        # Only leaves need a mkdir; parents=True creates the rest, and exist_ok
+        # absorbs two workers racing on a shared ancestor
+        parents = {parent for path in directories for parent in path.parents}
+        leaves = [path for path in dict.fromkeys(directories) if path not in parents]
+
+        def write_file(item):
+            path, content = item
+            path.write_text(content, encoding='utf-8')
+
+        with ThreadPoolExecutor(max_workers=SCAFFOLD_FS_WORKERS) as pool:
+            list(pool.map(lambda path: path.mkdir(parents=True, exist_ok=True), leaves))
+            list(pool.map(write_file, files.items()))
+
     async def create_directory_structure(self, template: BlueprintTemplate, episode_path: Path) -> None:
         """Create directory structure from blueprint template"""
+        created: List[Path] = []
         try:
-            # Get root nodes (no parent)
-            root_nodes = self.db.query(BlueprintNode).filter(
-                BlueprintNode.template_id == template.id,
-                BlueprintNode.parent_id.is_(None)
-            ).order_by(BlueprintNode.sort_order).all()
-            
-            # Create episode root directory
-            episode_path.mkdir(parents=True, exist_ok=True)
-            
-            # Recursively create structure
-            await self._create_node_structure(root_nodes, episode_path)
-            
+            directories: List[Path] = []
+            files: Dict[Path, str] = {}
+            self._plan_directory_structure(template, episode_path, directories, files)
+            await run_in_threadpool(self._build_directories, directories, files, [episode_path], created)
+
         except Exception as e:
             logger.error(f"Error creating directory structure: {e}")
-            # Cleanup on failure
-            if episode_path.exists():
-                import shutil
-                shutil.rmtree(episode_path, ignore_errors=True)
+            # Cleanup on failure (only if this call created the episode directory)
+            for path in created:
+                shutil.rmtree(path, ignore_errors=True)
             raise HTTPException(status_code=500, detail=f"Failed to create directory structure: {e}")
-    
-    async def _create_node_structure(self, nodes: List[BlueprintNode], parent_path: Path) -> None:
-        """Recursively create directory/file structure from nodes"""
-        for node in nodes:
-            node_path = parent_path / node.name
-            
-            if node.node_type == "directory":
-                node_path.mkdir(exist_ok=True)
-                
-                # Get children of this node
-                children = self.db.query(BlueprintNode).filter(
-                    BlueprintNode.parent_id == node.id
-                ).order_by(BlueprintNode.sort_order).all()
-                
-                if children:
-                    await self._create_node_structure(children, node_path)
-                    
-            elif node.node_type == "file":
-                # Create file with content
-                content = node.content or ""
-                node_path.write_text(content, encoding='utf-8')
-    
+
     async def generate_info_md(self, template: BlueprintTemplate, episode_number: str, 
                               metadata: Optional[Dict[str, Any]] = None) -> str:
         """Generate info.md content with metadata"""
@@ -239,135 +293,230 @@ class EpisodeScaffoldService:
         
         return "\n".join(frontmatter_lines)
     
-    async def create_episode(self, request: BlueprintCreate, user_id: Optional[int] = None,
-                           organization_id: Optional[int] = None) -> BlueprintResponse:
-        """Create a new episode from blueprint template with AssetID generation"""
-        try:
-            # Generate episode number if not provided
-            episode_number = request.episode_number
-            if not episode_number:
-                episode_number = await self.get_next_episode_number()
-            
-            # Validate episode number with detailed conflict reporting
-            conflict_info = await self.get_episode_conflicts(episode_number)
-            if conflict_info["has_conflicts"]:
-                conflicts_text = ", ".join(conflict_info["conflicts"])
-                raise HTTPException(
-                    status_code=409, 
-                    detail=f"Episode {episode_number} already exists in: {conflicts_text}"
-                )
-            
-            # Get template
-            template = None
-            if request.template_id:
-                template = self.db.query(BlueprintTemplate).filter(
-                    BlueprintTemplate.id == request.template_id,
-                    BlueprintTemplate.is_active == True
-                ).first()
-                if not template:
-                    raise HTTPException(status_code=404, detail="Blueprint template not found")
-            else:
-                template = await self.get_default_template()
-                if not template:
-                    raise HTTPException(status_code=404, detail="No default blueprint template found")
-            
-            # Generate AssetID via the unified endpoint (CRITICAL: all AssetIDs must be logged)
-            from services.asset_id import AssetIDService
-            user_identifier = str(user_id) if user_id else "episode_scaffold_service"
-            
-            asset_id = AssetIDService.request_asset_id(
-                db=self.db,
-                entity_type="episode",
-                reason="episode_scaffold_create",
-                requested_by=user_identifier,
-                linked_to=[],
-                context={
-                    "episode_number": episode_number,
-                    "template_id": template.id,
-                    "template_name": template.name,
-                    "title": request.title,
-                    "source": "episode_scaffold_service",
-                    "blueprint_template_type": template.template_type
-                }
+    async def plan_episode(self, request: BlueprintCreate, user_id: Optional[int] = None,
+                           reserved_numbers: Optional[Set[str]] = None,
+                           asset_ids: Optional[Set[str]] = None) -> EpisodePlan:
+        """
+        Plan everything an episode needs without touching the DB or the NAS.
+
+        Args:
+            request: Episode creation request
+            user_id: Requesting user
+            reserved_numbers: Episode numbers already planned in the same batch
+            asset_ids: AssetIDs already planned in the same batch (kept unique)
+        """
+        reserved_numbers = reserved_numbers if reserved_numbers is not None else set()
+        asset_ids = asset_ids if asset_ids is not None else set()
+
+        # Generate episode number if not provided; "42" and "0042" are the
+        # same episode, so numbers are zero-padded like the ones generated
+        episode_number = request.episode_number
+        if not episode_number:
+            episode_number = await self.get_next_episode_number()
+            while episode_number in reserved_numbers:
+                episode_number = f"{int(episode_number) + 1:04d}"
+        elif not episode_number.strip().isdigit():
+            raise HTTPException(status_code=400, detail=f"Episode number must be numeric: {episode_number}")
+        else:
+            episode_number = f"{int(episode_number):04d}"
+            if episode_number in reserved_numbers:
+                raise HTTPException(status_code=409, detail=f"Episode {episode_number} appears twice in this batch")
+
+        # Validate episode number with detailed conflict reporting
+        conflict_info = await self.get_episode_conflicts(episode_number)
+        if conflict_info["has_conflicts"]:
+            conflicts_text = ", ".join(conflict_info["conflicts"])
+            raise HTTPException(
+                status_code=409,
+                detail=f"Episode {episode_number} already exists in: {conflicts_text}"
             )
-            
-            # Create episode directory structure
-            episode_path = self.media_paths.get_episode_path(episode_number)
-            await self.create_directory_structure(template, episode_path)
-            
-            # Prepare enhanced metadata with AssetID
-            enhanced_metadata = request.episode_metadata.copy() if request.episode_metadata else {}
-            enhanced_metadata.update({
-                "asset_id": asset_id,
+
+        # Get template
+        template = None
+        if request.template_id:
+            template = self.db.query(BlueprintTemplate).filter(
+                BlueprintTemplate.id == request.template_id,
+                BlueprintTemplate.is_active == True
+            ).first()
+            if not template:
+                raise HTTPException(status_code=404, detail="Blueprint template not found")
+        else:
+            template = await self.get_default_template()
+            if not template:
+                raise HTTPException(status_code=404, detail="No default blueprint template found")
+
+        def new_asset_id(entity_type: str) -> str:
+            asset_id = AssetIDService.generate(entity_type)
+            while asset_id in asset_ids:
+                asset_id = AssetIDService.generate(entity_type)
+            asset_ids.add(asset_id)
+            return asset_id
+
+        plan = EpisodePlan(
+            episode_number=episode_number,
+            template=template,
+            title=request.title.strip() if request.title and request.title.strip() else f"Episode {episode_number}",  # Provide default title if None/empty
+            episode_path=self.media_paths.get_episode_path(episode_number),
+            asset_id=new_asset_id("episode"),
+        )
+
+        # All AssetIDs are logged (CRITICAL), in the same transaction as the rows
+        plan.asset_entries.append({
+            "asset_id": plan.asset_id,
+            "entity_type": "episode",
+            "reason": "episode_scaffold_create",
+            "requested_by": str(user_id) if user_id else "episode_scaffold_service",
+            "linked_to": [],
+            "context": {
                 "episode_number": episode_number,
                 "template_id": template.id,
-                "template_name": template.name
-            })
-            
-            # Generate and write info.md with AssetID included
-            info_content = await self.generate_info_md(template, episode_number, enhanced_metadata)
-            info_file = episode_path / "info.md"
-            info_file.write_text(info_content, encoding='utf-8')
-            
-            # Create record in main episodes table
-            from models_v2 import Episode
-            from datetime import datetime
-
-            episodes_record = Episode(
-                asset_id=asset_id,
-                season_id=1,  # Default season
-                episode_number=int(episode_number),
-                title=request.title.strip() if request.title and request.title.strip() else f"Episode {episode_number}",  # Provide default title if None/empty
-                slug=f"episode-{episode_number}",
-                status="draft",
-                template_type=template.template_type,
-                template_name=template.name,
-                # Store airdate if provided
-                air_date=datetime.fromisoformat(enhanced_metadata['airdate']) if enhanced_metadata.get('airdate') else None,
-                duration_formatted=enhanced_metadata.get('duration', '01:00:00')
+                "template_name": template.name,
+                "title": request.title,
+                "source": "episode_scaffold_service",
+                "blueprint_template_type": template.template_type
+            }
+        })
+
+        # Prepare enhanced metadata with AssetID
+        plan.metadata = request.episode_metadata.copy() if request.episode_metadata else {}
+        plan.metadata.update({
+            "asset_id": plan.asset_id,
+            "episode_number": episode_number,
+            "template_id": template.id,
+            "template_name": template.name
+        })
+
+        # Directory structure, then info.md with AssetID included
+        self._plan_directory_structure(template, plan.episode_path, plan.directories, plan.files)
+        plan.files[plan.episode_path / "info.md"] = await self.generate_info_md(template, episode_number, plan.metadata)
+
+        # Rundown items from rundown template if provided, otherwise from blueprint template
+        if request.rundown_template_id:
+            self._plan_rundown_from_rundown_template(plan, request.rundown_template_id, new_asset_id)
+        else:
+            # Blueprint template rundown items (with inheritance)
+            self._plan_rundown_from_template(plan, new_asset_id)
+
+        reserved_numbers.add(episode_number)
+        return plan
+
+    async def apply_plans(self, plans: List[EpisodePlan]) -> List[Any]:
+        """
+        Create planned episodes: all DB rows in one transaction, directories in parallel.
+
+        The transaction is committed only after every directory tree was built;
+        if anything fails, the DB is rolled back and the episode directories
+        this call created are removed. An episode directory that already
+        exists fails the batch and is left alone.
+        """
+        from models_v2 import Episode, Rundown, RundownItem
+
+        episodes = []
+        created: List[Path] = []
+        try:
+            AssetIDService.register_asset_ids(
+                self.db, [entry for plan in plans for entry in plan.asset_entries], commit=False
+            )
+
+            for plan in plans:
+                episodes.append(Episode(
+                    asset_id=plan.asset_id,
+                    season_id=1,  # Default season
+                    episode_number=int(plan.episode_number),
+                    title=plan.title,
+                    slug=f"episode-{plan.episode_number}",
+                    status="draft",
+                    template_type=plan.template.template_type,
+                    template_name=plan.template.name,
+                    # Store airdate if provided
+                    air_date=datetime.fromisoformat(plan.metadata['airdate']) if plan.metadata.get('airdate') else None,
+                    duration_formatted=plan.metadata.get('duration', '01:00:00')
+                ))
+            self.db.add_all(episodes)
+            self.db.flush()
+
+            rundowns = {}
+            for plan, episode in zip(plans, episodes):
+                if plan.rundown:
+                    rundowns[plan.episode_number] = Rundown(episode_id=episode.id, **plan.rundown)
+            self.db.add_all(rundowns.values())
+            self.db.flush()
+
+            self.db.add_all([
+                RundownItem(rundown_id=rundowns[plan.episode_number].id, **item)
+                for plan in plans if plan.rundown
+                for item in plan.items
+            ])
+            self.db.flush()
+
+            await run_in_threadpool(
+                self._build_directories,
+                [path for plan in plans for path in plan.directories],
+                {path: content for plan in plans for path, content in plan.files.items()},
+                [plan.episode_path for plan in plans],
+                created
             )
 
-            self.db.add(episodes_record)
             self.db.commit()
-            self.db.refresh(episodes_record)
 
-            logger.info(f"Created episode {episode_number} with AssetID {asset_id} using template {template.name} in episodes table")
+        except Exception:
+            self.db.rollback()
+            for path in created:
+                shutil.rmtree(path, ignore_errors=True)
+            raise
 
-            # Create rundown items from rundown template if provided, otherwise use blueprint template
-            if request.rundown_template_id:
-                await self.create_rundown_items_from_rundown_template(
-                    request.rundown_template_id, episodes_record.id, episode_number
-                )
-            else:
-                # Create rundown items from blueprint template (with inheritance)
-                await self.create_rundown_items_from_template(template, episodes_record.id, episode_number)
+        for plan in plans:
+            logger.info(f"Created episode {plan.episode_number} with AssetID {plan.asset_id} using template "
+                        f"{plan.template.name}: {len(plan.items)} rundown items, {len(plan.directories)} directories")
+        return episodes
+
+    def _plan_response(self, plan: EpisodePlan, episode, user_id: Optional[int],
+                       organization_id: Optional[int]) -> BlueprintResponse:
+        return BlueprintResponse(
+            id=episode.id,
+            episode_number=plan.episode_number,
+            title=episode.title,
+            description="",
+            template_id=plan.template.id,
+            status=episode.status,
+            created_by=user_id,
+            organization_id=organization_id,
+            file_path=str(plan.episode_path),
+            episode_metadata=plan.metadata,
+            created_at=episode.created_at,
+            updated_at=episode.updated_at
+        )
+
+    async def create_episodes(self, requests: List[BlueprintCreate], user_id: Optional[int] = None,
+                              organization_id: Optional[int] = None) -> List[BlueprintResponse]:
+        """Create several episodes (e.g. a season calendar) all-or-nothing"""
+        try:
+            reserved_numbers: Set[str] = set()
+            asset_ids: Set[str] = set()
+            plans = [
+                await self.plan_episode(request, user_id, reserved_numbers, asset_ids)
+                for request in requests
+            ]
+            episodes = await self.apply_plans(plans)
+            return [
+                self._plan_response(plan, episode, user_id, organization_id)
+                for plan, episode in zip(plans, episodes)
+            ]
 
-            # Return response based on the episodes record
-            return BlueprintResponse(
-                id=episodes_record.id,
-                episode_number=episode_number,
-                title=episodes_record.title,
-                description="",
-                template_id=template.id,
-                status=episodes_record.status,
-                created_by=user_id,
-                organization_id=organization_id,
-                file_path=str(episode_path),
-                episode_metadata=enhanced_metadata,
-                created_at=episodes_record.created_at,
-                updated_at=episodes_record.updated_at
-            )
-            
         except HTTPException:
             self.db.rollback()
             raise
         except Exception as e:
             self.db.rollback()
-            import traceback
-            logger.error(f"Error creating episode: {e}")
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.error(f"Error creating episodes: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Failed to create episode: {e}")
-    
+
+    async def create_episode(self, request: BlueprintCreate, user_id: Optional[int] = None,
+                           organization_id: Optional[int] = None) -> BlueprintResponse:
+        """Create a new episode from blueprint template with AssetID generation"""
+        responses = await self.create_episodes([request], user_id, organization_id)
+        return responses[0]
+
     async def get_episode_by_number(self, episode_number: str) -> Optional[BlueprintResponse]:
         """Get episode information by number"""
         from models_v2 import Episode
@@ -420,17 +569,17 @@ class EpisodeScaffoldService:
             ))
         return results
 
-    async def create_rundown_items_from_template(self, template: BlueprintTemplate, episode_id: int, episode_number: str):
+
+    def _plan_rundown_from_template(self, plan: EpisodePlan, new_asset_id: Callable[[str], str]) -> None:
         """
-        Create rundown items from blueprint template nodes (with cascading inheritance support).
+        Plan rundown items from blueprint template nodes (with cascading inheritance support).
 
         Args:
-            template: The blueprint template (may have parent templates)
-            episode_id: The episode record ID
-            episode_number: Episode number string
+            plan: The episode plan to add the rundown and items to
+            new_asset_id: Batch-unique AssetID generator
         """
-        from models_v2 import RundownItem, Rundown
-        from services.asset_id import AssetIDService
+        template = plan.template
+        episode_number = plan.episode_number
 
         # Get resolved nodes (includes inherited nodes from parent templates)
         resolved_nodes = template.get_resolved_nodes(self.db)
@@ -442,97 +591,74 @@ class EpisodeScaffoldService:
             logger.info(f"No rundown item templates found in template {template.name}")
             return
 
-        # Create Rundown record first (required parent for RundownItems)
-        rundown_asset_id = AssetIDService.request_asset_id(
-            db=self.db,
-            entity_type="rundown",
-            reason="episode_scaffold_rundown",
-            requested_by="episode_scaffold_service",
-            linked_to=[],
-            context={
+        # Rundown record (required parent for RundownItems)
+        rundown_asset_id = new_asset_id("rundown")
+        plan.asset_entries.append({
+            "asset_id": rundown_asset_id,
+            "entity_type": "rundown",
+            "reason": "episode_scaffold_rundown",
+            "requested_by": "episode_scaffold_service",
+            "linked_to": [],
+            "context": {
                 "episode_number": episode_number,
-                "episode_id": episode_id,
                 "template_name": template.name
             }
-        )
-
-        rundown = Rundown(
-            asset_id=rundown_asset_id,
-            episode_id=episode_id,
-            name=f"Episode {episode_number} Main Rundown",
-            description=f"Main rundown for episode {episode_number}",
-            order_in_episode=0,
-            status="draft"
-        )
-        self.db.add(rundown)
-        self.db.commit()
-        self.db.refresh(rundown)
-
-        logger.info(f"Created rundown {rundown.id} with AssetID {rundown_asset_id} for episode {episode_number}")
+        })
+        plan.rundown = {
+            "asset_id": rundown_asset_id,
+            "name": f"Episode {episode_number} Main Rundown",
+            "description": f"Main rundown for episode {episode_number}",
+            "order_in_episode": 0,
+            "status": "draft"
+        }
 
         # Sort by sort_order
         rundown_nodes.sort(key=lambda n: n.sort_order)
 
-        # Create rundown items
-        created_count = 0
         for idx, node in enumerate(rundown_nodes):
             metadata = node.rundown_item_metadata or {}
+            item_type = metadata.get('item_type', 'segment')
 
-            # Generate AssetID for each rundown item
-            item_asset_id = AssetIDService.request_asset_id(
-                db=self.db,
-                entity_type="rundown_item",
-                reason="episode_scaffold_item",
-                requested_by="episode_scaffold_service",
-                linked_to=[{"asset_id": rundown_asset_id, "link_type": "child_of"}],
-                context={
+            # AssetID for each rundown item
+            item_asset_id = new_asset_id("rundown_item")
+            plan.asset_entries.append({
+                "asset_id": item_asset_id,
+                "entity_type": "rundown_item",
+                "reason": "episode_scaffold_item",
+                "requested_by": "episode_scaffold_service",
+                "linked_to": [{"asset_id": rundown_asset_id, "link_type": "child_of"}],
+                "context": {
                     "episode_number": episode_number,
-                    "item_type": metadata.get('item_type', 'segment'),
+                    "item_type": item_type,
                     "title": node.name
                 }
-            )
-
-            # Build metadata for rundown item fields (no frontmatter in script_content)
-            item_slug = metadata.get('slug', node.name.lower().replace(' ', '-'))
-            item_type = metadata.get('item_type', 'segment')
-            item_order = (idx + 1) * 10
-            item_duration = metadata.get('duration', '00:05:00')
-            item_status = metadata.get('status', 'draft')
+            })
 
             # Script content is just the body - no YAML frontmatter
-            script_content = node.content if node.content else ''
-
-            # Create rundown item with correct rundown_id and asset_id
-            rundown_item = RundownItem(
-                asset_id=item_asset_id,
-                rundown_id=rundown.id,
-                title=node.name,
-                slug=item_slug,
-                item_type=item_type,
-                order_in_rundown=item_order,
-                duration=item_duration,
-                status=item_status,
-                script_content=script_content
-            )
-
-            self.db.add(rundown_item)
-            created_count += 1
-
-        self.db.commit()
-        logger.info(f"Created {created_count} rundown items for episode {episode_number} from template {template.name}")
+            plan.items.append({
+                "asset_id": item_asset_id,
+                "title": node.name,
+                "slug": metadata.get('slug', node.name.lower().replace(' ', '-')),
+                "item_type": item_type,
+                "order_in_rundown": (idx + 1) * 10,
+                "duration": metadata.get('duration', '00:05:00'),
+                "status": metadata.get('status', 'draft'),
+                "script_content": node.content if node.content else ''
+            })
 
-    async def create_rundown_items_from_rundown_template(self, rundown_template_id: int, episode_id: int, episode_number: str):
+    def _plan_rundown_from_rundown_template(self, plan: EpisodePlan, rundown_template_id: int,
+                                            new_asset_id: Callable[[str], str]) -> None:
         """
-        Create rundown items from a rundown template.
+        Plan rundown items from a rundown template.
 
         Args:
+            plan: The episode plan to add the rundown and items to
             rundown_template_id: The rundown template ID
-            episode_id: The episode record ID
-            episode_number: Episode number string
+            new_asset_id: Batch-unique AssetID generator
         """
-        from models_v2 import RundownItem, Rundown
         from models_episode import RundownTemplate
-        from services.asset_id import AssetIDService
+
+        episode_number = plan.episode_number
 
         # Get rundown template with items
         rundown_template = self.db.query(RundownTemplate).filter(
@@ -548,79 +674,57 @@ class EpisodeScaffoldService:
             logger.info(f"No items found in rundown template {rundown_template.name}")
             return
 
-        # Create Rundown record first (required parent for RundownItems)
-        rundown_asset_id = AssetIDService.request_asset_id(
-            db=self.db,
-            entity_type="rundown",
-            reason="episode_scaffold_rundown_template",
-            requested_by="episode_scaffold_service",
-            linked_to=[],
-            context={
+        # Rundown record (required parent for RundownItems)
+        rundown_asset_id = new_asset_id("rundown")
+        plan.asset_entries.append({
+            "asset_id": rundown_asset_id,
+            "entity_type": "rundown",
+            "reason": "episode_scaffold_rundown_template",
+            "requested_by": "episode_scaffold_service",
+            "linked_to": [],
+            "context": {
                 "episode_number": episode_number,
-                "episode_id": episode_id,
                 "rundown_template_id": rundown_template_id,
                 "rundown_template_name": rundown_template.name
             }
-        )
-
-        rundown = Rundown(
-            asset_id=rundown_asset_id,
-            episode_id=episode_id,
-            name=f"Episode {episode_number} Main Rundown",
-            description=f"Main rundown for episode {episode_number} (from template: {rundown_template.name})",
-            order_in_episode=0,
-            status="draft"
-        )
-        self.db.add(rundown)
-        self.db.commit()
-        self.db.refresh(rundown)
-
-        logger.info(f"Created rundown {rundown.id} with AssetID {rundown_asset_id} for episode {episode_number} from template {rundown_template.name}")
+        })
+        plan.rundown = {
+            "asset_id": rundown_asset_id,
+            "name": f"Episode {episode_number} Main Rundown",
+            "description": f"Main rundown for episode {episode_number} (from template: {rundown_template.name})",
+            "order_in_episode": 0,
+            "status": "draft"
+        }
 
         # Sort items by sort_order
         sorted_items = sorted(rundown_template.items, key=lambda item: item.sort_order)
 
-        # Create rundown items
-        created_count = 0
         for idx, template_item in enumerate(sorted_items):
-            # Generate AssetID for each rundown item
-            item_asset_id = AssetIDService.request_asset_id(
-                db=self.db,
-                entity_type="rundown_item",
-                reason="episode_scaffold_rundown_template_item",
-                requested_by="episode_scaffold_service",
-                linked_to=[{"asset_id": rundown_asset_id, "link_type": "child_of"}],
-                context={
+            item_title = template_item.title or template_item.item_type
+
+            # AssetID for each rundown item
+            item_asset_id = new_asset_id("rundown_item")
+            plan.asset_entries.append({
+                "asset_id": item_asset_id,
+                "entity_type": "rundown_item",
+                "reason": "episode_scaffold_rundown_template_item",
+                "requested_by": "episode_scaffold_service",
+                "linked_to": [{"asset_id": rundown_asset_id, "link_type": "child_of"}],
+                "context": {
                     "episode_number": episode_number,
                     "item_type": template_item.item_type,
-                    "title": template_item.title or template_item.item_type
+                    "title": item_title
                 }
-            )
-
-            # Build metadata for rundown item fields (no frontmatter in script_content)
-            item_slug = template_item.slug or template_item.title.lower().replace(' ', '-')
-            item_order = (idx + 1) * 10
-            item_duration = template_item.duration or '00:05:00'
-            item_title = template_item.title or template_item.item_type
+            })
 
             # Script content is just the body - no YAML frontmatter
-            script_content = template_item.script_content if template_item.script_content else ''
-
-            # Create rundown item with correct rundown_id and asset_id
-            rundown_item = RundownItem(
-                asset_id=item_asset_id,
-                rundown_id=rundown.id,
-                title=item_title,
-                slug=item_slug,
-                item_type=template_item.item_type,
-                order_in_rundown=item_order,
-                duration=item_duration,
-                status='draft',
-                script_content=script_content
-            )
-
-            self.db.add(rundown_item)
-            created_count += 1
-
-        self.db.commit()
-        logger.info(f"Created {created_count} rundown items for episode {episode_number} from rundown template {rundown_template.name}")
\ No newline at end of file
+            plan.items.append({
+                "asset_id": item_asset_id,
+                "title": item_title,
+                "slug": template_item.slug or template_item.title.lower().replace(' ', '-'),
+                "item_type": template_item.item_type,
+                "order_in_rundown": (idx + 1) * 10,
+                "duration": template_item.duration or '00:05:00',
+                "status": 'draft',
+                "script_content": template_item.script_content if template_item.script_content else ''
+            })
@@ -17,7 +17,8 @@ the libx264 path; same code, graceful degrade.
 
 This module is encoder-policy only — it does NOT change WHAT each task encodes,
 just the codec flags + the run-with-failover wrapper. Tasks build their filter
-graph / io as before and call `run_encode()` instead of `subprocess.run([...])`.
+graph / io as before and call `run_encode()` instead of `subprocess.run([...])`,
+or `encode_with_failover()` when they assemble the full command line themselves.
 """
 from __future__ import annotations
 
@@ -25,7 +26,10 @@ import logging
 import os
 import subprocess
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Optional
+
+from services.ffmpeg_progress import ProgressReporter, run_ffmpeg
+from services.nvenc_sessions import acquire_nvenc_session
 
 log = logging.getLogger(__name__)
 
@@ -85,8 +89,8 @@ def video_encoder_flags(prefer_gpu: bool, quality: str = "medium") -> tuple[str,
     return "libx264", _libx264_video_flags(quality)
 
 
-def _looks_like_nvenc_failure(stderr: str) -> bool:
-    s = stderr or ""
+def _looks_like_nvenc_failure(stderr) -> bool:
+    s = stderr.decode("utf-8", errors="replace") if isinstance(stderr, bytes) else (stderr or "")
     return any(m.lower() in s.lower() for m in _NVENC_FAIL_MARKERS)
 
 
@@ -100,6 +104,9 @@ def run_encode(
     audio_args: Optional[list[str]] = None,
     quality: str = "medium",
     timeout: Optional[int] = None,
+    duration: Optional[float] = None,
+    reporter: Optional[ProgressReporter] = None,
+    phase: str = "encode",
 ) -> EncodeResult:
     """Run an ffmpeg ENCODE with GPU-first / CPU-failover.
 
@@ -110,6 +117,7 @@ def run_encode(
       audio_args  : e.g. ['-c:a', 'aac', '-b:a', '192k']  (optional)
       output_args : container/muxing flags BEFORE the output path (e.g. ['-movflags','+faststart'])
       output_path : final file
+      duration/reporter/phase : live progress + timings (see ffmpeg_progress)
 
     Returns EncodeResult with which encoder actually ran (recorded by tasks into
     the job ledger as `encoder`, so saturation is observable).
@@ -132,11 +140,31 @@ def run_encode(
             ("libx264", _libx264_video_flags(quality)),
         ]
 
+    # Admission control: take an NVENC session lease before the GPU attempt.
+    # No lease (host saturated, or CPU-only host) -> go straight to libx264
+    # instead of launching a doomed nvenc encode. The stderr failover below
+    # stays as the backstop (e.g. sessions held by processes outside the pool).
+    lease = None
+    if attempts[0][0] == "h264_nvenc":
+        lease = acquire_nvenc_session()
+        if lease is None and _POLICY != "gpu":
+            attempts = attempts[1:]
+
+    try:
+        return _run_attempts(attempts, _build, phase=phase, duration=duration,
+                             reporter=reporter, timeout=timeout)
+    finally:
+        if lease is not None:
+            lease.release()
+
+
+def _run_attempts(attempts, build, *, phase, duration, reporter, timeout) -> EncodeResult:
     last: Optional[EncodeResult] = None
     for idx, (enc, vflags) in enumerate(attempts):
-        cmd = _build(enc, vflags)
+        cmd = build(enc, vflags)
         log.info("ffmpeg encode attempt enc=%s: %s", enc, " ".join(cmd))
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        proc = run_ffmpeg(cmd, phase=phase, duration=duration, reporter=reporter,
+                          timeout=timeout, check=False, encoder=enc, fell_back=(idx > 0))
         if proc.returncode == 0:
             return EncodeResult(ok=True, encoder=enc, returncode=0,
                                 stderr=proc.stderr or "",
@@ -161,3 +189,41 @@ def run_encode(
 
     return last or EncodeResult(ok=False, encoder="?", returncode=1,
                                 stderr="no attempt ran")
+
+
+def encode_with_failover(
+    build_cmd: Callable[[list[str]], list[str]],
+    nvenc_args: list[str],
+    cpu_args: list[str],
+    run: Callable[[list[str]], subprocess.CompletedProcess],
+) -> subprocess.CompletedProcess:
+    """Run a caller-built ffmpeg encode with the same GPU-first / CPU-failover as run_encode.
+
+    For tasks whose command line puts the codec flags in the middle and that
+    run / check it their own way:
+      build_cmd(video_args) -> the full ffmpeg command using those codec flags
+      run(cmd)              -> CompletedProcess, or raises CalledProcessError,
+                               exactly as the call site ran it before
+
+    The NVENC attempt runs under a session lease. If it fails with an
+    nvenc-availability signature (saturation, driver error, or an unmanaged
+    lease while Redis is down) the encode is re-run once with cpu_args; any
+    other failure is returned / raised unchanged.
+    """
+    if _POLICY != "cpu":
+        lease = acquire_nvenc_session()
+        if lease is not None or _POLICY == "gpu":
+            try:
+                try:
+                    result = run(build_cmd(nvenc_args))
+                except subprocess.CalledProcessError as e:
+                    if _POLICY == "gpu" or not _looks_like_nvenc_failure(e.stderr):
+                        raise
+                else:
+                    if result.returncode == 0 or _POLICY == "gpu" or not _looks_like_nvenc_failure(result.stderr):
+                        return result
+            finally:
+                if lease is not None:
+                    lease.release()
+            log.warning("nvenc unavailable/saturated -> failing over to libx264")
+    return run(build_cmd(cpu_args))
@@ -0,0 +1,264 @@
+"""
+FFmpeg Progress - run ffmpeg with live progress, ETA and per-phase timings.
+
+run_ffmpeg() is a drop-in for `subprocess.run(cmd, check=True, capture_output=True)`
+on ffmpeg commands. It adds `-progress pipe:1 -nostats` and parses the
+key=value blocks ffmpeg writes on stdout (frame, fps, out_time_us, speed)
+while the encode runs, instead of learning the outcome only at exit.
+
+A ProgressReporter, when given, receives every block and publishes at most
+one update per PROGRESS_INTERVAL seconds:
+  - Celery task state (state='PROGRESS', for /status polling), and
+  - the job's Redis channel `job_updates:{job_id}` (same payload shape as
+    websocket.publish_job_update, plus an `ffmpeg` block).
+It also records each run's wall time and encoder speed into the processing
+report under `timings`, so slow phases and slow workers are visible:
+
+    "timings": {"phase6": {"wall_seconds": 41.2, "media_seconds": 95.0,
+                           "speed": 2.31, "frames": 2848, "worker": "media-02"}}
+"""
+import json
+import logging
+import os
+import platform
+import subprocess
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between published updates for one job
+PROGRESS_INTERVAL = float(os.getenv("FFMPEG_PROGRESS_INTERVAL", "2.0"))
+# Lines of ffmpeg stderr kept for error reporting
+STDERR_TAIL_LINES = 200
+
+_redis_client = None
+_redis_lock = threading.Lock()
+
+
+def _get_redis():
+    global _redis_client
+    with _redis_lock:
+        if _redis_client is None:
+            import redis
+            _redis_client = redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        return _redis_client
+
+
+@dataclass
+class FFmpegProgress:
+    """Latest state reported by `ffmpeg -progress`."""
+    frame: int = 0
+    fps: float = 0.0
+    out_time: float = 0.0   # seconds of output written so far
+    speed: float = 0.0      # x realtime
+    elapsed: float = 0.0    # wall seconds since start
+    duration: Optional[float] = None  # expected output seconds, if known
+    done: bool = False
+
+    @property
+    def percent(self) -> Optional[float]:
+        if self.done:
+            return 100.0
+        if not self.duration:
+            return None
+        return max(0.0, min(100.0, 100.0 * self.out_time / self.duration))
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated wall seconds remaining."""
+        if self.done:
+            return 0.0
+        if not self.duration or self.speed <= 0:
+            return None
+        return max(0.0, (self.duration - self.out_time) / self.speed)
+
+    def update(self, key: str, value: str) -> None:
+        try:
+            if key == "frame":
+                self.frame = int(value)
+            elif key == "fps":
+                self.fps = float(value)
+            elif key == "out_time_us":
+                self.out_time = int(value) / 1_000_000
+            elif key == "speed" and value.endswith("x"):
+                self.speed = float(value[:-1])
+        except ValueError:
+            pass  # "N/A" before the first frame is out
+
+    def to_dict(self) -> Dict[str, Any]:
+        percent, eta = self.percent, self.eta
+        return {
+            "frame": self.frame,
+            "fps": round(self.fps, 1),
+            "time": round(self.out_time, 2),
+            "speed": round(self.speed, 2),
+            "percent": round(percent, 1) if percent is not None else None,
+            "eta": round(eta) if eta is not None else None,
+        }
+
+
+class ProgressReporter:
+    """Publishes ffmpeg progress for one job and records phase timings."""
+
+    def __init__(self, task=None, job_id: Optional[str] = None,
+                 report: Optional[Dict[str, Any]] = None, interval: float = PROGRESS_INTERVAL):
+        self.task = task
+        self.job_id = job_id
+        self.report = report
+        self.interval = interval
+        self._last_publish = 0.0
+
+    def __call__(self, phase: str, progress: FFmpegProgress, span: Tuple[int, int] = (0, 100)) -> None:
+        now = time.monotonic()
+        if not progress.done and now - self._last_publish < self.interval:
+            return
+        self._last_publish = now
+
+        # Map this run's percent into the task's overall progress range
+        lo, hi = span
+        percent = progress.percent
+        overall = int(lo + (hi - lo) * percent / 100) if percent is not None else lo
+        ffmpeg_meta = progress.to_dict()
+
+        if self.task is not None:
+            try:
+                self.task.update_state(state='PROGRESS', meta={
+                    'progress': overall, 'stage': phase, 'ffmpeg': ffmpeg_meta
+                })
+            except Exception as e:
+                logger.debug(f"Could not update task state: {e}")
+
+        if self.job_id:
+            eta = ffmpeg_meta["eta"]
+            message = f"{phase}: {ffmpeg_meta['speed']}x" + (f", ETA {eta}s" if eta is not None else "")
+            try:
+                _get_redis().publish(f"job_updates:{self.job_id}", json.dumps({
+                    "status": "running",
+                    "progress": overall,
+                    "message": message,
+                    "timestamp": time.time(),
+                    "phase": phase,
+                    "ffmpeg": ffmpeg_meta,
+                }))
+            except Exception as e:
+                logger.debug(f"Could not publish progress for {self.job_id}: {e}")
+
+    def record(self, phase: str, progress: FFmpegProgress, **extra) -> None:
+        """Store the run's wall time and encoder speed under report['timings'][phase]."""
+        if self.report is None:
+            return
+        self.report.setdefault("timings", {})[phase] = {
+            "wall_seconds": round(progress.elapsed, 2),
+            "media_seconds": round(progress.out_time, 2),
+            # Average speed over the run; ffmpeg's own figure is for the last block
+            "speed": round(progress.out_time / progress.elapsed, 2) if progress.elapsed > 0 else None,
+            "frames": progress.frame,
+            "worker": platform.node(),
+            **extra,
+        }
+
+
+def _with_progress_flags(cmd: List[str]) -> List[str]:
+    # Global options: valid anywhere before the first output
+    return [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+
+
+def run_ffmpeg(
+    cmd: List[str],
+    *,
+    phase: str = "ffmpeg",
+    duration: Optional[float] = None,
+    reporter: Optional[ProgressReporter] = None,
+    span: Tuple[int, int] = (0, 100),
+    timeout: Optional[float] = None,
+    check: bool = True,
+    **record_extra
+) -> subprocess.CompletedProcess:
+    """
+    Run an ffmpeg command, streaming its progress to `reporter`.
+
+    Args:
+        cmd: ffmpeg command (binary first), without any -progress flags
+        phase: Label for published updates and the timings entry
+        duration: Expected output seconds, for percent/ETA
+        reporter: Optional ProgressReporter (publishing + timings)
+        span: Overall task progress range this run covers
+        timeout: Kill ffmpeg after this many seconds (raises TimeoutExpired)
+        check: Raise CalledProcessError on a non-zero exit
+
+    Returns a CompletedProcess with the stderr tail (text); the final
+    FFmpegProgress is attached as `.progress`.
+    """
+    full_cmd = _with_progress_flags(cmd)
+    progress = FFmpegProgress(duration=duration)
+    stderr_tail: deque = deque(maxlen=STDERR_TAIL_LINES)
+    started = time.monotonic()
+
+    process = subprocess.Popen(
+        full_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        text=True, errors="replace", bufsize=1
+    )
+
+    # Drain stderr concurrently so a chatty encoder can't fill the pipe and stall
+    def drain_stderr():
+        for line in process.stderr:
+            stderr_tail.append(line)
+
+    stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
+    stderr_thread.start()
+
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        process.kill()
+
+    timer = threading.Timer(timeout, kill) if timeout else None
+    if timer:
+        timer.start()
+
+    try:
+        for line in process.stdout:
+            key, sep, value = line.strip().partition("=")
+            if not sep:
+                continue
+            if key == "progress":
+                progress.elapsed = time.monotonic() - started
+                progress.done = value == "end"
+                if reporter:
+                    reporter(phase, progress, span)
+            else:
+                progress.update(key, value)
+        returncode = process.wait()
+    except BaseException:
+        # Soft time limit, a reporter error, KeyboardInterrupt: never leave
+        # the encoder running behind us (subprocess.run killed it too)
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        if timer:
+            timer.cancel()
+        stderr_thread.join(timeout=5)
+
+    progress.elapsed = time.monotonic() - started
+    stderr = "".join(stderr_tail)
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout, stderr=stderr)
+
+    if returncode == 0:
+        logger.info(f"{phase}: ffmpeg finished in {progress.elapsed:.1f}s "
+                    f"({progress.out_time:.1f}s of media, {progress.frame} frames)")
+        if reporter:
+            reporter.record(phase, progress, **record_extra)
+
+    result = subprocess.CompletedProcess(cmd, returncode, stdout="", stderr=stderr)
+    result.progress = progress
+    if check and returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, output="", stderr=stderr)
+    return result
@@ -21,18 +21,22 @@ from datetime import datetime
 from pathlib import Path
 from celery import shared_task
 from celery.utils.log import get_task_logger
-from sqlalchemy import func
+from sqlalchemy import func, or_
 
 # Ensure /app is in Python path
 if '/app' not in sys.path:
     sys.path.insert(0, '/app')
 
+from services.cue_parser import parse_script
+from services.ffmpeg_accel import encode_with_failover
+from services.ffmpeg_progress import ProgressReporter, run_ffmpeg
+from services.sot_checkpoints import load_checkpoint, record_checkpoint, record_dispatch
+
 # Cross-platform utilities
 from platform_utils import (
     normalize_path,
     get_ffmpeg_binary,
     get_ffprobe_binary,
-    get_platform_info,
     get_media_root
 )
 
@@ -235,9 +239,8 @@ def send_notification(title: str, message: str, priority: str = "normal", task_i
     except Exception as e:
         logger.warning(f"Failed to send notification: {str(e)}")
 
-# Log worker platform on module load
-_platform_info = get_platform_info()
-logger.info(f"🖥️  FFmpeg Tasks Module Loaded on {_platform_info['platform']} ({_platform_info['hostname']})")
+# Log worker platform on module load (hardware is probed lazily, see platform_utils)
+logger.info(f"🖥️  FFmpeg Tasks Module Loaded on {platform.system()} ({platform.node()})")
 
 
 def calculate_frame_sharpness(image_path: str, ffmpeg: str = None) -> float:
@@ -613,55 +616,65 @@ def extract_audio_from_video(self, video_path: str, output_path: str):
 
 @shared_task(bind=True, queue='media', name='services.ffmpeg_tasks.generate_episode_mp3',
              soft_time_limit=3600, time_limit=7200)
-def generate_episode_mp3(self, episode: str, profile_id: int = None, bitrate: str = "192k", source_file: str = None):
-    """Generate MP3 from master episode video file.
+def generate_episode_mp3(self, episode: str, profile_id: int = None, bitrate: str = "192k",
+                         source_file: str = None, all_profiles: bool = False):
+    """Generate MP3(s) from master episode video file.
 
     Supports .mov, .mp4, and .avi source files in the episode exports directory.
     Reports progress via celery state updates for UI polling.
 
     When profile_id is provided, encoding parameters are loaded from the
     mp3_encoding_profiles database table. Otherwise falls back to bitrate arg.
+    With all_profiles, every active profile is exported from a single decode
+    of the source (see services/audio_export.py); the requested (or default)
+    profile is written to {episode}.mp3, the others to {episode}-{profile}-{id}.mp3.
+
+    Loudness normalization is two-pass: the source is measured once (cached
+    per source file) and the measured values drive a linear loudnorm.
 
     Args:
         episode: Episode number string (e.g. "0261")
         profile_id: Optional database profile ID to load encoding settings from
         bitrate: Fallback MP3 bitrate if no profile_id (default "192k")
         source_file: Optional specific source filename to use (e.g. "0261.avi")
+        all_profiles: Export every active MP3 profile in one pass
     """
-    # Load profile settings from database if profile_id provided
-    profile_settings = None
-    if profile_id:
+    from services.audio_export import Mp3Profile, build_export_command, measure_loudness, profile_output_name
+
+    # Load profile settings from database
+    profiles = []
+    if profile_id or all_profiles:
         try:
             from database import SessionLocal
             from models_episode import Mp3EncodingProfile
             db = SessionLocal()
             try:
-                profile = db.query(Mp3EncodingProfile).filter(
-                    Mp3EncodingProfile.id == profile_id
-                ).first()
-                if profile:
-                    profile_settings = {
-                        "bitrate": profile.bitrate,
-                        "sample_rate": profile.sample_rate,
-                        "channels": profile.channels,
-                        "quality": profile.quality,
-                        "normalize_audio": profile.normalize_audio,
-                        "name": profile.name,
-                    }
-                    logger.info(f"Using MP3 profile '{profile.name}': {profile.bitrate}, {profile.sample_rate}Hz, {profile.channels}ch")
+                query = db.query(Mp3EncodingProfile)
+                if all_profiles:
+                    # An explicitly requested profile is exported even if inactive
+                    active = Mp3EncodingProfile.is_active == True
+                    if profile_id:
+                        active = or_(active, Mp3EncodingProfile.id == profile_id)
+                    rows = query.filter(active).order_by(
+                        Mp3EncodingProfile.sort_order, Mp3EncodingProfile.id
+                    ).all()
+                    # Primary output: the requested profile, else the default one
+                    rows.sort(key=lambda p: (p.id != profile_id, not p.is_default) if profile_id else not p.is_default)
                 else:
-                    logger.warning(f"MP3 profile {profile_id} not found, using defaults")
+                    rows = query.filter(Mp3EncodingProfile.id == profile_id).all()
+                profiles = [Mp3Profile.from_model(row) for row in rows]
+                if not profiles:
+                    logger.warning(f"MP3 profile(s) not found (profile_id={profile_id}, all_profiles={all_profiles}), using defaults")
             finally:
                 db.close()
         except Exception as e:
-            logger.warning(f"Failed to load MP3 profile {profile_id}: {e}, using defaults")
+            logger.warning(f"Failed to load MP3 profiles: {e}, using defaults")
 
-    # Resolve encoding parameters
-    enc_bitrate = profile_settings["bitrate"] if profile_settings else bitrate
-    enc_sample_rate = profile_settings["sample_rate"] if profile_settings else 44100
-    enc_channels = profile_settings["channels"] if profile_settings else 2
-    enc_quality = profile_settings["quality"] if profile_settings else None
-    enc_normalize = profile_settings["normalize_audio"] if profile_settings else False
+    from_db = bool(profiles)
+    if not profiles:
+        profiles = [Mp3Profile(name="default", bitrate=bitrate)]
+    for profile in profiles:
+        logger.info(f"Using MP3 profile '{profile.name}': {profile.bitrate}, {profile.sample_rate}Hz, {profile.channels}ch")
 
     media_root = get_media_root()
     exports_dir = os.path.join(media_root, "episodes", episode, "exports")
@@ -685,76 +698,87 @@ def generate_episode_mp3(self, episode: str, profile_id: int = None, bitrate: st
     if not source_path:
         raise FileNotFoundError(f"No source video found for episode {episode} in {exports_dir}")
 
-    output_path = os.path.join(exports_dir, f"{episode}.mp3")
-    logger.info(f"Generating MP3: {source_path} -> {output_path}")
+    outputs = [
+        (profile, os.path.join(exports_dir, profile_output_name(episode, profile, primary=(i == 0))))
+        for i, profile in enumerate(profiles)
+    ]
+    # Encode to temporary names so a failed run never leaves a truncated MP3 behind
+    partials = [(profile, f"{path}.part") for profile, path in outputs]
+    logger.info(f"Generating {len(outputs)} MP3(s): {source_path} -> {', '.join(os.path.basename(p) for _, p in outputs)}")
 
     self.update_state(state='PROGRESS', meta={'progress': 5, 'stage': 'starting'})
 
     try:
         ffmpeg = get_ffmpeg_binary()
-        cmd = [
-            ffmpeg, "-y",
-            "-i", source_path,
-            "-vn",
-            "-acodec", "libmp3lame",
-        ]
-
-        # VBR mode (quality) takes precedence over CBR (bitrate)
-        if enc_quality is not None:
-            cmd.extend(["-q:a", str(enc_quality)])
-        else:
-            cmd.extend(["-ab", enc_bitrate])
-
-        cmd.extend(["-ar", str(enc_sample_rate)])
-        cmd.extend(["-ac", str(enc_channels)])
 
-        # Audio normalization (EBU R128)
-        if enc_normalize:
-            cmd.extend(["-af", "loudnorm=I=-16:LRA=11:TP=-1.5"])
+        measurement = None
+        if any(profile.normalize_audio for profile in profiles):
+            self.update_state(state='PROGRESS', meta={'progress': 10, 'stage': 'measuring loudness'})
+            measurement = measure_loudness(ffmpeg, source_path)
 
-        cmd.append(output_path)
+        cmd = build_export_command(ffmpeg, source_path, partials, measurement)
 
-        self.update_state(state='PROGRESS', meta={'progress': 10, 'stage': 'encoding'})
+        self.update_state(state='PROGRESS', meta={'progress': 40 if measurement else 10, 'stage': 'encoding'})
 
-        process = subprocess.Popen(
-            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        duration_probe = subprocess.run(
+            [get_ffprobe_binary(), "-v", "error", "-show_entries", "format=duration",
+             "-of", "default=noprint_wrappers=1:nokey=1", source_path],
+            capture_output=True, text=True
+        )
+        try:
+            source_duration = float(duration_probe.stdout.strip())
+        except ValueError:
+            source_duration = None
+
+        run_ffmpeg(
+            cmd, phase="encoding", duration=source_duration,
+            reporter=ProgressReporter(task=self, job_id=self.request.id),
+            span=(40 if measurement else 10, 95)
         )
-        _, stderr = process.communicate()
-
-        if process.returncode != 0:
-            error_msg = stderr.decode('utf-8', errors='replace')[-500:]
-            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=error_msg)
 
         self.update_state(state='PROGRESS', meta={'progress': 95, 'stage': 'finalizing'})
 
-        file_size = os.path.getsize(output_path)
-        file_size_mb = round(file_size / (1024 * 1024), 1)
-
-        logger.info(f"MP3 generated: {output_path} ({file_size_mb} MB)")
+        results = []
+        for (profile, output_path), (_, partial_path) in zip(outputs, partials):
+            os.replace(partial_path, output_path)
+            file_size_mb = round(os.path.getsize(output_path) / (1024 * 1024), 1)
+            logger.info(f"MP3 generated: {output_path} ({file_size_mb} MB)")
+            results.append({
+                "mp3_path": output_path,
+                "file_size_mb": file_size_mb,
+                "profile": profile.name if from_db else "default",
+                "bitrate": profile.bitrate,
+                "sample_rate": profile.sample_rate,
+                "channels": profile.channels,
+                "normalized": profile.normalize_audio,
+            })
 
+        primary = results[0]
         return {
-            "mp3_path": output_path,
-            "file_size_mb": file_size_mb,
+            "mp3_path": primary["mp3_path"],
+            "file_size_mb": primary["file_size_mb"],
             "source": os.path.basename(source_path),
-            "profile": profile_settings["name"] if profile_settings else "default",
-            "bitrate": enc_bitrate,
-            "sample_rate": enc_sample_rate,
-            "channels": enc_channels,
+            "profile": primary["profile"],
+            "bitrate": primary["bitrate"],
+            "sample_rate": primary["sample_rate"],
+            "channels": primary["channels"],
+            "loudness": measurement,
+            "outputs": results,
             "status": "completed"
         }
 
     except subprocess.CalledProcessError as e:
-        error_msg = str(e.stderr) if hasattr(e, 'stderr') else str(e)
+        error_msg = str(e.stderr)[-500:] if hasattr(e, 'stderr') else str(e)
         logger.error(f"MP3 generation failed: {error_msg}")
-        # Clean up partial output
-        if os.path.exists(output_path):
-            os.remove(output_path)
         raise
     except Exception as e:
         logger.error(f"MP3 generation error: {str(e)}")
-        if os.path.exists(output_path):
-            os.remove(output_path)
         raise
+    finally:
+        # Clean up partial output
+        for _, partial_path in partials:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
 
 
 @shared_task(bind=True, queue='media', name='services.ffmpeg_tasks.generate_thumbnail')
@@ -860,26 +884,26 @@ def process_vo_montage(
             trimmed_clip_path = temp_dir / f"clip_{idx:03d}.mp4"
 
             # Trim the clip using FFmpeg
-            # Determine video encoder based on platform
-            from platform_utils import IS_WINDOWS, has_nvidia_gpu
-            if IS_WINDOWS and has_nvidia_gpu():
-                video_encoder_args = ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "23"]
-            else:
-                video_encoder_args = ["-c:v", "libx264", "-preset", "medium", "-crf", "23"]
-
-            trim_cmd = [
-                ffmpeg, "-y",
-                "-ss", str(start_sec),
-                "-i", str(video_path),
-                "-t", str(clip_duration),
-                *video_encoder_args,
-                "-c:a", "aac",
-                "-b:a", "192k",
-                str(trimmed_clip_path)
-            ]
+            # Video encoder: NVENC if this host has a free session, else libx264
+            def trim_cmd(video_encoder_args):
+                return [
+                    ffmpeg, "-y",
+                    "-ss", str(start_sec),
+                    "-i", str(video_path),
+                    "-t", str(clip_duration),
+                    *video_encoder_args,
+                    "-c:a", "aac",
+                    "-b:a", "192k",
+                    str(trimmed_clip_path)
+                ]
 
             logger.info(f"Trimming clip {idx}: {start_sec}s to {end_sec}s ({clip_duration}s)")
-            subprocess.run(trim_cmd, check=True, capture_output=True)
+            encode_with_failover(
+                trim_cmd,
+                ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "23"],
+                ["-c:v", "libx264", "-preset", "medium", "-crf", "23"],
+                lambda cmd: subprocess.run(cmd, check=True, capture_output=True)
+            )
 
             trimmed_clips.append(trimmed_clip_path)
             total_duration += clip_duration
@@ -1014,7 +1038,7 @@ def _replace_sot_cue_asset_id(episode: str, old_asset_id: str, new_asset_id: str
     """
     try:
         from models_v2 import Rundown, RundownItem, Episode
-        import re
+        from services.rundown_items import WITH_SCRIPT
 
         with db_session() as db:
             # Find the rundown for this episode by joining with Episode
@@ -1024,50 +1048,28 @@ def _replace_sot_cue_asset_id(episode: str, old_asset_id: str, new_asset_id: str
                 return
 
             # Search all rundown items for SOT cue with matching AssetID
-            items = db.query(RundownItem).filter_by(rundown_id=rundown.id).all()
+            items = db.query(RundownItem).options(WITH_SCRIPT).filter_by(rundown_id=rundown.id).all()
 
             for item in items:
                 if not item.script_content:
                     continue
 
-                # Look for SOT cue block with matching AssetID (case-insensitive).
-                # Matches expanded + collapsed cues; the whole block (incl. its
-                # original Begin marker) is captured and field-edited in place,
-                # so the collapsed marker is preserved.
-                cue_pattern = re.compile(
-                    r'(<!-- Begin Cue(?: collapsed)? -->(?:(?!<!-- End Cue -->).)*?\[Type:\s*SOT\](?:(?!<!-- End Cue -->).)*?<!-- End Cue -->)',
-                    re.DOTALL | re.IGNORECASE
-                )
-                asset_pattern = re.compile(r'\[Asset[Ii][Dd]:\s*' + re.escape(old_asset_id) + r'\s*\]', re.IGNORECASE)
-
-                for match in cue_pattern.finditer(item.script_content):
-                    cue_block = match.group(1)
-
-                    # Check if this cue block contains our asset_id
-                    if not asset_pattern.search(cue_block):
-                        continue
-
-                    # Replace old AssetID with new one (case-insensitive)
-                    updated_cue = re.sub(
-                        r'\[Asset[Ii][Dd]:\s*' + re.escape(old_asset_id) + r'\s*\]',
-                        f'[AssetID: {new_asset_id}]',
-                        cue_block,
-                        flags=re.IGNORECASE
-                    )
-
-                    # Also add SourceAssetID field to preserve reference
-                    if '[SourceAssetID:' not in updated_cue.lower():
-                        updated_cue = updated_cue.replace(
-                            f'[AssetID: {new_asset_id}]',
-                            f'[AssetID: {new_asset_id}]\n[SourceAssetID: {old_asset_id}]'
-                        )
+                # SOT cue (expanded or collapsed) with the old AssetID, under
+                # any spelling of the field name; rewritten in place by offset
+                script = parse_script(item.script_content)
+                cue = script.find('SOT', asset_id=old_asset_id)
+                if cue is None:
+                    continue
 
-                    # Replace in script_content
-                    item.script_content = item.script_content.replace(cue_block, updated_cue)
-                    db.commit()
+                updates = {'AssetID': new_asset_id}
+                # Also add SourceAssetID field to preserve reference
+                if not cue.get('Source Asset Id'):
+                    updates['SourceAssetID'] = old_asset_id
+                item.script_content = script.with_fields(cue, updates)
+                db.commit()
 
-                    logger.info(f"✅ Replaced AssetID in cue: {old_asset_id} → {new_asset_id}")
-                    return
+                logger.info(f"✅ Replaced AssetID in cue: {old_asset_id} → {new_asset_id}")
+                return
 
             logger.warning(f"No SOT cue found with AssetID {old_asset_id} in episode {episode}")
 
@@ -1087,7 +1089,7 @@ def _update_sot_cue_block(episode: str, slug: str, asset_id: str, updates: dict)
     """
     try:
         from models_v2 import Rundown, RundownItem, Episode
-        import re
+        from services.rundown_items import WITH_SCRIPT
 
         with db_session() as db:
             # Find the rundown for this episode by joining with Episode
@@ -1097,51 +1099,26 @@ def _update_sot_cue_block(episode: str, slug: str, asset_id: str, updates: dict)
                 return
 
             # Search all rundown items for SOT cue with matching AssetID
-            items = db.query(RundownItem).filter_by(rundown_id=rundown.id).all()
+            items = db.query(RundownItem).options(WITH_SCRIPT).filter_by(rundown_id=rundown.id).all()
 
             for item in items:
                 if not item.script_content:
                     continue
 
-                # Look for SOT cue block with matching AssetID (case-insensitive for field names)
-                # The cue block contains [Type: SOT] and [Asset Id: xxx] or [AssetID: xxx] in any order
-                cue_pattern = re.compile(
-                    r'(<!-- Begin Cue(?: collapsed)? -->(?:(?!<!-- End Cue -->).)*?\[Type:\s*SOT\](?:(?!<!-- End Cue -->).)*?<!-- End Cue -->)',
-                    re.DOTALL | re.IGNORECASE
-                )
-                # Find cue blocks and check if they contain our asset_id
-                # Match both "Asset Id" (space-separated) and "AssetId"/"AssetID" (camelCase)
-                asset_pattern = re.compile(r'\[Asset\s*[Ii][Dd]:\s*' + re.escape(asset_id) + r'\s*\]', re.IGNORECASE)
-
-                # Find all SOT cue blocks and check each for our asset_id
-                for match in cue_pattern.finditer(item.script_content):
-                    cue_block = match.group(1)
-
-                    # Check if this cue block contains our asset_id
-                    if not asset_pattern.search(cue_block):
-                        continue
-
-                    updated_cue = cue_block
-
-                    # Update each field in the cue block (case-insensitive matching)
-                    for field, value in updates.items():
-                        # Check if field exists (case-insensitive), update it
-                        field_pattern = re.compile(rf'\[{field}:\s*[^\]]*\]', re.IGNORECASE)
-                        if field_pattern.search(updated_cue):
-                            updated_cue = field_pattern.sub(f'[{field}: {value}]', updated_cue)
-                        else:
-                            # Add new field before <!-- End Cue -->
-                            updated_cue = updated_cue.replace(
-                                '<!-- End Cue -->',
-                                f'[{field}: {value}]\n<!-- End Cue -->'
-                            )
+                # SOT cue (expanded or collapsed) with our AssetID, under any
+                # spelling of the field name ("Asset Id", "AssetID", ...)
+                script = parse_script(item.script_content)
+                cue = script.find('SOT', asset_id=asset_id)
+                if cue is None:
+                    continue
 
-                    # Replace in script_content
-                    item.script_content = item.script_content.replace(cue_block, updated_cue)
-                    db.commit()
+                # Existing fields are rewritten in place, new ones added before
+                # <!-- End Cue -->; the Begin marker is kept
+                item.script_content = script.with_fields(cue, updates)
+                db.commit()
 
-                    logger.info(f"Updated SOT cue block in item {item.id} for AssetID {asset_id}")
-                    return
+                logger.info(f"Updated SOT cue block in item {item.id} for AssetID {asset_id}")
+                return
 
             logger.warning(f"No SOT cue found with AssetID {asset_id} in episode {episode}")
 
@@ -1421,25 +1398,23 @@ def _process_single_clip(clip_file, clip_slug, clip_asset_id, episode, working_d
                 phase05_audio.unlink()
 
     # PHASE 1: Video normalization
-    # Determine video encoder based on platform
-    from platform_utils import IS_WINDOWS, has_nvidia_gpu
-    if IS_WINDOWS and has_nvidia_gpu():
-        video_encoder_args = ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "23"]
-    else:
-        video_encoder_args = ["-c:v", "libx264", "-preset", "medium", "-crf", "23"]
-
+    # Video encoder: NVENC if this host has a free session, else libx264
     phase1_output = working_dir / f"clip{clip_index}_1_normalized.mp4"
-    phase1_cmd = [
-        ffmpeg, "-y",
-        "-i", str(clip_file),
-        *video_encoder_args,
-        "-r", "29.97",
-        "-b:v", "8000k",
-        "-c:a", "aac",
-        "-b:a", "192k",
-        str(phase1_output)
-    ]
-    result = subprocess.run(phase1_cmd, capture_output=True)
+    result = encode_with_failover(
+        lambda video_encoder_args: [
+            ffmpeg, "-y",
+            "-i", str(clip_file),
+            *video_encoder_args,
+            "-r", "29.97",
+            "-b:v", "8000k",
+            "-c:a", "aac",
+            "-b:a", "192k",
+            str(phase1_output)
+        ],
+        ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "23"],
+        ["-c:v", "libx264", "-preset", "medium", "-crf", "23"],
+        lambda cmd: subprocess.run(cmd, capture_output=True)
+    )
     if result.returncode != 0:
         stderr = result.stderr.decode('utf-8', errors='replace') if result.stderr else 'Unknown'
         logger.error(f"Phase 1 video normalization failed for clip {clip_index}: {stderr[:500]}")
@@ -1582,6 +1557,7 @@ def _insert_multiple_cue_blocks(episode, clip_results, parent_asset_id):
 
     # === LEGACY CODE BELOW (unreachable, kept for reference) ===
     from models_v2 import Rundown, RundownItem, Episode
+    from services.rundown_items import WITH_SCRIPT
     import re
 
     with db_session() as db:
@@ -1591,7 +1567,7 @@ def _insert_multiple_cue_blocks(episode, clip_results, parent_asset_id):
             raise CueInsertionError(f"No rundown found for episode {episode}")
 
         # Search all rundown items for parent SOT cue with matching AssetID
-        items = db.query(RundownItem).filter_by(rundown_id=rundown.id).all()
+        items = db.query(RundownItem).options(WITH_SCRIPT).filter_by(rundown_id=rundown.id).all()
         logger.info(f"🔍 Searching {len(items)} rundown items for parent cue {parent_asset_id}")
 
         for item in items:
@@ -1723,13 +1699,6 @@ def _process_montage(temp_job_id, episode, slug, clips, asset_id, working_dir, n
     extracted_clips = []
     total_duration = 0.0
 
-    # Determine video encoder based on platform
-    from platform_utils import IS_WINDOWS, has_nvidia_gpu
-    if IS_WINDOWS and has_nvidia_gpu():
-        video_encoder_args = ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "23"]
-    else:
-        video_encoder_args = ["-c:v", "libx264", "-preset", "medium", "-crf", "23"]
-
     # Step 1: Extract each clip from source video
     for idx, clip in enumerate(clips, 1):
         clip_start = clip.get('time_start', '00:00:00:00')
@@ -1747,20 +1716,27 @@ def _process_montage(temp_job_id, episode, slug, clips, asset_id, working_dir, n
         extracted_clip_path = temp_montage_dir / f"clip_{idx:03d}.mp4"
 
         # Extract with re-encoding to ensure consistent format for concatenation
-        extract_cmd = [
-            ffmpeg, "-y",
-            "-ss", str(start_sec),
-            "-i", str(input_file),
-            "-t", str(clip_duration),
-            *video_encoder_args,
-            "-c:a", "aac",
-            "-b:a", "192k",
-            str(extracted_clip_path)
-        ]
+        # Video encoder: NVENC if this host has a free session, else libx264
+        def extract_cmd(video_encoder_args):
+            return [
+                ffmpeg, "-y",
+                "-ss", str(start_sec),
+                "-i", str(input_file),
+                "-t", str(clip_duration),
+                *video_encoder_args,
+                "-c:a", "aac",
+                "-b:a", "192k",
+                str(extracted_clip_path)
+            ]
 
         logger.info(f"📹 Extracting montage clip {idx}: {start_sec}s to {end_sec}s ({clip_duration}s)")
 
-        result = subprocess.run(extract_cmd, capture_output=True)
+        result = encode_with_failover(
+            extract_cmd,
+            ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "23"],
+            ["-c:v", "libx264", "-preset", "medium", "-crf", "23"],
+            lambda cmd: subprocess.run(cmd, capture_output=True)
+        )
         if result.returncode != 0:
             stderr = result.stderr.decode('utf-8', errors='replace') if result.stderr else 'Unknown'
             logger.error(f"FFmpeg clip extraction failed for clip {idx}: {stderr[:500]}")
@@ -1869,6 +1845,7 @@ def _update_cue_block_with_result(episode, asset_id, result):
     """
     try:
         from models_v2 import Rundown, RundownItem, Episode
+        from services.rundown_items import WITH_SCRIPT
         import re
 
         with db_session() as db:
@@ -1879,7 +1856,7 @@ def _update_cue_block_with_result(episode, asset_id, result):
                 return
 
             # Search all rundown items for the cue with matching AssetID
-            items = db.query(RundownItem).filter_by(rundown_id=rundown.id).all()
+            items = db.query(RundownItem).options(WITH_SCRIPT).filter_by(rundown_id=rundown.id).all()
 
             for item in items:
                 if not item.script_content:
@@ -2046,6 +2023,7 @@ def sot_prepare(
             "devel_mode": devel_mode,
             "intermediate_files": [] if devel_mode else None
         }
+        reporter = ProgressReporter(task=self, job_id=temp_job_id, report=processing_report)
 
         ffmpeg = get_ffmpeg_binary()
         ffprobe = get_ffprobe_binary()
@@ -2328,45 +2306,38 @@ def sot_prepare(
             # ends on the exact requested frame. The full resolution/framerate
             # normalization still happens later in Phase 6 (sot_finalize) — here
             # we only re-encode for cut accuracy, so use the same encoder pick.
-            from platform_utils import IS_WINDOWS, has_nvidia_gpu
-            if IS_WINDOWS and has_nvidia_gpu():
-                video_encoder_args = ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "18", "-maxrate", "8M", "-bufsize", "16M"]
-            else:
-                video_encoder_args = ["-c:v", "libx264", "-preset", "medium", "-crf", "18"]
-
             # Audio handling for the trim re-encode. When the source has audio,
             # re-encode it to AAC alongside the video; when it doesn't, drop it
             # (the silent track is injected later in Phase 6).
             trim_audio_args = ["-c:a", "aac", "-b:a", "192k", "-ar", "48000", "-ac", "2"] if has_audio else ["-an"]
 
+            start_sec = _timecode_to_seconds(trim_start)
             if not _is_zero_time(trim_end):
-                start_sec = _timecode_to_seconds(trim_start)
                 end_sec = _timecode_to_seconds(trim_end)
                 trim_duration = end_sec - start_sec
-                phase3_cmd = [
-                    ffmpeg, "-y",
-                    "-ss", str(start_sec),  # fast seek to nearby keyframe
-                    "-i", str(input_file),
-                    "-t", str(trim_duration),
-                    *video_encoder_args,
-                    *trim_audio_args,
-                    str(phase3_output)
-                ]
+                trim_length_args = ["-t", str(trim_duration)]
             else:
                 # Trim from start only (frame-accurate re-encode; see note above)
-                start_sec = _timecode_to_seconds(trim_start)
-                phase3_cmd = [
+                trim_duration = duration_seconds - start_sec
+                trim_length_args = []
+
+            encode_with_failover(
+                lambda video_encoder_args: [
                     ffmpeg, "-y",
                     "-ss", str(start_sec),  # fast seek to nearby keyframe
                     "-i", str(input_file),
+                    *trim_length_args,
                     *video_encoder_args,
                     *trim_audio_args,
                     str(phase3_output)
-                ]
-
-            subprocess.run(phase3_cmd, check=True, capture_output=True)
+                ],
+                ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "18", "-maxrate", "8M", "-bufsize", "16M"],
+                ["-c:v", "libx264", "-preset", "medium", "-crf", "18"],
+                lambda cmd: run_ffmpeg(cmd, phase="phase3", duration=trim_duration, reporter=reporter)
+            )
             logger.info(f"Phase 3 complete (trimmed): {phase3_output}")
             trimmed_file = phase3_output
+            trimmed_duration = trim_duration
 
             if asset_id:
                 _update_sot_cue_block(episode, slug, asset_id, {
@@ -2376,6 +2347,7 @@ def sot_prepare(
             # No trimming needed — pass the upload through unchanged
             logger.info(f"Phase 3: Skipped (no trimming needed) for {temp_job_id}")
             trimmed_file = input_file
+            trimmed_duration = duration_seconds
             if asset_id:
                 _update_sot_cue_block(episode, slug, asset_id, {
                     'ProcessingStatus': 'Phase 3 Skipped: No Trimming Needed'
@@ -2394,7 +2366,7 @@ def sot_prepare(
                 "-ac", "1",
                 str(phase3_audio)
             ]
-            subprocess.run(audio_extract_cmd, check=True, capture_output=True)
+            run_ffmpeg(audio_extract_cmd, phase="phase3_audio", duration=trimmed_duration, reporter=reporter)
             audio_wav_path = str(phase3_audio)
             logger.info(f"Phase 3: Trimmed audio extracted to {phase3_audio} (for whisper link)")
 
@@ -2420,6 +2392,11 @@ def sot_prepare(
             "transcription": None,
             "outcue": "",
         }
+        record_checkpoint(
+            temp_job_id, 3, ctx,
+            {"trimmed": trimmed_file, "audio_wav": audio_wav_path},
+            media=("trimmed", "audio_wav")
+        )
         return ctx
 
     except subprocess.CalledProcessError as e:
@@ -2481,6 +2458,7 @@ def transcribe_sot_audio(self, ctx: dict):
                 'Transcription': '',
                 'Outcue': ''
             })
+        record_checkpoint(temp_job_id, 4, ctx, {"trimmed": ctx["trimmed_file"]})
         return ctx
 
     logger.info(f"Phase 4: Transcribing trimmed audio for {temp_job_id} on {platform.node()}")
@@ -2509,6 +2487,9 @@ def transcribe_sot_audio(self, ctx: dict):
                 'Outcue': outcue_text
             })
 
+        # Only a real transcript is checkpointed; recovery retries whisper after a failure
+        record_checkpoint(temp_job_id, 4, ctx, {"trimmed": ctx["trimmed_file"]})
+
     except Exception as e:
         # NON-FATAL: keep the chain going so the rest of the pipeline still runs.
         logger.error(f"Phase 4: Transcription failed: {e}")
@@ -2550,6 +2531,7 @@ def sot_finalize(self, ctx: dict):
     Returns the final result dict (same shape the original returned).
     """
     import json
+    import shutil
     from models_v2 import SOTProcessingJob
 
     temp_job_id = ctx["temp_job_id"]
@@ -2571,442 +2553,504 @@ def sot_finalize(self, ctx: dict):
         "phases": {}, "failures": [], "warnings": [],
         "devel_mode": devel_mode, "intermediate_files": [] if devel_mode else None
     }
+    ctx["processing_report"] = processing_report
     transcription_text = ctx.get("transcription")
+    reporter = ProgressReporter(task=self, job_id=temp_job_id, report=processing_report)
 
     ffmpeg = get_ffmpeg_binary()
     ffprobe = get_ffprobe_binary()
     episodes_root = media_root / "episodes"
 
+    # When orphan recovery re-enqueues a job lost mid-finalize, phases whose
+    # verified outputs are checkpointed are skipped and their outputs reused.
+    checkpoint = load_checkpoint(temp_job_id)
+    resume_phase = checkpoint.resume_phase()
+    if resume_phase >= 6:
+        has_audio = True  # phase 6 always leaves an audio track (real or injected)
+    phase6_output = checkpoint.artifact(6, "video")
+    phase7_output = checkpoint.artifact(7, "video")
+    phase8_output = checkpoint.artifact(9, "video") or checkpoint.artifact(8, "video")
+    phase9_thumbs = checkpoint.artifact(9, "thumbnails") or []
+    phase9_audio = checkpoint.artifact(9, "audio")
+    final_video = checkpoint.artifact(10, "video")
+    final_audio = checkpoint.artifact(10, "audio")
+    final_thumbs = checkpoint.artifact(10, "thumbnails") or []
+    duration = ctx.get("final_duration")
+
     try:
-        logger.info(f"🎬 sot_finalize on {platform.node()} for {temp_job_id}")
+        logger.info(f"🎬 sot_finalize on {platform.node()} for {temp_job_id}"
+                    + (f" (resuming after phase {resume_phase})" if resume_phase >= 5 else ""))
 
         # ================================================================
         # PHASE 5: Analyze the TRIMMED clip (real cue-block metadata)
         #  - Re-probe the trimmed file so duration/etc reflect what the user
         #    actually kept (the raw probe in phase 2 was sanity-only).
         # ================================================================
-        logger.info(f"Phase 5: Analyzing trimmed clip for {temp_job_id}")
-        _update_job_status(temp_job_id, 'phase5', 'processing')
-
-        trimmed_duration_probe = subprocess.run(
-            [ffprobe, "-v", "error", "-show_entries", "format=duration",
-             "-of", "default=noprint_wrappers=1:nokey=1", str(trimmed_file)],
-            capture_output=True, text=True, check=True
-        )
-        trimmed_duration_seconds = float(trimmed_duration_probe.stdout.strip())
-        t_hours = int(trimmed_duration_seconds // 3600)
-        t_minutes = int((trimmed_duration_seconds % 3600) // 60)
-        t_seconds = int(trimmed_duration_seconds % 60)
-        trimmed_duration_formatted = f"{t_hours:02d}:{t_minutes:02d}:{t_seconds:02d}"
+        if resume_phase < 5:
+            logger.info(f"Phase 5: Analyzing trimmed clip for {temp_job_id}")
+            _update_job_status(temp_job_id, 'phase5', 'processing')
+
+            trimmed_duration_probe = subprocess.run(
+                [ffprobe, "-v", "error", "-show_entries", "format=duration",
+                 "-of", "default=noprint_wrappers=1:nokey=1", str(trimmed_file)],
+                capture_output=True, text=True, check=True
+            )
+            trimmed_duration_seconds = float(trimmed_duration_probe.stdout.strip())
+            t_hours = int(trimmed_duration_seconds // 3600)
+            t_minutes = int((trimmed_duration_seconds % 3600) // 60)
+            t_seconds = int(trimmed_duration_seconds % 60)
+            trimmed_duration_formatted = f"{t_hours:02d}:{t_minutes:02d}:{t_seconds:02d}"
+
+            processing_report["phases"]["phase5"] = {
+                "status": "success",
+                "data": {"duration": trimmed_duration_formatted, "duration_seconds": trimmed_duration_seconds}
+            }
+            logger.info(f"Phase 5 analyze: trimmed duration {trimmed_duration_formatted}")
 
-        processing_report["phases"]["phase5"] = {
-            "status": "success",
-            "data": {"duration": trimmed_duration_formatted, "duration_seconds": trimmed_duration_seconds}
-        }
-        logger.info(f"Phase 5 analyze: trimmed duration {trimmed_duration_formatted}")
+            if asset_id:
+                _update_sot_cue_block(episode, slug, asset_id, {
+                    'ProcessingStatus': 'Phase 5 Complete: Trimmed Clip Analyzed',
+                    'Duration': trimmed_duration_formatted
+                })
 
-        if asset_id:
-            _update_sot_cue_block(episode, slug, asset_id, {
-                'ProcessingStatus': 'Phase 5 Complete: Trimmed Clip Analyzed',
-                'Duration': trimmed_duration_formatted
-            })
+            record_checkpoint(temp_job_id, 5, ctx, {"trimmed": trimmed_file})
+        else:
+            logger.info(f"Phase 5: already completed (checkpoint) for {temp_job_id}")
+            # A resumed or redelivered ctx can predate phase 5; its analysis
+            # (the clip duration below) is in the checkpointed report
+            if "phase5" not in processing_report["phases"]:
+                saved_report = (checkpoint.ctx or {}).get("processing_report") or {}
+                saved_phase5 = saved_report.get("phases", {}).get("phase5")
+                if saved_phase5:
+                    processing_report["phases"]["phase5"] = saved_phase5
+
+        # Expected output length of every encode below (for progress/ETA)
+        clip_duration = processing_report["phases"].get("phase5", {}).get("data", {}).get("duration_seconds")
 
         # ================================================================
         # PHASE 6: Video Normalization
         #  - Convert to H.264/AAC MP4, 29.97fps, max width 1920
         # ================================================================
-        logger.info(f"Phase 6: Video normalization for {temp_job_id}")
-        _update_job_status(temp_job_id, 'phase6', 'processing')
+        if resume_phase < 6:
+            logger.info(f"Phase 6: Video normalization for {temp_job_id}")
+            _update_job_status(temp_job_id, 'phase6', 'processing')
+
+            phase6_output = working_dir / f"{temp_job_id}_6_normalized.mp4"
+
+            # Video encoder: NVENC if this host has a free session (admission
+            # control, see services/nvenc_sessions.py), libx264 otherwise.
+            # When the source has NO audio track, synthesize a silent stereo track
+            # (anullsrc) as a second input so the normalized MP4 always carries audio.
+            # Every downstream phase (channel analysis, loudness, MP3 extraction) then
+            # runs unchanged, and the SOT ships WITH a real (silent) audio track
+            # instead of being audio-less — broadcast-safer and consistent across
+            # workers. See MEMORY: project_audioless_sot_silent_inject.
+            if has_audio:
+                phase6_inputs = ["-i", str(trimmed_file)]
+                phase6_tail = []
+            else:
+                phase6_inputs = [
+                    "-i", str(trimmed_file),
+                    "-f", "lavfi",
+                    "-i", "anullsrc=channel_layout=stereo:sample_rate=48000",
+                    "-map", "0:v:0",
+                    "-map", "1:a:0",
+                ]
+                phase6_tail = ["-shortest"]  # stop at end of video (silent input is infinite)
 
-        phase6_output = working_dir / f"{temp_job_id}_6_normalized.mp4"
+            encode_with_failover(
+                lambda video_encoder_args: [
+                    ffmpeg, "-y",
+                    *phase6_inputs,
+                    *video_encoder_args,
+                    "-r", "29.97",  # Broadcast standard framerate
+                    "-vf", "scale='if(gt(iw,1920),1920,-2)':'-2'",  # Max width 1920, maintain aspect
+                    "-c:a", "aac", "-b:a", "192k", "-ar", "48000", "-ac", "2",
+                    *phase6_tail,
+                    str(phase6_output)
+                ],
+                ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "18", "-maxrate", "8M", "-bufsize", "16M"],
+                ["-c:v", "libx264", "-preset", "medium", "-crf", "18"],
+                lambda cmd: run_ffmpeg(cmd, phase="phase6", duration=clip_duration, reporter=reporter)
+            )
+            logger.info(f"Phase 6 complete: {phase6_output}")
 
-        # Determine video encoder based on platform.
-        # NVENC for Windows with GPU, libx264 CPU fallback for Linux workers.
-        from platform_utils import IS_WINDOWS, has_nvidia_gpu
-        if IS_WINDOWS and has_nvidia_gpu():
-            video_encoder_args = ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "18", "-maxrate", "8M", "-bufsize", "16M"]
-        else:
-            video_encoder_args = ["-c:v", "libx264", "-preset", "medium", "-crf", "18"]
-
-        # When the source has NO audio track, synthesize a silent stereo track
-        # (anullsrc) as a second input so the normalized MP4 always carries audio.
-        # Every downstream phase (channel analysis, loudness, MP3 extraction) then
-        # runs unchanged, and the SOT ships WITH a real (silent) audio track
-        # instead of being audio-less — broadcast-safer and consistent across
-        # workers. See MEMORY: project_audioless_sot_silent_inject.
-        if has_audio:
-            phase6_cmd = [
-                ffmpeg, "-y",
-                "-i", str(trimmed_file),
-                *video_encoder_args,
-                "-r", "29.97",  # Broadcast standard framerate
-                "-vf", "scale='if(gt(iw,1920),1920,-2)':'-2'",  # Max width 1920, maintain aspect
-                "-c:a", "aac", "-b:a", "192k", "-ar", "48000", "-ac", "2",
-                str(phase6_output)
-            ]
-        else:
-            phase6_cmd = [
-                ffmpeg, "-y",
-                "-i", str(trimmed_file),
-                "-f", "lavfi",
-                "-i", "anullsrc=channel_layout=stereo:sample_rate=48000",
-                "-map", "0:v:0",
-                "-map", "1:a:0",
-                *video_encoder_args,
-                "-r", "29.97",  # Broadcast standard framerate
-                "-vf", "scale='if(gt(iw,1920),1920,-2)':'-2'",  # Max width 1920, maintain aspect
-                "-c:a", "aac", "-b:a", "192k", "-ar", "48000", "-ac", "2",
-                "-shortest",  # stop at end of video (silent input is infinite)
-                str(phase6_output)
-            ]
-        subprocess.run(phase6_cmd, check=True, capture_output=True)
-        logger.info(f"Phase 6 complete: {phase6_output}")
+            # From here on the normalized file ALWAYS has an audio track (real or the
+            # injected silent one), so let the audio phases (7 channels, 8/9 loudness,
+            # MP3) run normally instead of being skipped.
+            has_audio = True
 
-        # From here on the normalized file ALWAYS has an audio track (real or the
-        # injected silent one), so let the audio phases (7 channels, 8/9 loudness,
-        # MP3) run normally instead of being skipped.
-        has_audio = True
+            if asset_id:
+                _update_sot_cue_block(episode, slug, asset_id, {
+                    'ProcessingStatus': 'Phase 6 Complete: Video Normalized'
+                })
 
-        if asset_id:
-            _update_sot_cue_block(episode, slug, asset_id, {
-                'ProcessingStatus': 'Phase 6 Complete: Video Normalized'
-            })
+            record_checkpoint(temp_job_id, 6, ctx, {"video": phase6_output}, media=("video",))
+        else:
+            logger.info(f"Phase 6: already completed (checkpoint) for {temp_job_id}")
 
         # ================================================================
         # PHASE 7: Audio Channel Analysis and Dual-Mono Conversion
         #  - Convert to dual-mono if channels are unbalanced
         #  - Skipped entirely when the source has no audio track.
         # ================================================================
-        if not has_audio:
-            logger.info(f"Phase 7: Skipped (no audio track) for {temp_job_id}")
-            _update_job_status(temp_job_id, 'phase7', 'skipped')
-            phase7_output = phase6_output
-            if asset_id:
-                _update_sot_cue_block(episode, slug, asset_id, {
-                    'ProcessingStatus': 'Phase 7 Skipped: No Audio Track',
-                    'AudioProcessing': 'No audio track'
-                })
-        else:
-            logger.info(f"Phase 7: Audio channel analysis for {temp_job_id}")
-            _update_job_status(temp_job_id, 'phase7', 'processing')
-
-            analyze_cmd = [
-                ffmpeg,
-                "-i", str(phase6_output),
-                "-map", "0:a:0",
-                "-af", "astats=measure_overall=Peak_level:measure_perchannel=Peak_level",
-                "-f", "null",
-                "-"
-            ]
-            analyze_result = subprocess.run(analyze_cmd, capture_output=True, text=True)
-            astats_output = analyze_result.stderr
-
-            import re
-            channel_levels = []
-            for line in astats_output.split('\n'):
-                if 'Peak level dB' in line:
-                    if '-inf' in line.lower():
-                        channel_levels.append(-96.0)
-                    elif 'inf' in line.lower():
-                        channel_levels.append(0.0)
-                    else:
-                        match = re.search(r'Peak level dB:\s*([-]?\d+\.?\d*)', line)
-                        if match:
-                            try:
-                                channel_levels.append(float(match.group(1)))
-                            except ValueError:
-                                logger.warning(f"Could not parse dB level from: {line}")
-                                channel_levels.append(-96.0)
-
-            logger.info(f"Phase 7: Channel levels: {channel_levels}")
-
-            needs_dual_mono = False
-            if len(channel_levels) >= 2:
-                left_level = channel_levels[0]
-                right_level = channel_levels[1]
-                level_diff = abs(left_level - right_level)
-                if level_diff > 10:
-                    needs_dual_mono = True
-                    logger.info(f"Phase 7: Unbalanced channels detected ({level_diff:.1f}dB diff), converting to dual-mono")
-
-            phase7_output = working_dir / f"{temp_job_id}_7_audio-fixed.mp4"
-
-            if needs_dual_mono:
-                dual_mono_cmd = [
-                    ffmpeg, "-y",
-                    "-i", str(phase6_output),
-                    "-c:v", "copy",
-                    "-af", "pan=stereo|c0=0.5*c0+0.5*c1|c1=0.5*c0+0.5*c1",
-                    "-c:a", "aac",
-                    "-b:a", "192k",
-                    str(phase7_output)
-                ]
-                subprocess.run(dual_mono_cmd, check=True, capture_output=True)
-                logger.info(f"Phase 7 complete: Converted to dual-mono")
+        if resume_phase < 7:
+            if not has_audio:
+                logger.info(f"Phase 7: Skipped (no audio track) for {temp_job_id}")
+                _update_job_status(temp_job_id, 'phase7', 'skipped')
+                phase7_output = phase6_output
                 if asset_id:
                     _update_sot_cue_block(episode, slug, asset_id, {
-                        'ProcessingStatus': 'Phase 7 Complete: Dual-Mono Conversion Applied',
-                        'AudioProcessing': 'Dual-mono conversion (unbalanced channels detected)'
+                        'ProcessingStatus': 'Phase 7 Skipped: No Audio Track',
+                        'AudioProcessing': 'No audio track'
                     })
             else:
-                import shutil
-                shutil.copy2(phase6_output, phase7_output)
-                logger.info(f"Phase 7 complete: Channels balanced, no conversion needed")
-                if asset_id:
-                    _update_sot_cue_block(episode, slug, asset_id, {
-                        'ProcessingStatus': 'Phase 7 Complete: Audio Channels OK',
-                        'AudioProcessing': 'Channels balanced'
-                    })
+                logger.info(f"Phase 7: Audio channel analysis for {temp_job_id}")
+                _update_job_status(temp_job_id, 'phase7', 'processing')
+
+                analyze_cmd = [
+                    ffmpeg,
+                    "-i", str(phase6_output),
+                    "-map", "0:a:0",
+                    "-af", "astats=measure_overall=Peak_level:measure_perchannel=Peak_level",
+                    "-f", "null",
+                    "-"
+                ]
+                analyze_result = subprocess.run(analyze_cmd, capture_output=True, text=True)
+                astats_output = analyze_result.stderr
+
+                import re
+                channel_levels = []
+                for line in astats_output.split('\n'):
+                    if 'Peak level dB' in line:
+                        if '-inf' in line.lower():
+                            channel_levels.append(-96.0)
+                        elif 'inf' in line.lower():
+                            channel_levels.append(0.0)
+                        else:
+                            match = re.search(r'Peak level dB:\s*([-]?\d+\.?\d*)', line)
+                            if match:
+                                try:
+                                    channel_levels.append(float(match.group(1)))
+                                except ValueError:
+                                    logger.warning(f"Could not parse dB level from: {line}")
+                                    channel_levels.append(-96.0)
+
+                logger.info(f"Phase 7: Channel levels: {channel_levels}")
+
+                needs_dual_mono = False
+                if len(channel_levels) >= 2:
+                    left_level = channel_levels[0]
+                    right_level = channel_levels[1]
+                    level_diff = abs(left_level - right_level)
+                    if level_diff > 10:
+                        needs_dual_mono = True
+                        logger.info(f"Phase 7: Unbalanced channels detected ({level_diff:.1f}dB diff), converting to dual-mono")
+
+                phase7_output = working_dir / f"{temp_job_id}_7_audio-fixed.mp4"
+
+                if needs_dual_mono:
+                    dual_mono_cmd = [
+                        ffmpeg, "-y",
+                        "-i", str(phase6_output),
+                        "-c:v", "copy",
+                        "-af", "pan=stereo|c0=0.5*c0+0.5*c1|c1=0.5*c0+0.5*c1",
+                        "-c:a", "aac",
+                        "-b:a", "192k",
+                        str(phase7_output)
+                    ]
+                    run_ffmpeg(dual_mono_cmd, phase="phase7", duration=clip_duration, reporter=reporter)
+                    logger.info(f"Phase 7 complete: Converted to dual-mono")
+                    if asset_id:
+                        _update_sot_cue_block(episode, slug, asset_id, {
+                            'ProcessingStatus': 'Phase 7 Complete: Dual-Mono Conversion Applied',
+                            'AudioProcessing': 'Dual-mono conversion (unbalanced channels detected)'
+                        })
+                else:
+                    shutil.copy2(phase6_output, phase7_output)
+                    logger.info(f"Phase 7 complete: Channels balanced, no conversion needed")
+                    if asset_id:
+                        _update_sot_cue_block(episode, slug, asset_id, {
+                            'ProcessingStatus': 'Phase 7 Complete: Audio Channels OK',
+                            'AudioProcessing': 'Channels balanced'
+                        })
+
+            record_checkpoint(temp_job_id, 7, ctx, {"video": phase7_output}, media=("video",))
+        else:
+            logger.info(f"Phase 7: already completed (checkpoint) for {temp_job_id}")
 
         # ================================================================
         # PHASE 8: Audio Normalization (EBU R128 loudness)
         #  - -23 LUFS target, dynamic range compression, peak limit -1dB
         #  - Skipped entirely when the source has no audio track.
         # ================================================================
-        if not has_audio:
-            logger.info(f"Phase 8: Skipped (no audio track) for {temp_job_id}")
-            _update_job_status(temp_job_id, 'phase8', 'skipped')
-            phase8_output = phase7_output
-            if asset_id:
-                _update_sot_cue_block(episode, slug, asset_id, {
-                    'ProcessingStatus': 'Phase 8 Skipped: No Audio Track'
-                })
-        else:
-            logger.info(f"Phase 8: Audio normalization for {temp_job_id}")
-            _update_job_status(temp_job_id, 'phase8', 'processing')
+        if resume_phase < 8:
+            if not has_audio:
+                logger.info(f"Phase 8: Skipped (no audio track) for {temp_job_id}")
+                _update_job_status(temp_job_id, 'phase8', 'skipped')
+                phase8_output = phase7_output
+                if asset_id:
+                    _update_sot_cue_block(episode, slug, asset_id, {
+                        'ProcessingStatus': 'Phase 8 Skipped: No Audio Track'
+                    })
+            else:
+                logger.info(f"Phase 8: Audio normalization for {temp_job_id}")
+                _update_job_status(temp_job_id, 'phase8', 'processing')
 
-            phase8_output = working_dir / f"{temp_job_id}_8_audio-normalized.mp4"
-            phase8_cmd = [
-                ffmpeg, "-y",
-                "-i", str(phase7_output),
-                "-c:v", "copy",
-                "-af", "loudnorm=I=-23:TP=-1:LRA=11,acompressor=threshold=-18dB:ratio=4:attack=5:release=50",
-                "-c:a", "aac",
-                "-b:a", "192k",
-                str(phase8_output)
-            ]
-            subprocess.run(phase8_cmd, check=True, capture_output=True)
-            logger.info(f"Phase 8 complete: {phase8_output}")
-            if asset_id:
-                _update_sot_cue_block(episode, slug, asset_id, {
-                    'ProcessingStatus': 'Phase 8 Complete: Audio Normalized'
-                })
+                phase8_output = working_dir / f"{temp_job_id}_8_audio-normalized.mp4"
+                phase8_cmd = [
+                    ffmpeg, "-y",
+                    "-i", str(phase7_output),
+                    "-c:v", "copy",
+                    "-af", "loudnorm=I=-23:TP=-1:LRA=11,acompressor=threshold=-18dB:ratio=4:attack=5:release=50",
+                    "-c:a", "aac",
+                    "-b:a", "192k",
+                    str(phase8_output)
+                ]
+                run_ffmpeg(phase8_cmd, phase="phase8", duration=clip_duration, reporter=reporter)
+                logger.info(f"Phase 8 complete: {phase8_output}")
+                if asset_id:
+                    _update_sot_cue_block(episode, slug, asset_id, {
+                        'ProcessingStatus': 'Phase 8 Complete: Audio Normalized'
+                    })
+
+            record_checkpoint(temp_job_id, 8, ctx, {"video": phase8_output}, media=("video",))
+        else:
+            logger.info(f"Phase 8: already completed (checkpoint) for {temp_job_id}")
 
         # ================================================================
         # PHASE 9: Derivative Extraction
         #  - Generate 15 thumbnail options + MP3 audio extract
         # ================================================================
-        logger.info(f"Phase 9: Derivative extraction for {temp_job_id}")
-        _update_job_status(temp_job_id, 'phase9', 'processing')
-
-        # Get video duration for thumbnail spacing (use the processed clip)
-        duration_probe = subprocess.run(
-            [ffprobe, "-v", "error", "-show_entries", "format=duration",
-             "-of", "default=noprint_wrappers=1:nokey=1", str(phase8_output)],
-            capture_output=True, text=True, check=True
-        )
-        video_duration = float(duration_probe.stdout.strip())
-
-        num_thumbnails = 15  # Generate 15 options for user selection
+        if resume_phase < 9:
+            logger.info(f"Phase 9: Derivative extraction for {temp_job_id}")
+            _update_job_status(temp_job_id, 'phase9', 'processing')
+
+            # Get video duration for thumbnail spacing (use the processed clip)
+            duration_probe = subprocess.run(
+                [ffprobe, "-v", "error", "-show_entries", "format=duration",
+                 "-of", "default=noprint_wrappers=1:nokey=1", str(phase8_output)],
+                capture_output=True, text=True, check=True
+            )
+            video_duration = float(duration_probe.stdout.strip())
 
-        if video_duration < 10:
-            start_offset = min(0.5, video_duration * 0.1)
-            end_offset = max(start_offset, video_duration - start_offset)
-            logger.info(f"Phase 9: Short video ({video_duration:.1f}s), using reduced offsets: {start_offset:.1f}s")
-        else:
-            start_offset = 2
-            end_offset = max(2, video_duration - 2)
+            num_thumbnails = 15  # Generate 15 options for user selection
 
-        usable_duration = end_offset - start_offset
+            if video_duration < 10:
+                start_offset = min(0.5, video_duration * 0.1)
+                end_offset = max(start_offset, video_duration - start_offset)
+                logger.info(f"Phase 9: Short video ({video_duration:.1f}s), using reduced offsets: {start_offset:.1f}s")
+            else:
+                start_offset = 2
+                end_offset = max(2, video_duration - 2)
 
-        thumbnail_times = []
-        if usable_duration > 0:
-            for i in range(num_thumbnails):
-                time_point = start_offset + (usable_duration * i / (num_thumbnails - 1))
-                thumbnail_times.append(time_point)
-        else:
-            for i in range(num_thumbnails):
-                time_point = video_duration * i / (num_thumbnails - 1)
-                thumbnail_times.append(max(0.1, time_point))
-            logger.warning(f"Phase 9: Very short video, using full duration for thumbnails")
+            usable_duration = end_offset - start_offset
 
-        phase9_thumbs = []
-        thumbnail_data = []  # Store (filename, sharpness, time_point) tuples
-        for i, time_point in enumerate(thumbnail_times, 1):
-            thumb_file = working_dir / f"{temp_job_id}_9_thumb_{i:02d}.png"
-            thumb_cmd = [
-                ffmpeg, "-y",
-                "-i", str(phase8_output),
-                "-ss", str(time_point),
-                "-vframes", "1",
-                str(thumb_file)
-            ]
-            subprocess.run(thumb_cmd, check=True, capture_output=True)
+            thumbnail_times = []
+            if usable_duration > 0:
+                for i in range(num_thumbnails):
+                    time_point = start_offset + (usable_duration * i / (num_thumbnails - 1))
+                    thumbnail_times.append(time_point)
+            else:
+                for i in range(num_thumbnails):
+                    time_point = video_duration * i / (num_thumbnails - 1)
+                    thumbnail_times.append(max(0.1, time_point))
+                logger.warning(f"Phase 9: Very short video, using full duration for thumbnails")
+
+            phase9_thumbs = []
+            thumbnail_data = []  # Store (filename, sharpness, time_point) tuples
+            for i, time_point in enumerate(thumbnail_times, 1):
+                thumb_file = working_dir / f"{temp_job_id}_9_thumb_{i:02d}.png"
+                thumb_cmd = [
+                    ffmpeg, "-y",
+                    "-i", str(phase8_output),
+                    "-ss", str(time_point),
+                    "-vframes", "1",
+                    str(thumb_file)
+                ]
+                subprocess.run(thumb_cmd, check=True, capture_output=True)
 
-            # Calculate sharpness score — also validates the file is a real PNG.
-            # A single corrupt thumbnail shouldn't kill an otherwise successful job.
-            try:
-                sharpness = calculate_sharpness_simple(str(thumb_file))
-            except (ValueError, FileNotFoundError) as e:
-                logger.warning(f"Phase 9: skipping thumbnail {i}/{num_thumbnails} at {time_point:.1f}s ({e})")
+                # Calculate sharpness score — also validates the file is a real PNG.
+                # A single corrupt thumbnail shouldn't kill an otherwise successful job.
                 try:
-                    thumb_file.unlink()
-                except FileNotFoundError:
-                    pass
-                continue
+                    sharpness = calculate_sharpness_simple(str(thumb_file))
+                except (ValueError, FileNotFoundError) as e:
+                    logger.warning(f"Phase 9: skipping thumbnail {i}/{num_thumbnails} at {time_point:.1f}s ({e})")
+                    try:
+                        thumb_file.unlink()
+                    except FileNotFoundError:
+                        pass
+                    continue
 
-            phase9_thumbs.append(thumb_file)
-            thumbnail_data.append({
-                'filename': f"{temp_job_id}_9_thumb_{i:02d}.png",
-                'sharpness': sharpness,
-                'time': time_point,
-                'index': i
-            })
-            logger.info(f"Phase 9: Generated thumbnail {i}/{num_thumbnails} at {time_point:.1f}s (sharpness: {sharpness:.1f})")
+                phase9_thumbs.append(thumb_file)
+                thumbnail_data.append({
+                    'filename': f"{temp_job_id}_9_thumb_{i:02d}.png",
+                    'sharpness': sharpness,
+                    'time': time_point,
+                    'index': i
+                })
+                logger.info(f"Phase 9: Generated thumbnail {i}/{num_thumbnails} at {time_point:.1f}s (sharpness: {sharpness:.1f})")
 
-        thumbnail_data_sorted = sorted(thumbnail_data, key=lambda x: x['sharpness'], reverse=True)
+            thumbnail_data_sorted = sorted(thumbnail_data, key=lambda x: x['sharpness'], reverse=True)
 
-        max_sharpness = thumbnail_data_sorted[0]['sharpness'] if thumbnail_data_sorted else 0
-        avg_sharpness = sum(t['sharpness'] for t in thumbnail_data) / len(thumbnail_data) if thumbnail_data else 0
+            max_sharpness = thumbnail_data_sorted[0]['sharpness'] if thumbnail_data_sorted else 0
+            avg_sharpness = sum(t['sharpness'] for t in thumbnail_data) / len(thumbnail_data) if thumbnail_data else 0
 
-        if max_sharpness < SHARPNESS_THRESHOLD_BLURRY:
-            logger.warning(f"⚠️ Phase 9: ALL thumbnails appear blurry! Max sharpness: {max_sharpness:.1f} (threshold: {SHARPNESS_THRESHOLD_BLURRY})")
-            logger.warning(f"⚠️ Source video may contain motion blur or be out of focus")
-        elif avg_sharpness < SHARPNESS_THRESHOLD_WARNING:
-            logger.warning(f"⚠️ Phase 9: Thumbnails have below-average sharpness. Avg: {avg_sharpness:.1f}")
+            if max_sharpness < SHARPNESS_THRESHOLD_BLURRY:
+                logger.warning(f"⚠️ Phase 9: ALL thumbnails appear blurry! Max sharpness: {max_sharpness:.1f} (threshold: {SHARPNESS_THRESHOLD_BLURRY})")
+                logger.warning(f"⚠️ Source video may contain motion blur or be out of focus")
+            elif avg_sharpness < SHARPNESS_THRESHOLD_WARNING:
+                logger.warning(f"⚠️ Phase 9: Thumbnails have below-average sharpness. Avg: {avg_sharpness:.1f}")
 
-        thumbnail_filenames = [t['filename'] for t in thumbnail_data]
-        best_thumbnail_idx = next((i for i, t in enumerate(thumbnail_data) if t['filename'] == thumbnail_data_sorted[0]['filename']), 0)
-
-        with db_session() as db:
-            job = db.query(SOTProcessingJob).filter_by(temp_job_id=temp_job_id).first()
-            if job:
-                job.thumbnail_candidates = thumbnail_filenames
-                job.selected_thumbnail = thumbnail_data_sorted[0]['filename'] if thumbnail_data_sorted else thumbnail_filenames[0]
-                db.commit()
+            thumbnail_filenames = [t['filename'] for t in thumbnail_data]
+            best_thumbnail_idx = next((i for i, t in enumerate(thumbnail_data) if t['filename'] == thumbnail_data_sorted[0]['filename']), 0)
 
-        logger.info(f"Phase 9: Stored {len(thumbnail_filenames)} thumbnail candidates (best sharpness: {max_sharpness:.1f} at index {best_thumbnail_idx + 1})")
+            with db_session() as db:
+                job = db.query(SOTProcessingJob).filter_by(temp_job_id=temp_job_id).first()
+                if job:
+                    job.thumbnail_candidates = thumbnail_filenames
+                    job.selected_thumbnail = thumbnail_data_sorted[0]['filename'] if thumbnail_data_sorted else thumbnail_filenames[0]
+                    db.commit()
 
-        processing_report["phases"]["phase9"] = {
-            "status": "success",
-            "data": {
-                "thumbnail_count": len(thumbnail_data),
-                "thumbnail_data": thumbnail_data,
-                "best_thumbnail": thumbnail_data_sorted[0] if thumbnail_data_sorted else None,
-                "max_sharpness": max_sharpness,
-                "avg_sharpness": avg_sharpness
+            logger.info(f"Phase 9: Stored {len(thumbnail_filenames)} thumbnail candidates (best sharpness: {max_sharpness:.1f} at index {best_thumbnail_idx + 1})")
+
+            processing_report["phases"]["phase9"] = {
+                "status": "success",
+                "data": {
+                    "thumbnail_count": len(thumbnail_data),
+                    "thumbnail_data": thumbnail_data,
+                    "best_thumbnail": thumbnail_data_sorted[0] if thumbnail_data_sorted else None,
+                    "max_sharpness": max_sharpness,
+                    "avg_sharpness": avg_sharpness
+                }
             }
-        }
 
-        if max_sharpness < SHARPNESS_THRESHOLD_BLURRY:
-            processing_report["warnings"].append(f"low_sharpness: All thumbnails appear blurry (max: {max_sharpness:.1f})")
-        elif avg_sharpness < SHARPNESS_THRESHOLD_WARNING:
-            processing_report["warnings"].append(f"moderate_blur: Thumbnails below average sharpness (avg: {avg_sharpness:.1f})")
+            if max_sharpness < SHARPNESS_THRESHOLD_BLURRY:
+                processing_report["warnings"].append(f"low_sharpness: All thumbnails appear blurry (max: {max_sharpness:.1f})")
+            elif avg_sharpness < SHARPNESS_THRESHOLD_WARNING:
+                processing_report["warnings"].append(f"moderate_blur: Thumbnails below average sharpness (avg: {avg_sharpness:.1f})")
 
-        # Audio extract (full segment) — skipped when source has no audio track
-        if has_audio:
-            phase9_audio = working_dir / f"{temp_job_id}_9_audio.mp3"
-            audio_cmd = [
-                ffmpeg, "-y",
-                "-i", str(phase8_output),
-                "-vn",
-                "-acodec", "libmp3lame",
-                "-ab", "192k",
-                str(phase9_audio)
-            ]
-            subprocess.run(audio_cmd, check=True, capture_output=True)
-            logger.info(f"Phase 9 complete: thumbnails + audio")
-            phase9_status = 'Phase 9 Complete: Thumbnails + MP3 Generated'
-        else:
-            phase9_audio = None
-            logger.info(f"Phase 9 complete: thumbnails only (no audio track)")
-            phase9_status = 'Phase 9 Complete: Thumbnails Only (No Audio Track)'
+            # Audio extract (full segment) — skipped when source has no audio track
+            if has_audio:
+                phase9_audio = working_dir / f"{temp_job_id}_9_audio.mp3"
+                audio_cmd = [
+                    ffmpeg, "-y",
+                    "-i", str(phase8_output),
+                    "-vn",
+                    "-acodec", "libmp3lame",
+                    "-ab", "192k",
+                    str(phase9_audio)
+                ]
+                run_ffmpeg(audio_cmd, phase="phase9_audio", duration=video_duration, reporter=reporter)
+                logger.info(f"Phase 9 complete: thumbnails + audio")
+                phase9_status = 'Phase 9 Complete: Thumbnails + MP3 Generated'
+            else:
+                phase9_audio = None
+                logger.info(f"Phase 9 complete: thumbnails only (no audio track)")
+                phase9_status = 'Phase 9 Complete: Thumbnails Only (No Audio Track)'
 
-        if asset_id:
-            _update_sot_cue_block(episode, slug, asset_id, {
-                'ProcessingStatus': phase9_status
-            })
+            if asset_id:
+                _update_sot_cue_block(episode, slug, asset_id, {
+                    'ProcessingStatus': phase9_status
+                })
+
+            record_checkpoint(
+                temp_job_id, 9, ctx,
+                {"video": phase8_output, "thumbnails": phase9_thumbs, "audio": phase9_audio},
+                media=("video", "audio")
+            )
+        else:
+            logger.info(f"Phase 9: already completed (checkpoint) for {temp_job_id}")
 
         # ================================================================
         # PHASE 10: Final Move and Rename
         #  - Move to episode assets directory, rename with normalized slug
         # ================================================================
-        logger.info(f"Phase 10: Final move for {temp_job_id}")
-        _update_job_status(temp_job_id, 'phase10', 'processing')
-
-        final_video_dir = media_root / "episodes" / episode / "assets" / "video"
-        final_thumb_dir = media_root / "episodes" / episode / "assets" / "thumbnails"
-        final_video_dir.mkdir(parents=True, exist_ok=True)
-        final_thumb_dir.mkdir(parents=True, exist_ok=True)
-
-        final_video = final_video_dir / f"{normalized_slug}.mp4"
-        final_audio = final_video_dir / f"{normalized_slug}.mp3" if has_audio else None
-
-        import shutil
-        shutil.move(str(phase8_output), str(final_video))
-        if has_audio and phase9_audio is not None:
-            shutil.move(str(phase9_audio), str(final_audio))
-
-        final_thumbs = []
-        for i, thumb_file in enumerate(phase9_thumbs, 1):
-            final_thumb = final_thumb_dir / f"{normalized_slug}-thumb-{i:02d}.png"
-            shutil.move(str(thumb_file), str(final_thumb))
-            final_thumbs.append(final_thumb)
-
-        logger.info(f"Phase 10 complete: video/audio moved to {final_video_dir}, {len(final_thumbs)} thumbnails moved to {final_thumb_dir}")
-
-        # Get final video duration for metadata
-        duration_cmd = [
-            ffprobe,
-            "-v", "error",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            str(final_video)
-        ]
-        duration_result = subprocess.run(duration_cmd, capture_output=True, text=True, check=True)
-        duration = float(duration_result.stdout.strip())
+        if resume_phase < 10:
+            logger.info(f"Phase 10: Final move for {temp_job_id}")
+            _update_job_status(temp_job_id, 'phase10', 'processing')
+
+            final_video_dir = media_root / "episodes" / episode / "assets" / "video"
+            final_thumb_dir = media_root / "episodes" / episode / "assets" / "thumbnails"
+            final_video_dir.mkdir(parents=True, exist_ok=True)
+            final_thumb_dir.mkdir(parents=True, exist_ok=True)
+
+            final_video = final_video_dir / f"{normalized_slug}.mp4"
+            final_audio = final_video_dir / f"{normalized_slug}.mp3" if has_audio else None
+
+            shutil.move(str(phase8_output), str(final_video))
+            if has_audio and phase9_audio is not None:
+                shutil.move(str(phase9_audio), str(final_audio))
+
+            final_thumbs = []
+            for i, thumb_file in enumerate(phase9_thumbs, 1):
+                final_thumb = final_thumb_dir / f"{normalized_slug}-thumb-{i:02d}.png"
+                shutil.move(str(thumb_file), str(final_thumb))
+                final_thumbs.append(final_thumb)
+
+            logger.info(f"Phase 10 complete: video/audio moved to {final_video_dir}, {len(final_thumbs)} thumbnails moved to {final_thumb_dir}")
+
+            # Get final video duration for metadata
+            duration_cmd = [
+                ffprobe,
+                "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                str(final_video)
+            ]
+            duration_result = subprocess.run(duration_cmd, capture_output=True, text=True, check=True)
+            duration = float(duration_result.stdout.strip())
 
-        with db_session() as db:
-            job = db.query(SOTProcessingJob).filter_by(temp_job_id=temp_job_id).first()
-            if job:
-                job.current_phase = 'phase10'
-                job.status = 'processing'
-                job.final_video_path = str(final_video.relative_to(episodes_root))
-                job.final_audio_path = str(final_audio.relative_to(episodes_root)) if final_audio else None
-                job.final_thumbnail_path = str(final_thumbs[0].relative_to(episodes_root)) if final_thumbs else None
-                db.commit()
+            with db_session() as db:
+                job = db.query(SOTProcessingJob).filter_by(temp_job_id=temp_job_id).first()
+                if job:
+                    job.current_phase = 'phase10'
+                    job.status = 'processing'
+                    job.final_video_path = str(final_video.relative_to(episodes_root))
+                    job.final_audio_path = str(final_audio.relative_to(episodes_root)) if final_audio else None
+                    job.final_thumbnail_path = str(final_thumbs[0].relative_to(episodes_root)) if final_thumbs else None
+                    db.commit()
 
-                # Create parent/child asset relationship if source asset exists
-                if job.source_asset_id and job.final_asset_id:
-                    if '/app' not in sys.path:
-                        sys.path.insert(0, '/app')
-                    import models_assetid
-                    AssetIDRegistry = models_assetid.AssetIDRegistry
-                    AssetRelationship = models_assetid.AssetRelationship
-
-                    final_asset = db.query(AssetIDRegistry).filter_by(asset_id=job.final_asset_id).first()
-                    if final_asset:
-                        final_asset.parent_asset_id = job.source_asset_id
-                        final_asset.asset_role = 'final'
-                        final_asset.derivative_type = job_type or 'trimmed'
+                    # Create parent/child asset relationship if source asset exists
+                    if job.source_asset_id and job.final_asset_id:
+                        if '/app' not in sys.path:
+                            sys.path.insert(0, '/app')
+                        import models_assetid
+                        AssetIDRegistry = models_assetid.AssetIDRegistry
+                        AssetRelationship = models_assetid.AssetRelationship
+
+                        final_asset = db.query(AssetIDRegistry).filter_by(asset_id=job.final_asset_id).first()
+                        if final_asset:
+                            final_asset.parent_asset_id = job.source_asset_id
+                            final_asset.asset_role = 'final'
+                            final_asset.derivative_type = job_type or 'trimmed'
+                            db.commit()
+                            logger.info(f"✅ Updated final asset {job.final_asset_id} with parent {job.source_asset_id}")
+
+                        relationship = AssetRelationship(
+                            parent_asset_id=job.source_asset_id,
+                            child_asset_id=job.final_asset_id,
+                            relationship_type=f"{job_type}_from" if job_type else "trimmed_from",
+                            processing_metadata={
+                                'trim_start': trim_start,
+                                'trim_end': trim_end,
+                                'job_type': job_type,
+                                'temp_job_id': temp_job_id,
+                                'processing_date': str(func.now())
+                            }
+                        )
+                        db.add(relationship)
                         db.commit()
-                        logger.info(f"✅ Updated final asset {job.final_asset_id} with parent {job.source_asset_id}")
-
-                    relationship = AssetRelationship(
-                        parent_asset_id=job.source_asset_id,
-                        child_asset_id=job.final_asset_id,
-                        relationship_type=f"{job_type}_from" if job_type else "trimmed_from",
-                        processing_metadata={
-                            'trim_start': trim_start,
-                            'trim_end': trim_end,
-                            'job_type': job_type,
-                            'temp_job_id': temp_job_id,
-                            'processing_date': str(func.now())
-                        }
-                    )
-                    db.add(relationship)
-                    db.commit()
-                    logger.info(f"✅ Created asset relationship: {job.source_asset_id} → {job.final_asset_id}")
+                        logger.info(f"✅ Created asset relationship: {job.source_asset_id} → {job.final_asset_id}")
+
+            ctx["final_duration"] = duration
+            record_checkpoint(
+                temp_job_id, 10, ctx,
+                {"video": final_video, "audio": final_audio, "thumbnails": final_thumbs},
+                media=("video",)
+            )
+        else:
+            logger.info(f"Phase 10: already completed (checkpoint) for {temp_job_id}")
 
         # Convert duration to HH:MM:SS format
         hours = int(duration // 3600)
@@ -3235,6 +3279,17 @@ def process_sot_video_multi_phase(
 
         # single_trim / full_process → fire the 3-link chain.
         logger.info(f"Executing {job_type.upper()} workflow for {temp_job_id} via Celery chain")
+        # Fresh checkpoint: what orphan recovery needs to restart from phase 1
+        record_dispatch(temp_job_id, {
+            "temp_job_id": temp_job_id,
+            "episode": episode,
+            "slug": slug,
+            "trim_start": trim_start,
+            "trim_end": trim_end,
+            "job_type": job_type,
+            "asset_id": asset_id,
+            "devel_mode": devel_mode,
+        })
         pipeline = chain(
             sot_prepare.s(
                 temp_job_id=temp_job_id,
@@ -3304,6 +3359,7 @@ def _update_vo_cue_block(episode: str, slug: str, asset_id: str, updates: dict):
     """
     try:
         from models_v2 import Rundown, RundownItem, Episode
+        from services.rundown_items import WITH_SCRIPT
         import re
 
         with db_session() as db:
@@ -3312,7 +3368,7 @@ def _update_vo_cue_block(episode: str, slug: str, asset_id: str, updates: dict):
                 logger.warning(f"No rundown found for episode {episode}")
                 return False
 
-            items = db.query(RundownItem).filter_by(rundown_id=rundown.id).all()
+            items = db.query(RundownItem).options(WITH_SCRIPT).filter_by(rundown_id=rundown.id).all()
 
             cue_pattern = re.compile(
                 r'(<!-- Begin Cue(?: collapsed)? -->(?:(?!<!-- End Cue -->).)*?\[Type:\s*VO\](?:(?!<!-- End Cue -->).)*?<!-- End Cue -->)',
@@ -3433,6 +3489,7 @@ def process_vo_video(
             "phases": {},
             "warnings": []
         }
+        reporter = ProgressReporter(task=self, job_id=temp_job_id, report=processing_report)
 
         # Get platform-appropriate binaries
         ffmpeg = get_ffmpeg_binary()
@@ -3559,6 +3616,7 @@ def process_vo_video(
             return 0.0
 
         current_input = input_file
+        clip_duration = duration_seconds
 
         if not is_zero_time(trim_start) or not is_zero_time(trim_end):
             logger.info(f"Phase 1: Trimming for {temp_job_id} (start={trim_start}, end={trim_end})")
@@ -3573,41 +3631,32 @@ def process_vo_video(
             # landed seconds off the requested points. Same fix as the SOT
             # phase-3 trim (2026-06). Audio (if any) re-encodes to AAC via
             # the optional 0:a:0? map; audio-less sources pass through.
-            from platform_utils import IS_WINDOWS, has_nvidia_gpu
-            if IS_WINDOWS and has_nvidia_gpu():
-                trim_encoder_args = ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "18", "-maxrate", "8M", "-bufsize", "16M"]
-            else:
-                trim_encoder_args = ["-c:v", "libx264", "-preset", "medium", "-crf", "18"]
-
+            start_sec = time_to_seconds(trim_start)
             if not is_zero_time(trim_end):
-                start_sec = time_to_seconds(trim_start)
                 end_sec = time_to_seconds(trim_end)
                 trim_duration = end_sec - start_sec
-
-                phase1_cmd = [
-                    ffmpeg, "-y",
-                    "-ss", str(start_sec),
-                    "-i", str(current_input),
-                    "-t", str(trim_duration),
-                    "-map", "0:v:0", "-map", "0:a:0?",
-                    *trim_encoder_args,
-                    "-c:a", "aac", "-b:a", "192k",
-                    str(phase1_output)
-                ]
+                trim_length_args = ["-t", str(trim_duration)]
             else:
-                start_sec = time_to_seconds(trim_start)
-                phase1_cmd = [
+                trim_duration = duration_seconds - start_sec
+                trim_length_args = []
+
+            encode_with_failover(
+                lambda trim_encoder_args: [
                     ffmpeg, "-y",
                     "-ss", str(start_sec),
                     "-i", str(current_input),
+                    *trim_length_args,
                     "-map", "0:v:0", "-map", "0:a:0?",
                     *trim_encoder_args,
                     "-c:a", "aac", "-b:a", "192k",
                     str(phase1_output)
-                ]
-
-            subprocess.run(phase1_cmd, check=True, capture_output=True)
+                ],
+                ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "18", "-maxrate", "8M", "-bufsize", "16M"],
+                ["-c:v", "libx264", "-preset", "medium", "-crf", "18"],
+                lambda cmd: run_ffmpeg(cmd, phase="phase1", duration=trim_duration, reporter=reporter)
+            )
             current_input = phase1_output
+            clip_duration = trim_duration
             logger.info(f"Phase 1 complete: Trimmed to {phase1_output}")
 
             if asset_id:
@@ -3629,12 +3678,6 @@ def process_vo_video(
 
         phase2_output = working_dir / f"{temp_job_id}_2_normalized.mp4"
 
-        from platform_utils import IS_WINDOWS, has_nvidia_gpu
-        if IS_WINDOWS and has_nvidia_gpu():
-            video_encoder_args = ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "18", "-maxrate", "8M", "-bufsize", "16M"]
-        else:
-            video_encoder_args = ["-c:v", "libx264", "-preset", "medium", "-crf", "18"]
-
         # Check if video has audio - if so, copy it through
         audio_check_cmd = [
             ffprobe, "-v", "error",
@@ -3645,31 +3688,24 @@ def process_vo_video(
         ]
         audio_check = subprocess.run(audio_check_cmd, capture_output=True, text=True)
         has_audio = audio_check.stdout.strip() == "audio"
+        # Video has audio - pass it through unchanged; otherwise no audio output
+        phase2_audio_args = ["-c:a", "copy"] if has_audio else ["-an"]
 
-        if has_audio:
-            # Video has audio - copy it through
-            phase2_cmd = [
-                ffmpeg, "-y",
-                "-i", str(current_input),
-                *video_encoder_args,
-                "-r", "29.97",
-                "-vf", "scale='if(gt(iw,1920),1920,-2)':'-2'",
-                "-c:a", "copy",  # Pass audio through unchanged
-                str(phase2_output)
-            ]
-        else:
-            # Video has no audio
-            phase2_cmd = [
+        # Video encoder: NVENC if this host has a free session, else libx264
+        encode_with_failover(
+            lambda video_encoder_args: [
                 ffmpeg, "-y",
                 "-i", str(current_input),
                 *video_encoder_args,
                 "-r", "29.97",
                 "-vf", "scale='if(gt(iw,1920),1920,-2)':'-2'",
-                "-an",  # No audio output
+                *phase2_audio_args,
                 str(phase2_output)
-            ]
-
-        subprocess.run(phase2_cmd, check=True, capture_output=True)
+            ],
+            ["-c:v", "h264_nvenc", "-preset", "p4", "-cq", "18", "-maxrate", "8M", "-bufsize", "16M"],
+            ["-c:v", "libx264", "-preset", "medium", "-crf", "18"],
+            lambda cmd: run_ffmpeg(cmd, phase="phase2", duration=clip_duration, reporter=reporter)
+        )
         current_input = phase2_output
         logger.info(f"Phase 2 complete: Video normalized to {phase2_output}")
 
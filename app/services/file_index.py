@@ -0,0 +1,462 @@
+"""
+Persistent File Index
+Incrementally maintained index of episode-tree files so inventory, consolidation,
+gather and host-script media resolution stop re-walking the NAS on every call.
+
+Each row records (path, size, mtime, inode, image dimensions, media probe,
+content hash). A refresh is a pruned `os.scandir` walk: excluded/hidden
+directories (.stversions, .syncthing, ...) are never descended into, and a
+file whose (size, mtime, inode) is unchanged keeps its cached dimensions,
+probe and hash — PIL/ffprobe/sha256 only run for new or modified files.
+
+The index is per-host (inode and mtime are host-local), so it lives in a
+local SQLite file rather than Postgres. WAL mode lets the API and workers on
+the same host share it.
+"""
+
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXCLUDE_DIRS = (
+    '.git', '.syncthing', '.stfolder', '.blackmagicsync-v2',
+    '.DS_Store', '.claude', '.vscode', '__pycache__',
+    'node_modules', '.stversions'
+)
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.psd', '.gif', '.webp'}
+
+# Override with FILE_INDEX_DB; default lives next to the other app caches.
+_DEFAULT_DB_PATH = (
+    "/app/cache/file_index.sqlite3" if Path('/app').exists()
+    else "/tmp/show-build/file_index.sqlite3"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_index (
+    root TEXT NOT NULL,
+    rel_path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    is_dir INTEGER NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL DEFAULT 0,
+    mtime_ns INTEGER NOT NULL DEFAULT 0,
+    inode INTEGER NOT NULL DEFAULT 0,
+    width INTEGER,
+    height INTEGER,
+    probe TEXT,
+    content_hash TEXT,
+    indexed_at REAL NOT NULL,
+    PRIMARY KEY (root, rel_path)
+);
+CREATE INDEX IF NOT EXISTS ix_file_index_root_name ON file_index (root, name);
+CREATE TABLE IF NOT EXISTS file_index_roots (
+    root TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    last_refresh REAL NOT NULL DEFAULT 0
+);
+"""
+
+
+@dataclass
+class FileEntry:
+    """One indexed file or directory under an indexed root."""
+    root: str
+    rel_path: str
+    name: str
+    is_dir: bool
+    size: int
+    mtime_ns: int
+    inode: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    probe: Optional[Dict[str, Any]] = None
+    content_hash: Optional[str] = None
+
+    @property
+    def path(self) -> Path:
+        return Path(self.root) / self.rel_path
+
+    @property
+    def extension(self) -> str:
+        return Path(self.name).suffix.lower()
+
+    @property
+    def mtime(self) -> float:
+        return self.mtime_ns / 1e9
+
+    @property
+    def dimensions(self) -> Optional[str]:
+        if self.width and self.height:
+            return f"{self.width}x{self.height}"
+        return None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "FileEntry":
+        return cls(
+            root=row["root"],
+            rel_path=row["rel_path"],
+            name=row["name"],
+            is_dir=bool(row["is_dir"]),
+            size=row["size"],
+            mtime_ns=row["mtime_ns"],
+            inode=row["inode"],
+            width=row["width"],
+            height=row["height"],
+            probe=json.loads(row["probe"]) if row["probe"] else None,
+            content_hash=row["content_hash"],
+        )
+
+
+def _read_image_dimensions(path: str) -> Tuple[Optional[int], Optional[int]]:
+    try:
+        from PIL import Image
+        with Image.open(path) as img:
+            return img.width, img.height
+    except Exception as e:
+        logger.debug(f"Could not read image dimensions for {path}: {e}")
+        return None, None
+
+
+class FileIndex:
+    """
+    SQLite-backed incremental index of one or more directory roots.
+
+    `version(root)` increases whenever a refresh observes any change under the
+    root, so callers can key derived caches on it.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = Path(db_path or os.getenv("FILE_INDEX_DB", _DEFAULT_DB_PATH))
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._initialized = True
+        return conn
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def refresh(
+        self,
+        root: Path,
+        exclude_dirs: Iterable[str] = DEFAULT_EXCLUDE_DIRS,
+        max_age: float = 0.0,
+    ) -> int:
+        """
+        Bring the index for `root` up to date and return its version.
+
+        The walk runs without the index lock, so lookups keep being served
+        from the previous state; only reading the known entries and writing
+        the changes hold it. If a refresh that started later has already
+        been written, this one's (older) result is dropped.
+
+        Args:
+            root: Directory to index (stored by its absolute path)
+            exclude_dirs: Directory names that are pruned from the walk
+            max_age: Skip the walk if the last refresh is younger than this (seconds)
+        """
+        root_key = str(Path(root).resolve())
+        excluded = set(exclude_dirs)
+
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT version, last_refresh FROM file_index_roots WHERE root = ?",
+                    (root_key,)
+                ).fetchone()
+                if row and max_age and time.time() - row["last_refresh"] < max_age:
+                    return row["version"]
+
+                known = {
+                    r["rel_path"]: (r["size"], r["mtime_ns"], r["inode"], r["is_dir"])
+                    for r in conn.execute(
+                        "SELECT rel_path, size, mtime_ns, inode, is_dir FROM file_index WHERE root = ?",
+                        (root_key,)
+                    )
+                }
+            finally:
+                conn.close()
+
+        started = time.time()
+        seen = set()
+        upserts = []
+        for rel_path, name, is_dir, st in self._walk(root_key, excluded):
+            seen.add(rel_path)
+            signature = (0 if is_dir else st.st_size, st.st_mtime_ns, st.st_ino, int(is_dir))
+            if known.get(rel_path) == signature:
+                continue
+            width = height = None
+            if not is_dir and Path(name).suffix.lower() in IMAGE_EXTENSIONS:
+                width, height = _read_image_dimensions(os.path.join(root_key, rel_path))
+            upserts.append((
+                root_key, rel_path, name, int(is_dir), signature[0],
+                st.st_mtime_ns, st.st_ino, width, height, started
+            ))
+        removed = [p for p in known if p not in seen]
+
+        with self._lock:
+            conn = self._connect()
+            try:
+                # IMMEDIATE: check and write as one step for other processes too
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT version, last_refresh FROM file_index_roots WHERE root = ?",
+                    (root_key,)
+                ).fetchone()
+                version = row["version"] if row else 0
+                if row and row["last_refresh"] > started:
+                    conn.rollback()
+                    return version
+
+                if upserts or removed or not row:
+                    version += 1
+                if upserts:
+                    # Changed files lose their probe/hash; they are recomputed lazily.
+                    conn.executemany(
+                        """
+                        INSERT INTO file_index
+                            (root, rel_path, name, is_dir, size, mtime_ns, inode,
+                             width, height, probe, content_hash, indexed_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL, NULL, ?)
+                        ON CONFLICT (root, rel_path) DO UPDATE SET
+                            name = excluded.name, is_dir = excluded.is_dir,
+                            size = excluded.size, mtime_ns = excluded.mtime_ns,
+                            inode = excluded.inode, width = excluded.width,
+                            height = excluded.height, probe = NULL,
+                            content_hash = NULL, indexed_at = excluded.indexed_at
+                        """,
+                        upserts
+                    )
+                if removed:
+                    conn.executemany(
+                        "DELETE FROM file_index WHERE root = ? AND rel_path = ?",
+                        [(root_key, p) for p in removed]
+                    )
+                conn.execute(
+                    """
+                    INSERT INTO file_index_roots (root, version, last_refresh) VALUES (?, ?, ?)
+                    ON CONFLICT (root) DO UPDATE SET
+                        version = excluded.version, last_refresh = excluded.last_refresh
+                    """,
+                    (root_key, version, started)
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+        if upserts or removed:
+            logger.info(
+                f"File index {root_key}: {len(upserts)} updated, {len(removed)} removed "
+                f"(version {version})"
+            )
+        return version
+
+    @staticmethod
+    def _walk(root: str, excluded: set):
+        """Pruned scandir walk yielding (rel_path, name, is_dir, stat) for non-hidden entries."""
+        stack = [""]
+        while stack:
+            rel_dir = stack.pop()
+            abs_dir = os.path.join(root, rel_dir) if rel_dir else root
+            try:
+                with os.scandir(abs_dir) as it:
+                    for entry in it:
+                        name = entry.name
+                        if name.startswith('.') or name in excluded:
+                            continue
+                        rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                            if not is_dir and not entry.is_file():
+                                continue
+                            st = entry.stat(follow_symlinks=False) if is_dir else entry.stat()
+                        except OSError as e:
+                            logger.debug(f"Could not stat {rel_path}: {e}")
+                            continue
+                        if is_dir:
+                            stack.append(rel_path)
+                        yield rel_path, name, is_dir, st
+            except (PermissionError, FileNotFoundError, NotADirectoryError) as e:
+                logger.warning(f"Could not read directory {abs_dir}: {e}")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def version(self, root: Path) -> int:
+        with self._lock:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT version FROM file_index_roots WHERE root = ?",
+                    (str(Path(root).resolve()),)
+                ).fetchone()
+                return row["version"] if row else 0
+            finally:
+                conn.close()
+
+    def entries(
+        self,
+        root: Path,
+        prefix: Optional[str] = None,
+        include_dirs: bool = False,
+    ) -> List[FileEntry]:
+        """Return indexed entries under `root` (optionally under `prefix/`), sorted by path."""
+        root_key = str(Path(root).resolve())
+        sql = "SELECT * FROM file_index WHERE root = ?"
+        params: List[Any] = [root_key]
+        if prefix:
+            sql += " AND rel_path LIKE ? ESCAPE '\\'"
+            escaped = prefix.strip('/').replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f"{escaped}/%")
+        if not include_dirs:
+            sql += " AND is_dir = 0"
+        sql += " ORDER BY rel_path"
+        with self._lock:
+            conn = self._connect()
+            try:
+                return [FileEntry.from_row(r) for r in conn.execute(sql, params)]
+            finally:
+                conn.close()
+
+    def find(
+        self,
+        root: Path,
+        pattern: str,
+        prefix: Optional[str] = None,
+        max_age: Optional[float] = 30.0,
+        recursive: bool = True,
+    ) -> List[FileEntry]:
+        """
+        Find files whose name matches a glob `pattern` (e.g. "*-my-slug.png").
+
+        Refreshes `root` first unless it was refreshed within `max_age` seconds
+        (None skips the refresh, for callers that just refreshed it). With
+        recursive=False only direct children of `prefix` (or `root`) match.
+        """
+        if max_age is not None:
+            self.refresh(root, max_age=max_age)
+        found = self._find(root, pattern, prefix)
+        if not recursive:
+            depth = prefix.strip('/').count('/') + 1 if prefix else 0
+            found = [e for e in found if e.rel_path.count('/') == depth]
+        return found
+
+    def _find(self, root: Path, pattern: str, prefix: Optional[str]) -> List[FileEntry]:
+        if any(ch in pattern for ch in '*?['):
+            return [e for e in self.entries(root, prefix) if fnmatch.fnmatchcase(e.name, pattern)]
+
+        root_key = str(Path(root).resolve())
+        with self._lock:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT * FROM file_index WHERE root = ? AND name = ? AND is_dir = 0 ORDER BY rel_path",
+                    (root_key, pattern)
+                ).fetchall()
+            finally:
+                conn.close()
+        found = [FileEntry.from_row(r) for r in rows]
+        if prefix:
+            prefix = prefix.strip('/') + '/'
+            found = [e for e in found if e.rel_path.startswith(prefix)]
+        return found
+
+    # ------------------------------------------------------------------
+    # Lazily computed attributes
+    # ------------------------------------------------------------------
+
+    def _store(self, entry: FileEntry, column: str, value: Optional[str]) -> None:
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    f"UPDATE file_index SET {column} = ? "
+                    "WHERE root = ? AND rel_path = ? AND size = ? AND mtime_ns = ?",
+                    (value, entry.root, entry.rel_path, entry.size, entry.mtime_ns)
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    def content_hash(self, entry: FileEntry) -> Optional[str]:
+        """SHA-256 of the file contents, computed once per (size, mtime)."""
+        if entry.content_hash:
+            return entry.content_hash
+        digest = hashlib.sha256()
+        try:
+            with open(entry.path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+        except OSError as e:
+            logger.warning(f"Could not hash {entry.path}: {e}")
+            return None
+        entry.content_hash = digest.hexdigest()
+        self._store(entry, "content_hash", entry.content_hash)
+        return entry.content_hash
+
+    def media_probe(self, entry: FileEntry) -> Optional[Dict[str, Any]]:
+        """ffprobe format/stream summary, computed once per (size, mtime)."""
+        if entry.probe is not None:
+            return entry.probe
+        from platform_utils import get_ffprobe_binary
+        try:
+            result = subprocess.run(
+                [get_ffprobe_binary(), "-v", "error", "-print_format", "json",
+                 "-show_format", "-show_streams", str(entry.path)],
+                capture_output=True, text=True, timeout=30
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"ffprobe failed for {entry.path}: {e}")
+            return None
+        if result.returncode != 0:
+            logger.debug(f"ffprobe returned {result.returncode} for {entry.path}")
+            return None
+        try:
+            raw = json.loads(result.stdout or "{}")
+        except json.JSONDecodeError:
+            return None
+        fmt = raw.get("format", {})
+        entry.probe = {
+            "duration": float(fmt["duration"]) if fmt.get("duration") else None,
+            "format": fmt.get("format_name"),
+            "bit_rate": int(fmt["bit_rate"]) if fmt.get("bit_rate") else None,
+            "streams": [
+                {k: s.get(k) for k in ("codec_type", "codec_name", "width", "height", "sample_rate", "channels")}
+                for s in raw.get("streams", [])
+            ],
+        }
+        self._store(entry, "probe", json.dumps(entry.probe))
+        return entry.probe
+
+
+_file_index: Optional[FileIndex] = None
+
+
+def get_file_index() -> FileIndex:
+    """Process-wide FileIndex singleton."""
+    global _file_index
+    if _file_index is None:
+        _file_index = FileIndex()
+    return _file_index
@@ -6,16 +6,29 @@ Scans episode directories using batched LLM calls for efficient semantic matchin
 import os
 import json
 import yaml
+import asyncio
+import hashlib
 import logging
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from PIL import Image
 
 from services.file_inventory_llm_v2 import OllamaLLMService
+from services.file_index import DEFAULT_EXCLUDE_DIRS, IMAGE_EXTENSIONS, FileEntry, get_file_index
+from services.file_inventory_rules import prematch_slots
 
 logger = logging.getLogger(__name__)
 
+# Max concurrent LLM batches per LLM host (across all scans in this process)
+LLM_HOST_CONCURRENCY = int(os.getenv("INVENTORY_LLM_CONCURRENCY", "2"))
+_HOST_SEMAPHORES: Dict[str, asyncio.Semaphore] = {}
+
+# Normalized batch results keyed by _batch_cache_key (LRU)
+_BATCH_CACHE_MAX = 256
+_BATCH_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
 # ============================================================================
 # LLM FILE CLASSIFICATION HINT SYSTEM
 # ============================================================================
@@ -385,24 +398,29 @@ SLOT_PROMPTS = {
 }
 
 
-def get_file_metadata(file_path: Path) -> Dict[str, Any]:
-    """Extract metadata from file for directory tree."""
+def get_file_metadata(file_path: Path, entry: Optional[FileEntry] = None) -> Dict[str, Any]:
+    """Extract metadata from file for directory tree (cached stat/dimensions if an index entry is given)."""
     try:
-        stat = file_path.stat()
+        size = entry.size if entry is not None else file_path.stat().st_size
         metadata = {
             "path": str(file_path),
             "filename": file_path.name,
             "extension": file_path.suffix.lower(),
-            "size": stat.st_size,
+            "size": size,
             "relative_path": None  # Will be set by caller
         }
 
         # Get image dimensions if applicable
-        if file_path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.psd', '.gif', '.webp']:
+        if file_path.suffix.lower() in IMAGE_EXTENSIONS:
             try:
-                with Image.open(file_path) as img:
-                    metadata["dimensions"] = f"{img.width}x{img.height}"
-                    ratio = img.width / img.height
+                if entry is not None:
+                    width, height = entry.width, entry.height
+                else:
+                    with Image.open(file_path) as img:
+                        width, height = img.width, img.height
+                if width and height:
+                    metadata["dimensions"] = f"{width}x{height}"
+                    ratio = width / height
                     if 1.7 < ratio < 1.8:
                         metadata["aspect_ratio"] = "16:9"
                     elif 0.95 < ratio < 1.05:
@@ -419,23 +437,19 @@ def get_file_metadata(file_path: Path) -> Dict[str, Any]:
 
 
 def scan_directory_recursive(base_path: Path, exclude_dirs: List[str] = None) -> List[Dict[str, Any]]:
-    """Scan directory and collect file metadata."""
+    """Scan directory and collect file metadata (via the persistent file index)."""
     if exclude_dirs is None:
-        exclude_dirs = [
-            '.git', '.syncthing', '.stfolder', '.blackmagicsync-v2',
-            '.DS_Store', '.claude', '.vscode', '__pycache__',
-            'node_modules', '.stversions'
-        ]
+        exclude_dirs = DEFAULT_EXCLUDE_DIRS
+
+    file_index = get_file_index()
+    file_index.refresh(base_path, exclude_dirs=exclude_dirs)
 
     files = []
-    for item in base_path.rglob('*'):
-        if any(excluded in item.parts for excluded in exclude_dirs):
-            continue
-        if item.is_file() and not item.name.startswith('.'):
-            file_meta = get_file_metadata(item)
-            if file_meta:
-                file_meta["relative_path"] = str(item.relative_to(base_path))
-                files.append(file_meta)
+    for entry in file_index.entries(base_path):
+        file_meta = get_file_metadata(entry.path, entry)
+        if file_meta:
+            file_meta["relative_path"] = entry.rel_path
+            files.append(file_meta)
 
     return files
 
@@ -513,6 +527,157 @@ Examples: {slot_info['filename_variations']}
     return system_prompt, user_prompt, overridden
 
 
+def _host_semaphore(llm_service) -> asyncio.Semaphore:
+    """Concurrency cap shared by every inventory scan hitting the same LLM host."""
+    host = getattr(llm_service, 'base_url', None) or getattr(llm_service, 'provider', 'default')
+    if host not in _HOST_SEMAPHORES:
+        _HOST_SEMAPHORES[host] = asyncio.Semaphore(LLM_HOST_CONCURRENCY)
+    return _HOST_SEMAPHORES[host]
+
+
+def _batch_cache_key(llm_service, system_prompt: str, user_prompt: str) -> str:
+    """
+    Cache key for one LLM batch.
+
+    The user prompt embeds the full file tree (which only changes when the
+    file index version does) and the slot definitions; together with the
+    system prompt and model that pins both the file-index and prompt version.
+    """
+    digest = hashlib.sha256()
+    for part in (getattr(llm_service, 'provider', ''), getattr(llm_service, 'model', ''), system_prompt, user_prompt):
+        digest.update(str(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _normalize_batch_results(batch: List[str], batch_results: Dict[str, Any], actual_files: set) -> Dict[str, Any]:
+    """Validate an LLM batch response: fill missing slots and drop hallucinated files."""
+    normalized = {}
+
+    # POST-PROCESSING FALLBACK: Ensure all slots from batch are present
+    # This is the safety net recommended by all LLM consultations
+    for slot_name in batch:
+        if slot_name not in batch_results:
+            logger.warning(f"Slot '{slot_name}' missing from LLM response, adding empty fallback")
+            batch_results[slot_name] = {
+                "matches": [],
+                "confidence": 0,
+                "reasoning": "Slot missing from LLM response (post-processing fallback applied)"
+            }
+
+    # Validate and normalize response structure
+    for slot_name in batch:
+        slot_value = batch_results[slot_name]
+
+        # Extract matches list
+        if isinstance(slot_value, list):
+            matches = slot_value
+            confidence = 75
+            reasoning = "LLM returned simplified list format"
+        elif isinstance(slot_value, dict):
+            matches = slot_value.get('matches', [])
+            confidence = slot_value.get('confidence', 75)
+            reasoning = slot_value.get('reasoning', 'No reasoning provided')
+        else:
+            matches = []
+            confidence = 0
+            reasoning = f"Invalid response format: {type(slot_value)}"
+
+        # Validate that matched files actually exist
+        if isinstance(matches, list):
+            validated_matches = []
+            hallucinated = []
+            for match in matches:
+                if match in actual_files:
+                    validated_matches.append(match)
+                else:
+                    hallucinated.append(match)
+
+            if hallucinated:
+                logger.warning(f"LLM hallucinated non-existent files for {slot_name}: {hallucinated}")
+                if validated_matches:
+                    reasoning += f" (removed {len(hallucinated)} hallucinated files)"
+                else:
+                    reasoning = f"LLM hallucinated files that don't exist: {', '.join(hallucinated)}"
+                    confidence = 0
+
+            normalized[slot_name] = {
+                "matches": validated_matches,
+                "confidence": confidence,
+                "reasoning": reasoning,
+                "matched_by": "llm"
+            }
+        else:
+            normalized[slot_name] = {
+                "matches": [],
+                "confidence": 0,
+                "reasoning": "Matches field was not a list",
+                "matched_by": "llm"
+            }
+
+    return normalized
+
+
+async def _match_slot_batch(
+    batch: List[str],
+    batch_num: int,
+    file_tree: str,
+    actual_files: set,
+    episode_number: str,
+    llm_service: OllamaLLMService,
+    db_session = None
+) -> Dict[str, Any]:
+    """Run one slot batch through the LLM (or the batch cache)."""
+    # Build prompts (with optional override support)
+    system_prompt, user_prompt, overridden = build_slot_batch_prompt(batch, file_tree, episode_number, db_session)
+    if overridden:
+        logger.info(f"Using prompt override for batch {batch_num}")
+
+    cache_key = _batch_cache_key(llm_service, system_prompt, user_prompt)
+    cached = _BATCH_CACHE.get(cache_key)
+    if cached is not None:
+        _BATCH_CACHE.move_to_end(cache_key)
+        logger.info(f"Batch {batch_num} served from cache: {batch}")
+        return {slot: dict(result, matched_by="llm_cache") for slot, result in cached.items()}
+
+    try:
+        async with _host_semaphore(llm_service):
+            logger.info(f"Processing slot batch {batch_num}: {batch}")
+            # Call LLM with optimized parameters
+            response_text = await llm_service.generate(
+                system_prompt,
+                user_prompt,
+                temperature=0.1,  # Lower for stricter adherence (was 0.3)
+                response_format="json",
+                max_tokens=2000,  # Ensure complete output
+                top_p=0.9  # Allow diverse token choices
+            )
+
+        # Parse response
+        results = _normalize_batch_results(batch, json.loads(response_text), actual_files)
+
+        _BATCH_CACHE[cache_key] = results
+        while len(_BATCH_CACHE) > _BATCH_CACHE_MAX:
+            _BATCH_CACHE.popitem(last=False)
+
+        logger.info(f"Batch {batch_num} completed successfully")
+        return results
+
+    except json.JSONDecodeError as e:
+        logger.error(f"Failed to parse LLM JSON for batch {batch}: {e}")
+        # Return empty for this batch
+        return {
+            slot: {"matches": [], "confidence": 0, "reasoning": f"JSON parse error: {str(e)}", "matched_by": "llm"}
+            for slot in batch
+        }
+    except Exception as e:
+        logger.error(f"Error processing batch {batch}: {e}")
+        return {
+            slot: {"matches": [], "confidence": 0, "reasoning": f"Error: {str(e)}", "matched_by": "llm"}
+            for slot in batch
+        }
+
+
 async def match_slots_batched(
     files: List[Dict[str, Any]],
     episode_number: str,
@@ -521,7 +686,12 @@ async def match_slots_batched(
     db_session = None
 ) -> Dict[str, Any]:
     """
-    Match files to slots using batched LLM calls.
+    Match files to slots: deterministic rules first, batched LLM calls for the rest.
+
+    Slots the pre-matcher settles by filename/extension/dimensions never reach
+    the LLM. The ambiguous remainder is split into batches that run
+    concurrently (capped per LLM host), and batch responses are cached so an
+    unchanged tree with unchanged prompts costs no GPU time.
 
     Args:
         files: List of file metadata
@@ -531,130 +701,31 @@ async def match_slots_batched(
         db_session: Database session for prompt overrides (optional)
 
     Returns:
-        Dictionary mapping slot names to match results
+        Dictionary mapping slot names to match results (each tagged with
+        matched_by: rules | llm | llm_cache)
     """
-    # Build directory tree once
-    file_tree = build_directory_tree(files)
-
-    # Get all slot names
     all_slots = list(SLOT_PROMPTS.keys())
 
-    # Process slots in batches
-    all_results = {}
-
-    for i in range(0, len(all_slots), batch_size):
-        batch = all_slots[i:i+batch_size]
-        logger.info(f"Processing slot batch {i//batch_size + 1}: {batch}")
-
-        # Build prompts (with optional override support)
-        system_prompt, user_prompt, overridden = build_slot_batch_prompt(batch, file_tree, episode_number, db_session)
-        if overridden:
-            logger.info(f"Using prompt override for batch {i//batch_size + 1}")
-
-        try:
-            # Call LLM with optimized parameters
-            response_text = await llm_service.generate(
-                system_prompt,
-                user_prompt,
-                temperature=0.1,  # Lower for stricter adherence (was 0.3)
-                response_format="json",
-                max_tokens=2000,  # Ensure complete output
-                top_p=0.9  # Allow diverse token choices
-            )
-
-            # Parse response
-            batch_results = json.loads(response_text)
-
-            # POST-PROCESSING FALLBACK: Ensure all slots from batch are present
-            # This is the safety net recommended by all LLM consultations
-            for slot_name in batch:
-                if slot_name not in batch_results:
-                    logger.warning(f"Slot '{slot_name}' missing from LLM response, adding empty fallback")
-                    batch_results[slot_name] = {
-                        "matches": [],
-                        "confidence": 0,
-                        "reasoning": "Slot missing from LLM response (post-processing fallback applied)"
-                    }
-
-            # Build set of actual file paths for validation
-            actual_files = set(f.get('relative_path', f.get('path', '')) for f in files)
-
-            # Validate and normalize response structure
-            for slot_name in batch:
-                if slot_name in batch_results:
-                    slot_value = batch_results[slot_name]
-
-                    # Extract matches list
-                    if isinstance(slot_value, list):
-                        matches = slot_value
-                        confidence = 75
-                        reasoning = "LLM returned simplified list format"
-                    elif isinstance(slot_value, dict):
-                        matches = slot_value.get('matches', [])
-                        confidence = slot_value.get('confidence', 75)
-                        reasoning = slot_value.get('reasoning', 'No reasoning provided')
-                    else:
-                        matches = []
-                        confidence = 0
-                        reasoning = f"Invalid response format: {type(slot_value)}"
-
-                    # Validate that matched files actually exist
-                    if isinstance(matches, list):
-                        validated_matches = []
-                        hallucinated = []
-                        for match in matches:
-                            if match in actual_files:
-                                validated_matches.append(match)
-                            else:
-                                hallucinated.append(match)
-
-                        if hallucinated:
-                            logger.warning(f"LLM hallucinated non-existent files for {slot_name}: {hallucinated}")
-                            if validated_matches:
-                                reasoning += f" (removed {len(hallucinated)} hallucinated files)"
-                            else:
-                                reasoning = f"LLM hallucinated files that don't exist: {', '.join(hallucinated)}"
-                                confidence = 0
-
-                        all_results[slot_name] = {
-                            "matches": validated_matches,
-                            "confidence": confidence,
-                            "reasoning": reasoning
-                        }
-                    else:
-                        all_results[slot_name] = {
-                            "matches": [],
-                            "confidence": 0,
-                            "reasoning": "Matches field was not a list"
-                        }
-                else:
-                    all_results[slot_name] = {
-                        "matches": [],
-                        "confidence": 0,
-                        "reasoning": "Slot missing from LLM response"
-                    }
-
-            logger.info(f"Batch {i//batch_size + 1} completed successfully")
-
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse LLM JSON for batch {batch}: {e}")
-            # Return empty for this batch
-            for slot in batch:
-                all_results[slot] = {
-                    "matches": [],
-                    "confidence": 0,
-                    "reasoning": f"JSON parse error: {str(e)}"
-                }
-        except Exception as e:
-            logger.error(f"Error processing batch {batch}: {e}")
-            for slot in batch:
-                all_results[slot] = {
-                    "matches": [],
-                    "confidence": 0,
-                    "reasoning": f"Error: {str(e)}"
-                }
-
-    return all_results
+    resolved, ambiguous = prematch_slots(files, episode_number, all_slots)
+
+    batch_results = []
+    if ambiguous:
+        # Build directory tree once
+        file_tree = build_directory_tree(files)
+        # Build set of actual file paths for validation
+        actual_files = set(f.get('relative_path', f.get('path', '')) for f in files)
+
+        batches = [ambiguous[i:i + batch_size] for i in range(0, len(ambiguous), batch_size)]
+        batch_results = await asyncio.gather(*[
+            _match_slot_batch(batch, num + 1, file_tree, actual_files, episode_number, llm_service, db_session)
+            for num, batch in enumerate(batches)
+        ])
+
+    # Keep canonical slot order in the output
+    merged = dict(resolved)
+    for results in batch_results:
+        merged.update(results)
+    return {slot: merged[slot] for slot in all_slots if slot in merged}
 
 
 def generate_mapping_yaml(
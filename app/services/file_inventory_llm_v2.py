@@ -4,6 +4,7 @@ Semantic file matching using LLM with strict JSON responses and Ollama/OpenAI in
 """
 
 import json
+import asyncio
 import logging
 import requests
 from typing import Dict, Any, Optional
@@ -95,7 +96,10 @@ class OllamaLLMService:
                 if response_format == "json":
                     payload["format"] = "json"
 
-                response = requests.post(
+                # Blocking HTTP call runs in a thread so concurrent slot
+                # batches don't serialize on the event loop
+                response = await asyncio.to_thread(
+                    requests.post,
                     f"{self.base_url}/api/chat",
                     json=payload,
                     timeout=180
@@ -157,7 +161,7 @@ class OpenAILLMService:
             if response_format == "json":
                 params["response_format"] = {"type": "json_object"}
 
-            response = openai.chat.completions.create(**params)
+            response = await asyncio.to_thread(openai.chat.completions.create, **params)
             return response.choices[0].message.content
 
         except Exception as e:
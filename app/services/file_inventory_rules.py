@@ -0,0 +1,271 @@
+"""
+File Inventory - Deterministic Slot Pre-Matcher
+Resolves obvious slots from filename patterns, extensions and dimensions before
+anything is sent to the LLM. Only slots the rules can't settle go to
+match_slots_batched's LLM batches.
+
+Resolution policy (per slot):
+- single slots resolve only when EXACTLY one file satisfies the rule. Zero or
+  several candidates (e.g. EP0244.mov vs EP0244-2.mov re-renders) are left to
+  the LLM, which has the re-render semantics in its prompt.
+- multiple slots resolve when at least one file satisfies the rule. Zero
+  candidates go to the LLM in case files are named unconventionally.
+"""
+
+import re
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+RULE_CONFIDENCE = 95
+
+VIDEO_EXTS = {'.mov', '.mp4', '.mkv'}
+IMAGE_EXPORT_EXTS = {'.png', '.jpg', '.jpeg'}
+
+
+@dataclass
+class SlotRule:
+    """Deterministic matcher for one slot in SLOT_PROMPTS."""
+    # Regex matched (case-insensitive) against relative_path; {EP} is the episode number
+    pattern: str
+    multiplicity: str = "single"
+    extensions: Optional[set] = None
+    # Optional (width, height) -> bool check; files without known dimensions fail it
+    dimensions: Optional[Callable[[int, int], bool]] = None
+    description: str = ""
+    # Regex; if any OTHER file matches it the slot is ambiguous (e.g. re-renders)
+    ambiguous_if: Optional[str] = None
+    _compiled: Dict[str, "re.Pattern"] = field(default_factory=dict, repr=False)
+
+    def compile(self, pattern: str, episode_number: str) -> "re.Pattern":
+        key = f"{pattern}\0{episode_number}"
+        if key not in self._compiled:
+            self._compiled[key] = re.compile(
+                pattern.replace("{EP}", re.escape(episode_number)),
+                re.IGNORECASE
+            )
+        return self._compiled[key]
+
+    def has_conflicts(self, files: List[Dict[str, Any]], episode_number: str, matches: List[str]) -> bool:
+        if not self.ambiguous_if:
+            return False
+        regex = self.compile(self.ambiguous_if, episode_number)
+        return any(
+            regex.search(f.get('relative_path') or '') and f.get('relative_path') not in matches
+            for f in files
+        )
+
+    def candidates(self, files: List[Dict[str, Any]], episode_number: str) -> List[str]:
+        regex = self.compile(self.pattern, episode_number)
+        found = []
+        for f in files:
+            rel_path = f.get('relative_path') or ''
+            if self.extensions and f.get('extension', '').lower() not in self.extensions:
+                continue
+            if not regex.search(rel_path):
+                continue
+            if self.dimensions is not None:
+                dims = _parse_dimensions(f.get('dimensions'))
+                if not dims or not self.dimensions(*dims):
+                    continue
+            found.append(rel_path)
+        return sorted(found)
+
+
+def _parse_dimensions(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    if not value or 'x' not in str(value):
+        return None
+    try:
+        w, h = str(value).lower().split('x', 1)
+        return int(w), int(h)
+    except ValueError:
+        return None
+
+
+def _is_16x9(w: int, h: int) -> bool:
+    return h > 0 and 1.7 < w / h < 1.8
+
+
+def _is_square(w: int, h: int) -> bool:
+    return h > 0 and 0.98 < w / h < 1.02
+
+
+# Block letters / break numbers. Anchored at a path boundary so that
+# e.g. "assets/video/roadblock-a.mp4" doesn't read as a capture.
+_BLOCK = r"block[-_ ]?[a-h]"
+_BREAK = r"break[-_ ]?\d+"
+# Episode-prefixed media that is NOT a block export: 0244-2.mov, EP0239-RE.mov...
+_RERENDER = r"^(exports/)?(ep)?{{EP}}[-_ ](?!(block[-_ ]?)?[a-h]\.)[^/]+\.({ext})$"
+
+SLOT_RULES: Dict[str, SlotRule] = {
+    "episode_info": SlotRule(
+        r"^(info|metadata|readme|{EP}-info)\.md$",
+        description="root-level info.md/metadata.md",
+    ),
+    "rundown_json": SlotRule(
+        r"^({EP}-)?rundown\.json$",
+        description="root-level {episode}-rundown.json",
+    ),
+    "capture_blocks": SlotRule(
+        rf"^(captures/)?([^/]*[-_ ])?{_BLOCK}\.[^./]+$",
+        multiplicity="multiple", extensions=VIDEO_EXTS,
+        description="BLOCK-<letter> video in captures/ or root",
+    ),
+    "capture_breaks": SlotRule(
+        rf"^(captures/)?{_BREAK}\.[^./]+$",
+        multiplicity="multiple", extensions=VIDEO_EXTS,
+        description="BREAK-<n> video in captures/ or root",
+    ),
+    "thumbnail_master_16x9_source": SlotRule(
+        r"^thumbnails/[^/]*(16x9|widescreen)[^/]*$",
+        extensions={'.psd'}, dimensions=_is_16x9,
+        description="16:9 PSD in thumbnails/",
+    ),
+    "thumbnail_master_16x9_export": SlotRule(
+        r"^thumbnails/[^/]*(16x9|widescreen)[^/]*$",
+        extensions=IMAGE_EXPORT_EXTS, dimensions=lambda w, h: _is_16x9(w, h) and w >= 1920,
+        description="16:9 PNG/JPG (>=1920 wide) in thumbnails/",
+    ),
+    "thumbnail_master_1x1_source": SlotRule(
+        r"^thumbnails/[^/]*(square|1x1|podcast)[^/]*$",
+        extensions={'.psd'}, dimensions=_is_square,
+        description="square PSD in thumbnails/",
+    ),
+    "thumbnail_master_1x1_export": SlotRule(
+        r"^thumbnails/[^/]*(square|1x1|podcast)[^/]*$",
+        extensions=IMAGE_EXPORT_EXTS, dimensions=lambda w, h: _is_square(w, h) and w >= 1400,
+        description="square PNG/JPG (>=1400) in thumbnails/",
+    ),
+    "export_video_blocks": SlotRule(
+        r"^(exports/)?(ep)?{EP}[-_ ](block[-_ ]?)?[a-h]\.mp4$",
+        multiplicity="multiple", extensions={'.mp4'},
+        description="{episode}-<letter>.mp4",
+    ),
+    "export_audio_blocks": SlotRule(
+        r"^(exports/)?(ep)?{EP}[-_ ](block[-_ ]?)?[a-h]\.mp3$",
+        multiplicity="multiple", extensions={'.mp3'},
+        description="{episode}-<letter>.mp3",
+    ),
+    "export_video_full": SlotRule(
+        r"^(exports/)?(ep)?{EP}(-full)?\.(mp4|mov)$",
+        extensions={'.mp4', '.mov'},
+        ambiguous_if=_RERENDER.format(ext="mp4|mov"),
+        description="{episode}.mp4 with no re-render variants",
+    ),
+    "export_audio_full": SlotRule(
+        r"^(exports/)?(ep)?{EP}(-full|-podcast)?\.mp3$",
+        extensions={'.mp3'},
+        ambiguous_if=_RERENDER.format(ext="mp3"),
+        description="{episode}.mp3 with no re-render variants",
+    ),
+    "export_subtitles": SlotRule(
+        r"^(exports/)?[^/]*\.(srt|vtt|sub)$",
+        description="single subtitle file in exports/ or root",
+    ),
+    "export_thumbnail_1920x1080": SlotRule(
+        r"^exports/[^/]+$",
+        extensions=IMAGE_EXPORT_EXTS, dimensions=lambda w, h: (w, h) == (1920, 1080),
+        description="exactly 1920x1080 image in exports/",
+    ),
+    "export_thumbnail_1280x720": SlotRule(
+        r"^exports/[^/]+$",
+        extensions=IMAGE_EXPORT_EXTS, dimensions=lambda w, h: (w, h) == (1280, 720),
+        description="exactly 1280x720 image in exports/",
+    ),
+    "export_thumbnail_1400x1400": SlotRule(
+        r"^exports/[^/]+$",
+        extensions=IMAGE_EXPORT_EXTS, dimensions=lambda w, h: (w, h) in ((1400, 1400), (1500, 1500)),
+        description="1400x1400/1500x1500 image in exports/",
+    ),
+    "project_vmix": SlotRule(
+        r"\.vmix$",
+        description="single .vmix file",
+    ),
+    "project_guest_teaser_source": SlotRule(
+        r"^projects/teasers/[^/]+/source/[^/]+\.aep$",
+        multiplicity="multiple",
+        description=".aep under projects/teasers/<guest>/source/",
+    ),
+    "project_guest_teaser_tonight": SlotRule(
+        r"^projects/teasers/[^/]+/[^/]*tonight[^/]*\.mp4$",
+        multiplicity="multiple",
+        description="*tonight*.mp4 under projects/teasers/<guest>/",
+    ),
+    "project_guest_teaser_up_next": SlotRule(
+        r"^projects/teasers/[^/]+/[^/]*up[-_ ]?next[^/]*\.mp4$",
+        multiplicity="multiple",
+        description="*up_next*.mp4 under projects/teasers/<guest>/",
+    ),
+    "project_guest_teaser_follow": SlotRule(
+        r"^projects/teasers/[^/]+/[^/]*follow[^/]*\.mp4$",
+        multiplicity="multiple",
+        description="*follow*.mp4 under projects/teasers/<guest>/",
+    ),
+    "assets_video": SlotRule(
+        r"^assets/(video|sot)/[^/]+\.(mp4|mov)$",
+        multiplicity="multiple",
+        description="video in assets/video or assets/sot",
+    ),
+    "assets_images": SlotRule(
+        r"^assets/images/[^/]+\.(png|jpe?g|webp)$",
+        multiplicity="multiple",
+        description="image in assets/images",
+    ),
+    "assets_audio": SlotRule(
+        r"^assets/audio/[^/]+\.(mp3|wav)$",
+        multiplicity="multiple",
+        description="audio in assets/audio",
+    ),
+    "assets_graphics": SlotRule(
+        r"^assets/(graphics|gfx)/[^/]+\.png$",
+        multiplicity="multiple",
+        description="PNG in assets/graphics or assets/gfx",
+    ),
+}
+
+
+def prematch_slots(
+    files: List[Dict[str, Any]],
+    episode_number: str,
+    slot_names: List[str]
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Resolve slots that deterministic rules can settle on their own.
+
+    Args:
+        files: File metadata (relative_path, extension, dimensions)
+        episode_number: Episode number substituted into {EP}
+        slot_names: Slots to consider (normally SLOT_PROMPTS keys)
+
+    Returns:
+        Tuple of (resolved slot results, ambiguous slot names for the LLM)
+    """
+    resolved: Dict[str, Any] = {}
+    ambiguous: List[str] = []
+
+    for slot_name in slot_names:
+        rule = SLOT_RULES.get(slot_name)
+        if rule is None:
+            ambiguous.append(slot_name)
+            continue
+
+        matches = rule.candidates(files, episode_number)
+        if rule.multiplicity == "single":
+            settled = len(matches) == 1 and not rule.has_conflicts(files, episode_number, matches)
+        else:
+            settled = len(matches) >= 1
+
+        if settled:
+            resolved[slot_name] = {
+                "matches": matches,
+                "confidence": RULE_CONFIDENCE,
+                "reasoning": f"Deterministic rule: {rule.description}",
+                "matched_by": "rules"
+            }
+        else:
+            ambiguous.append(slot_name)
+
+    logger.info(f"Pre-matcher resolved {len(resolved)} slots, {len(ambiguous)} left for LLM")
+    return resolved, ambiguous
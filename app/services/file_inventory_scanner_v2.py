@@ -14,6 +14,7 @@ from PIL import Image
 import mimetypes
 
 from services.file_inventory_llm_v2 import match_file_to_expectation, classify_stray_file
+from services.file_index import DEFAULT_EXCLUDE_DIRS, IMAGE_EXTENSIONS, FileEntry, get_file_index
 
 logger = logging.getLogger(__name__)
 
@@ -258,41 +259,53 @@ CANONICAL_EXPECTATIONS = [
 ]
 
 
-def get_file_metadata(file_path: Path) -> Dict[str, Any]:
+def get_file_metadata(file_path: Path, entry: Optional[FileEntry] = None) -> Dict[str, Any]:
     """
     Extract metadata from a file for LLM analysis.
+
+    When a FileEntry from the file index is supplied, its cached stat and
+    image dimensions are used instead of touching the file again.
     """
     try:
-        stat = file_path.stat()
+        if entry is not None:
+            size, mtime = entry.size, entry.mtime
+        else:
+            stat = file_path.stat()
+            size, mtime = stat.st_size, stat.st_mtime
 
         metadata = {
             "path": str(file_path),
             "filename": file_path.name,
             "extension": file_path.suffix.lower(),
-            "size": stat.st_size,
-            "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+            "size": size,
+            "modified": datetime.fromtimestamp(mtime).isoformat(),
             "folder_path": str(file_path.parent),
             "dimensions": "N/A",
             "duration": "N/A"
         }
 
         # Try to get image dimensions
-        if file_path.suffix.lower() in ['.png', '.jpg', '.jpeg', '.psd', '.gif', '.webp']:
+        if file_path.suffix.lower() in IMAGE_EXTENSIONS:
             try:
-                with Image.open(file_path) as img:
-                    metadata["dimensions"] = f"{img.width}x{img.height}"
+                if entry is not None:
+                    width, height = entry.width or 0, entry.height or 0
+                else:
+                    with Image.open(file_path) as img:
+                        width, height = img.width, img.height
+
+                if width > 0 and height > 0:
+                    metadata["dimensions"] = f"{width}x{height}"
 
                     # Calculate aspect ratio
-                    if img.width > 0 and img.height > 0:
-                        ratio = img.width / img.height
-                        if 1.7 < ratio < 1.8:
-                            metadata["aspect_ratio"] = "16:9"
-                        elif 0.95 < ratio < 1.05:
-                            metadata["aspect_ratio"] = "1:1 (square)"
-                        elif 0.5 < ratio < 0.6:
-                            metadata["aspect_ratio"] = "9:16 (vertical)"
-                        else:
-                            metadata["aspect_ratio"] = f"{ratio:.2f}"
+                    ratio = width / height
+                    if 1.7 < ratio < 1.8:
+                        metadata["aspect_ratio"] = "16:9"
+                    elif 0.95 < ratio < 1.05:
+                        metadata["aspect_ratio"] = "1:1 (square)"
+                    elif 0.5 < ratio < 0.6:
+                        metadata["aspect_ratio"] = "9:16 (vertical)"
+                    else:
+                        metadata["aspect_ratio"] = f"{ratio:.2f}"
             except Exception as e:
                 logger.debug(f"Could not read image dimensions for {file_path}: {e}")
 
@@ -312,32 +325,24 @@ def get_file_metadata(file_path: Path) -> Dict[str, Any]:
 def scan_directory_recursive(base_path: Path, exclude_dirs: List[str] = None) -> List[Dict[str, Any]]:
     """
     Recursively scan a directory and collect all file metadata.
+
+    Served from the persistent file index: the walk prunes excluded
+    directories and only re-reads files that changed since the last scan.
     """
     if exclude_dirs is None:
-        exclude_dirs = [
-            '.git', '.syncthing', '.stfolder', '.blackmagicsync-v2',
-            '.DS_Store', '.claude', '.vscode', '__pycache__',
-            'node_modules', '.stversions'
-        ]
+        exclude_dirs = DEFAULT_EXCLUDE_DIRS
 
     files = []
 
     try:
-        for item in base_path.rglob('*'):
-            # Skip excluded directories
-            if any(excluded in item.parts for excluded in exclude_dirs):
-                continue
-
-            # Skip directories, only process files
-            if item.is_file():
-                # Skip hidden files
-                if item.name.startswith('.'):
-                    continue
-
-                file_meta = get_file_metadata(item)
-                # Add relative path for easier matching
-                file_meta["relative_path"] = str(item.relative_to(base_path))
-                files.append(file_meta)
+        file_index = get_file_index()
+        file_index.refresh(base_path, exclude_dirs=exclude_dirs)
+
+        for entry in file_index.entries(base_path):
+            file_meta = get_file_metadata(entry.path, entry)
+            # Add relative path for easier matching
+            file_meta["relative_path"] = entry.rel_path
+            files.append(file_meta)
 
     except Exception as e:
         logger.error(f"Error scanning directory {base_path}: {e}")
@@ -17,37 +17,43 @@ Each block has clear START/END headers for easy navigation.
 import re
 import html
 import base64
+import hashlib
 import logging
 import mimetypes
 import shutil
 import subprocess
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from enum import Enum
 from database import SessionLocal
-from models_v2 import Episode, Rundown, RundownItem, Season, Show, SOTProcessingJob
+from models_v2 import Episode, RundownItem, Season, Show, SOTProcessingJob
+from services.compiled_episode import compile_episode
+from services.cue_parser import parse_cue_body, parse_script
+from services.file_index import get_file_index
+from services.script_media_derivatives import DERIVATIVE_DIR, ensure_derivatives
+from services.script_render_cache import (
+    SegmentFragmentCache, compute_render_key, get_cached_render, store_render
+)
 
 logger = logging.getLogger(__name__)
 
 
-def _extract_field(cue_content: str, field_pattern: str) -> str:
+def _extract_field(cue_content: str, field_name: str) -> str:
     """Extract a field value from cue content.
 
-    Handles multi-line values and ] characters inside the value by anchoring
-    the closing ] at a real field boundary (next [Field: line, end-cue marker,
-    or end of content).
+    Parsed by services.cue_parser (memoized per body), which handles multi-line
+    values and ] characters inside the value. Field names match regardless of
+    spacing, case and separators ('Asset Id' finds [AssetID: ...]).
 
     Args:
         cue_content: The raw text inside <!-- Begin Cue -->...<!-- End Cue -->
-        field_pattern: Field name regex (e.g. 'Quote', 'Media\\s*[Uu]rl', 'Asset\\s*Id')
+        field_name: Field name (e.g. 'Quote', 'Media Url', 'Asset Id')
 
     Returns:
-        The captured value with surrounding whitespace stripped, or '' if not found.
+        The first occurrence's value with surrounding whitespace stripped, or '' if not found.
     """
-    pattern = rf'\[{field_pattern}:\s*(.*?)\](?=\s*(?:\n\s*\[|\n\s*<!--|\Z))'
-    match = re.search(pattern, cue_content, re.DOTALL | re.IGNORECASE)
-    return match.group(1).strip() if match else ''
+    return parse_cue_body(cue_content).get(field_name)
 
 
 class ScriptPreset(Enum):
@@ -76,7 +82,9 @@ SPEAKER_CONFIG = {
 def generate_host_script(
     episode_number: str,
     output_dir: Optional[str] = None,
-    preset: str = "host_full"
+    preset: str = "host_full",
+    progress: Optional[Callable[[int, str], None]] = None,
+    use_cache: bool = True
 ) -> Dict[str, Any]:
     """
     Generate a host script from database rundown items.
@@ -85,42 +93,39 @@ def generate_host_script(
         episode_number: Episode number (e.g., "0249")
         output_dir: Optional output directory. Defaults to episode's scripts/current/ folder.
         preset: Script preset - "host_full", "host_clean", or "production"
+        progress: Optional callback(percent, stage) for job progress reporting
+        use_cache: Return the previous artifacts when nothing that feeds the
+            render has changed (see services/script_render_cache)
 
     Returns:
         Dict with success status, output path, and metadata
+        ("cached": True when served from the render cache)
     """
+    def report(percent: int, stage: str):
+        if progress:
+            try:
+                progress(percent, stage)
+            except Exception as e:
+                logger.debug(f"Progress callback failed: {e}")
+
     db = SessionLocal()
 
     try:
+        report(5, "Loading rundown")
+
         # Validate preset
         try:
             script_preset = ScriptPreset(preset.lower())
         except ValueError:
             script_preset = ScriptPreset.HOST_FULL
 
-        # Find episode
-        episode = db.query(Episode).filter(
-            Episode.episode_number == int(episode_number)
-        ).first()
-
-        if not episode:
-            return {"success": False, "error": f"Episode {episode_number} not found"}
-
-        # Get rundown
-        rundown = db.query(Rundown).filter(Rundown.episode_id == episode.id).first()
-        if not rundown:
-            return {"success": False, "error": f"No rundown found for episode {episode_number}"}
-
-        # Get all rundown items ordered by position
-        items = db.query(RundownItem).filter(
-            RundownItem.rundown_id == rundown.id
-        ).order_by(RundownItem.order_in_rundown).all()
-
-        if not items:
-            return {"success": False, "error": f"No rundown items found for episode {episode_number}"}
-
-        # Get episode metadata (pass items for runtime calculation)
-        episode_info = _get_episode_info(episode, db, items)
+        # Rundown, cues, media sources and transcriptions - shared across presets
+        try:
+            compiled = compile_episode(episode_number, db)
+        except LookupError as e:
+            return {"success": False, "error": str(e)}
+        items = compiled.items
+        episode_info = compiled.episode_info
 
         # Determine output path
         ep_num_padded = episode_number.zfill(4)
@@ -137,14 +142,9 @@ def generate_host_script(
         resources_path = output_path / "resources"
         resources_path.mkdir(parents=True, exist_ok=True)
 
-        # Collect media resources
-        url_mapping = _collect_media_resources(items, resources_path, ep_num_padded)
-
-        # Build transcription cache from SOTProcessingJob records
-        transcription_cache = _build_transcription_cache(items, db)
-
-        # Detect blocks
-        blocks = _detect_blocks(items)
+        # Referenced media is resolved to paths at compile time; embedding happens below on a cache miss
+        media_sources = compiled.media_sources
+        transcription_cache = compiled.transcription_cache
 
         # Load settings (for FSQ quote rendering flags, etc.)
         try:
@@ -154,8 +154,29 @@ def generate_host_script(
             logger.warning(f"Failed to load settings, using defaults: {e}")
             settings = {}
 
+        render_key = compute_render_key(
+            ep_num_padded, script_preset.value, output_path, items,
+            episode_info, media_sources, transcription_cache, settings
+        )
+        if use_cache:
+            cached = get_cached_render(output_path, script_preset.value, render_key)
+            if cached:
+                logger.info(f"Script inputs unchanged for {ep_num_padded} {script_preset.value}; "
+                            f"reusing revision {cached.get('revision')}")
+                report(100, "Unchanged - reused previous render")
+                return cached
+
+        # Collect media resources
+        report(20, "Embedding media")
+        url_mapping = compiled.url_mapping(resources_path)
+        blocks = compiled.blocks
+
+        # Unchanged segments are assembled from fragments cached by earlier renders
+        fragments = SegmentFragmentCache(output_path, script_preset.value)
+
         # Generate HTML
-        html_content = _generate_html(episode_info, blocks, script_preset, url_mapping, transcription_cache, settings)
+        report(45, "Rendering HTML")
+        html_content = _generate_html(episode_info, blocks, script_preset, url_mapping, transcription_cache, settings, fragments)
 
         # Generate filenames with revision numbers
         date_str = datetime.now().strftime("%Y%m%d")
@@ -181,16 +202,20 @@ def generate_host_script(
         logger.info(f"Generated {preset} script HTML: {html_path}")
 
         # Generate Markdown
-        md_content = _generate_markdown(episode_info, blocks, script_preset, url_mapping, transcription_cache)
+        report(60, "Rendering Markdown")
+        md_content = _generate_markdown(episode_info, blocks, script_preset, url_mapping, transcription_cache, fragments)
+        fragments.save()
+        logger.info(f"Segment fragments: {fragments.hits} reused, {fragments.misses} rendered")
         with open(md_path, 'w', encoding='utf-8') as f:
             f.write(md_content)
 
         logger.info(f"Generated {preset} script Markdown: {md_path}")
 
         # Convert to PDF
+        report(70, "Converting to PDF")
         pdf_generated = _convert_to_pdf(html_path, pdf_path, episode_info)
 
-        return {
+        result = {
             "success": True,
             "html_path": str(html_path),
             "pdf_path": str(pdf_path) if pdf_generated else None,
@@ -202,6 +227,9 @@ def generate_host_script(
             "block_count": len(blocks),
             "revision": revision
         }
+        store_render(output_path, script_preset.value, render_key, result)
+        report(100, "Completed")
+        return result
 
     except Exception as e:
         logger.error(f"Error generating script for episode {episode_number}: {e}")
@@ -362,84 +390,94 @@ def _detect_blocks(items: List[RundownItem]) -> List[Dict[str, Any]]:
     return blocks
 
 
-def _collect_media_resources(
-    items: List[RundownItem],
-    resources_path: Path,
-    episode_number: str
-) -> Dict[str, str]:
+def _resolve_media_sources(items: List[RundownItem], episode_number: str) -> Dict[str, Optional[Path]]:
     """
-    Collect and copy media files from cue blocks.
+    Find every media URL referenced by cue blocks and resolve it to a file.
 
-    Returns mapping of original URL -> local relative path.
+    Returns mapping of original URL -> source Path (None when unresolvable).
+    Cheap (cached parse + stat); the render cache keys on the result before anything
+    is read or embedded.
     """
-    url_mapping = {}
-    cue_counter = 0
+    sources: Dict[str, Optional[Path]] = {}
 
     # Base paths for media files. The container mount (/home/episodes) is the
     # authoritative one in production; the host path is a dev fallback.
     container_base = Path("/home/episodes")
     host_base = Path("/mnt/sync/disaffected/episodes")
 
-    # Pattern to find cue blocks
-    cue_pattern = re.compile(r'<!-- Begin Cue -->(.*?)<!-- End Cue -->', re.DOTALL | re.IGNORECASE)
-
-    # Patterns for media URLs - handle both "Media Url" (with space) and "MediaUrl" (no space)
-    media_patterns = [
-        re.compile(r'\[Media\s*[Uu]rl:\s*([^\]]+)\]', re.IGNORECASE),
-        re.compile(r'\[MediaURL:\s*([^\]]+)\]', re.IGNORECASE),
-        re.compile(r'\[Thumbnail\s*[Uu]rl:\s*([^\]]+)\]', re.IGNORECASE),
-        re.compile(r'\[ThumbnailURL:\s*([^\]]+)\]', re.IGNORECASE),
-        re.compile(r'<img[^>]+src="([^"]+)"', re.IGNORECASE),
-    ]
-
     for item in items:
         if not item.script_content:
             continue
 
-        for cue_match in cue_pattern.finditer(item.script_content):
-            cue_content = cue_match.group(1)
-            cue_counter += 10
-
-            # Extract slug for filename
-            slug = _extract_field(cue_content, 'Slug') or 'media'
-
-            for pattern in media_patterns:
-                for match in pattern.finditer(cue_content):
-                    original_url = match.group(1).strip()
-
-                    if not original_url or original_url in url_mapping:
-                        continue
-
-                    # Skip blob and http URLs. blob: URLs are transient browser
-                    # handles that were mistakenly persisted into script_content
-                    # and can never resolve server-side — that's an UPSTREAM data
-                    # problem. Leave them unmapped so the formatter renders a
-                    # visible "missing" placeholder instead of a silent blank.
-                    if original_url.startswith(('http://', 'https://', 'blob:')):
-                        logger.warning(
-                            f"GFX/SOT cue references a non-asset URL ({original_url[:60]}); "
-                            f"skipping — image must live under episodes/{episode_number}/assets/"
-                        )
-                        continue
-
-                    # Resolve the file strictly under the episode's assets/ tree.
-                    source_path = _find_media_file(original_url, episode_number, container_base, host_base)
-
-                    if source_path and source_path.exists():
-                        # Embed as a base64 data URI so the HTML is fully
-                        # self-contained (images render no matter where the file
-                        # is opened) and the PDF needs no path resolution.
-                        data_uri = _file_to_data_uri(source_path)
-                        if data_uri:
-                            url_mapping[original_url] = data_uri
-                        else:
-                            logger.warning(f"Failed to embed {source_path}")
-                    else:
-                        logger.warning(
-                            f"Image not found under assets/ for URL '{original_url}' "
-                            f"(episode {episode_number}) — upstream: asset missing from "
-                            f"episodes/{episode_number}/assets/"
-                        )
+        # Expanded and collapsed cues alike; media fields under any spelling
+        # ("Media Url", "MediaURL", ...) plus <img> tags
+        for cue in parse_script(item.script_content).cues:
+            urls = cue.values('Media Url') + cue.values('Thumbnail Url') + [image.src for image in cue.images]
+            for url in urls:
+                original_url = url.strip()
+
+                if not original_url or original_url in sources:
+                    continue
+
+                # Skip blob and http URLs. blob: URLs are transient browser
+                # handles that were mistakenly persisted into script_content
+                # and can never resolve server-side — that's an UPSTREAM data
+                # problem. Leave them unmapped so the formatter renders a
+                # visible "missing" placeholder instead of a silent blank.
+                if original_url.startswith(('http://', 'https://', 'blob:')):
+                    logger.warning(
+                        f"GFX/SOT cue references a non-asset URL ({original_url[:60]}); "
+                        f"skipping — image must live under episodes/{episode_number}/assets/"
+                    )
+                    continue
+
+                # Resolve the file strictly under the episode's assets/ tree.
+                source_path = _find_media_file(original_url, episode_number, container_base, host_base)
+                sources[original_url] = source_path if source_path and source_path.exists() else None
+
+    return sources
+
+
+def _collect_media_resources(
+    items: List[RundownItem],
+    resources_path: Path,
+    episode_number: str,
+    sources: Optional[Dict[str, Optional[Path]]] = None
+) -> Dict[str, str]:
+    """
+    Collect media files from cue blocks and embed them.
+
+    Images are embedded from print-resolution derivatives cached under
+    resources/media/ (see services/script_media_derivatives), falling back to
+    the original file when a derivative can't be built.
+
+    Returns mapping of original URL -> data: URI.
+    """
+    if sources is None:
+        sources = _resolve_media_sources(items, episode_number)
+
+    derivatives = ensure_derivatives(
+        [path for path in sources.values() if path],
+        resources_path / DERIVATIVE_DIR
+    )
+
+    url_mapping = {}
+    for original_url, source_path in sources.items():
+        if source_path:
+            # Embed as a base64 data URI so the HTML is fully
+            # self-contained (images render no matter where the file
+            # is opened) and the PDF needs no path resolution.
+            data_uri = _file_to_data_uri(derivatives.get(source_path) or source_path)
+            if data_uri:
+                url_mapping[original_url] = data_uri
+            else:
+                logger.warning(f"Failed to embed {source_path}")
+        else:
+            logger.warning(
+                f"Image not found under assets/ for URL '{original_url}' "
+                f"(episode {episode_number}) — upstream: asset missing from "
+                f"episodes/{episode_number}/assets/"
+            )
 
     return url_mapping
 
@@ -539,13 +577,13 @@ def _find_media_file(
             candidate = base / episode_number / subdir / filename
             if candidate.exists():
                 return candidate
-        # Fallback: any match by filename anywhere under assets/ (one rglob),
-        # in case a future subdir is added. Still confined to assets/.
+        # Fallback: any match by filename anywhere under assets/ (file index
+        # lookup), in case a future subdir is added. Still confined to assets/.
         if ep_assets.is_dir():
             try:
-                for match in ep_assets.rglob(filename):
-                    if match.is_file():
-                        return match
+                for match in get_file_index().find(ep_assets, filename):
+                    if match.path.is_file():
+                        return match.path
             except Exception:
                 pass
 
@@ -558,20 +596,25 @@ def _build_transcription_cache(items: List[RundownItem], db) -> Dict[str, str]:
 
     Returns mapping of AssetID -> transcription text.
     """
-    cache = {}
+    return _fetch_transcriptions(_sot_asset_ids(items), db)
 
-    # Extract all Asset IDs from SOT cues
+
+def _sot_asset_ids(items: List[RundownItem]) -> set:
+    """Asset IDs referenced by SOT cues in the items' script content."""
     asset_ids = set()
     for item in items:
         if not item.script_content:
             continue
         # Find all SOT cues and extract Asset IDs
-        for cue in re.findall(r'<!-- Begin Cue -->(.*?)<!-- End Cue -->', item.script_content, re.DOTALL):
-            if '[Type: SOT]' in cue:
-                asset_id = _extract_field(cue, r'Asset\s*Id')
-                if asset_id:
-                    asset_ids.add(asset_id)
+        for cue in parse_script(item.script_content).of_type('SOT'):
+            if cue.asset_id:
+                asset_ids.add(cue.asset_id)
+    return asset_ids
+
 
+def _fetch_transcriptions(asset_ids, db) -> Dict[str, str]:
+    """Look up SOTProcessingJob transcriptions for the given Asset IDs."""
+    cache = {}
     if not asset_ids:
         return cache
 
@@ -597,7 +640,8 @@ def _generate_html(
     preset: ScriptPreset,
     url_mapping: Dict[str, str],
     transcription_cache: Dict[str, str] = None,
-    settings: Dict[str, Any] = None
+    settings: Dict[str, Any] = None,
+    fragments: Optional[SegmentFragmentCache] = None
 ) -> str:
     """Generate the complete HTML document."""
     if transcription_cache is None:
@@ -605,6 +649,10 @@ def _generate_html(
     if settings is None:
         settings = {}
 
+    # Segments render against stable placeholders; the (large) embedded media is
+    # substituted once at the end, so cached fragments stay small and reusable.
+    placeholders, media_by_token = _media_placeholders(url_mapping)
+
     # Get CSS for the preset
     css = _get_css(preset, episode_info['episode_number'])
 
@@ -626,11 +674,54 @@ def _generate_html(
 
     # Content blocks
     for block in blocks:
-        html_parts.append(_generate_block(block, preset, url_mapping, transcription_cache, settings))
+        html_parts.append(_generate_block(block, preset, placeholders, transcription_cache, settings, fragments))
 
     html_parts.extend(['</body>', '</html>'])
 
-    return '\n'.join(html_parts)
+    return _MEDIA_TOKEN_RE.sub(lambda m: media_by_token.get(m.group(0), ''), '\n'.join(html_parts))
+
+
+_MEDIA_TOKEN_RE = re.compile(r'data:x-script-media;[0-9a-f]{20}')
+
+
+def _media_placeholders(url_mapping: Dict[str, str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """
+    Map each media URL to a stable placeholder token.
+
+    Returns (url -> token, token -> real value). Tokens keep the data: prefix
+    so the formatters' embedded-source checks treat them like the real thing.
+    """
+    placeholders = {}
+    media_by_token = {}
+    for url, value in url_mapping.items():
+        token = f"data:x-script-media;{hashlib.sha1(url.encode('utf-8')).hexdigest()[:20]}"
+        placeholders[url] = token
+        media_by_token[token] = value
+    return placeholders, media_by_token
+
+
+def _segment_fragment_key(
+    fragments: SegmentFragmentCache,
+    kind: str,
+    item: RundownItem,
+    preset: ScriptPreset,
+    url_mapping: Dict[str, str],
+    transcription_cache: Dict[str, str],
+    settings: Dict[str, Any],
+    last_speaker: Optional[str] = None
+) -> str:
+    """Fragment cache key: everything a single segment's output depends on."""
+    content = item.script_content or ''
+    return fragments.key(
+        kind,
+        preset.value,
+        item.item_type, item.slug, item.title, item.duration, content,
+        # Only the media / transcriptions this segment can reference
+        sorted(url for url in url_mapping if url in content),
+        sorted((asset_id, text) for asset_id, text in transcription_cache.items() if asset_id in content),
+        settings,
+        last_speaker,
+    )
 
 
 def _generate_markdown(
@@ -638,7 +729,8 @@ def _generate_markdown(
     blocks: List[Dict[str, Any]],
     preset: ScriptPreset,
     url_mapping: Dict[str, str],
-    transcription_cache: Dict[str, str] = None
+    transcription_cache: Dict[str, str] = None,
+    fragments: Optional[SegmentFragmentCache] = None
 ) -> str:
     """Generate clean markdown document from script data."""
     if transcription_cache is None:
@@ -679,7 +771,7 @@ def _generate_markdown(
 
     # Content blocks
     for block in blocks:
-        md_parts.append(_generate_markdown_block(block, preset, url_mapping, transcription_cache))
+        md_parts.append(_generate_markdown_block(block, preset, url_mapping, transcription_cache, fragments))
 
     return '\n'.join(md_parts)
 
@@ -688,7 +780,8 @@ def _generate_markdown_block(
     block: Dict[str, Any],
     preset: ScriptPreset,
     url_mapping: Dict[str, str],
-    transcription_cache: Dict[str, str] = None
+    transcription_cache: Dict[str, str] = None,
+    fragments: Optional[SegmentFragmentCache] = None
 ) -> str:
     """Generate markdown for a single block."""
     if transcription_cache is None:
@@ -703,7 +796,14 @@ def _generate_markdown_block(
 
     # Process each segment
     for item in block['items']:
-        segment_md = _process_segment_markdown(item, preset, url_mapping, transcription_cache)
+        segment_md = None
+        if fragments is not None:
+            key = _segment_fragment_key(fragments, 'md', item, preset, url_mapping, transcription_cache, {})
+            segment_md = fragments.get(key)
+        if segment_md is None:
+            segment_md = _process_segment_markdown(item, preset, url_mapping, transcription_cache)
+            if fragments is not None:
+                fragments.put(key, segment_md)
         if segment_md:
             parts.append(segment_md)
 
@@ -795,31 +895,17 @@ def _process_content_markdown(
 
     parts = []
 
-    # Pattern for cue blocks
-    cue_pattern = re.compile(r'<!-- Begin Cue -->(.*?)<!-- End Cue -->', re.DOTALL | re.IGNORECASE)
-
-    # Split by cue blocks and process
-    last_end = 0
-    for match in cue_pattern.finditer(content):
-        # Text before cue
-        text_before = content[last_end:match.start()]
-        if text_before.strip():
-            text_md = _process_text_markdown(text_before, preset)
-            parts.append(text_md)
+    # Text runs and cue blocks (expanded or collapsed) in document order
+    for segment in parse_script(content).segments():
+        if isinstance(segment, str):
+            if segment.strip():
+                parts.append(_process_text_markdown(segment, preset))
+            continue
 
-        # Cue block
-        cue_md = _process_cue_markdown(match.group(1), preset, url_mapping, transcription_cache)
+        cue_md = _process_cue_markdown(segment.body, preset, url_mapping, transcription_cache)
         if cue_md:
             parts.append(cue_md)
 
-        last_end = match.end()
-
-    # Text after last cue
-    text_after = content[last_end:]
-    if text_after.strip():
-        text_md = _process_text_markdown(text_after, preset)
-        parts.append(text_md)
-
     return '\n'.join(parts)
 
 
@@ -886,8 +972,8 @@ def _process_cue_markdown(
     cue_type = (_extract_field(cue_content, 'Type') or 'CUE').upper()
     slug = _extract_field(cue_content, 'Slug')
     duration = _extract_field(cue_content, 'Duration')
-    media_url = _extract_field(cue_content, r'Media\s*[Uu]rl')
-    asset_id = _extract_field(cue_content, r'Asset\s*[Ii][Dd]')
+    media_url = _extract_field(cue_content, 'Media Url')
+    asset_id = _extract_field(cue_content, 'Asset Id')
     transcription = _extract_field(cue_content, 'Transcription')
     description = _extract_field(cue_content, 'Description')
 
@@ -1425,7 +1511,8 @@ def _generate_block(
     preset: ScriptPreset,
     url_mapping: Dict[str, str],
     transcription_cache: Dict[str, str] = None,
-    settings: Dict[str, Any] = None
+    settings: Dict[str, Any] = None,
+    fragments: Optional[SegmentFragmentCache] = None
 ) -> str:
     """Generate HTML for a single block."""
     if transcription_cache is None:
@@ -1444,7 +1531,17 @@ def _generate_block(
     # Process each segment in the block
     last_speaker = None
     for item in block['items']:
-        segment_html, last_speaker = _process_segment(item, last_speaker, preset, url_mapping, transcription_cache, settings)
+        cached = None
+        if fragments is not None:
+            # The speaker carried in from the previous segment affects this one's output
+            key = _segment_fragment_key(fragments, 'html', item, preset, url_mapping, transcription_cache, settings, last_speaker)
+            cached = fragments.get(key)
+        if cached is not None:
+            segment_html, last_speaker = cached
+        else:
+            segment_html, last_speaker = _process_segment(item, last_speaker, preset, url_mapping, transcription_cache, settings)
+            if fragments is not None:
+                fragments.put(key, [segment_html, last_speaker])
         if segment_html:
             parts.append(segment_html)
 
@@ -1563,31 +1660,18 @@ def _process_content(
     parts = []
     current_speaker = last_speaker
 
-    # Pattern for cue blocks
-    cue_pattern = re.compile(r'<!-- Begin Cue -->(.*?)<!-- End Cue -->', re.DOTALL | re.IGNORECASE)
-
-    # Split by cue blocks and process
-    last_end = 0
-    for match in cue_pattern.finditer(content):
-        # Text before cue
-        text_before = content[last_end:match.start()]
-        if text_before.strip():
-            text_html, current_speaker = _process_text(text_before, current_speaker, preset)
-            parts.append(text_html)
+    # Text runs and cue blocks (expanded or collapsed) in document order
+    for segment in parse_script(content).segments():
+        if isinstance(segment, str):
+            if segment.strip():
+                text_html, current_speaker = _process_text(segment, current_speaker, preset)
+                parts.append(text_html)
+            continue
 
-        # Cue block
-        cue_html = _process_cue(match.group(1), preset, url_mapping, transcription_cache, settings)
+        cue_html = _process_cue(segment.body, preset, url_mapping, transcription_cache, settings)
         if cue_html:
             parts.append(cue_html)
 
-        last_end = match.end()
-
-    # Text after last cue
-    text_after = content[last_end:]
-    if text_after.strip():
-        text_html, current_speaker = _process_text(text_after, current_speaker, preset)
-        parts.append(text_html)
-
     return '\n'.join(parts), current_speaker
 
 
@@ -1740,7 +1824,7 @@ def _format_fsq(cue_content: str, slug: str, url_mapping: Dict[str, str], settin
         quote = quote.strip().strip('"')
     attribution = _extract_field(cue_content, 'Attribution')
 
-    original_url = _extract_field(cue_content, r'Media\s*[Uu]rl')
+    original_url = _extract_field(cue_content, 'Media Url')
     media_url = url_mapping.get(original_url, '') if original_url else ''
 
     parts = [
@@ -1772,7 +1856,7 @@ def _format_sot(cue_content: str, slug: str, url_mapping: Dict[str, str], transc
 
     duration = _extract_field(cue_content, 'Duration')
 
-    original_thumb = _extract_field(cue_content, r'Thumbnail\s*[Uu]rl') or _extract_field(cue_content, 'ThumbnailURL')
+    original_thumb = _extract_field(cue_content, 'Thumbnail Url')
     thumbnail_url = ''
     if original_thumb:
         # Only use the embedded (base64) version. If the thumbnail didn't
@@ -1787,7 +1871,7 @@ def _format_sot(cue_content: str, slug: str, url_mapping: Dict[str, str], transc
 
     if not transcription:
         # Look up by Asset ID in transcription cache
-        asset_id = _extract_field(cue_content, r'Asset\s*Id')
+        asset_id = _extract_field(cue_content, 'Asset Id')
         if asset_id:
             transcription = transcription_cache.get(asset_id, '')
 
@@ -1829,7 +1913,7 @@ def _format_sot(cue_content: str, slug: str, url_mapping: Dict[str, str], transc
 def _format_img(cue_content: str, slug: str, cue_type: str, url_mapping: Dict[str, str]) -> str:
     """Format IMG or GFX cue."""
 
-    original_url = _extract_field(cue_content, r'Media\s*[Uu]rl')
+    original_url = _extract_field(cue_content, 'Media Url')
     media_url = url_mapping.get(original_url, '') if original_url else ''
 
     if not media_url:
@@ -1843,8 +1927,8 @@ def _format_img(cue_content: str, slug: str, cue_type: str, url_mapping: Dict[st
         media_url = ''
 
     description = _extract_field(cue_content, 'Description')
-    script_text = _extract_field(cue_content, r'Script\s*Text')
-    include_script = _extract_field(cue_content, r'Include\s*Script\s*Text').lower() in ('yes', 'true', '1')
+    script_text = _extract_field(cue_content, 'Script Text')
+    include_script = _extract_field(cue_content, 'Include Script Text').lower() in ('yes', 'true', '1')
 
     css_class = 'cue-gfx' if cue_type == 'GFX' else 'cue-img'
     body_class = 'cue-img-body' if cue_type != 'GFX' else 'cue-gfx-body'
@@ -1884,7 +1968,7 @@ def _format_production_cue(cue_content: str, cue_type: str, slug: str, url_mappi
         parts.append(f' — {html.escape(duration)}')
 
     # Media URL
-    media_url_raw = _extract_field(cue_content, r'Media\s*[Uu]rl')
+    media_url_raw = _extract_field(cue_content, 'Media Url')
     if media_url_raw:
         parts.append(f'<br><small>Media: {html.escape(media_url_raw)}</small>')
 
@@ -148,7 +148,12 @@ class HousekeepingService:
             rundowns = db.query(Rundown).filter(Rundown.episode_id == episode.id).all()
 
             for rundown in rundowns:
-                items = db.query(RundownItem).filter(
+                # Only the first 100 characters are compared, so only those are fetched
+                items = db.query(
+                    RundownItem.asset_id,
+                    RundownItem.slug,
+                    func.substr(RundownItem.script_content, 1, 100).label('preview')
+                ).filter(
                     RundownItem.rundown_id == rundown.id,
                     RundownItem.script_content.isnot(None),
                     RundownItem.script_content != ''
@@ -157,7 +162,7 @@ class HousekeepingService:
                 # Group by script_content
                 content_map = {}
                 for item in items:
-                    content_hash = item.script_content[:100] if item.script_content else ''
+                    content_hash = item.preview or ''
                     if content_hash not in content_map:
                         content_map[content_hash] = []
                     content_map[content_hash].append(item)
@@ -0,0 +1,236 @@
+"""
+Async HTTP Fetch Service
+Shared, non-blocking HTTP client for outbound fetches made from async endpoints
+(link previews, X/Twitter syndication, social media downloads).
+
+- One httpx.AsyncClient (connection pool) per event loop, reused by all callers
+- Per-host concurrency limit so one slow site can't hog the pool
+- Identical in-flight GETs are de-duplicated: concurrent callers share one request
+- Downloads stream straight to disk with an optional byte cap
+- Sync callers use run_sync(), which closes their loop's client before the loop ends
+"""
+import asyncio
+import logging
+import os
+import weakref
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Dict, Optional, Tuple, TypeVar
+from urllib.parse import urlparse
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+PER_HOST_LIMIT = int(os.getenv("HTTP_FETCH_PER_HOST_LIMIT", "4"))
+MAX_CONNECTIONS = int(os.getenv("HTTP_FETCH_MAX_CONNECTIONS", "50"))
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+T = TypeVar("T")
+
+
+@dataclass
+class FetchResponse:
+    """Buffered response snapshot (safe to share between de-duplicated callers)."""
+    url: str
+    status_code: int
+    headers: Dict[str, str] = field(default_factory=dict)
+    content: bytes = b""
+    encoding: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get('content-type', '')
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def json(self) -> Any:
+        import json
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise httpx.HTTPStatusError(
+                f"HTTP {self.status_code} for {self.url}",
+                request=httpx.Request("GET", self.url),
+                response=httpx.Response(self.status_code),
+            )
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of a streamed download."""
+    url: str
+    status_code: int
+    headers: Dict[str, str]
+    path: Path
+    bytes_written: int
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get('content-type', '')
+
+
+class DownloadTooLarge(Exception):
+    """Raised when a streamed download exceeds its byte cap."""
+
+
+class AsyncFetcher:
+    """Pooled async HTTP client with per-host limits and in-flight de-duplication."""
+
+    def __init__(self, per_host_limit: int = PER_HOST_LIMIT):
+        self.per_host_limit = per_host_limit
+        self._client = httpx.AsyncClient(
+            follow_redirects=True,
+            headers={'User-Agent': DEFAULT_USER_AGENT},
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=20),
+            timeout=DEFAULT_TIMEOUT,
+        )
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[Tuple, asyncio.Future] = {}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    async def get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> FetchResponse:
+        """
+        GET a URL and buffer the body.
+
+        Concurrent calls with the same (url, params, headers) share one request.
+        Network errors propagate as httpx exceptions; HTTP error statuses do not
+        raise (check .ok / call .raise_for_status()).
+        """
+        key = (
+            url,
+            tuple(sorted((params or {}).items())),
+            tuple(sorted((headers or {}).items())),
+        )
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            async with self._host_limit(url):
+                response = await self._client.get(url, params=params, headers=headers, timeout=timeout)
+            result = FetchResponse(
+                url=str(response.url),
+                status_code=response.status_code,
+                headers={k.lower(): v for k, v in response.headers.items()},
+                content=response.content,
+                encoding=response.encoding,
+            )
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody else awaited doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def download(
+        self,
+        url: str,
+        dest: Path,
+        timeout: float = 30.0,
+        max_bytes: Optional[int] = None,
+        chunk_size: int = 65536,
+    ) -> DownloadResult:
+        """
+        Stream a URL to `dest` without buffering it in memory.
+
+        The file is written to a temporary sibling and renamed on success, so
+        a failed or oversized download never leaves a partial file at `dest`.
+        Raises httpx.HTTPStatusError on an error status and DownloadTooLarge
+        when max_bytes is exceeded.
+        """
+        dest = Path(dest)
+        tmp_path = dest.with_name(f".{dest.name}.part")
+        written = 0
+        try:
+            async with self._host_limit(url):
+                async with self._client.stream("GET", url, timeout=timeout) as response:
+                    response.raise_for_status()
+                    headers = {k.lower(): v for k, v in response.headers.items()}
+                    with open(tmp_path, 'wb') as f:
+                        async for chunk in response.aiter_bytes(chunk_size):
+                            written += len(chunk)
+                            if max_bytes is not None and written > max_bytes:
+                                raise DownloadTooLarge(f"exceeds {max_bytes} byte cap")
+                            f.write(chunk)
+                    status_code = response.status_code
+                    final_url = str(response.url)
+            os.replace(tmp_path, dest)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        return DownloadResult(
+            url=final_url,
+            status_code=status_code,
+            headers=headers,
+            path=dest,
+            bytes_written=written,
+        )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+# httpx clients are bound to the event loop they were created on; keep one
+# fetcher per loop (the API has one; asyncio.run() callers get their own).
+_fetchers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncFetcher]" = weakref.WeakKeyDictionary()
+
+
+def get_fetcher() -> AsyncFetcher:
+    """Return the shared AsyncFetcher for the running event loop."""
+    loop = asyncio.get_running_loop()
+    fetcher = _fetchers.get(loop)
+    if fetcher is None:
+        fetcher = AsyncFetcher()
+        _fetchers[loop] = fetcher
+    return fetcher
+
+
+async def close_fetcher() -> None:
+    """Close and drop the running loop's AsyncFetcher, if it has one."""
+    fetcher = _fetchers.pop(asyncio.get_running_loop(), None)
+    if fetcher is not None:
+        await fetcher.aclose()
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """
+    asyncio.run() for worker-thread callers. The loop's fetcher is closed
+    before the loop exits, so each call doesn't leave an httpx client (and
+    its pooled connections) behind.
+    """
+    async def _main() -> T:
+        try:
+            return await coro
+        finally:
+            await close_fetcher()
+
+    return asyncio.run(_main())
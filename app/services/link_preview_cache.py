@@ -0,0 +1,242 @@
+"""
+Link Preview Cache
+Two-tier read-through cache in front of the link_preview_cache table:
+
+- L1: in-process LRU (per API worker), bounded and TTL-aware
+- L2: Redis, shared across workers, keyed by url_hash
+- L3: Postgres link_preview_cache (source of truth, written by cache_preview)
+
+Lookups are bulk-first: get_many() resolves a list of URLs with one pass over
+L1, one Redis MGET and one SQL query for whatever is still missing, so a
+whiteboard with dozens of links costs a single round trip per tier.
+
+Entries carry their own expiry so stale-while-revalidate keeps working: an
+expired entry is still returned (is_stale=True) until it ages out of the
+stale window.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+L1_MAX_ENTRIES = int(os.getenv("LINK_PREVIEW_L1_SIZE", "2048"))
+# Bound on how long a worker trusts its own copy (picks up other workers' writes)
+L1_MAX_AGE_SECONDS = int(os.getenv("LINK_PREVIEW_L1_TTL", "300"))
+# How long past expires_at an entry is kept for stale-while-revalidate
+STALE_GRACE_SECONDS = int(os.getenv("LINK_PREVIEW_STALE_GRACE", str(7 * 86400)))
+REDIS_KEY_PREFIX = "link_preview:"
+# After a Redis failure, skip the L2 tier for this long instead of timing out on every call
+REDIS_RETRY_SECONDS = 30
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()
+
+
+@dataclass
+class CachedPreview:
+    """One cached preview plus the metadata needed for freshness checks."""
+    data: dict
+    fetched_at: Optional[str] = None   # ISO timestamp, surfaced as _cached_at
+    expires_at: Optional[float] = None  # epoch seconds; None = never expires
+
+    @property
+    def is_stale(self) -> bool:
+        return self.expires_at is not None and time.time() > self.expires_at
+
+    @property
+    def is_evictable(self) -> bool:
+        return self.expires_at is not None and time.time() > self.expires_at + STALE_GRACE_SECONDS
+
+    def to_json(self) -> str:
+        return json.dumps({"data": self.data, "fetched_at": self.fetched_at, "expires_at": self.expires_at})
+
+    @classmethod
+    def from_json(cls, raw) -> "CachedPreview":
+        payload = json.loads(raw)
+        return cls(payload["data"], payload.get("fetched_at"), payload.get("expires_at"))
+
+
+class LinkPreviewCache:
+    """L1 LRU + L2 Redis front for link_preview_cache."""
+
+    def __init__(self, max_entries: int = L1_MAX_ENTRIES):
+        self.max_entries = max_entries
+        # url -> (CachedPreview, monotonic time stored in L1)
+        self._lru: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_down_until = 0.0
+
+    # ---- L1 ----
+
+    def _l1_get(self, url: str) -> Optional[CachedPreview]:
+        with self._lock:
+            item = self._lru.get(url)
+            if item is None:
+                return None
+            entry, stored = item
+            if entry.is_evictable or time.monotonic() - stored > L1_MAX_AGE_SECONDS:
+                del self._lru[url]
+                return None
+            self._lru.move_to_end(url)
+            return entry
+
+    def _l1_put(self, url: str, entry: CachedPreview):
+        with self._lock:
+            self._lru[url] = (entry, time.monotonic())
+            self._lru.move_to_end(url)
+            if len(self._lru) > self.max_entries:
+                # TTL-aware: drop dead entries first, then fall back to LRU order
+                for key in [k for k, (e, _) in self._lru.items() if e.is_evictable]:
+                    del self._lru[key]
+                while len(self._lru) > self.max_entries:
+                    self._lru.popitem(last=False)
+
+    # ---- L2 ----
+
+    def _get_redis(self):
+        if time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            try:
+                import redis
+                self._redis = redis.Redis.from_url(
+                    os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+                    socket_timeout=0.5, socket_connect_timeout=0.5
+                )
+            except Exception as e:
+                self._redis_failed(e)
+                return None
+        return self._redis
+
+    def _redis_failed(self, error: Exception):
+        logger.warning(f"Link preview Redis tier unavailable, skipping for {REDIS_RETRY_SECONDS}s: {error}")
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+
+    def _redis_ttl(self, entry: CachedPreview) -> Optional[int]:
+        if entry.expires_at is None:
+            return None
+        return max(1, int(entry.expires_at + STALE_GRACE_SECONDS - time.time()))
+
+    def _l2_get_many(self, urls: List[str]) -> Dict[str, CachedPreview]:
+        client = self._get_redis()
+        if client is None or not urls:
+            return {}
+        try:
+            raw_values = client.mget([REDIS_KEY_PREFIX + url_hash(u) for u in urls])
+        except Exception as e:
+            self._redis_failed(e)
+            return {}
+
+        found = {}
+        for url, raw in zip(urls, raw_values):
+            if raw is None:
+                continue
+            try:
+                found[url] = CachedPreview.from_json(raw)
+            except (ValueError, KeyError):
+                continue
+        return found
+
+    def _l2_put_many(self, entries: Dict[str, CachedPreview]):
+        client = self._get_redis()
+        if client is None or not entries:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for url, entry in entries.items():
+                pipe.set(REDIS_KEY_PREFIX + url_hash(url), entry.to_json(), ex=self._redis_ttl(entry))
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+
+    # ---- L3 ----
+
+    def _l3_get_many(self, urls: List[str], db) -> Dict[str, CachedPreview]:
+        from sqlalchemy import text
+
+        by_hash = {url_hash(u): u for u in urls}
+        rows = db.execute(text("""
+            SELECT url_hash, preview_data, fetched_at, expires_at
+            FROM link_preview_cache
+            WHERE url_hash = ANY(:hashes)
+        """), {"hashes": list(by_hash)}).fetchall()
+
+        found = {}
+        for hash_, preview_data, fetched_at, expires_at in rows:
+            if not isinstance(preview_data, dict):
+                continue
+            found[by_hash[hash_]] = CachedPreview(
+                data=preview_data,
+                fetched_at=fetched_at.isoformat() if fetched_at else None,
+                expires_at=expires_at.timestamp() if expires_at else None,
+            )
+        return found
+
+    # ---- public ----
+
+    def get_many(self, urls: Iterable[str], db=None) -> Dict[str, CachedPreview]:
+        """
+        Resolve cached previews for many URLs (stale entries included).
+        Misses are simply absent from the result.
+        """
+        wanted = list(dict.fromkeys(u for u in urls if u))
+        found: Dict[str, CachedPreview] = {}
+
+        for url in wanted:
+            entry = self._l1_get(url)
+            if entry is not None:
+                found[url] = entry
+
+        missing = [u for u in wanted if u not in found]
+        if missing:
+            from_redis = self._l2_get_many(missing)
+            for url, entry in from_redis.items():
+                self._l1_put(url, entry)
+            found.update(from_redis)
+            missing = [u for u in missing if u not in from_redis]
+
+        if missing and db is not None:
+            from_db = self._l3_get_many(missing, db)
+            for url, entry in from_db.items():
+                self._l1_put(url, entry)
+            self._l2_put_many(from_db)
+            found.update(from_db)
+
+        logger.debug(f"Link preview cache: {len(found)}/{len(wanted)} hits ({len(wanted) - len(found)} misses)")
+        return found
+
+    def put(self, url: str, entry: CachedPreview):
+        """Write-through to L1 and L2 (the caller owns the Postgres write)."""
+        self._l1_put(url, entry)
+        self._l2_put_many({url: entry})
+
+    def invalidate(self, url: str):
+        with self._lock:
+            self._lru.pop(url, None)
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            client.delete(REDIS_KEY_PREFIX + url_hash(url))
+        except Exception as e:
+            self._redis_failed(e)
+
+
+_cache: Optional[LinkPreviewCache] = None
+
+
+def get_preview_cache() -> LinkPreviewCache:
+    """Process-wide LinkPreviewCache singleton."""
+    global _cache
+    if _cache is None:
+        _cache = LinkPreviewCache()
+    return _cache
@@ -2,20 +2,38 @@
 Link Preview Service
 Fetch OpenGraph metadata from URLs for rich link previews
 Enhanced with social media-specific metadata extraction
-Includes database caching to store successful fetches
+Includes database caching to store successful fetches, fronted by an
+in-process LRU and Redis (services/link_preview_cache)
+Fetching is async (shared pool in services/http_fetch) with negative caching
+and stale-while-revalidate on top of link_preview_cache
 """
-import requests
+import asyncio
+import copy
+import os
 import re
+import time
 import hashlib
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import httpx
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse, urljoin
 import logging
-from services.social_media import extract_twitter_metadata, fetch_tweet_from_api, fetch_tweet_via_syndication, get_twitter_oauth_credentials
+from services.http_fetch import get_fetcher, run_sync
+from services.link_preview_cache import CachedPreview, get_preview_cache
+from services.social_media import extract_twitter_metadata, fetch_tweet_from_api, fetch_tweet_via_syndication_async, get_twitter_oauth_credentials
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)  # Force INFO level for cache debugging
 
+# Failed fetches are remembered briefly so a dead/slow site isn't re-hit on every render
+NEGATIVE_TTL_SECONDS = int(os.getenv("LINK_PREVIEW_NEGATIVE_TTL", "600"))
+NEGATIVE_CACHE_MAX = 1000
+_negative_cache = {}  # url -> (monotonic expiry, error dict)
+
+# Stale-while-revalidate bookkeeping
+_revalidating = set()
+_background_tasks = set()
+
 
 def get_twitter_bearer_token(db=None):
     """
@@ -62,53 +80,46 @@ def get_twitter_bearer_token(db=None):
         return None
 
 
-def get_cached_preview(url: str, db) -> dict:
-    """
-    Get cached preview data from database if available and not expired
-    Returns dict with _cached flag set to True if from cache
+def _to_response(entry) -> dict:
+    """Copy a CachedPreview into the response shape (with _cached/_stale flags)"""
+    result = copy.deepcopy(entry.data)
+    result['_cached'] = True
+    result['_cached_at'] = entry.fetched_at
+    if entry.is_stale:
+        result['_stale'] = True
+    return result
+
+
+def get_cached_previews(urls, db=None, allow_stale: bool = False) -> dict:
     """
-    if not db:
-        return None
+    Bulk cache lookup: {url: preview} for every URL with a cached preview
+    Resolved through the in-process LRU, then Redis, then one SQL query for the rest
 
+    With allow_stale=True expired entries are included, flagged with _stale=True,
+    so callers can serve them while revalidating.
+    """
     try:
-        from sqlalchemy import text
-        url_hash = hashlib.sha256(url.encode()).hexdigest()
-        logger.info(f"🔎 Looking for cache with hash: {url_hash[:16]}...")
-
-        result = db.execute(text("""
-            SELECT preview_data, fetched_at, expires_at
-            FROM link_preview_cache
-            WHERE url_hash = :url_hash
-        """), {"url_hash": url_hash}).fetchone()
-
-        logger.info(f"🔍 Cache lookup result: {'Found' if result else 'Not found'}")
-
-        if result:
-            preview_data, fetched_at, expires_at = result
-            logger.info(f"📋 Retrieved: preview_data type={type(preview_data)}, expires_at={expires_at}")
-
-            # Check if cache is expired (use timezone-aware datetime)
-            from datetime import timezone
-            if expires_at and datetime.now(timezone.utc) > expires_at:
-                logger.info(f"⏰ Cache expired for {url}")
-                return None
-
-            logger.info(f"✅ Using cached preview for {url} (fetched {fetched_at})")
-            # Add cached flag to indicate this came from cache
-            # Make a copy to avoid modifying cached data
-            import copy
-            result = copy.deepcopy(preview_data) if isinstance(preview_data, dict) else preview_data
-            if isinstance(result, dict):
-                result['_cached'] = True
-                result['_cached_at'] = fetched_at.isoformat() if fetched_at else None
-            logger.info(f"✅ Returning cached result with {len(result)} keys")
-            return result
-
-        logger.info("🔴 Result was None, returning None")
-        return None
+        entries = get_preview_cache().get_many(urls, db)
     except Exception as e:
         logger.error(f"❗ Error reading cache: {e}", exc_info=True)
-        return None
+        return {}
+
+    return {
+        url: _to_response(entry)
+        for url, entry in entries.items()
+        if allow_stale or not entry.is_stale
+    }
+
+
+def get_cached_preview(url: str, db=None, allow_stale: bool = False) -> dict:
+    """
+    Get cached preview data if available and not expired
+    Returns dict with _cached flag set to True if from cache
+
+    With allow_stale=True an expired entry is still returned, flagged with
+    _stale=True, so callers can serve it while revalidating.
+    """
+    return get_cached_previews([url], db, allow_stale=allow_stale).get(url)
 
 
 def cache_preview(url: str, preview_data: dict, db, ttl_days=30):
@@ -144,149 +155,191 @@ def cache_preview(url: str, preview_data: dict, db, ttl_days=30):
     except Exception as e:
         logger.error(f"Error caching preview: {e}")
         db.rollback()
+        return
 
+    get_preview_cache().put(url, CachedPreview(
+        data=preview_data,
+        fetched_at=datetime.now(timezone.utc).isoformat(),
+        expires_at=time.time() + ttl_days * 86400 if ttl_days else None,
+    ))
 
-def fetch_link_preview(url: str, db=None) -> dict:
+
+def invalidate_preview(url: str, db=None):
     """
-    Fetch OpenGraph metadata from a URL
-    Returns dict with title, description, image, and domain
-    Enhanced with Twitter/X-specific metadata when applicable
-    Uses database caching to avoid re-fetching
+    Drop any cached (positive or negative) preview for a URL
     """
-    # Check cache first
-    if db:
-        logger.info(f"🔍 Checking cache for {url}")
-        cached = get_cached_preview(url, db)
-        if cached:
-            logger.info(f"📦 Returning cached data for {url}")
-            return cached
-        logger.info(f"❌ No cache found for {url}, fetching fresh")
+    _negative_cache.pop(url, None)
+    get_preview_cache().invalidate(url)
+    if not db:
+        return
 
     try:
-        # Check if this is a Twitter media URL (pbs.twimg.com)
+        from sqlalchemy import text
+        url_hash = hashlib.sha256(url.encode()).hexdigest()
+        db.execute(text("DELETE FROM link_preview_cache WHERE url_hash = :url_hash"), {"url_hash": url_hash})
+        db.commit()
+    except Exception as e:
+        logger.error(f"Error invalidating preview cache: {e}")
+        db.rollback()
+
+
+def _get_negative(url: str) -> dict:
+    entry = _negative_cache.get(url)
+    if not entry:
+        return None
+    expires, error = entry
+    if time.monotonic() > expires:
+        _negative_cache.pop(url, None)
+        return None
+    return {**error, '_negative_cached': True}
+
+
+def _set_negative(url: str, error: dict):
+    if len(_negative_cache) >= NEGATIVE_CACHE_MAX:
+        # Evict the entry closest to expiry
+        oldest = min(_negative_cache, key=lambda k: _negative_cache[k][0])
+        _negative_cache.pop(oldest, None)
+    _negative_cache[url] = (time.monotonic() + NEGATIVE_TTL_SECONDS, error)
+
+
+def _twitter_media_preview(url: str) -> dict:
+    """Preview for direct Twitter media URLs (pbs.twimg.com / video.twimg.com)"""
+    og_data = {
+        'title': 'Twitter Media',
+        'description': 'Direct media link from Twitter/X',
+        'image': url if '/img/' in url or url.endswith(('.jpg', '.jpeg', '.png', '.webp')) else '',
+        'domain': 'pbs.twimg.com',
+        'favicon': 'https://abs.twimg.com/favicons/twitter.3.ico',
+        'x_media_type': 'video' if 'amplify_video' in url or 'tweet_video' in url else 'image',
+        'x_is_direct_media': True
+    }
+
+    # Try to extract higher quality video thumbnail
+    if 'amplify_video_thumb' in url and 'format=jpg' in url:
+        # Convert to higher quality by changing size parameter
+        og_data['image'] = url.replace('name=small', 'name=large').replace('name=medium', 'name=large')
+        og_data['x_video_thumbnail'] = og_data['image']
+
+    return og_data
+
+
+def _parse_preview_html(html: str, url: str):
+    """
+    Extract OpenGraph metadata from page HTML (CPU-bound, run off the event loop)
+    Returns (og_data, soup)
+    """
+    parsed = urlparse(url)
+    soup = BeautifulSoup(html, 'html.parser')
+
+    # Extract OpenGraph metadata
+    og_data = {}
+
+    # Title
+    og_title = soup.find('meta', property='og:title')
+    if og_title:
+        og_data['title'] = og_title.get('content', '')
+    else:
+        # Fallback to <title> tag
+        title_tag = soup.find('title')
+        og_data['title'] = title_tag.string if title_tag else ''
+
+    # Description
+    og_desc = soup.find('meta', property='og:description')
+    if og_desc:
+        og_data['description'] = og_desc.get('content', '')
+    else:
+        # Fallback to meta description
+        meta_desc = soup.find('meta', attrs={'name': 'description'})
+        og_data['description'] = meta_desc.get('content', '') if meta_desc else ''
+
+    # Image
+    og_image = soup.find('meta', property='og:image')
+    if og_image:
+        image_url = og_image.get('content', '')
+        # Make absolute URL if relative
+        if image_url and not image_url.startswith('http'):
+            image_url = urljoin(url, image_url)
+        og_data['image'] = image_url
+    else:
+        og_data['image'] = ''
+
+    # Domain
+    og_data['domain'] = parsed.netloc
+
+    # Favicon
+    favicon = soup.find('link', rel='icon') or soup.find('link', rel='shortcut icon')
+    if favicon:
+        favicon_url = favicon.get('href', '')
+        if favicon_url and not favicon_url.startswith('http'):
+            favicon_url = urljoin(url, favicon_url)
+        og_data['favicon'] = favicon_url
+    else:
+        # Default favicon location
+        og_data['favicon'] = f"{parsed.scheme}://{parsed.netloc}/favicon.ico"
+
+    return og_data, soup
+
+
+async def _fetch_twitter_metadata(soup, url: str, db) -> dict:
+    """Enhanced X/Twitter metadata: v2 API, then syndication, then scraped HTML"""
+    tweet_id_match = re.search(r'/status/(\d+)', url)
+    if not tweet_id_match:
+        return await asyncio.to_thread(extract_twitter_metadata, soup, url)
+
+    tweet_id = tweet_id_match.group(1)
+
+    # Try v2 API first with credentials
+    oauth_creds = get_twitter_oauth_credentials(db)
+    bearer_token = get_twitter_bearer_token(db) if not oauth_creds else None
+
+    if oauth_creds or bearer_token:
+        # OAuth1 request signing lives in requests_oauthlib; keep it off the loop
+        api_metadata = await asyncio.to_thread(
+            fetch_tweet_from_api, tweet_id, bearer_token=bearer_token, oauth_creds=oauth_creds
+        )
+        if api_metadata and not api_metadata.get('_error'):
+            logger.info(f"Fetched X preview via v2 API for {url}: @{api_metadata.get('author_handle', 'unknown')}")
+            return api_metadata
+
+    # v2 failed or no credentials — try syndication fallback
+    syndication_result = await fetch_tweet_via_syndication_async(tweet_id)
+    if syndication_result:
+        logger.info(f"Fetched X preview via syndication for {url}: @{syndication_result.get('author_handle', 'unknown')}")
+        return syndication_result
+
+    # Both APIs failed — fall back to scraping
+    logger.info(f"All X APIs failed, using scraped data for {url}")
+    return await asyncio.to_thread(extract_twitter_metadata, soup, url)
+
+
+async def _fetch_fresh_preview(url: str, db=None) -> dict:
+    """
+    Fetch a preview from the source and cache it (positive or negative)
+    """
+    try:
         parsed = urlparse(url)
-        is_twitter_media = parsed.netloc in ['pbs.twimg.com', 'video.twimg.com']
 
-        if is_twitter_media:
-            # Handle direct Twitter media URLs
+        # Check if this is a Twitter media URL (pbs.twimg.com)
+        if parsed.netloc in ['pbs.twimg.com', 'video.twimg.com']:
             logger.info(f"Detected Twitter media URL: {url}")
-            og_data = {
-                'title': 'Twitter Media',
-                'description': 'Direct media link from Twitter/X',
-                'image': url if '/img/' in url or url.endswith(('.jpg', '.jpeg', '.png', '.webp')) else '',
-                'domain': 'pbs.twimg.com',
-                'favicon': 'https://abs.twimg.com/favicons/twitter.3.ico',
-                'x_media_type': 'video' if 'amplify_video' in url or 'tweet_video' in url else 'image',
-                'x_is_direct_media': True
-            }
-
-            # Try to extract higher quality video thumbnail
-            if 'amplify_video_thumb' in url and 'format=jpg' in url:
-                # Convert to higher quality by changing size parameter
-                og_data['image'] = url.replace('name=small', 'name=large').replace('name=medium', 'name=large')
-                og_data['x_video_thumbnail'] = og_data['image']
-
-            # Cache and return
-            if db and og_data:
+            og_data = _twitter_media_preview(url)
+            if db:
                 cache_preview(url, og_data, db, ttl_days=30)
             return og_data
 
-        # Add timeout and user agent
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
+        response = await get_fetcher().get(url, timeout=10)
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # Check if this is a Twitter/X URL
-        is_twitter = parsed.netloc in ['twitter.com', 'x.com', 'www.twitter.com', 'www.x.com']
-
-        # Extract OpenGraph metadata
-        og_data = {}
-
-        # Title
-        og_title = soup.find('meta', property='og:title')
-        if og_title:
-            og_data['title'] = og_title.get('content', '')
-        else:
-            # Fallback to <title> tag
-            title_tag = soup.find('title')
-            og_data['title'] = title_tag.string if title_tag else ''
-
-        # Description
-        og_desc = soup.find('meta', property='og:description')
-        if og_desc:
-            og_data['description'] = og_desc.get('content', '')
-        else:
-            # Fallback to meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            og_data['description'] = meta_desc.get('content', '') if meta_desc else ''
-
-        # Image
-        og_image = soup.find('meta', property='og:image')
-        if og_image:
-            image_url = og_image.get('content', '')
-            # Make absolute URL if relative
-            if image_url and not image_url.startswith('http'):
-                image_url = urljoin(url, image_url)
-            og_data['image'] = image_url
-        else:
-            og_data['image'] = ''
-
-        # Domain
-        og_data['domain'] = parsed.netloc
-
-        # Favicon
-        favicon = soup.find('link', rel='icon') or soup.find('link', rel='shortcut icon')
-        if favicon:
-            favicon_url = favicon.get('href', '')
-            if favicon_url and not favicon_url.startswith('http'):
-                favicon_url = urljoin(url, favicon_url)
-            og_data['favicon'] = favicon_url
-        else:
-            # Default favicon location
-            og_data['favicon'] = f"{parsed.scheme}://{parsed.netloc}/favicon.ico"
+        og_data, soup = await asyncio.to_thread(_parse_preview_html, response.text, url)
 
         # If Twitter/X, extract enhanced metadata
-        if is_twitter:
-            tweet_id_match = re.search(r'/status/(\d+)', url)
-
-            if tweet_id_match:
-                tweet_id = tweet_id_match.group(1)
-
-                # Try v2 API first with credentials
-                oauth_creds = get_twitter_oauth_credentials(db)
-                bearer_token = get_twitter_bearer_token(db) if not oauth_creds else None
-                twitter_metadata = None
-
-                if oauth_creds or bearer_token:
-                    api_metadata = fetch_tweet_from_api(tweet_id, bearer_token=bearer_token, oauth_creds=oauth_creds)
-                    if api_metadata and not api_metadata.get('_error'):
-                        twitter_metadata = api_metadata
-                        logger.info(f"Fetched X preview via v2 API for {url}: @{api_metadata.get('author_handle', 'unknown')}")
-
-                # v2 failed or no credentials — try syndication fallback
-                if not twitter_metadata:
-                    syndication_result = fetch_tweet_via_syndication(tweet_id)
-                    if syndication_result:
-                        twitter_metadata = syndication_result
-                        logger.info(f"Fetched X preview via syndication for {url}: @{syndication_result.get('author_handle', 'unknown')}")
-
-                # Both APIs failed — fall back to scraping
-                if not twitter_metadata:
-                    twitter_metadata = extract_twitter_metadata(soup, url)
-                    logger.info(f"All X APIs failed, using scraped data for {url}")
-            else:
-                twitter_metadata = extract_twitter_metadata(soup, url)
+        if parsed.netloc in ['twitter.com', 'x.com', 'www.twitter.com', 'www.x.com']:
+            twitter_metadata = await _fetch_twitter_metadata(soup, url, db)
 
             # Merge Twitter data into og_data with 'x_' prefix
             for key, value in twitter_metadata.items():
                 og_data[f'x_{key}'] = value
-
-            if not bearer_token or not tweet_id_match:
-                logger.info(f"Fetched X/Twitter preview (scraped) for {url}: {og_data.get('title', 'No title')} by @{twitter_metadata.get('author_handle', 'unknown')}")
+            logger.info(f"Fetched X/Twitter preview for {url}: {og_data.get('title', 'No title')} by @{twitter_metadata.get('author_handle', 'unknown')}")
         else:
             logger.info(f"Fetched preview for {url}: {og_data.get('title', 'No title')}")
 
@@ -296,12 +349,109 @@ def fetch_link_preview(url: str, db=None) -> dict:
 
         return og_data
 
-    except requests.Timeout:
+    except httpx.TimeoutException:
         logger.error(f"Timeout fetching preview for {url}")
-        return {'error': 'Request timeout'}
-    except requests.RequestException as e:
+        error = {'error': 'Request timeout'}
+    except httpx.HTTPError as e:
         logger.error(f"Error fetching preview for {url}: {e}")
-        return {'error': str(e)}
+        error = {'error': str(e)}
     except Exception as e:
         logger.error(f"Unexpected error fetching preview for {url}: {e}")
-        return {'error': str(e)}
+        error = {'error': str(e)}
+
+    _set_negative(url, error)
+    return error
+
+
+async def _revalidate(url: str):
+    """Background refresh of a stale cache entry, on its own DB session"""
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        await _fetch_fresh_preview(url, db)
+        logger.info(f"♻️ Revalidated stale preview for {url}")
+    except Exception as e:
+        logger.error(f"Error revalidating preview for {url}: {e}")
+    finally:
+        db.close()
+        _revalidating.discard(url)
+
+
+def _schedule_revalidation(url: str):
+    if url in _revalidating:
+        return
+    _revalidating.add(url)
+    task = asyncio.create_task(_revalidate(url))
+    # Keep a reference so the task isn't garbage-collected mid-flight
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def fetch_link_preview_async(url: str, db=None, revalidate_in_background: bool = True) -> dict:
+    """
+    Fetch OpenGraph metadata from a URL without blocking the event loop
+    Returns dict with title, description, image, and domain
+    Enhanced with Twitter/X-specific metadata when applicable
+
+    Cache layers:
+    - fresh link_preview_cache row: returned directly
+    - stale row: returned immediately (flagged _stale) and refreshed in a
+      background task; with revalidate_in_background=False it is refreshed
+      inline instead and only served if the refresh fails
+    - recent failure: the error is served from an in-process negative cache
+      for NEGATIVE_TTL_SECONDS instead of hammering a dead site
+    """
+    cached = get_cached_preview(url, db, allow_stale=True)
+    return await _resolve_preview(url, cached, db, revalidate_in_background)
+
+
+async def fetch_link_previews_async(urls, db=None) -> dict:
+    """
+    Resolve previews for many URLs at once: {url: preview}
+    Cached entries come from one bulk lookup; the misses are fetched concurrently
+    (bounded per host by the shared HTTP pool).
+    """
+    urls = list(dict.fromkeys(u for u in urls if u))
+    cached = get_cached_previews(urls, db, allow_stale=True)
+    results = await asyncio.gather(*(
+        _resolve_preview(url, cached.get(url), db, revalidate_in_background=True)
+        for url in urls
+    ))
+    return dict(zip(urls, results))
+
+
+async def _resolve_preview(url: str, cached, db, revalidate_in_background: bool) -> dict:
+    stale = None
+    if cached and not cached.get('_stale'):
+        return cached
+    if cached:
+        if revalidate_in_background:
+            _schedule_revalidation(url)
+            return cached
+        stale = cached
+    else:
+        logger.info(f"❌ No cache found for {url}, fetching fresh")
+
+    negative = _get_negative(url)
+    if negative:
+        logger.info(f"🚫 Serving negative-cached error for {url}")
+        return stale or negative
+
+    fresh = await _fetch_fresh_preview(url, db)
+    if stale and fresh.get('error'):
+        return stale
+    return fresh
+
+
+def fetch_link_preview(url: str, db=None) -> dict:
+    """
+    Fetch OpenGraph metadata from a URL
+    Returns dict with title, description, image, and domain
+    Enhanced with Twitter/X-specific metadata when applicable
+    Uses database caching to avoid re-fetching
+
+    Synchronous wrapper for worker-thread callers; async endpoints should
+    await fetch_link_preview_async instead.
+    """
+    return run_sync(fetch_link_preview_async(url, db, revalidate_in_background=False))
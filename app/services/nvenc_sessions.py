@@ -0,0 +1,374 @@
+"""
+NVENC Sessions - cluster-wide admission control for GPU encode sessions.
+
+NVIDIA cards cap concurrent NVENC encode sessions. Encoding used to find the
+ceiling by launching h264_nvenc and pattern-matching the failure, wasting a
+doomed attempt under load. Now each GPU host has a Redis-backed semaphore
+and an encode takes a lease on it BEFORE choosing the GPU encoder:
+
+    nvenc:capacity:{host}   session ceiling, refreshed by the worker heartbeat
+                            (expires when the worker goes away)
+    nvenc:sessions:{host}   sorted set of lease ids scored by expiry; a lease
+                            is renewed while its encode runs, so a killed
+                            worker's sessions free themselves after LEASE_TTL
+
+No lease -> the caller encodes with libx264 straight away. /health reports
+per-host utilization from the same keys.
+
+The dispatch-side router sends encode-heavy tasks to the `media_gpu` queue
+(consumed only by GPU workers) one free session at a time: a background
+thread snapshots the free sessions, the media_gpu backlog and whether any
+live worker advertises nvenc (services/worker_capabilities), and each routed
+task claims one slot of that snapshot in memory, so publishing never waits on
+Redis. Once the GPU backlog covers the free sessions, encodes stay on `media`
+for the CPU workers. If the GPU hosts go away, the beat task
+requeue_stranded_gpu_tasks hands whatever is left on media_gpu back to media.
+
+A host's capacity comes from NVENC_SESSIONS, else 3 when an NVIDIA GPU is
+detected, else 0 (CPU-only: never leases, never consumes media_gpu). Pass a
+redis client and capacity to EncodeSessionPool to exercise the logic without
+a GPU.
+"""
+import logging
+import os
+import platform
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "nvenc"
+GPU_QUEUE = "media_gpu"
+DEFAULT_CAPACITY = 3  # historical consumer-card ceiling
+LEASE_TTL = int(os.getenv("NVENC_LEASE_TTL", "120"))
+HOST_TTL = int(os.getenv("NVENC_HOST_TTL", "60"))
+ACQUIRE_WAIT = float(os.getenv("NVENC_ACQUIRE_WAIT", "10"))
+ACQUIRE_POLL = 1.0
+# How often the dispatch-side routing snapshot is refreshed
+ROUTING_CACHE_SECONDS = 5.0
+# Shared queue encodes fall back to (and stranded media_gpu tasks return to)
+CPU_QUEUE = "media"
+
+# Expire stale leases, then admit if under capacity. Redis server time keeps
+# hosts with skewed clocks from expiring each other's leases.
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+local capacity = tonumber(redis.call('GET', KEYS[2]) or '0')
+if redis.call('ZCARD', KEYS[1]) < capacity then
+  redis.call('ZADD', KEYS[1], now + tonumber(ARGV[1]), ARGV[2])
+  redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]) * 2)
+  return 1
+end
+return 0
+"""
+
+_RENEW_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]) * 2)
+return redis.call('ZADD', KEYS[1], 'XX', 'CH', now + tonumber(ARGV[1]), ARGV[2])
+"""
+
+_COUNT_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+return redis.call('ZCOUNT', KEYS[1], now, '+inf')
+"""
+
+
+def _default_capacity() -> int:
+    configured = os.getenv("NVENC_SESSIONS")
+    if configured is not None:
+        return max(0, int(configured))
+    from platform_utils import has_nvidia_gpu
+    return DEFAULT_CAPACITY if has_nvidia_gpu() else 0
+
+
+def _capacity_key(host: str) -> str:
+    return f"{KEY_PREFIX}:capacity:{host}"
+
+
+def _sessions_key(host: str) -> str:
+    return f"{KEY_PREFIX}:sessions:{host}"
+
+
+class SessionLease:
+    """One held NVENC session; renewed in the background until released."""
+
+    def __init__(self, pool: Optional["EncodeSessionPool"], lease_id: str):
+        self.pool = pool
+        self.lease_id = lease_id
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if pool is not None:
+            self._thread = threading.Thread(target=self._renew_loop, name="nvenc-lease", daemon=True)
+            self._thread.start()
+
+    @property
+    def managed(self) -> bool:
+        """False for the fail-open lease handed out when Redis is unreachable."""
+        return self.pool is not None
+
+    def _renew_loop(self):
+        while not self._stop.wait(self.pool.lease_ttl / 3):
+            try:
+                self.pool.renew(self.lease_id)
+            except Exception as e:
+                logger.warning(f"Could not renew NVENC lease {self.lease_id}: {e}")
+
+    def release(self) -> None:
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        if self.pool is not None:
+            try:
+                self.pool.release(self.lease_id)
+            except Exception as e:
+                logger.warning(f"Could not release NVENC lease {self.lease_id} (expires in {self.pool.lease_ttl}s): {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class EncodeSessionPool:
+    """The NVENC semaphore of one host (and read access to every host's)."""
+
+    def __init__(self, redis_client=None, host: Optional[str] = None,
+                 capacity: Optional[int] = None, lease_ttl: int = LEASE_TTL):
+        self._redis = redis_client
+        self.host = host or os.getenv("NVENC_HOST") or platform.node()
+        self.capacity = _default_capacity() if capacity is None else capacity
+        self.lease_ttl = lease_ttl
+        self._heartbeat: Optional[threading.Thread] = None
+
+    @property
+    def redis(self):
+        if self._redis is None:
+            import redis
+            from celery_app import REDIS_URL
+            self._redis = redis.Redis.from_url(REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+        return self._redis
+
+    # ---- worker side ----
+
+    def register(self) -> None:
+        """Publish this host's capacity (expires unless refreshed)."""
+        if self.capacity > 0:
+            self.redis.set(_capacity_key(self.host), self.capacity, ex=HOST_TTL)
+
+    def start_heartbeat(self) -> None:
+        """Keep this host's capacity registered while the worker runs."""
+        if self.capacity <= 0 or self._heartbeat is not None:
+            return
+
+        def beat():
+            while True:
+                try:
+                    self.register()
+                except Exception as e:
+                    logger.warning(f"NVENC capacity heartbeat failed for {self.host}: {e}")
+                time.sleep(HOST_TTL / 3)
+
+        self._heartbeat = threading.Thread(target=beat, name="nvenc-heartbeat", daemon=True)
+        self._heartbeat.start()
+        logger.info(f"NVENC admission control: {self.host} offers {self.capacity} sessions")
+
+    def try_acquire(self) -> Optional[SessionLease]:
+        if self.capacity <= 0:
+            return None
+        lease_id = f"{self.host}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        # Re-register first so a lease is never refused just because the
+        # heartbeat key lapsed (e.g. encoding from a non-worker process)
+        self.register()
+        admitted = self.redis.eval(_ACQUIRE_SCRIPT, 2, _sessions_key(self.host), _capacity_key(self.host),
+                                   self.lease_ttl, lease_id)
+        return SessionLease(self, lease_id) if admitted else None
+
+    def acquire(self, wait: float = 0) -> Optional[SessionLease]:
+        """Lease a session, polling for up to `wait` seconds; None if none freed up."""
+        deadline = time.monotonic() + wait
+        while True:
+            lease = self.try_acquire()
+            remaining = deadline - time.monotonic()
+            if lease is not None or remaining <= 0:
+                return lease
+            time.sleep(min(ACQUIRE_POLL, remaining))
+
+    def renew(self, lease_id: str) -> None:
+        self.redis.eval(_RENEW_SCRIPT, 1, _sessions_key(self.host), self.lease_ttl, lease_id)
+
+    def release(self, lease_id: str) -> None:
+        self.redis.zrem(_sessions_key(self.host), lease_id)
+
+    # ---- cluster view (API side) ----
+
+    def utilization(self) -> Dict[str, Dict[str, Any]]:
+        """Per registered GPU host: capacity, sessions in use, free sessions."""
+        hosts = {}
+        for key in self.redis.scan_iter(match=_capacity_key("*")):
+            key = key.decode() if isinstance(key, bytes) else key
+            host = key[len(_capacity_key("")):]
+            capacity = int(self.redis.get(key) or 0)
+            in_use = int(self.redis.eval(_COUNT_SCRIPT, 1, _sessions_key(host)))
+            hosts[host] = {
+                "capacity": capacity,
+                "in_use": in_use,
+                "free": max(0, capacity - in_use),
+                "utilization": round(in_use / capacity, 2) if capacity else None,
+            }
+        return hosts
+
+    def free_sessions(self) -> int:
+        return sum(h["free"] for h in self.utilization().values())
+
+
+_pool: Optional[EncodeSessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> EncodeSessionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = EncodeSessionPool()
+        return _pool
+
+
+_cluster_view: Optional[EncodeSessionPool] = None
+
+
+def get_cluster_view() -> EncodeSessionPool:
+    """Read-only pool for the API side (no GPU detection, never leases)."""
+    global _cluster_view
+    with _pool_lock:
+        if _cluster_view is None:
+            _cluster_view = EncodeSessionPool(capacity=0)
+        return _cluster_view
+
+
+# Dispatch-side routing snapshot; `routed` counts the encodes this process
+# sent to media_gpu since the snapshot was taken
+_routing = {"at": 0.0, "free": 0, "queued": 0, "routed": 0}
+_routing_lock = threading.Lock()
+_routing_refresher: Optional[threading.Thread] = None
+_routing_pid: Optional[int] = None
+
+
+def refresh_routing() -> Dict[str, Any]:
+    """
+    Re-read free sessions and the media_gpu backlog into the routing snapshot.
+
+    Free sessions count only while some live worker advertises nvenc in its
+    capability profile. Redis errors leave nothing free (route to CPU).
+    """
+    try:
+        view = get_cluster_view()
+        from services.worker_capabilities import workers_with
+        free = view.free_sessions() if workers_with("nvenc") else 0
+        queued = int(view.redis.llen(GPU_QUEUE))
+    except Exception as e:
+        logger.debug(f"NVENC routing refresh failed: {e}")
+        free = queued = 0
+    with _routing_lock:
+        # Tasks routed before this read are in the backlog or holding leases now
+        _routing.update(at=time.monotonic(), free=free, queued=queued, routed=0)
+        return dict(_routing)
+
+
+def _ensure_routing_refresher() -> None:
+    global _routing_refresher, _routing_pid
+    with _routing_lock:
+        # Threads don't survive a fork: a prefork child starts its own
+        if _routing_refresher is not None and _routing_pid == os.getpid():
+            return
+        _routing_pid = os.getpid()
+
+        def loop():
+            while True:
+                refresh_routing()
+                time.sleep(ROUTING_CACHE_SECONDS)
+
+        _routing_refresher = threading.Thread(target=loop, name="nvenc-routing", daemon=True)
+        _routing_refresher.start()
+
+
+def claim_gpu_slot() -> bool:
+    """
+    Whether to publish one more encode to media_gpu (and count it if so).
+
+    Only the in-memory snapshot is read. An encode goes to the GPU queue while
+    the snapshot's free sessions exceed its media_gpu backlog plus the encodes
+    already routed since; the rest stay on media, so a burst fills the GPU
+    hosts and spills over to the CPU workers instead of queueing behind them.
+    A missing or stale snapshot (refresher not run yet, or stuck) claims nothing.
+    """
+    _ensure_routing_refresher()
+    with _routing_lock:
+        if time.monotonic() - _routing["at"] > ROUTING_CACHE_SECONDS * 3:
+            return False
+        if _routing["free"] > _routing["queued"] + _routing["routed"]:
+            _routing["routed"] += 1
+            return True
+        return False
+
+
+def requeue_stranded_gpu_tasks(client=None) -> int:
+    """
+    Move media_gpu's backlog to media when no GPU host is registered.
+
+    A GPU host's capacity key expires HOST_TTL after its worker stops, so an
+    empty registry means nobody will consume media_gpu. Messages are moved
+    whole (RPOPLPUSH, oldest first) and the broker delivers by list, so CPU
+    workers pick them up as-is.
+    """
+    client = client or get_cluster_view().redis
+    if next(iter(client.scan_iter(match=_capacity_key("*"))), None) is not None:
+        return 0
+    moved = 0
+    while client.rpoplpush(GPU_QUEUE, CPU_QUEUE) is not None:
+        moved += 1
+    if moved:
+        logger.warning(f"No GPU host registered: moved {moved} task(s) from {GPU_QUEUE} to {CPU_QUEUE}")
+    return moved
+
+
+def acquire_nvenc_session(wait: float = ACQUIRE_WAIT) -> Optional[SessionLease]:
+    """
+    Lease an NVENC session on this host, or None to encode with libx264.
+
+    CPU-only hosts get None immediately. If Redis is unreachable a GPU host
+    fails open (unmanaged lease): nvenc is tried without admission control,
+    and the stderr failover of ffmpeg_accel (run_encode, encode_with_failover)
+    re-runs the encode on libx264 if the GPU refuses it. Every encode that
+    takes a lease must go through one of those two.
+    """
+    pool = get_session_pool()
+    if pool.capacity <= 0:
+        return None
+    try:
+        lease = pool.acquire(wait)
+    except Exception as e:
+        logger.warning(f"NVENC admission control unavailable ({e}); trying nvenc unmanaged")
+        return SessionLease(None, "unmanaged")
+    if lease is None:
+        logger.info(f"No free NVENC session on {pool.host} after {wait:.0f}s -> libx264")
+    return lease
+
+
+@contextmanager
+def nvenc_session(wait: float = ACQUIRE_WAIT) -> Iterator[Optional[SessionLease]]:
+    """Context-managed acquire_nvenc_session(); the lease is released on exit."""
+    lease = acquire_nvenc_session(wait)
+    try:
+        yield lease
+    finally:
+        if lease is not None:
+            lease.release()
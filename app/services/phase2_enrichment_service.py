@@ -41,6 +41,7 @@ import celery_app  # noqa: F401
 from database import SessionLocal
 from models_segment_llm import SegmentLLMData
 from models_v2 import RundownItem
+from services.rundown_items import WITH_SCRIPT
 from api_config import api_config_manager
 from services.social_media import (
     fetch_x_user_by_username,
@@ -363,7 +364,7 @@ def run_phase2_enrichment(db: Session, rundown_item_id: int) -> SegmentLLMData:
         )
 
     rundown_item = (
-        db.query(RundownItem).filter(RundownItem.id == rundown_item_id).first()
+        db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.id == rundown_item_id).first()
     )
     if not rundown_item:
         raise ValueError(f"Rundown item {rundown_item_id} not found")
@@ -0,0 +1,204 @@
+"""
+Rundown Cues - cue blocks of rundown item scripts, stored as rows.
+
+Cues live as bracketed text inside rundown_items.script_content, so finding
+"the SOT cues of episode 0257 that are still processing" used to mean loading
+and parsing every script of the episode. rundown_item_cues mirrors each
+script's cue blocks, one row per cue in script order:
+
+    cue_type, slug, asset_id        [Type:] (upper-cased), [Slug:], [Asset Id:]
+    media_url, thumbnail_url,       [Media Url:], [Thumbnail Url:], [Audio Url:]
+    audio_url
+    duration, processing_status     [Duration:], [ProcessingStatus:]
+    fields                          every field, camelCase (field_map shape)
+    span_start / span_end           character offsets of the block in the script
+
+The rows are rewritten through services/cue_parser in a flush hook whenever a
+script is saved, inside the saving transaction (under a savepoint, so a
+failure here never fails the save). script_content stays the source of truth:
+code that writes a script behind the ORM (raw SQL) calls scripts_written()
+in the same transaction, and rebuild_episode_cues() repairs anything else.
+"""
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, event, inspect, insert, literal, select
+from sqlalchemy.orm import Session
+
+from models.episode import Rundown, RundownItem, RundownItemCue
+from services.cue_parser import parse_script
+
+logger = logging.getLogger(__name__)
+
+# [ProcessingStatus:] of a SOT whose pipeline has finished; failures start with ❌
+PROCESSING_COMPLETE = "Complete"
+PROCESSING_FAILED_PREFIX = "❌"
+
+_items = RundownItem.__table__
+_cues = RundownItemCue.__table__
+_rundowns = Rundown.__table__
+
+
+def _clip(value: str, length: int) -> Optional[str]:
+    return value[:length] if value else None
+
+
+def cue_rows(item_id: int, content: Optional[str], now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """rundown_item_cues rows of one script, in script order."""
+    if not content:
+        return []
+    now = now or datetime.now(timezone.utc)
+    rows = []
+    for position, cue in enumerate(parse_script(content).cues):
+        rows.append({
+            "item_id": item_id,
+            "position": position,
+            "cue_type": _clip(cue.type, 20),
+            "slug": _clip(cue.slug, 255),
+            "asset_id": _clip(cue.asset_id, 100),
+            "media_url": cue.media_url or None,
+            "thumbnail_url": cue.thumbnail_url or None,
+            "audio_url": cue.get("Audio Url") or None,
+            "duration": _clip(cue.duration, 20),
+            "processing_status": _clip(cue.get("Processing Status"), 100),
+            "fields": cue.field_map(),
+            "span_start": cue.start,
+            "span_end": cue.end,
+            "collapsed": cue.collapsed,
+            "updated_at": now,
+        })
+    return rows
+
+
+def sync_item_cues(conn, scripts: Dict[int, Optional[str]]) -> int:
+    """
+    Replace the cue rows of each {item_id: script_content}.
+
+    One DELETE and one executemany INSERT for the whole batch. Returns the
+    number of cue rows written.
+    """
+    if not scripts:
+        return 0
+    now = datetime.now(timezone.utc)
+    rows = [row for item_id, content in scripts.items() for row in cue_rows(item_id, content, now)]
+    conn.execute(delete(_cues).where(_cues.c.item_id.in_(list(scripts))))
+    if rows:
+        conn.execute(insert(_cues), rows)
+    return len(rows)
+
+
+def scripts_written(conn, scripts: Dict[int, Optional[str]]) -> None:
+    """
+    Rewrite the cue rows of scripts saved behind the ORM (raw SQL UPDATEs the
+    flush hook never sees), in the caller's transaction. Like the hook, runs
+    under a savepoint and only logs a failure.
+    """
+    if not scripts:
+        return
+    try:
+        with conn.begin_nested():
+            sync_item_cues(conn, scripts)
+    except Exception as e:
+        logger.warning(f"Could not update rundown item cues (items {sorted(scripts)}): {e}")
+
+
+def rebuild_episode_cues(db: Session, episode_id: int) -> int:
+    """Rewrite the cue rows of every item of an episode from its script. The caller commits."""
+    conn = db.connection()
+    scripts = dict(conn.execute(
+        select(_items.c.id, _items.c.script_content)
+        .select_from(_items.join(_rundowns, _rundowns.c.id == _items.c.rundown_id))
+        .where(_rundowns.c.episode_id == episode_id)
+    ).all())
+    written = sync_item_cues(conn, scripts)
+    logger.info(f"Rebuilt cues for episode id {episode_id}: {written} cues in {len(scripts)} items")
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+def still_processing():
+    """
+    Filter for cues whose media pipeline has started but neither finished nor failed.
+
+    The constants are rendered inline so PostgreSQL can match the predicate of
+    the partial index ix_rundown_item_cues_processing (bound parameters hide it).
+    """
+    status = _cues.c.processing_status
+    return (status.isnot(None)
+            & (status != literal(PROCESSING_COMPLETE, literal_execute=True))
+            & status.notlike(literal(f"{PROCESSING_FAILED_PREFIX}%", literal_execute=True)))
+
+
+def find_cues(db: Session, episode_id: int, cue_type: Optional[str] = None,
+              asset_id: Optional[str] = None, processing: Optional[bool] = None) -> List[Dict[str, Any]]:
+    """
+    Cues of an episode in running order, from the stored rows (no script bodies).
+
+    Args:
+        cue_type: Only cues of this [Type:] (case-insensitive)
+        asset_id: Only cues carrying this [Asset Id:]
+        processing: True = only cues still processing, False = only cues that are not
+    """
+    query = (
+        select(_cues, _items.c.asset_id.label("item_asset_id"), _items.c.slug.label("item_slug"),
+               _items.c.rundown_id)
+        .select_from(_cues.join(_items, _items.c.id == _cues.c.item_id)
+                     .join(_rundowns, _rundowns.c.id == _items.c.rundown_id))
+        .where(_rundowns.c.episode_id == episode_id)
+        .order_by(_rundowns.c.order_in_episode, _rundowns.c.id,
+                  _items.c.order_in_rundown, _items.c.id, _cues.c.position)
+    )
+    if cue_type:
+        query = query.where(_cues.c.cue_type == cue_type.upper())
+    if asset_id:
+        query = query.where(_cues.c.asset_id == asset_id)
+    if processing is True:
+        query = query.where(still_processing())
+    elif processing is False:
+        query = query.where(~still_processing())
+
+    return [
+        {
+            "rundown_id": row.rundown_id,
+            "item_id": row.item_id,
+            "item_asset_id": row.item_asset_id,
+            "item_slug": row.item_slug,
+            "position": row.position,
+            "type": row.cue_type,
+            "slug": row.slug,
+            "asset_id": row.asset_id,
+            "media_url": row.media_url,
+            "thumbnail_url": row.thumbnail_url,
+            "audio_url": row.audio_url,
+            "duration": row.duration,
+            "processing_status": row.processing_status,
+            "collapsed": row.collapsed,
+            "span": [row.span_start, row.span_end],
+            "fields": row.fields or {},
+        }
+        for row in db.execute(query).all()
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Save hook
+# ---------------------------------------------------------------------------
+
+def _maintain_cues(session: Session, flush_context) -> None:
+    """after_flush: rewrite the cue rows of items whose script changed (deletes cascade)."""
+    scripts: Dict[int, Optional[str]] = {}
+    for obj in session.new:
+        if isinstance(obj, RundownItem) and obj.script_content:
+            scripts[obj.id] = obj.script_content
+    for obj in session.dirty:
+        if isinstance(obj, RundownItem) and inspect(obj).attrs.script_content.history.has_changes():
+            scripts[obj.id] = obj.script_content
+    if scripts:
+        scripts_written(session.connection(), scripts)
+
+
+event.listen(Session, "after_flush", _maintain_cues)
@@ -0,0 +1,59 @@
+"""
+Rundown Items - what loading a rundown item costs.
+
+RundownItem.script_content and ContentVersion.script_content are deferred
+columns: db.query(RundownItem) loads every other column and fetches an item's
+script only when `.script_content` is touched. Item lists, reorders and
+version histories no longer pull script bodies (often 100 KB+ each), but a
+loop that reads every item's script would now issue one query per item, so:
+
+- a query whose items' scripts are read undefers them up front, in the same
+  SELECT:  db.query(RundownItem).options(WITH_SCRIPT)
+- code that only needs a few columns of many items selects just those:
+  item_summaries(db, rundown_ids) returns rows of ITEM_SUMMARY_COLUMNS plus
+  script_length, computed by the database.
+"""
+from typing import Any, Iterable, List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, undefer
+
+from models.content import ContentVersion
+from models.episode import Rundown, RundownItem
+
+WITH_SCRIPT = undefer(RundownItem.script_content)
+WITH_VERSION_CONTENT = undefer(ContentVersion.script_content)
+
+ITEM_SUMMARY_COLUMNS = (
+    RundownItem.id,
+    RundownItem.asset_id,
+    RundownItem.rundown_id,
+    RundownItem.item_type,
+    RundownItem.title,
+    RundownItem.slug,
+    RundownItem.order_in_rundown,
+    RundownItem.duration,
+    RundownItem.block_letter,
+    RundownItem.status,
+)
+
+SCRIPT_LENGTH = func.length(func.coalesce(RundownItem.script_content, '')).label("script_length")
+
+
+def item_summaries(db: Session, rundown_ids: Iterable[int]) -> List[Any]:
+    """Rows of ITEM_SUMMARY_COLUMNS + script_length for the given rundowns, by order_in_rundown."""
+    return db.execute(
+        select(*ITEM_SUMMARY_COLUMNS, SCRIPT_LENGTH)
+        .where(RundownItem.rundown_id.in_(list(rundown_ids)))
+        .order_by(RundownItem.order_in_rundown, RundownItem.id)
+    ).all()
+
+
+def episode_item_summaries(db: Session, episode_id: int) -> List[Any]:
+    """Rows of ITEM_SUMMARY_COLUMNS + script_length for every rundown of an episode, in running order."""
+    return db.execute(
+        select(*ITEM_SUMMARY_COLUMNS, SCRIPT_LENGTH)
+        .join(Rundown, Rundown.id == RundownItem.rundown_id)
+        .where(Rundown.episode_id == episode_id)
+        .order_by(Rundown.order_in_episode, Rundown.id, RundownItem.order_in_rundown, RundownItem.id)
+    ).all()
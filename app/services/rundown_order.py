@@ -0,0 +1,246 @@
+"""
+Rundown Order - gap-numbered order_in_rundown keys.
+
+Items of a rundown are numbered 10, 20, 30, ... (ORDER_GAP apart, the same
+numbers as the "010-slug.md" filenames and the normalize rules), so moving
+one item only needs a free number between its new neighbours:
+
+    move 50 between 10 and 20  ->  UPDATE one row to 15
+
+Only when the neighbours have no number left between them (or share one) is
+the rundown renumbered, as one UPDATE ... FROM (VALUES ...) statement that
+writes just the rows whose number changes. Client-sent orders (reorder, full
+rundown saves) are read as a sequence: if it differs from the stored one by a
+single displaced item, that item is moved like a drag and drop; an unchanged
+sequence writes nothing, whatever numbers the client used.
+
+A move takes no lock and writes one row. The single-row UPDATE refuses a
+number another item already holds (then the rundown is renumbered instead),
+but two editors can still both take the same free number before either
+commits. settle_rundown() runs after the commit, in its own short
+transaction: it renumbers a rundown left with a tie and rolls up its timing
+(rollup_rundown, services/rundown_timing), which the Core statements here
+bypass. Timing is briefly stale in between; the move never waits on it.
+"""
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Integer, bindparam, column, func, select, update, values
+
+from models.episode import RundownItem
+from services.rundown_timing import rollup_rundown
+
+logger = logging.getLogger(__name__)
+
+ORDER_GAP = 10
+
+_items = RundownItem.__table__
+
+
+def order_between(before: Optional[int], after: Optional[int]) -> Optional[int]:
+    """
+    A free order key strictly between two neighbours (None = rundown edge).
+
+    Keys stay positive: the top of the rundown counts as 0. Returns None when
+    there is no integer between the neighbours and the rundown has to be
+    renumbered first.
+    """
+    if after is None:
+        return (before or 0) + ORDER_GAP
+    before = before or 0
+    if after - before < 2:
+        return None
+    return (before + after) // 2
+
+
+def gap_orders(item_ids: Sequence[int]) -> Dict[int, int]:
+    """{item_id: order} numbering the items ORDER_GAP apart, in the given order."""
+    return {item_id: (position + 1) * ORDER_GAP for position, item_id in enumerate(item_ids)}
+
+
+def current_orders(conn, rundown_id: int) -> List[Tuple[int, int]]:
+    """(item_id, order_in_rundown) of a rundown in running order, ties by id."""
+    return [tuple(row) for row in conn.execute(
+        select(_items.c.id, _items.c.order_in_rundown)
+        .where(_items.c.rundown_id == rundown_id)
+        .order_by(_items.c.order_in_rundown, _items.c.id)
+    ).all()]
+
+
+def write_orders(conn, orders: Dict[int, int]) -> int:
+    """
+    Set order_in_rundown of each {item_id: order} in one statement.
+
+    PostgreSQL gets UPDATE ... FROM (VALUES ...); other dialects an executemany.
+    Returns the number of rows written.
+    """
+    if not orders:
+        return 0
+    if conn.dialect.name == "postgresql":
+        wanted = values(column("id", Integer), column("new_order", Integer), name="v").data(list(orders.items()))
+        conn.execute(
+            update(_items)
+            .where(_items.c.id == wanted.c.id)
+            .values(order_in_rundown=wanted.c.new_order)
+        )
+    else:
+        conn.execute(
+            update(_items)
+            .where(_items.c.id == bindparam("b_id"))
+            .values(order_in_rundown=bindparam("b_order")),
+            [{"b_id": item_id, "b_order": order} for item_id, order in orders.items()]
+        )
+    return len(orders)
+
+
+def _write_free_key(conn, rundown_id: int, item_id: int, order: int) -> bool:
+    """Set one item's order unless another item of the rundown already holds it."""
+    other = _items.alias("other")
+    taken = select(other.c.id).where(
+        other.c.rundown_id == rundown_id,
+        other.c.order_in_rundown == order,
+        other.c.id != item_id,
+    ).exists()
+    result = conn.execute(
+        update(_items)
+        .where(_items.c.id == item_id, ~taken)
+        .values(order_in_rundown=order)
+    )
+    return result.rowcount == 1
+
+
+def renumber_rundown(conn, rundown_id: int) -> int:
+    """
+    Renumber a rundown ORDER_GAP apart, keeping its running order (ties by id).
+
+    Returns the number of rows written; an evenly numbered rundown writes none.
+    """
+    rows = current_orders(conn, rundown_id)
+    wanted = gap_orders([item_id for item_id, _ in rows])
+    return write_orders(conn, {item_id: wanted[item_id] for item_id, order in rows if order != wanted[item_id]})
+
+
+def _place(conn, rundown_id: int, rows: List[Tuple[int, int]], item_id: int, slot: int) -> Dict[str, object]:
+    """Put item_id at position `slot` among the other rows (in running order)."""
+    current = dict(rows)
+    others = [(row_id, order) for row_id, order in rows if row_id != item_id]
+    before = others[slot - 1][1] if slot > 0 else None
+    after = others[slot][1] if slot < len(others) else None
+    if (before or 0) < current[item_id] and (after is None or current[item_id] < after):
+        return {"order": current[item_id], "orders": {}, "renumbered": False}
+
+    order = order_between(before, after)
+    if order is not None and _write_free_key(conn, rundown_id, item_id, order):
+        return {"order": order, "orders": {item_id: order}, "renumbered": False}
+
+    # No free number between the neighbours, or a concurrent move took it
+    other_ids = [row_id for row_id, _ in others]
+    wanted = gap_orders(other_ids[:slot] + [item_id] + other_ids[slot:])
+    changed = {row_id: new for row_id, new in wanted.items() if new != current[row_id]}
+    write_orders(conn, changed)
+    return {"order": wanted[item_id], "orders": changed, "renumbered": True}
+
+
+def _displaced_item(current: List[int], wanted: List[int]) -> Optional[int]:
+    """The one item whose move turns `current` into `wanted`, if there is one."""
+    start = next(i for i, (a, b) in enumerate(zip(current, wanted)) if a != b)
+    end = next(i for i in range(len(current) - 1, -1, -1) if current[i] != wanted[i])
+    for candidate in (current[start], current[end]):
+        if [i for i in current if i != candidate] == [i for i in wanted if i != candidate]:
+            return candidate
+    return None
+
+
+def apply_orders(conn, rundown_id: int, requested: Dict[int, int]) -> Dict[str, object]:
+    """
+    Apply client-sent {item_id: order} to a rundown, as a running order.
+
+    The requested numbers only rank the items (ties by id); items not in
+    `requested` keep theirs. The same sequence as stored writes nothing; one
+    displaced item is moved like move_item (usually one row); anything else
+    renumbers the rundown in the requested sequence, writing only the rows
+    whose number changes. Returns {"orders": {item_id: order written},
+    "renumbered": bool}.
+    """
+    rows = current_orders(conn, rundown_id)
+    merged = {item_id: requested.get(item_id, order) for item_id, order in rows}
+    current_seq = [item_id for item_id, _ in rows]
+    wanted_seq = sorted(merged, key=lambda item_id: (merged[item_id], item_id))
+    if wanted_seq == current_seq:
+        return {"orders": {}, "renumbered": False}
+
+    moved = _displaced_item(current_seq, wanted_seq)
+    if moved is not None:
+        result = _place(conn, rundown_id, rows, moved, wanted_seq.index(moved))
+        return {"orders": result["orders"], "renumbered": result["renumbered"]}
+
+    current = dict(rows)
+    wanted = gap_orders(wanted_seq)
+    changed = {item_id: order for item_id, order in wanted.items() if order != current[item_id]}
+    write_orders(conn, changed)
+    return {"orders": changed, "renumbered": True}
+
+
+def move_item(conn, rundown_id: int, item_id: int,
+              after_id: Optional[int] = None, before_id: Optional[int] = None) -> Dict[str, object]:
+    """
+    Move one item to just after `after_id` (or just before `before_id`; neither = top).
+
+    Writes the moved row only, unless its new neighbours leave no free number,
+    in which case the rundown is renumbered around it in one statement.
+    Returns {"order": new order, "orders": {item_id: order written}, "renumbered": bool}.
+    Raises ValueError if an item is not in the rundown.
+    """
+    rows = current_orders(conn, rundown_id)
+    ids = [row_id for row_id, _ in rows]
+    for wanted in (item_id, after_id, before_id):
+        if wanted is not None and wanted not in ids:
+            raise ValueError(f"Item {wanted} is not in rundown {rundown_id}")
+    if item_id in (after_id, before_id):
+        raise ValueError(f"Item {item_id} cannot be placed next to itself")
+
+    other_ids = [row_id for row_id in ids if row_id != item_id]
+    if after_id is not None:
+        slot = other_ids.index(after_id) + 1
+    elif before_id is not None:
+        slot = other_ids.index(before_id)
+    else:
+        slot = 0
+    return _place(conn, rundown_id, rows, item_id, slot)
+
+
+def has_ties(conn, rundown_id: int) -> bool:
+    """Whether two items of the rundown share an order_in_rundown."""
+    return conn.execute(
+        select(_items.c.order_in_rundown)
+        .where(_items.c.rundown_id == rundown_id)
+        .group_by(_items.c.order_in_rundown)
+        .having(func.count() > 1)
+        .limit(1)
+    ).first() is not None
+
+
+def settle_rundown(rundown_ids: Iterable[int]) -> None:
+    """
+    After an order change has committed: renumber any rundown left with a tie
+    (two concurrent moves into the same gap) and roll up its timing.
+
+    Runs in its own session and transaction, one per rundown, so the move's
+    transaction never waits on the timing rows. Failures are logged, never raised.
+    """
+    from database import SessionLocal
+
+    for rundown_id in rundown_ids:
+        db = SessionLocal()
+        try:
+            conn = db.connection()
+            if has_ties(conn, rundown_id):
+                logger.info(f"Rundown {rundown_id}: order tie after a concurrent move, renumbering")
+                renumber_rundown(conn, rundown_id)
+            rollup_rundown(conn, rundown_id)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Could not settle rundown {rundown_id} after reorder: {e}")
+        finally:
+            db.close()
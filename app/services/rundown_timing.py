@@ -0,0 +1,576 @@
+"""
+Rundown Timing - materialized running time, backtime and block over/under.
+
+DurationEstimator totals an episode by re-parsing every item's script on
+request. Timing is now derived when items are saved instead:
+
+- When a RundownItem's script_content changes, the script is analyzed once
+  (spoken words outside cue blocks, SOT/FSQ/ADLIB cue durations) into its
+  rundown_item_timings row. A script with an unchanged SHA256 is not re-read.
+- When an item is added, removed, re-timed, re-ordered or moved between
+  blocks, or the episode's hard out (target_duration, else its
+  duration_formatted length) changes, the rundown's positions are recomputed
+  from those rows alone, without loading any script bodies:
+
+      start_seconds            running time at the top of the item
+      backtime_seconds         latest start that still makes the hard out
+      rundowns.timing_summary  totals, over/under against the hard out and
+                               per block_letter start/estimated/planned
+
+Both run in a flush hook inside the saving transaction (under a savepoint, so
+a timing failure never fails the save), which keeps timing consistent with
+the scripts it was derived from. Reading it is a row lookup.
+
+Spoken text is timed paragraph by paragraph at the reading rate of whoever
+reads it (services/speaker_rates): a `<p class="josh">` paragraph by that
+speaker, anything else by the item's speaker. Rates are resolved once per
+(speaker, segment type) for a whole batch, so re-estimating an episode is one
+columnar pass over all of its paragraphs. An item's estimate is its script
+time when the script has any, else its planned `duration`.
+
+`duration` is the producer's planned time and is only ever read here; the
+estimates live in rundown_item_timings, never in that column, so block
+over/under compares two independent numbers. Code that writes scripts with
+raw SQL calls refresh_item_timing() in the same transaction.
+"""
+import hashlib
+import logging
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, event, inspect, insert, select, update
+from sqlalchemy.orm import Session
+
+from models.episode import Episode, Rundown, RundownItem, RundownItemTiming
+from services.cue_parser import parse_script
+from services.speaker_rates import (
+    FSQ_SEGMENT_TYPE, SpeakerRateModel, get_rate_model
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOT_SECONDS = 30.0  # SOT cue without a duration
+DEFAULT_ADLIB_SECONDS = 60.0  # ADLIB cue without a duration
+EMPTY_FSQ_SECONDS = 10.0  # FSQ cue without quote text
+
+# Item changes that move the rest of the rundown without touching the script
+_POSITION_FIELDS = ("duration", "order_in_rundown", "block_letter", "rundown_id")
+# Item changes that change who reads the script, or at what rate
+_READER_FIELDS = ("speaker_id", "item_type")
+
+_FRONTMATTER_RE = re.compile(r'\A---[ \t]*\n.*?\n---[ \t]*(?:\n|\Z)', re.DOTALL)
+# Editor paragraphs carry the reader as a class: <p class="josh">, <p class="guest bullet">
+_PARAGRAPH_RE = re.compile(r'<p\s+class=["\']([^"\']+)["\'][^>]*>(.*?)</p>', re.DOTALL | re.IGNORECASE)
+_CLASS_MODIFIERS = {'bullet'}
+
+_items = RundownItem.__table__
+_timings = RundownItemTiming.__table__
+_rundowns = Rundown.__table__
+_episodes = Episode.__table__
+
+
+# ---------------------------------------------------------------------------
+# Script analysis
+# ---------------------------------------------------------------------------
+
+def count_words(text: str) -> int:
+    """Count words in text, excluding markdown formatting."""
+    if not text:
+        return 0
+
+    text = re.sub(r'^#+\s*', '', text, flags=re.MULTILINE)   # headers
+    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)           # **bold**
+    text = re.sub(r'\*([^*]+)\*', r'\1', text)               # *italic*
+    text = re.sub(r'__([^_]+)__', r'\1', text)               # __bold__
+    text = re.sub(r'_([^_]+)_', r'\1', text)                 # _italic_
+    text = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', text)     # [text](url)
+    text = re.sub(r'<[^>]+>', '', text)                      # HTML tags
+    return len(text.split())
+
+
+def parse_duration(value: Optional[str]) -> float:
+    """Seconds in a HH:MM:SS, MM:SS or SS string (HH:MM:SS:FF drops the frames); 0.0 if unparseable."""
+    if not value:
+        return 0.0
+    parts = str(value).strip().split(':')
+    if len(parts) == 4:
+        parts = parts[:3]
+    try:
+        seconds = 0.0
+        for part in parts:
+            seconds = seconds * 60 + float(part)
+        return seconds
+    except ValueError:
+        logger.debug(f"Could not parse duration: {value}")
+        return 0.0
+
+
+def content_hash(content: Optional[str]) -> str:
+    return hashlib.sha256((content or '').encode('utf-8')).hexdigest()
+
+
+def split_paragraphs(body: str) -> List[Tuple[Optional[str], str]]:
+    """(speaker class or None, text) for each paragraph of spoken text, in order."""
+    paragraphs: List[Tuple[Optional[str], str]] = []
+
+    def plain(text: str):
+        paragraphs.extend((None, chunk) for chunk in re.split(r'\n\s*\n', text) if chunk.strip())
+
+    position = 0
+    for match in _PARAGRAPH_RE.finditer(body):
+        plain(body[position:match.start()])
+        tokens = [t for t in match.group(1).lower().split() if t not in _CLASS_MODIFIERS]
+        paragraphs.append((tokens[0] if tokens else None, match.group(2)))
+        position = match.end()
+    plain(body[position:])
+    return paragraphs
+
+
+class ScriptSource(NamedTuple):
+    """A script to analyze and who reads it by default."""
+    content: Optional[str]
+    speaker_id: Optional[int] = None
+    segment_type: Optional[str] = None  # rundown item_type
+
+
+@dataclass
+class ScriptTiming:
+    """What one script contributes to the running time."""
+    word_count: int = 0
+    fsq_word_count: int = 0
+    speech_seconds: float = 0.0
+    speech_stddev: float = 0.0
+    sot_seconds: float = 0.0
+    fsq_seconds: float = 0.0
+    adlib_seconds: float = 0.0
+
+    @property
+    def script_seconds(self) -> float:
+        return self.speech_seconds + self.sot_seconds + self.fsq_seconds + self.adlib_seconds
+
+
+def analyze_scripts(sources: Sequence[ScriptSource],
+                    rates: Optional[SpeakerRateModel] = None) -> List[ScriptTiming]:
+    """
+    Word counts and cue durations of many scripts in one pass.
+
+    Paragraphs of every script are collected as columns (script, reader,
+    words); each distinct (speaker, segment type) rate is looked up once and
+    applied across the columns. The stddev treats a reader's rate error as
+    shared by all their paragraphs within a script.
+    """
+    rates = rates or SpeakerRateModel()
+    timings = [ScriptTiming() for _ in sources]
+    column_script: List[int] = []
+    column_reader: List[Tuple[Optional[int], Optional[str]]] = []
+    column_words: List[int] = []
+
+    for index, source in enumerate(sources):
+        if not source.content:
+            continue
+        timing = timings[index]
+        script = parse_script(source.content)
+        body = _FRONTMATTER_RE.sub('', script.text(), count=1)
+        for label, text in split_paragraphs(body):
+            words = count_words(text)
+            if not words:
+                continue
+            timing.word_count += words
+            column_script.append(index)
+            column_reader.append((rates.speaker_for(label) or source.speaker_id, source.segment_type))
+            column_words.append(words)
+
+        for cue in script.cues:
+            cue_type = cue.type
+            if cue_type == "SOT":
+                duration = cue.duration
+                timing.sot_seconds += parse_duration(duration) if duration else DEFAULT_SOT_SECONDS
+            elif cue_type == "FSQ":
+                words = count_words(cue.quote)
+                if words:
+                    timing.fsq_word_count += words
+                    column_script.append(index)
+                    column_reader.append((source.speaker_id, FSQ_SEGMENT_TYPE))
+                    column_words.append(words)
+                else:
+                    timing.fsq_seconds += EMPTY_FSQ_SECONDS
+            elif cue_type == "ADLIB":
+                duration = cue.duration
+                timing.adlib_seconds += parse_duration(duration) if duration else DEFAULT_ADLIB_SECONDS
+
+    resolved = {reader: rates.rate(*reader) for reader in set(column_reader)}
+    # d(seconds)/d(wpm) summed per (script, reader): the rate error is shared within a script
+    sensitivity: Dict[Tuple[int, Tuple[Optional[int], Optional[str]]], float] = {}
+    for index, reader, words in zip(column_script, column_reader, column_words):
+        rate = resolved[reader]
+        seconds = words * 60 / rate.wpm
+        if reader[1] == FSQ_SEGMENT_TYPE:
+            timings[index].fsq_seconds += seconds
+        else:
+            timings[index].speech_seconds += seconds
+        key = (index, reader)
+        sensitivity[key] = sensitivity.get(key, 0.0) + seconds / rate.wpm
+
+    variances = [0.0] * len(sources)
+    for (index, reader), slope in sensitivity.items():
+        variances[index] += (slope * resolved[reader].stddev) ** 2
+    for timing, variance in zip(timings, variances):
+        timing.speech_stddev = variance ** 0.5
+    return timings
+
+
+def analyze_script(content: Optional[str], speaker_id: Optional[int] = None,
+                   segment_type: Optional[str] = None,
+                   rates: Optional[SpeakerRateModel] = None) -> ScriptTiming:
+    """Word counts and cue durations of one script (frontmatter and cue blocks are not spoken text)."""
+    return analyze_scripts([ScriptSource(content, speaker_id, segment_type)], rates)[0]
+
+
+# ---------------------------------------------------------------------------
+# Running order
+# ---------------------------------------------------------------------------
+
+def _r(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds, 1) if seconds is not None else None
+
+
+def build_timeline(
+    entries: Iterable[Tuple[float, float, Optional[float], Optional[str]]],
+    hard_out: Optional[float] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Position items in running order.
+
+    Args:
+        entries: (script_seconds, stddev_seconds, planned_seconds, block_letter) per item, in order
+        hard_out: Rundown must end by this many seconds (None = no hard out)
+
+    Returns (per-item positions, rundown summary).
+    """
+    positions = []
+    running = 0.0
+    spread = 0.0
+    for script_seconds, stddev, planned, block in entries:
+        planned = planned or None
+        estimated = script_seconds if script_seconds > 0 else (planned or 0.0)
+        if script_seconds > 0:
+            # Reading-rate errors of the same speakers recur item after item, so add up
+            spread += stddev or 0.0
+        positions.append({
+            "planned_seconds": _r(planned),
+            "estimated_seconds": _r(estimated),
+            "start_seconds": _r(running),
+            "block_letter": block or None,
+        })
+        running += estimated
+    total = running
+
+    blocks: Dict[str, Dict[str, Any]] = {}
+    for position in positions:
+        if hard_out:
+            position["backtime_seconds"] = _r(hard_out - (total - position["start_seconds"]))
+        else:
+            position["backtime_seconds"] = None
+        block = position["block_letter"]
+        if not block:
+            continue
+        entry = blocks.setdefault(block, {
+            "start_seconds": position["start_seconds"],
+            "estimated_seconds": 0.0,
+            "planned_seconds": 0.0,
+            "item_count": 0,
+        })
+        entry["estimated_seconds"] += position["estimated_seconds"]
+        entry["planned_seconds"] += position["planned_seconds"] or 0.0
+        entry["item_count"] += 1
+
+    for entry in blocks.values():
+        entry["estimated_seconds"] = _r(entry["estimated_seconds"])
+        entry["planned_seconds"] = _r(entry["planned_seconds"])
+        entry["end_seconds"] = _r(entry["start_seconds"] + entry["estimated_seconds"])
+        entry["over_under_seconds"] = (_r(entry["estimated_seconds"] - entry["planned_seconds"])
+                                       if entry["planned_seconds"] else None)
+
+    summary = {
+        "estimated_seconds": _r(total),
+        "estimated_stddev_seconds": _r(spread),
+        "planned_seconds": _r(sum(p["planned_seconds"] or 0.0 for p in positions)),
+        "hard_out_seconds": hard_out,
+        "over_under_seconds": _r(total - hard_out) if hard_out else None,
+        "item_count": len(positions),
+        "blocks": dict(sorted(blocks.items())),
+        "computed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    return positions, summary
+
+
+# ---------------------------------------------------------------------------
+# Maintenance (connection-level, so it can run inside a flush)
+# ---------------------------------------------------------------------------
+
+def store_analysis(conn, scripts: Dict[int, ScriptSource], force: Iterable[int] = ()) -> int:
+    """
+    Analyze each {item_id: ScriptSource} whose script hash changed (or in `force`).
+
+    All of them are analyzed in one analyze_scripts() batch. Returns how many
+    were (re-)analyzed.
+    """
+    if not scripts:
+        return 0
+    force = set(force)
+    known = dict(conn.execute(
+        select(_timings.c.item_id, _timings.c.content_hash).where(_timings.c.item_id.in_(list(scripts)))
+    ).all())
+
+    pending = []
+    for item_id, source in scripts.items():
+        digest = content_hash(source.content)
+        if item_id in force or known.get(item_id) != digest or item_id not in known:
+            pending.append((item_id, digest, source))
+    if not pending:
+        return 0
+
+    now = datetime.now(timezone.utc)
+    timings = analyze_scripts([source for _, _, source in pending], get_rate_model(conn))
+    inserts, updates = [], []
+    for (item_id, digest, _), timing in zip(pending, timings):
+        values = {
+            "content_hash": digest,
+            "word_count": timing.word_count,
+            "fsq_word_count": timing.fsq_word_count,
+            "speech_seconds": round(timing.speech_seconds, 2),
+            "speech_stddev_seconds": round(timing.speech_stddev, 2),
+            "sot_seconds": round(timing.sot_seconds, 2),
+            "fsq_seconds": round(timing.fsq_seconds, 2),
+            "adlib_seconds": round(timing.adlib_seconds, 2),
+            "script_seconds": round(timing.script_seconds, 2),
+            "analyzed_at": now,
+        }
+        if item_id in known:
+            updates.append({"b_item_id": item_id, **{f"b_{k}": v for k, v in values.items()}})
+        else:
+            inserts.append({"item_id": item_id, **values})
+
+    if inserts:
+        conn.execute(insert(_timings), inserts)
+    if updates:
+        columns = [k for k in updates[0] if k != "b_item_id"]
+        conn.execute(
+            update(_timings)
+            .where(_timings.c.item_id == bindparam("b_item_id"))
+            .values({k[2:]: bindparam(k) for k in columns}),
+            updates
+        )
+    return len(pending)
+
+
+def rollup_rundown(conn, rundown_id: int) -> Dict[str, Any]:
+    """Recompute positions and the summary of one rundown from its timing rows."""
+    rows = conn.execute(
+        select(_items.c.id, _items.c.duration, _items.c.block_letter,
+               _timings.c.item_id.label("timed"), _timings.c.script_seconds, _timings.c.speech_stddev_seconds,
+               _timings.c.planned_seconds, _timings.c.estimated_seconds,
+               _timings.c.start_seconds, _timings.c.backtime_seconds)
+        .select_from(_items.outerjoin(_timings, _timings.c.item_id == _items.c.id))
+        .where(_items.c.rundown_id == rundown_id)
+        .order_by(_items.c.order_in_rundown, _items.c.id)
+    ).all()
+    episode = conn.execute(
+        select(_episodes.c.target_duration, _episodes.c.duration_formatted)
+        .select_from(_rundowns.join(_episodes, _episodes.c.id == _rundowns.c.episode_id))
+        .where(_rundowns.c.id == rundown_id)
+    ).first()
+    # target_duration is seldom set; the episode's HH:MM:SS length is what
+    # the UI edits and reports
+    hard_out = episode and (episode.target_duration or parse_duration(episode.duration_formatted))
+
+    positions, summary = build_timeline(
+        ((row.script_seconds or 0.0, row.speech_stddev_seconds or 0.0, parse_duration(row.duration), row.block_letter)
+         for row in rows),
+        float(hard_out) if hard_out else None
+    )
+
+    now = datetime.now(timezone.utc)
+    changed = []
+    for row, position in zip(rows, positions):
+        if row.timed is None:
+            continue  # never analyzed (pre-dates the table): counted at its planned duration
+        current = (row.planned_seconds, row.estimated_seconds, row.start_seconds, row.backtime_seconds)
+        wanted = (position["planned_seconds"], position["estimated_seconds"],
+                  position["start_seconds"], position["backtime_seconds"])
+        if current != wanted:
+            changed.append({
+                "b_item_id": row.id,
+                "b_planned": wanted[0],
+                "b_estimated": wanted[1],
+                "b_start": wanted[2],
+                "b_backtime": wanted[3],
+                "b_updated_at": now,
+            })
+    if changed:
+        conn.execute(
+            update(_timings)
+            .where(_timings.c.item_id == bindparam("b_item_id"))
+            .values(planned_seconds=bindparam("b_planned"), estimated_seconds=bindparam("b_estimated"),
+                    start_seconds=bindparam("b_start"), backtime_seconds=bindparam("b_backtime"),
+                    updated_at=bindparam("b_updated_at")),
+            changed
+        )
+    conn.execute(update(_rundowns).where(_rundowns.c.id == rundown_id).values(timing_summary=summary))
+    return summary
+
+
+def refresh_item_timing(conn, item_ids: Iterable[int], force: bool = False) -> bool:
+    """
+    Re-analyze some items from their stored rows and roll up their rundowns,
+    in the caller's transaction: for scripts written behind the ORM (raw SQL
+    UPDATEs the flush hook never sees). `force` re-estimates unchanged scripts
+    too. Like the hook, runs under a savepoint and only logs a failure;
+    returns whether the timing rows were written.
+    """
+    item_ids = list(item_ids)
+    if not item_ids:
+        return True
+    try:
+        with conn.begin_nested():
+            rows = conn.execute(
+                select(_items.c.id, _items.c.rundown_id, _items.c.script_content,
+                       _items.c.speaker_id, _items.c.item_type)
+                .where(_items.c.id.in_(item_ids))
+            ).all()
+            scripts = {row.id: ScriptSource(row.script_content, row.speaker_id, row.item_type) for row in rows}
+            store_analysis(conn, scripts, force=scripts if force else ())
+            for rundown_id in {row.rundown_id for row in rows if row.rundown_id is not None}:
+                rollup_rundown(conn, rundown_id)
+        return True
+    except Exception as e:
+        logger.warning(f"Could not update rundown timing (items {sorted(item_ids)}): {e}")
+        return False
+
+
+def rebuild_episode_timing(db: Session, episode_id: int, force: bool = False) -> Dict[int, Dict[str, Any]]:
+    """
+    Re-estimate every item of an episode and roll up each of its rundowns. The caller commits.
+
+    All of the episode's scripts go through one analyze_scripts() batch.
+    `force` re-estimates unchanged scripts too (e.g. after speaker rates moved);
+    otherwise only items never analyzed or edited behind the hook are.
+    """
+    conn = db.connection()
+    rows = conn.execute(
+        select(_items.c.id, _items.c.rundown_id, _items.c.script_content, _items.c.speaker_id, _items.c.item_type)
+        .select_from(_items.join(_rundowns, _rundowns.c.id == _items.c.rundown_id))
+        .where(_rundowns.c.episode_id == episode_id)
+    ).all()
+    rundown_ids = conn.execute(select(_rundowns.c.id).where(_rundowns.c.episode_id == episode_id)).scalars().all()
+
+    scripts = {row.id: ScriptSource(row.script_content, row.speaker_id, row.item_type) for row in rows}
+    analyzed = store_analysis(conn, scripts, force=scripts if force else ())
+    summaries = {rundown_id: rollup_rundown(conn, rundown_id) for rundown_id in rundown_ids}
+    logger.info(f"Rebuilt timing for episode id {episode_id}: {analyzed}/{len(scripts)} scripts re-estimated")
+    return summaries
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+def get_rundown_timing(db: Session, rundown_id: int) -> Dict[str, Any]:
+    """Stored summary plus per-item positions of one rundown (no script bodies, no recompute)."""
+    summary = db.execute(select(_rundowns.c.timing_summary).where(_rundowns.c.id == rundown_id)).scalar()
+    rows = db.execute(
+        select(_items.c.id, _items.c.asset_id, _items.c.slug, _items.c.order_in_rundown, _items.c.block_letter,
+               _timings.c.word_count, _timings.c.script_seconds, _timings.c.speech_stddev_seconds,
+               _timings.c.planned_seconds,
+               _timings.c.estimated_seconds, _timings.c.start_seconds, _timings.c.backtime_seconds)
+        .select_from(_items.outerjoin(_timings, _timings.c.item_id == _items.c.id))
+        .where(_items.c.rundown_id == rundown_id)
+        .order_by(_items.c.order_in_rundown, _items.c.id)
+    ).all()
+
+    items = []
+    for row in rows:
+        over_under = None
+        if row.planned_seconds and row.estimated_seconds is not None:
+            over_under = _r(row.estimated_seconds - row.planned_seconds)
+        items.append({
+            "db_id": row.id,
+            "asset_id": row.asset_id,
+            "slug": row.slug,
+            "order": row.order_in_rundown,
+            "block_letter": row.block_letter or '',
+            "analyzed": row.word_count is not None,
+            "word_count": row.word_count,
+            "script_seconds": row.script_seconds,
+            "speech_stddev_seconds": row.speech_stddev_seconds,
+            "planned_seconds": row.planned_seconds,
+            "estimated_seconds": row.estimated_seconds,
+            "start_seconds": row.start_seconds,
+            "backtime_seconds": row.backtime_seconds,
+            "over_under_seconds": over_under,
+        })
+    return {"summary": summary, "items": items}
+
+
+# ---------------------------------------------------------------------------
+# Save hook
+# ---------------------------------------------------------------------------
+
+def _changed(obj, name: str) -> bool:
+    return inspect(obj).attrs[name].history.has_changes()
+
+
+def _maintain_timing(session: Session, flush_context) -> None:
+    """after_flush: re-analyze changed scripts and roll up the rundowns they affect."""
+    scripts: Dict[int, ScriptSource] = {}
+    force = set()
+    rundown_ids = set()
+    episode_ids = set()
+
+    def source(item):
+        return ScriptSource(item.script_content, item.speaker_id, item.item_type)
+
+    for obj in session.new:
+        if isinstance(obj, RundownItem):
+            scripts[obj.id] = source(obj)
+            rundown_ids.add(obj.rundown_id)
+    for obj in session.dirty:
+        if isinstance(obj, RundownItem):
+            if _changed(obj, "script_content"):
+                scripts[obj.id] = source(obj)
+                rundown_ids.add(obj.rundown_id)
+            elif any(_changed(obj, name) for name in _READER_FIELDS):
+                scripts[obj.id] = source(obj)
+                force.add(obj.id)
+                rundown_ids.add(obj.rundown_id)
+            elif any(_changed(obj, name) for name in _POSITION_FIELDS):
+                rundown_ids.add(obj.rundown_id)
+            # An item moved out of a rundown shortens the old one too
+            rundown_ids.update(inspect(obj).attrs.rundown_id.history.deleted or ())
+        elif isinstance(obj, Episode) and (_changed(obj, "target_duration") or _changed(obj, "duration_formatted")):
+            episode_ids.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, RundownItem):
+            rundown_ids.add(obj.rundown_id)
+
+    if not (scripts or rundown_ids or episode_ids):
+        return
+
+    try:
+        conn = session.connection()
+        with conn.begin_nested():
+            store_analysis(conn, scripts, force)
+            if episode_ids:
+                rundown_ids.update(conn.execute(
+                    select(_rundowns.c.id).where(_rundowns.c.episode_id.in_(episode_ids))
+                ).scalars())
+            for rundown_id in rundown_ids:
+                if rundown_id is not None:
+                    rollup_rundown(conn, rundown_id)
+    except Exception as e:
+        logger.warning(f"Could not update rundown timing (rundowns {sorted(r for r in rundown_ids if r)}): {e}")
+
+
+event.listen(Session, "after_flush", _maintain_timing)
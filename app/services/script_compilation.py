@@ -14,6 +14,7 @@ from celery_app import celery_app
 from database import SessionLocal
 from models_v2 import Episode, RundownItem
 from core.paths import paths
+from services.cue_parser import parse_cue_body
 import logging
 import re
 import yaml
@@ -189,35 +190,40 @@ def _validate_cue_blocks(rundown_files: List[Path]) -> Dict[str, Any]:
     
     return validation
 
+_LEGACY_CUE_MARKER_RE = re.compile(r"<<!--\s*(?:Begin|End) Cue\s*-->>", re.IGNORECASE)
+
+def _parse_legacy_cue(block: str):
+    """Parse a legacy <<!-- Begin Cue -->> block with the shared cue grammar.
+
+    The doubled markers hide the last field's terminator from the grammar,
+    so the body is parsed without them.
+    """
+    return parse_cue_body(_LEGACY_CUE_MARKER_RE.sub('\n', block))
+
 def _validate_single_cue_block(block: str, filename: str) -> Dict[str, List[str]]:
     """Validate a single cue block."""
     errors = []
     warnings = []
     
     # Extract cue components
-    cue_type = re.search(r"\[Type:\s*(.*?)\]", block, re.IGNORECASE)
-    slug = re.search(r"\[Slug:\s*(.*?)\]", block, re.IGNORECASE)
-    asset_id = re.search(r"\[AssetID:\s*(.*?)\]", block, re.IGNORECASE)
-    media_url = re.search(r"\[MediaURL:\s*(.*?)\]", block, re.IGNORECASE)
-    quote = re.search(r"\[Quote:\s*(.*?)(?=\[Attribution:|\[MediaURL:|\s*<<!--\s*End Cue\s*-->>|$)", block, re.IGNORECASE | re.DOTALL)
+    cue = _parse_legacy_cue(block)
+    cue_type = cue.type
     
     # Validate required fields
     if not cue_type:
         errors.append(f"Missing [Type] in {filename}")
-    elif cue_type.group(1).strip().upper() not in ["FSQ", "SOT", "GFX"]:
-        errors.append(f"Invalid [Type: {cue_type.group(1)}] in {filename}")
+    elif cue_type not in ["FSQ", "SOT", "GFX"]:
+        errors.append(f"Invalid [Type: {cue.get('Type')}] in {filename}")
     
-    if not slug or not slug.group(1).strip():
+    if not cue.slug:
         errors.append(f"Missing or empty [Slug] in {filename}")
     
     # Type-specific validation
-    if cue_type and cue_type.group(1).strip().upper() == "FSQ":
-        if not quote or not quote.group(1).strip():
-            errors.append(f"Missing or empty [Quote] for FSQ in {filename}")
+    if cue_type == "FSQ" and not cue.quote.strip():
+        errors.append(f"Missing or empty [Quote] for FSQ in {filename}")
     
-    if cue_type and cue_type.group(1).strip().upper() == "GFX":
-        if not media_url or not media_url.group(1).strip():
-            errors.append(f"Missing or empty [MediaURL] for GFX in {filename}")
+    if cue_type == "GFX" and not cue.media_url:
+        errors.append(f"Missing or empty [MediaURL] for GFX in {filename}")
     
     # Check for proper cue ending
     if not re.search(r"<<!--\s*End Cue\s*-->>", block, re.IGNORECASE):
@@ -402,52 +408,44 @@ def _process_segment_file(file_path: Path, para_counter: int, include_cues: bool
 def _format_cue_block(block: str) -> str:
     """Format a cue block as HTML."""
     # Extract cue components
-    cue_type = re.search(r"\[Type:\s*(.*?)\]", block, re.IGNORECASE)
-    slug = re.search(r"\[Slug:\s*(.*?)\]", block, re.IGNORECASE)
-    asset_id = re.search(r"\[AssetID:\s*(.*?)\]", block, re.IGNORECASE)
-    media_url = re.search(r"\[MediaURL:\s*(.*?)\]", block, re.IGNORECASE)
-    quote = re.search(r"\[Quote:\s*(.*?)(?=\[Attribution:|\[MediaURL:|\s*<<!--\s*End Cue\s*-->>|$)", block, re.IGNORECASE | re.DOTALL)
-    attribution = re.search(r"\[Attribution:\s*(.*?)\]", block, re.IGNORECASE)
-    duration = re.search(r"\[Duration:\s*(.*?)\]", block, re.IGNORECASE)
-    transcription = re.search(r"\[Transcription:\s*(.*?)\]", block, re.IGNORECASE)
+    cue = _parse_legacy_cue(block)
     
-    if not cue_type:
+    if not cue.type:
         return ""
     
-    cue_type_str = cue_type.group(1).strip().upper()
-    slug_str = slug.group(1).strip().lower() if slug else "unknown-slug"
+    cue_type_str = cue.type
+    slug_str = cue.slug.lower() or "unknown-slug"
     
     entry = f"""
     <div class='cue'>
     <p class='cue-header' style='font-weight:bold; font-size:1em;'>[[ {cue_type_str} / {slug_str} ]]</p>
     """
     
-    if cue_type_str == "GFX" and media_url:
-        media_url_str = media_url.group(1).strip()
+    if cue_type_str == "GFX" and cue.media_url:
         entry += f"""
         <div class='gfx'>
-        <img src='{media_url_str}' style='max-width:350px; max-height:350px; border:1px solid #ccc;' />
+        <img src='{cue.media_url}' style='max-width:350px; max-height:350px; border:1px solid #ccc;' />
         </div>
         """
     
     elif cue_type_str == "SOT":
         entry += "<div class='sot'>"
-        if duration and duration.group(1).strip():
-            entry += f"<p style='margin-top: 0.1em; margin-bottom: 0; font-size: 0.72em;'>Duration: {duration.group(1).strip()}</p>"
-        if transcription and transcription.group(1).strip():
-            entry += f"<p style='margin-top: 0.1em; margin-bottom: 0; font-size: 0.72em;'>Trans: {html.escape(transcription.group(1).strip())}</p>"
+        if cue.duration:
+            entry += f"<p style='margin-top: 0.1em; margin-bottom: 0; font-size: 0.72em;'>Duration: {cue.duration}</p>"
+        transcription = cue.get('Transcription')
+        if transcription:
+            entry += f"<p style='margin-top: 0.1em; margin-bottom: 0; font-size: 0.72em;'>Trans: {html.escape(transcription)}</p>"
         else:
             entry += "<p style='margin-top: 0.1em; margin-bottom: 0; font-size: 0.72em;'>No Transcript</p>"
         entry += "</div>"
     
-    elif cue_type_str == "FSQ" and quote:
-        quote_text = quote.group(1).strip().rstrip(']')
+    elif cue_type_str == "FSQ":
+        quote_text = cue.get('Quote')
         if quote_text:
-            attribution_text = attribution.group(1).strip() if attribution else ""
             entry += f"""
             <div class='fsq'>
             <blockquote>{html.escape(quote_text)}</blockquote>
-            <p>— {html.escape(attribution_text)}</p>
+            <p>— {html.escape(cue.attribution)}</p>
             </div>
             """
     
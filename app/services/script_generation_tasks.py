@@ -0,0 +1,43 @@
+"""
+Host script generation as a Celery job.
+
+generate_host_script does DB reads, media embedding, HTML/Markdown rendering
+and a wkhtmltopdf subprocess; running it on the compilation queue keeps the
+API responsive. Progress is reported as PROGRESS state meta
+({"progress", "stage"}), which celery_jobs_router surfaces in the job feed.
+"""
+import logging
+from typing import Any, Dict, Optional
+
+from celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True)
+def generate_host_script_task(
+    self,
+    episode_number: str,
+    output_dir: Optional[str] = None,
+    preset: str = "host_full",
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """Generate a host script (see services.host_script_generator.generate_host_script)."""
+    from services.host_script_generator import generate_host_script
+
+    def progress(percent: int, stage: str):
+        self.update_state(state="PROGRESS", meta={"progress": percent, "stage": stage})
+
+    result = generate_host_script(
+        episode_number, output_dir, preset=preset, progress=progress, use_cache=use_cache
+    )
+
+    if not result.get("success"):
+        # Surface as a task failure so the job log shows it as failed
+        raise RuntimeError(result.get("error") or f"Script generation failed for episode {episode_number}")
+
+    if result.get("cached"):
+        result["message"] = f"Episode {episode_number} {preset} unchanged - reused revision {result.get('revision')}"
+    else:
+        result["message"] = f"Generated episode {episode_number} {preset} revision {result.get('revision')}"
+    return result
@@ -0,0 +1,138 @@
+"""
+Script Media Derivatives - print-resolution copies of images embedded in host scripts.
+
+Rundown cues point at original assets (4K PNG thumbnails, full-size graphics,
+AVIF/WebP downloads). Embedding those as-is makes 50-100MB HTML files that
+wkhtmltopdf takes minutes to rasterise, and non-JPEG/PNG formats were decoded
+through Pillow on every render.
+
+Instead each referenced asset is converted once to a downscaled JPEG (longest
+side <= SCRIPT_MEDIA_MAX_PX) stored under scripts/current/resources/media/.
+The file name is derived from the source path, mtime, size and target size,
+so an edited asset gets a new derivative and an unchanged one is reused.
+Missing derivatives are generated in parallel.
+
+Presets of one episode render concurrently into the same directory, so a
+derivative the current script no longer references is only removed once no
+render has used it for PRUNE_AFTER seconds: reusing one touches its mtime.
+
+JPEG rather than WebP: wkhtmltopdf's WebKit cannot decode WebP.
+"""
+import hashlib
+import logging
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# ~7.5in printable width at 200dpi
+PRINT_MAX_PX = int(os.getenv("SCRIPT_MEDIA_MAX_PX", "1600"))
+JPEG_QUALITY = int(os.getenv("SCRIPT_MEDIA_JPEG_QUALITY", "82"))
+DERIVATIVE_WORKERS = int(os.getenv("SCRIPT_MEDIA_WORKERS", "4"))
+DERIVATIVE_DIR = "media"
+# Well past a render's length (wkhtmltopdf alone may take 120s)
+PRUNE_AFTER = int(os.getenv("SCRIPT_MEDIA_PRUNE_AFTER", "3600"))
+
+
+def derivative_path(source: Path, cache_dir: Path, max_px: int = PRINT_MAX_PX) -> Path:
+    """Where the derivative for this version of `source` lives (may not exist yet)."""
+    stat = source.stat()
+    key = f"{source.resolve()}:{stat.st_mtime_ns}:{stat.st_size}:{max_px}:{JPEG_QUALITY}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return cache_dir / f"{source.stem[:40]}-{digest}.jpg"
+
+
+def _build_derivative(source: Path, dest: Path, max_px: int) -> Path:
+    """Write a downscaled RGB JPEG of `source` to `dest` (atomic)."""
+    from PIL import Image, ImageOps
+
+    tmp_path = dest.with_name(f".{dest.name}.part")
+    try:
+        with Image.open(source) as img:
+            if img.format == 'JPEG' and max(img.size) <= max_px:
+                # Already print-sized JPEG: keep the original bytes, no re-encode loss
+                shutil.copyfile(source, tmp_path)
+            else:
+                img = ImageOps.exif_transpose(img)
+                img.thumbnail((max_px, max_px), Image.LANCZOS)
+                if img.mode in ('RGBA', 'LA', 'P'):
+                    # Flatten transparency onto white (the script page colour)
+                    img = img.convert('RGBA')
+                    background = Image.new('RGB', img.size, (255, 255, 255))
+                    background.paste(img, mask=img.getchannel('A'))
+                    img = background
+                else:
+                    img = img.convert('RGB')
+                img.save(tmp_path, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+        os.replace(tmp_path, dest)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return dest
+
+
+def ensure_derivatives(
+    sources: Iterable[Path],
+    cache_dir: Path,
+    max_px: int = PRINT_MAX_PX,
+    workers: int = DERIVATIVE_WORKERS
+) -> Dict[Path, Optional[Path]]:
+    """
+    Return source -> derivative path, generating missing derivatives in parallel.
+
+    A source maps to None when it couldn't be converted (the caller falls back
+    to the original). Derivatives no longer referenced by this set of sources
+    and unused for PRUNE_AFTER seconds are removed, so the directory holds
+    the current script's media plus whatever a concurrent render may still
+    be reading.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    result: Dict[Path, Optional[Path]] = {}
+    to_build: Dict[Path, Path] = {}
+    for source in dict.fromkeys(sources):
+        try:
+            dest = derivative_path(source, cache_dir, max_px)
+        except OSError as e:
+            logger.warning(f"Cannot stat {source} for derivative: {e}")
+            result[source] = None
+            continue
+        result[source] = dest
+        try:
+            os.utime(dest)  # Mark as in use, so a concurrent render doesn't prune it
+        except FileNotFoundError:
+            to_build[source] = dest
+        except OSError as e:
+            logger.debug(f"Could not touch derivative {dest}: {e}")
+
+    if to_build:
+        def build(item):
+            source, dest = item
+            try:
+                return source, _build_derivative(source, dest, max_px)
+            except Exception as e:
+                logger.warning(f"Could not build print derivative for {source}: {e}")
+                return source, None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(to_build)))) as pool:
+            for source, dest in pool.map(build, to_build.items()):
+                result[source] = dest
+
+    logger.info(f"Script media derivatives: {len(result) - len(to_build)} reused, {len(to_build)} generated")
+
+    keep = {dest.name for dest in result.values() if dest is not None}
+    cutoff = time.time() - PRUNE_AFTER
+    for path in cache_dir.glob('*.jpg'):
+        if path.name in keep:
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except FileNotFoundError:
+            pass  # Pruned by another render
+
+    return result
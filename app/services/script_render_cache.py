@@ -0,0 +1,181 @@
+"""
+Script Render Cache - skip regenerating host scripts whose inputs haven't changed.
+
+A render is keyed on everything that feeds the output:
+- episode, preset and output directory
+- every rundown item's rendered fields (type, slug, title, duration, script_content)
+- cover-page episode info, SOT transcriptions and script settings
+- each referenced media file's path, size and mtime
+- the generator modules themselves (a deploy invalidates old renders)
+
+The manifest lives next to the artifacts (scripts/current/.render_cache.json),
+one entry per preset. A hit returns the previous HTML/PDF/Markdown paths as
+long as those files still exist.
+
+When the document as a whole has changed, SegmentFragmentCache lets the
+generator reuse the rendered output of every segment whose own inputs are
+unchanged, so only edited segments are re-rendered.
+"""
+import hashlib
+import importlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".render_cache.json"
+# Modules whose code shapes the rendered output
+GENERATOR_MODULES = ("host_script_generator", "compiled_episode", "cue_parser")
+
+
+def _generator_fingerprint() -> str:
+    try:
+        parts = []
+        for name in GENERATOR_MODULES:
+            stat = os.stat(importlib.import_module(f"services.{name}").__file__)
+            parts.append(f"{name}={stat.st_mtime_ns}:{stat.st_size}")
+        return ";".join(parts)
+    except Exception:
+        return ""
+
+
+def _write_json(path: Path, data: Any, **dump_kwargs) -> None:
+    """Replace `path` atomically, through a temp file of its own (renders run concurrently)."""
+    f = tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=path.parent, prefix=f"{path.name}.",
+                                    suffix='.tmp', delete=False)
+    try:
+        with f:
+            json.dump(data, f, **dump_kwargs)
+        os.chmod(f.name, 0o644)  # mkstemp's 0600 would hide it from the other services
+        os.replace(f.name, path)
+    except BaseException:
+        try:
+            os.unlink(f.name)
+        except OSError:
+            pass
+        raise
+
+
+def compute_render_key(
+    episode_number: str,
+    preset: str,
+    output_path: Path,
+    items: List[Any],
+    episode_info: Dict[str, Any],
+    media_sources: Dict[str, Optional[Path]],
+    transcription_cache: Dict[str, str],
+    settings: Dict[str, Any]
+) -> str:
+    """Hash of every input that affects a host script render."""
+    digest = hashlib.sha256()
+
+    def feed(value: Any):
+        digest.update(json.dumps(value, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(b'\0')
+
+    feed([episode_number, preset, str(output_path), _generator_fingerprint()])
+    for item in items:
+        feed([item.id, item.item_type, item.slug, item.title, item.duration, item.script_content])
+    feed(episode_info)
+    feed(transcription_cache)
+    feed(settings)
+
+    for url in sorted(media_sources):
+        path = media_sources[url]
+        if path is None:
+            feed([url, None])
+            continue
+        try:
+            stat = path.stat()
+            feed([url, str(path), stat.st_size, stat.st_mtime_ns])
+        except OSError:
+            feed([url, str(path), None])
+
+    return digest.hexdigest()
+
+
+def _read_manifest(output_path: Path) -> Dict[str, Any]:
+    manifest_path = output_path / MANIFEST_NAME
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def get_cached_render(output_path: Path, preset: str, key: str) -> Optional[Dict[str, Any]]:
+    """Previous generate_host_script result for this key, if its artifacts still exist."""
+    entry = _read_manifest(output_path).get(preset)
+    if not entry or entry.get('key') != key:
+        return None
+
+    result = entry.get('result') or {}
+    for path_field in ('html_path', 'md_path', 'pdf_path'):
+        path = result.get(path_field)
+        if path and not Path(path).exists():
+            logger.info(f"Render cache entry for {preset} is missing {path}; regenerating")
+            return None
+
+    return {**result, "cached": True}
+
+
+def store_render(output_path: Path, preset: str, key: str, result: Dict[str, Any]):
+    """Record a successful render in the manifest (atomic replace)."""
+    manifest = _read_manifest(output_path)
+    manifest[preset] = {"key": key, "result": result}
+
+    manifest_path = output_path / MANIFEST_NAME
+    try:
+        _write_json(manifest_path, manifest, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not write render cache manifest {manifest_path}: {e}")
+
+
+class SegmentFragmentCache:
+    """
+    Rendered per-segment fragments for one (output directory, preset).
+
+    Stored in scripts/current/.fragments-<preset>.json. Each save keeps only
+    the fragments used by that render, so edited-away segments age out.
+    """
+
+    def __init__(self, output_path: Path, preset: str):
+        self.path = output_path / f".fragments-{preset}.json"
+        self._stored: Dict[str, Any] = {}
+        self._used: Dict[str, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self._fingerprint = _generator_fingerprint()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._stored = json.load(f)
+        except (OSError, ValueError):
+            self._stored = {}
+
+    def key(self, *parts: Any) -> str:
+        """Hash of a segment's render inputs (plus the generator version)."""
+        return hashlib.sha256(
+            json.dumps([self._fingerprint, *parts], sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self._used.get(key, self._stored.get(key))
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._used[key] = value
+        return value
+
+    def put(self, key: str, value: Any):
+        self._used[key] = value
+
+    def save(self):
+        try:
+            _write_json(self.path, self._used)
+        except OSError as e:
+            logger.warning(f"Could not write segment fragment cache {self.path}: {e}")
@@ -256,6 +256,8 @@ except Exception:  # celery not importable in some contexts (tests) — task opt
 def _scrub_idle_items_impl(limit: int = 200) -> dict:
     from database import SessionLocal
     from sqlalchemy import text
+    from services.rundown_cues import scripts_written
+    from services.rundown_timing import refresh_item_timing
 
     settings = load_scrub_settings()
     if not settings.enabled:
@@ -264,9 +266,10 @@ def _scrub_idle_items_impl(limit: int = 200) -> dict:
     db = SessionLocal()
     scrubbed = 0
     scanned = 0
+    written = {}
     try:
         rows = db.execute(text("""
-            SELECT ri.asset_id, ri.script_content
+            SELECT ri.id, ri.asset_id, ri.script_content
             FROM rundown_items ri
             JOIN rundowns r ON r.id = ri.rundown_id
             JOIN episodes e ON e.id = r.episode_id
@@ -293,7 +296,11 @@ def _scrub_idle_items_impl(limit: int = 200) -> dict:
             """), {"sc": result.content, "aid": row.asset_id})
             if upd.rowcount:
                 scrubbed += 1
+                written[row.id] = result.content
                 logger.info(f"[scrub-sweep] {row.asset_id}: {', '.join(result.notes)}")
+        # Raw UPDATEs bypass the save hooks: keep the cue and timing rows in step
+        scripts_written(db.connection(), written)
+        refresh_item_timing(db.connection(), written)
         db.commit()
         return {"status": "ok", "scanned": scanned, "scrubbed": scrubbed}
     except Exception as e:
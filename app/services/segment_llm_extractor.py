@@ -19,6 +19,7 @@ from sqlalchemy import text
 
 from models_segment_llm import SegmentLLMData
 from models_v2 import RundownItem
+from services.rundown_items import WITH_SCRIPT
 from services.asset_id import AssetIDService
 
 logger = logging.getLogger(__name__)
@@ -304,7 +305,7 @@ class SegmentLLMExtractor:
             SegmentLLMData record with extracted data
         """
         # Get the rundown item
-        rundown_item = db.query(RundownItem).filter(RundownItem.id == rundown_item_id).first()
+        rundown_item = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.id == rundown_item_id).first()
         if not rundown_item:
             raise Exception(f"Rundown item {rundown_item_id} not found")
 
@@ -498,7 +499,7 @@ class SegmentLLMExtractor:
             Dict with stale status and details
         """
         # Get the rundown item
-        rundown_item = db.query(RundownItem).filter(RundownItem.id == rundown_item_id).first()
+        rundown_item = db.query(RundownItem).options(WITH_SCRIPT).filter(RundownItem.id == rundown_item_id).first()
         if not rundown_item:
             return {"stale": True, "reason": "rundown_item_not_found"}
 
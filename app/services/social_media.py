@@ -207,6 +207,9 @@ def extract_twitter_metadata(soup, url: str) -> dict:
     return {k: v for k, v in twitter_data.items() if v}
 
 
+SYNDICATION_URL = 'https://cdn.syndication.twimg.com/tweet-result'
+
+
 def fetch_tweet_via_syndication(tweet_id: str) -> Optional[dict]:
     """
     Fetch tweet data via X's syndication API (used by embed widgets).
@@ -218,7 +221,7 @@ def fetch_tweet_via_syndication(tweet_id: str) -> Optional[dict]:
     try:
         logger.info(f"🔄 Fetching tweet {tweet_id} via syndication API")
         response = requests.get(
-            'https://cdn.syndication.twimg.com/tweet-result',
+            SYNDICATION_URL,
             params={'id': tweet_id, 'token': 'x'},
             timeout=10
         )
@@ -227,8 +230,42 @@ def fetch_tweet_via_syndication(tweet_id: str) -> Optional[dict]:
             logger.warning(f"Syndication API returned {response.status_code} for tweet {tweet_id}")
             return None
 
-        data = response.json()
+        return _parse_syndication_result(response.json(), tweet_id)
+
+    except Exception as e:
+        logger.error(f"Syndication API error for tweet {tweet_id}: {e}")
+        return None
+
+
+async def fetch_tweet_via_syndication_async(tweet_id: str) -> Optional[dict]:
+    """
+    Non-blocking fetch_tweet_via_syndication using the shared async HTTP pool.
+    Concurrent lookups of the same tweet share a single request.
+    """
+    from services.http_fetch import get_fetcher
+
+    try:
+        logger.info(f"🔄 Fetching tweet {tweet_id} via syndication API (async)")
+        response = await get_fetcher().get(
+            SYNDICATION_URL,
+            params={'id': tweet_id, 'token': 'x'},
+            timeout=10
+        )
+
+        if response.status_code != 200:
+            logger.warning(f"Syndication API returned {response.status_code} for tweet {tweet_id}")
+            return None
+
+        return _parse_syndication_result(response.json(), tweet_id)
 
+    except Exception as e:
+        logger.error(f"Syndication API error for tweet {tweet_id}: {e}")
+        return None
+
+
+def _parse_syndication_result(data: dict, tweet_id: str) -> Optional[dict]:
+    """Convert a syndication tweet-result payload to our standard metadata format."""
+    try:
         if data.get('__typename') == 'TweetTombstone':
             logger.warning(f"Tweet {tweet_id} is tombstoned (deleted/suspended)")
             return None
@@ -304,7 +341,7 @@ def fetch_tweet_via_syndication(tweet_id: str) -> Optional[dict]:
         return metadata
 
     except Exception as e:
-        logger.error(f"Syndication API error for tweet {tweet_id}: {e}")
+        logger.error(f"Error parsing syndication result for tweet {tweet_id}: {e}")
         return None
 
 
@@ -0,0 +1,208 @@
+"""
+SOT Checkpoints - per-phase resume points for the SOT processing chain.
+
+Each expensive phase of sot_prepare / transcribe_sot_audio / sot_finalize
+records, on its SOTProcessingJob row (`checkpoint` JSON), the output artifacts
+the next phase needs plus the chain ctx at that point. An artifact is only
+recorded once it is verified: non-empty, and for media files ffprobe must
+read a positive duration from it.
+
+    {
+      "args":   {...},                 # process_sot_video_multi_phase kwargs
+      "ctx":    {...},                 # chain ctx as of the latest checkpoint
+      "phases": {"6": {"completed_at": ..., "worker": ...,
+                       "artifacts": {"video": {"path": ..., "size": ...}}}}
+    }
+
+resume_phase() is the highest recorded phase whose artifacts are all still
+on disk with the recorded size, so a worker lost in phase 9 resumes after
+phase 8 instead of re-trimming, re-transcribing and re-encoding.
+"""
+import logging
+import platform
+import subprocess
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+ArtifactValue = Union[Path, str, List[Union[Path, str]], None]
+
+
+def _probe_duration(path: Path) -> float:
+    from platform_utils import get_ffprobe_binary
+
+    result = subprocess.run(
+        [get_ffprobe_binary(), "-v", "error", "-show_entries", "format=duration",
+         "-of", "default=noprint_wrappers=1:nokey=1", str(path)],
+        capture_output=True, text=True, timeout=60
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return 0.0
+
+
+def _verify(path: Union[Path, str], media: bool) -> Optional[Dict[str, Any]]:
+    path = Path(path)
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return None
+    if size == 0:
+        return None
+    if media and _probe_duration(path) <= 0:
+        return None
+    return {"path": str(path), "size": size}
+
+
+def _intact(entry: Any) -> bool:
+    """Whether a recorded artifact (or list of them) is still on disk unchanged."""
+    if entry is None:
+        return True
+    if isinstance(entry, list):
+        return all(_intact(e) for e in entry)
+    try:
+        return Path(entry["path"]).stat().st_size == entry["size"]
+    except (OSError, KeyError, TypeError):
+        return False
+
+
+def _paths(entry: Any) -> Any:
+    if entry is None:
+        return None
+    if isinstance(entry, list):
+        return [Path(e["path"]) for e in entry]
+    return Path(entry["path"])
+
+
+@dataclass
+class SOTCheckpoint:
+    """A job's recorded dispatch args, latest ctx and completed phases."""
+    args: Dict[str, Any] = field(default_factory=dict)
+    ctx: Optional[Dict[str, Any]] = None
+    phases: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, data: Optional[Dict[str, Any]]) -> "SOTCheckpoint":
+        data = data or {}
+        return cls(
+            args=data.get("args") or {},
+            ctx=data.get("ctx"),
+            phases={int(phase): value for phase, value in (data.get("phases") or {}).items()},
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "args": self.args,
+            "ctx": self.ctx,
+            "phases": {str(phase): value for phase, value in sorted(self.phases.items())},
+        }
+
+    @property
+    def last_phase(self) -> int:
+        """Highest recorded phase, without checking the artifacts (0 = none)."""
+        return max(self.phases, default=0)
+
+    def resume_phase(self) -> int:
+        """Highest completed phase whose artifacts are intact (0 = start over)."""
+        for phase in sorted(self.phases, reverse=True):
+            if all(_intact(entry) for entry in self.phases[phase].get("artifacts", {}).values()):
+                return phase
+        return 0
+
+    def artifact(self, phase: int, name: str) -> Any:
+        """Path (or list of paths) recorded for `name` at `phase`."""
+        return _paths(self.phases.get(phase, {}).get("artifacts", {}).get(name))
+
+
+def load_checkpoint(temp_job_id: str, db=None) -> SOTCheckpoint:
+    from models_v2 import SOTProcessingJob
+
+    def _load(session):
+        job = session.query(SOTProcessingJob).filter_by(temp_job_id=temp_job_id).first()
+        return SOTCheckpoint.from_json(job.checkpoint if job else None)
+
+    if db is not None:
+        return _load(db)
+
+    from database import SessionLocal
+    session = SessionLocal()
+    try:
+        return _load(session)
+    finally:
+        session.close()
+
+
+def _save(temp_job_id: str, update) -> bool:
+    from database import SessionLocal
+    from models_v2 import SOTProcessingJob
+
+    db = SessionLocal()
+    try:
+        job = db.query(SOTProcessingJob).filter_by(temp_job_id=temp_job_id).with_for_update().first()
+        if not job:
+            return False
+        checkpoint = SOTCheckpoint.from_json(job.checkpoint)
+        update(checkpoint)
+        job.checkpoint = checkpoint.to_json()  # reassign: plain JSON columns don't track mutation
+        db.commit()
+        return True
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Could not save checkpoint for {temp_job_id}: {e}")
+        return False
+    finally:
+        db.close()
+
+
+def record_dispatch(temp_job_id: str, args: Dict[str, Any]) -> bool:
+    """Start a fresh checkpoint for a (re)dispatched job."""
+    def update(checkpoint: SOTCheckpoint):
+        checkpoint.args = args
+        checkpoint.ctx = None
+        checkpoint.phases = {}
+
+    return _save(temp_job_id, update)
+
+
+def record_checkpoint(
+    temp_job_id: str,
+    phase: int,
+    ctx: Dict[str, Any],
+    artifacts: Optional[Dict[str, ArtifactValue]] = None,
+    media: tuple = ()
+) -> bool:
+    """
+    Verify `artifacts` and record `phase` as completed with them.
+
+    Names listed in `media` must be readable by ffprobe. Returns False (and
+    records nothing) if any artifact fails verification, so recovery falls
+    back to the previous phase.
+    """
+    verified: Dict[str, Any] = {}
+    for name, value in (artifacts or {}).items():
+        if value is None:
+            verified[name] = None
+            continue
+        values = value if isinstance(value, list) else [value]
+        entries = [_verify(v, name in media) for v in values]
+        if any(entry is None for entry in entries):
+            logger.warning(f"Phase {phase} artifact '{name}' for {temp_job_id} failed verification; not checkpointed")
+            return False
+        verified[name] = entries if isinstance(value, list) else entries[0]
+
+    def update(checkpoint: SOTCheckpoint):
+        checkpoint.ctx = ctx
+        checkpoint.phases[phase] = {
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+            "worker": platform.node(),
+            "artifacts": verified,
+        }
+
+    saved = _save(temp_job_id, update)
+    if saved:
+        logger.info(f"Checkpoint: {temp_job_id} phase {phase} ({', '.join(verified) or 'no artifacts'})")
+    return saved
@@ -0,0 +1,220 @@
+"""
+Speaker Rates - per-speaker reading-rate model for duration estimates.
+
+Every WPM measurement (wpm_audio /analyze, speakers /me/measure-wpm, voice
+sample upload) is kept in speaker_rate_measurements. The model aggregates
+them per speaker and per segment type (the rundown item_type read, or 'fsq'
+for full-screen quotes):
+
+- rate: words over minutes across all of a speaker's measurements, so long
+  readings count for more than short ones
+- stddev: spread of the individual measurements' WPM
+- segment-type rate: shrunk toward the speaker's overall rate by
+  PRIOR_WEIGHT measurements, so one odd promo read doesn't set the promo rate
+
+A speaker without measurements falls back to speakers.wpm (stddev from the
+wpm_min..wpm_max range, read as +-2 sigma); an unknown speaker to DEFAULT_WPM.
+FSQs without an 'fsq' measurement are read at the speaker's rate scaled by
+DEFAULT_FSQ_WPM / DEFAULT_WPM. No rate is ever below MIN_WPM, so estimates
+can always divide by it.
+
+The model is one aggregate query, cached for RATE_MODEL_TTL seconds and
+dropped whenever a measurement is recorded.
+"""
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from models.production import Speaker, SpeakerRateMeasurement
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WPM = 150  # Words per minute for speech
+DEFAULT_FSQ_WPM = 120  # Slightly slower for full-screen quotes
+MIN_WPM = 40  # Floor for any modelled rate (rows recorded before empty readings were rejected)
+FSQ_SEGMENT_TYPE = "fsq"
+# Measurements' worth of pull a segment-type rate gets toward the speaker's overall rate
+PRIOR_WEIGHT = 3
+RATE_MODEL_TTL = 300.0
+
+_speakers = Speaker.__table__
+_measurements = SpeakerRateMeasurement.__table__
+
+
+@dataclass(frozen=True)
+class Rate:
+    """A reading rate and its uncertainty."""
+    wpm: float
+    stddev: float = 0.0
+    samples: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"wpm": round(self.wpm, 1), "stddev": round(self.stddev, 1), "samples": self.samples}
+
+
+@dataclass
+class _Sums:
+    count: int = 0
+    words: float = 0.0
+    seconds: float = 0.0
+    wpm: float = 0.0
+    wpm_sq: float = 0.0
+
+    def add(self, other: "_Sums") -> None:
+        self.count += other.count
+        self.words += other.words
+        self.seconds += other.seconds
+        self.wpm += other.wpm
+        self.wpm_sq += other.wpm_sq
+
+    def rate(self) -> Rate:
+        wpm = self.words / self.seconds * 60 if self.seconds > 0 else self.wpm / self.count
+        wpm = max(float(MIN_WPM), wpm)
+        mean = self.wpm / self.count
+        variance = max(0.0, self.wpm_sq / self.count - mean * mean) if self.count > 1 else 0.0
+        return Rate(wpm=wpm, stddev=math.sqrt(variance), samples=self.count)
+
+
+def _fallback_rate(wpm: Optional[float], wpm_min: Optional[float], wpm_max: Optional[float]) -> Rate:
+    if not wpm:
+        return Rate(float(DEFAULT_WPM))
+    stddev = (wpm_max - wpm_min) / 4 if wpm_min and wpm_max and wpm_max > wpm_min else 0.0
+    return Rate(max(float(MIN_WPM), float(wpm)), stddev)
+
+
+@dataclass
+class SpeakerRateModel:
+    """Reading rates by speaker and segment type."""
+    overall: Dict[int, Rate] = field(default_factory=dict)
+    by_type: Dict[Tuple[int, str], Rate] = field(default_factory=dict)
+    labels: Dict[str, int] = field(default_factory=dict)  # paragraph class / slug / name -> speaker id
+    default: Rate = Rate(float(DEFAULT_WPM))
+
+    @classmethod
+    def load(cls, conn) -> "SpeakerRateModel":
+        """Build the model with one aggregate query over the measurements (plus the speakers)."""
+        model = cls()
+        speakers = conn.execute(
+            select(_speakers.c.id, _speakers.c.slug, _speakers.c.name,
+                   _speakers.c.wpm, _speakers.c.wpm_min, _speakers.c.wpm_max)
+        ).all()
+        for speaker in speakers:
+            model.overall[speaker.id] = _fallback_rate(speaker.wpm, speaker.wpm_min, speaker.wpm_max)
+            names = [speaker.slug, speaker.name]
+            if speaker.name:
+                names.append(speaker.name.split()[0])
+            for name in names:
+                if name:
+                    model.labels.setdefault(name.strip().lower().replace(' ', '-'), speaker.id)
+
+        rows = conn.execute(
+            select(_measurements.c.speaker_id, _measurements.c.segment_type,
+                   func.count().label("count"),
+                   func.sum(_measurements.c.word_count).label("words"),
+                   func.sum(_measurements.c.duration_seconds).label("seconds"),
+                   func.sum(_measurements.c.wpm).label("wpm"),
+                   func.sum(_measurements.c.wpm * _measurements.c.wpm).label("wpm_sq"))
+            .group_by(_measurements.c.speaker_id, _measurements.c.segment_type)
+        ).all()
+
+        totals: Dict[int, _Sums] = {}
+        typed: Dict[Tuple[int, str], _Sums] = {}
+        for row in rows:
+            sums = _Sums(row.count, float(row.words or 0), float(row.seconds or 0),
+                         float(row.wpm or 0), float(row.wpm_sq or 0))
+            totals.setdefault(row.speaker_id, _Sums()).add(sums)
+            if row.segment_type:
+                typed[(row.speaker_id, row.segment_type)] = sums
+
+        for speaker_id, sums in totals.items():
+            model.overall[speaker_id] = sums.rate()
+        for (speaker_id, segment_type), sums in typed.items():
+            own, base = sums.rate(), model.overall[speaker_id]
+            weight = own.samples + PRIOR_WEIGHT
+            model.by_type[(speaker_id, segment_type)] = Rate(
+                wpm=(own.samples * own.wpm + PRIOR_WEIGHT * base.wpm) / weight,
+                stddev=own.stddev if own.samples > 1 else base.stddev,
+                samples=own.samples,
+            )
+        return model
+
+    def speaker_for(self, label: Optional[str]) -> Optional[int]:
+        """Speaker id named by a paragraph's speaker class (slug, full or first name)."""
+        if not label:
+            return None
+        return self.labels.get(label.strip().lower())
+
+    def rate(self, speaker_id: Optional[int], segment_type: Optional[str] = None) -> Rate:
+        """Reading rate of `speaker_id` for `segment_type`, falling back to the speaker's, then the default."""
+        if speaker_id is None:
+            return self.default
+        if segment_type:
+            typed = self.by_type.get((speaker_id, segment_type))
+            if typed is not None:
+                return typed
+        overall = self.overall.get(speaker_id, self.default)
+        if segment_type == FSQ_SEGMENT_TYPE:
+            scale = DEFAULT_FSQ_WPM / DEFAULT_WPM
+            return Rate(overall.wpm * scale, overall.stddev * scale, 0)
+        return overall
+
+    def describe(self, speaker_id: int) -> Dict[str, Any]:
+        """Overall and per segment-type rates of one speaker, for the API."""
+        return {
+            "rate": self.rate(speaker_id).to_dict(),
+            "segment_types": {
+                segment_type: rate.to_dict()
+                for (sid, segment_type), rate in sorted(self.by_type.items()) if sid == speaker_id
+            },
+        }
+
+
+_model: Optional[SpeakerRateModel] = None
+_model_loaded_at = 0.0
+_model_lock = threading.Lock()
+
+
+def get_rate_model(conn) -> SpeakerRateModel:
+    """The cached model, reloaded through `conn` once older than RATE_MODEL_TTL."""
+    global _model, _model_loaded_at
+    with _model_lock:
+        if _model is None or time.monotonic() - _model_loaded_at > RATE_MODEL_TTL:
+            _model = SpeakerRateModel.load(conn)
+            _model_loaded_at = time.monotonic()
+        return _model
+
+
+def invalidate_rate_model() -> None:
+    global _model
+    with _model_lock:
+        _model = None
+
+
+def record_measurement(db, speaker_id: int, word_count: int, duration_seconds: float,
+                       source: str, segment_type: Optional[str] = None) -> Optional[SpeakerRateMeasurement]:
+    """
+    Add a measurement to the session (the caller commits) and drop the cached model.
+
+    A reading with no words or no duration says nothing about the speaker's
+    rate; it is skipped and None returned.
+    """
+    if (word_count or 0) <= 0 or (duration_seconds or 0) <= 0:
+        logger.info(f"Skipping empty {source} measurement for speaker {speaker_id} "
+                    f"({word_count} words in {duration_seconds}s)")
+        return None
+    measurement = SpeakerRateMeasurement(
+        speaker_id=speaker_id,
+        wpm=word_count / duration_seconds * 60,
+        word_count=word_count,
+        duration_seconds=duration_seconds,
+        segment_type=segment_type or None,
+        source=source,
+    )
+    db.add(measurement)
+    invalidate_rate_model()
+    return measurement
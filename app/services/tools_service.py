@@ -343,7 +343,8 @@ class ToolsService:
         If versions not specified, compares current state with itself
         (useful for getting current rundown structure).
         """
-        from models_v2 import RundownItem, Episode, Rundown
+        from models_v2 import Episode, Rundown
+        from services.rundown_items import item_summaries
 
         # Get episode
         episode_record = db.query(Episode).filter(
@@ -363,10 +364,8 @@ class ToolsService:
         if not rundown_ids:
             raise ValueError(f"No rundowns found for episode {episode}")
 
-        # Get current rundown items through rundown relationship
-        current_items = db.query(RundownItem).filter(
-            RundownItem.rundown_id.in_(rundown_ids)
-        ).order_by(RundownItem.order_in_rundown).all()
+        # Get current rundown items (columns + script length, no script bodies)
+        current_items = item_summaries(db, rundown_ids)
 
         # Build current state
         current_state = []
@@ -380,7 +379,7 @@ class ToolsService:
                 "order": item.order_in_rundown,
                 "duration": item.duration,
                 "status": item.status,
-                "has_script": bool(item.script_content and len(item.script_content) > 50)
+                "has_script": item.script_length > 50
             })
 
         # For now, we only support current vs current (shows structure)
@@ -36,6 +36,7 @@ def validate_metadata_task(self, episode: Optional[str] = None):
     """
     from database import SessionLocal
     from models_v2 import RundownItem, Episode, Rundown
+    from services.rundown_items import WITH_SCRIPT
 
     results = {
         "timestamp": datetime.utcnow().isoformat() + "Z",
@@ -53,7 +54,7 @@ def validate_metadata_task(self, episode: Optional[str] = None):
     db = SessionLocal()
     try:
         # Get rundown items
-        query = db.query(RundownItem)
+        query = db.query(RundownItem).options(WITH_SCRIPT)
         if episode:
             episode_record = db.query(Episode).filter(
                 Episode.episode_number == int(episode.lstrip('0')) if episode.isdigit() else Episode.episode_number == episode
@@ -133,6 +134,7 @@ def reconcile_durations_task(self, episode: str):
     """
     from database import SessionLocal
     from models_v2 import RundownItem, Episode, Rundown
+    from services.rundown_items import WITH_SCRIPT
     from platform_utils import get_ffprobe_binary
 
     results = {
@@ -166,7 +168,7 @@ def reconcile_durations_task(self, episode: str):
             return {"error": f"No rundowns found for episode {episode}"}
 
         # Get rundown items
-        items = db.query(RundownItem).filter(
+        items = db.query(RundownItem).options(WITH_SCRIPT).filter(
             RundownItem.rundown_id.in_(rundown_ids)
         ).all()
 
@@ -287,7 +289,8 @@ def generate_production_report_task(
         include_timeline: Include timeline visualization
     """
     from database import SessionLocal
-    from models_v2 import RundownItem, Episode, Rundown
+    from models_v2 import Episode, Rundown
+    from services.rundown_items import item_summaries
 
     db = SessionLocal()
     try:
@@ -308,10 +311,8 @@ def generate_production_report_task(
         if not rundown_ids:
             return {"error": f"No rundowns found for episode {episode}"}
 
-        # Get rundown items
-        items = db.query(RundownItem).filter(
-            RundownItem.rundown_id.in_(rundown_ids)
-        ).order_by(RundownItem.order_in_rundown).all()
+        # Get rundown items (columns + script length, no script bodies)
+        items = item_summaries(db, rundown_ids)
 
         self.update_state(state='PROGRESS', meta={'progress': 30})
 
@@ -345,7 +346,7 @@ def generate_production_report_task(
                 "type": item.item_type,
                 "duration": item.duration or "00:00:00",
                 "status": item.status or "draft",
-                "has_script": bool(item.script_content and len(item.script_content) > 100)
+                "has_script": item.script_length > 100
             }
             report_data["rundown"]["items"].append(item_data)
 
@@ -0,0 +1,106 @@
+"""
+Worker Capabilities - each worker's capability profile, published to Redis.
+
+Workers detect their profile once at boot (platform_utils.get_capabilities:
+GPU, NVENC/VAAPI, ffmpeg version, encoders and filters, media root access)
+and re-publish it every CAPABILITY_REFRESH_SECONDS under
+
+    worker:capabilities:{worker nodename}   JSON, expires after 3 intervals
+
+so the API and the routers can see what each worker can actually do instead
+of guessing from its name or platform. A worker that stops publishing drops
+out once its key expires.
+"""
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from platform_utils import CAPABILITY_REFRESH_SECONDS, get_capabilities
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "worker:capabilities:"
+PROFILE_TTL = CAPABILITY_REFRESH_SECONDS * 3
+
+_redis = None
+_publisher: Optional[threading.Thread] = None
+
+
+def _get_redis():
+    global _redis
+    if _redis is None:
+        import redis
+        from celery_app import REDIS_URL
+        _redis = redis.Redis.from_url(REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+    return _redis
+
+
+def publish_capabilities(worker_name: str, refresh: bool = False) -> Dict[str, Any]:
+    """Publish this host's (cached) profile for `worker_name`."""
+    profile = dict(get_capabilities(refresh=refresh), worker=worker_name)
+    _get_redis().set(f"{KEY_PREFIX}{worker_name}", json.dumps(profile), ex=PROFILE_TTL)
+    return profile
+
+
+def start_capability_publisher(worker_name: str) -> None:
+    """Publish at boot, then re-detect and re-publish on the slow interval."""
+    global _publisher
+    if _publisher is not None:
+        return
+
+    def loop():
+        refresh = False
+        while True:
+            try:
+                profile = publish_capabilities(worker_name, refresh=refresh)
+                if refresh:
+                    logger.debug(f"Re-published capabilities for {worker_name}")
+                else:
+                    logger.info(f"Capabilities for {worker_name}: nvenc={profile['nvenc']} vaapi={profile['vaapi']} "
+                                f"ffmpeg={profile['ffmpeg_version']} media_writable={profile['media']['writable']}")
+            except Exception as e:
+                logger.warning(f"Could not publish capabilities for {worker_name}: {e}")
+            refresh = True
+            time.sleep(CAPABILITY_REFRESH_SECONDS)
+
+    _publisher = threading.Thread(target=loop, name="capability-publisher", daemon=True)
+    _publisher.start()
+
+
+def get_worker_capabilities() -> Dict[str, Dict[str, Any]]:
+    """Every live worker's published profile, keyed by worker nodename."""
+    client = _get_redis()
+    keys = list(client.scan_iter(match=f"{KEY_PREFIX}*"))
+    if not keys:
+        return {}
+    profiles = {}
+    for key, raw in zip(keys, client.mget(keys)):
+        if raw is None:
+            continue  # expired between SCAN and MGET
+        key = key.decode() if isinstance(key, bytes) else key
+        try:
+            profiles[key[len(KEY_PREFIX):]] = json.loads(raw)
+        except ValueError:
+            logger.warning(f"Ignoring malformed capability profile at {key}")
+    return profiles
+
+
+def capability_tags(profile: Dict[str, Any]) -> List[str]:
+    """Short tags for UI display ("ffmpeg", "nvenc", "vaapi", "media")."""
+    tags = []
+    if profile.get("ffmpeg_available"):
+        tags.append("ffmpeg")
+    if profile.get("nvenc"):
+        tags.append("nvenc")
+    if profile.get("vaapi"):
+        tags.append("vaapi")
+    if (profile.get("media") or {}).get("writable"):
+        tags.append("media")
+    return tags
+
+
+def workers_with(capability: str) -> List[str]:
+    """Nodenames of live workers whose profile has `capability` truthy (e.g. "nvenc")."""
+    return sorted(name for name, profile in get_worker_capabilities().items() if profile.get(capability))
@@ -0,0 +1,249 @@
+"""
+Worker Inspector - background Celery fleet snapshot for the worker endpoints.
+
+celery_app.control.inspect() broadcasts to every worker and blocks for the full
+reply timeout; calling it from each request (several calls per endpoint, from
+async handlers, with monitors open all day) stalled the event loop. Instead one
+daemon thread per API process collects, every WORKER_INSPECT_INTERVAL seconds:
+
+- ping, active, reserved, stats and active_queues from all workers (one inspect)
+- broker queue depths (LLEN on the Redis-backed queues)
+- queue wait latency: time_start of each running task minus its
+  celery_job_log.created_at (registered jobs only)
+- the capability profiles workers publish (services/worker_capabilities)
+
+into a WorkerSnapshot, and keeps a bounded history of per-queue depth / latency
+points for trends. Polling pauses after WORKER_INSPECT_IDLE seconds without a
+reader and resumes on the next request.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INSPECT_INTERVAL = float(os.getenv("WORKER_INSPECT_INTERVAL", "10"))
+INSPECT_TIMEOUT = float(os.getenv("WORKER_INSPECT_TIMEOUT", "2"))
+IDLE_PAUSE_SECONDS = float(os.getenv("WORKER_INSPECT_IDLE", "300"))
+HISTORY_POINTS = int(os.getenv("WORKER_INSPECT_HISTORY", "360"))  # 1h at 10s
+# Workers that stop answering stay listed as offline for this long
+OFFLINE_RETENTION_SECONDS = 3600
+
+
+def worker_platform(worker_name: str) -> str:
+    return "Windows" if "windows" in worker_name.lower() else "Linux"
+
+
+@dataclass
+class WorkerSnapshot:
+    """One inspection pass over the worker fleet."""
+    taken_at: float
+    duration: float = 0.0
+    ping: Dict[str, Any] = field(default_factory=dict)
+    active: Dict[str, List[dict]] = field(default_factory=dict)
+    reserved: Dict[str, List[dict]] = field(default_factory=dict)
+    stats: Dict[str, dict] = field(default_factory=dict)
+    active_queues: Dict[str, List[dict]] = field(default_factory=dict)
+    queue_depths: Dict[str, int] = field(default_factory=dict)
+    queue_latency: Dict[str, float] = field(default_factory=dict)  # mean seconds waited
+    last_seen: Dict[str, float] = field(default_factory=dict)  # includes recently-offline workers
+    capabilities: Dict[str, dict] = field(default_factory=dict)  # published profiles by worker name
+    error: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.taken_at)
+
+    def worker_queues(self, worker_name: str) -> List[str]:
+        return sorted({q.get("name") for q in self.active_queues.get(worker_name, []) if q.get("name")})
+
+    def meta(self) -> Dict[str, Any]:
+        """Freshness info endpoints attach to their responses."""
+        return {
+            "snapshot_at": datetime.fromtimestamp(self.taken_at, timezone.utc).isoformat(),
+            "snapshot_age_seconds": round(self.age, 1),
+            "error": self.error,
+        }
+
+
+class WorkerInspector:
+    """Background poller holding the latest WorkerSnapshot plus history."""
+
+    def __init__(self):
+        self._snapshot: Optional[WorkerSnapshot] = None
+        self._history: Deque[Dict[str, Any]] = deque(maxlen=HISTORY_POINTS)
+        self._last_seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_read = 0.0
+        self._redis = None
+
+    # ---- collection ----
+
+    def _queue_names(self, active_queues: Dict[str, List[dict]]) -> List[str]:
+        from celery_app import celery_app
+
+        names = set((celery_app.conf.task_queues or {}).keys())
+        names.add(celery_app.conf.task_default_queue or "celery")
+        for queues in active_queues.values():
+            names.update(q.get("name") for q in queues if q.get("name"))
+        return sorted(names)
+
+    def _queue_depths(self, names: List[str]) -> Dict[str, int]:
+        try:
+            if self._redis is None:
+                import redis
+                from celery_app import REDIS_URL
+                self._redis = redis.Redis.from_url(REDIS_URL, socket_timeout=2, socket_connect_timeout=2)
+            pipe = self._redis.pipeline(transaction=False)
+            for name in names:
+                pipe.llen(name)
+            return dict(zip(names, pipe.execute()))
+        except Exception as e:
+            logger.warning(f"Worker inspector could not read queue depths: {e}")
+            return {}
+
+    def _queue_latency(self, active: Dict[str, List[dict]]) -> Dict[str, float]:
+        started = {}
+        for tasks in active.values():
+            for task in tasks:
+                queue = (task.get("delivery_info") or {}).get("routing_key")
+                if task.get("id") and queue and task.get("time_start"):
+                    started[task["id"]] = (queue, float(task["time_start"]))
+        if not started:
+            return {}
+
+        try:
+            from sqlalchemy import text
+            from database import SessionLocal
+
+            db = SessionLocal()
+            try:
+                rows = db.execute(text(
+                    "SELECT task_id, created_at FROM celery_job_log WHERE task_id = ANY(:ids)"
+                ), {"ids": list(started)}).fetchall()
+            finally:
+                db.close()
+        except Exception as e:
+            logger.debug(f"Worker inspector could not read job registration times: {e}")
+            return {}
+
+        waits: Dict[str, List[float]] = {}
+        for task_id, created_at in rows:
+            if created_at is None:
+                continue
+            queue, time_start = started[task_id]
+            waits.setdefault(queue, []).append(max(0.0, time_start - created_at.timestamp()))
+        return {queue: round(sum(values) / len(values), 2) for queue, values in waits.items()}
+
+    def refresh(self) -> WorkerSnapshot:
+        """Take a snapshot now (blocking; at most one in flight)."""
+        with self._refresh_lock:
+            from celery_app import celery_app
+
+            started = time.time()
+            snapshot = WorkerSnapshot(taken_at=started)
+            try:
+                inspector = celery_app.control.inspect(timeout=INSPECT_TIMEOUT)
+                snapshot.ping = inspector.ping() or {}
+                snapshot.active = inspector.active() or {}
+                snapshot.reserved = inspector.reserved() or {}
+                snapshot.stats = inspector.stats() or {}
+                snapshot.active_queues = inspector.active_queues() or {}
+            except Exception as e:
+                logger.warning(f"Worker inspect failed: {e}")
+                snapshot.error = str(e)
+
+            snapshot.queue_depths = self._queue_depths(self._queue_names(snapshot.active_queues))
+            snapshot.queue_latency = self._queue_latency(snapshot.active)
+            try:
+                from services.worker_capabilities import get_worker_capabilities
+                snapshot.capabilities = get_worker_capabilities()
+            except Exception as e:
+                logger.warning(f"Worker inspector could not read capability profiles: {e}")
+            snapshot.duration = round(time.time() - started, 3)
+
+            now = time.time()
+            for worker_name in set(snapshot.ping) | set(snapshot.active):
+                self._last_seen[worker_name] = now
+            self._last_seen = {
+                name: seen for name, seen in self._last_seen.items()
+                if now - seen < OFFLINE_RETENTION_SECONDS
+            }
+            snapshot.last_seen = dict(self._last_seen)
+
+            point = {
+                "at": datetime.fromtimestamp(started, timezone.utc).isoformat(),
+                "online_workers": len(snapshot.ping),
+                "active_tasks": sum(len(tasks) for tasks in snapshot.active.values()),
+                "queues": {
+                    name: {"depth": depth, "latency": snapshot.queue_latency.get(name)}
+                    for name, depth in snapshot.queue_depths.items()
+                },
+            }
+            with self._lock:
+                self._snapshot = snapshot
+                self._history.append(point)
+            return snapshot
+
+    def _run(self):
+        while True:
+            if time.monotonic() - self._last_read > IDLE_PAUSE_SECONDS:
+                # Nobody is looking; sleep until the next reader wakes us
+                self._wake.wait()
+            self._wake.clear()
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(f"Worker inspector refresh failed: {e}")
+            self._wake.wait(INSPECT_INTERVAL)
+
+    # ---- reading ----
+
+    def _touch(self):
+        self._last_read = time.monotonic()
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="worker-inspector", daemon=True)
+                self._thread.start()
+        if self._snapshot is None or self._snapshot.age > INSPECT_INTERVAL * 2:
+            self._wake.set()
+
+    def snapshot(self) -> Optional[WorkerSnapshot]:
+        """Latest snapshot (None until the first pass completes)."""
+        self._touch()
+        return self._snapshot
+
+    def history(self) -> List[Dict[str, Any]]:
+        self._touch()
+        with self._lock:
+            return list(self._history)
+
+
+_inspector: Optional[WorkerInspector] = None
+
+
+def get_worker_inspector() -> WorkerInspector:
+    """Process-wide WorkerInspector singleton."""
+    global _inspector
+    if _inspector is None:
+        _inspector = WorkerInspector()
+    return _inspector
+
+
+async def current_snapshot() -> WorkerSnapshot:
+    """Latest snapshot for async handlers; takes the first one off the event loop."""
+    from fastapi.concurrency import run_in_threadpool
+
+    inspector = get_worker_inspector()
+    snapshot = inspector.snapshot()
+    if snapshot is None:
+        snapshot = await run_in_threadpool(inspector.refresh)
+    return snapshot
@@ -1130,6 +1130,7 @@ async def reprocess_sot_by_asset_id(
     try:
         import glob
         from models_v2 import RundownItem
+        from services.rundown_items import WITH_SCRIPT
 
         cleanup_summary = {
             "asset_id": asset_id,
@@ -1222,11 +1223,11 @@ async def reprocess_sot_by_asset_id(
         # Re-examine cue data from rundown_items
         # SOTs can be embedded in segments, so check both direct asset_id match
         # and script_content containing the SOT AssetID
-        rundown_item = db.query(RundownItem).filter_by(asset_id=asset_id).first()
+        rundown_item = db.query(RundownItem).options(WITH_SCRIPT).filter_by(asset_id=asset_id).first()
 
         # If not found as direct asset_id, search script_content for SOT cues
         if not rundown_item:
-            rundown_item = db.query(RundownItem).filter(
+            rundown_item = db.query(RundownItem).options(WITH_SCRIPT).filter(
                 RundownItem.script_content.like(f'%[AssetID: {asset_id}]%')
             ).first()
 
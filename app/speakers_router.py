@@ -11,6 +11,7 @@ from database import get_db
 from auth.utils import get_current_user
 from models_speakers import Speaker
 from models_user import User
+from services.speaker_rates import record_measurement
 import logging
 
 logger = logging.getLogger(__name__)
@@ -107,6 +108,8 @@ async def measure_my_wpm(
             speaker.wpm = calculated_wpm
             speaker.wpm_min = wpm_min
             speaker.wpm_max = wpm_max
+            record_measurement(db, speaker.id, measurement.word_count, measurement.elapsed_seconds,
+                               source="read_timer")
             db.commit()
             db.refresh(speaker)
 
@@ -131,6 +134,9 @@ async def measure_my_wpm(
             )
 
             db.add(new_speaker)
+            db.flush()
+            record_measurement(db, new_speaker.id, measurement.word_count, measurement.elapsed_seconds,
+                               source="read_timer")
             db.commit()
             db.refresh(new_speaker)
 
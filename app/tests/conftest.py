@@ -4,12 +4,21 @@ Pytest fixtures for SOT processing tests.
 Provides mocks for database, FFmpeg, Whisper, and filesystem operations.
 """
 
+import os
 import pytest
+import sys
 from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch
 import tempfile
 import shutil
 
+# Add the app directory to path for imports (pytest.ini runs from the repo root)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# database.py builds its (lazy) engine from DATABASE_URL when the models are
+# imported; tests that touch tables run on their own sqlite engines
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{Path(tempfile.gettempdir()) / 'show-build-tests.sqlite3'}")
+
 
 @pytest.fixture
 def mock_db_session():
@@ -0,0 +1,54 @@
+"""
+Tests for the one-decode MP3 export (services/audio_export.py).
+"""
+
+from types import SimpleNamespace
+
+from services.audio_export import Mp3Profile, build_export_command, profile_output_name
+
+MEASUREMENT = {"input_i": "-20.1", "input_tp": "-3.2", "input_lra": "6.0",
+               "input_thresh": "-30.4", "target_offset": "0.3"}
+
+
+class TestOutputNames:
+
+    def test_primary_profile_gets_the_episode_name(self):
+        assert profile_output_name("0261", Mp3Profile(name="Podcast", id=3), primary=True) == "0261.mp3"
+
+    def test_other_profiles_carry_slug_and_id(self):
+        assert profile_output_name("0261", Mp3Profile(name="Podcast 128k", id=3), primary=False) == \
+            "0261-podcast-128k-3.mp3"
+
+    def test_profiles_that_slugify_alike_do_not_collide(self):
+        names = {
+            profile_output_name("0261", Mp3Profile(name=name, id=profile_id), primary=False)
+            for profile_id, name in [(3, "Podcast 128k"), (4, "podcast-128k"), (5, "PODCAST / 128K")]
+        }
+
+        assert len(names) == 3
+
+    def test_fallback_profile_without_id(self):
+        assert profile_output_name("0261", Mp3Profile(name="default"), primary=False) == "0261-default.mp3"
+
+    def test_from_model_keeps_the_id(self):
+        row = SimpleNamespace(id=9, name="Mono", bitrate="64k", sample_rate=22050, channels=1,
+                              quality=None, normalize_audio=True, is_default=None)
+
+        assert Mp3Profile.from_model(row).id == 9
+
+
+class TestExportCommand:
+
+    def test_one_decode_for_every_output(self):
+        outputs = [(Mp3Profile(name="a", normalize_audio=True), "/x/a.mp3"),
+                   (Mp3Profile(name="b"), "/x/b.mp3"),
+                   (Mp3Profile(name="c", normalize_audio=True, quality=2), "/x/c.mp3")]
+
+        cmd = build_export_command("ffmpeg", "/x/0261.mov", outputs, MEASUREMENT)
+
+        assert cmd.count("-i") == 1
+        graph = cmd[cmd.index("-filter_complex") + 1]
+        assert graph.startswith("[0:a:0]asplit=2[raw][tonorm]")
+        assert "measured_I=-20.1" in graph and "[normed]asplit=2[o0][o2]" in graph
+        assert [cmd[i + 1] for i, arg in enumerate(cmd) if arg == "-map"] == ["[o0]", "[o1]", "[o2]"]
+        assert cmd[-1] == "/x/c.mp3"
@@ -0,0 +1,236 @@
+"""
+Tests for the cue grammar (services/cue_parser.py).
+
+Scripts are built from the same markers the ProseMirror editor writes, so
+the offsets and rewrites checked here are the ones the rundown API, the
+timing hook and the media tasks rely on.
+"""
+
+import pytest
+
+from services.cue_parser import (
+    CUE_BEGIN, CUE_BEGIN_COLLAPSED, CUE_END, clear_parse_cache, parse_cache_info, parse_cue_body, parse_script
+)
+
+
+def cue(*fields, collapsed=False):
+    begin = CUE_BEGIN_COLLAPSED if collapsed else CUE_BEGIN
+    return "\n".join([begin, *fields, CUE_END])
+
+
+SOT = cue("[Type: SOT]", "[Slug: mayor-presser]", "[Asset Id: CUE001]", "[Duration: 00:00:42]")
+FSQ = cue("[Type: FSQ]", "[Quote: \"We will not yield.\"]", "[Attribution: Mayor]", collapsed=True)
+SCRIPT = f"<p>Good evening.</p>\n{SOT}\n<p>In other news.</p>\n{FSQ}\n<p>Goodnight.</p>"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_parse_cache()
+    yield
+    clear_parse_cache()
+
+
+class TestMarkers:
+
+    def test_expanded_and_collapsed_cues_are_both_found(self):
+        script = parse_script(SCRIPT)
+
+        assert [c.type for c in script.cues] == ["SOT", "FSQ"]
+        assert [c.collapsed for c in script.cues] == [False, True]
+        assert [c.marker_suffix for c in script.cues] == ["", " collapsed"]
+
+    def test_offsets_cover_the_block_and_body(self):
+        sot, fsq = parse_script(SCRIPT).cues
+
+        assert SCRIPT[sot.start:sot.end] == SOT
+        assert SCRIPT[fsq.start:fsq.end] == FSQ
+        assert SCRIPT[fsq.body_start:fsq.body_end] == fsq.body
+        assert fsq.body.startswith("\n[Type: FSQ]")
+
+    def test_field_offsets_cover_the_brackets(self):
+        sot = parse_script(SCRIPT).cues[0]
+        slug = sot.field("Slug")
+
+        assert SCRIPT[slug.start:slug.end] == "[Slug: mayor-presser]"
+
+    def test_text_and_segments_leave_the_cues_out(self):
+        script = parse_script(SCRIPT)
+
+        assert script.text() == "<p>Good evening.</p>\n\n\n<p>In other news.</p>\n\n\n<p>Goodnight.</p>"
+        assert [type(s).__name__ for s in script.segments()] == ["str", "Cue", "str", "Cue", "str"]
+
+    def test_no_cues(self):
+        script = parse_script("<p>Just words.</p>")
+
+        assert script.cues == ()
+        assert script.text() == "<p>Just words.</p>"
+        assert parse_script(None).cues == ()
+        assert parse_script("").cues == ()
+
+
+class TestUnterminatedCue:
+
+    def test_begin_without_end_does_not_swallow_the_next_cue(self):
+        content = f"{CUE_BEGIN}\n[Type: SOT]\n[Slug: orphan]\n<p>text</p>\n{FSQ}"
+
+        script = parse_script(content)
+
+        assert len(script.cues) == 1
+        assert script.cues[0].type == "FSQ"
+        assert script.cues[0].collapsed
+        assert content[script.cues[0].start:] == FSQ
+        # The orphaned Begin is left as text
+        assert "[Slug: orphan]" in script.text()
+
+    def test_begin_without_end_at_the_end_is_text(self):
+        content = f"{SOT}\n{CUE_BEGIN}\n[Type: VO]"
+
+        script = parse_script(content)
+
+        assert [c.type for c in script.cues] == ["SOT"]
+
+    def test_end_without_begin_is_text(self):
+        script = parse_script(f"<p>x</p>\n{CUE_END}\n{SOT}")
+
+        assert [c.slug for c in script.cues] == ["mayor-presser"]
+
+
+class TestFieldValues:
+
+    def test_multi_line_value(self):
+        body = "\n[Type: FSQ]\n[Quote: First line,\nsecond line.]\n[Attribution: Mayor]\n"
+
+        fsq = parse_cue_body(body)
+
+        assert fsq.quote == "First line,\nsecond line."
+        assert fsq.attribution == "Mayor"
+
+    def test_value_with_brackets(self):
+        body = "\n[Type: FSQ]\n[Quote: He said [inaudible] twice]\n[Attribution: Reporter]\n"
+
+        fsq = parse_cue_body(body)
+
+        assert fsq.quote == "He said [inaudible] twice"
+        assert [f.name for f in fsq.fields] == ["Type", "Quote", "Attribution"]
+
+    def test_last_value_runs_to_the_end_marker(self):
+        sot = parse_script(cue("[Type: SOT]", "[Description: ends [here]]")).cues[0]
+
+        assert sot.description == "ends [here]"
+
+    def test_quote_loses_its_quote_marks(self):
+        fsq = parse_script(SCRIPT).cues[1]
+
+        assert fsq.get("Quote") == '"We will not yield."'
+        assert fsq.quote == "We will not yield."
+        assert fsq.field_map()["quote"] == "We will not yield."
+
+    def test_image_in_body(self):
+        gfx = parse_script(cue("[Type: GFX]", '<img src="/media/map.png" alt="map">')).cues[0]
+
+        assert gfx.image_src == "/media/map.png"
+        assert gfx.field_map()["imageSrc"] == "/media/map.png"
+
+
+class TestFieldNames:
+
+    @pytest.mark.parametrize("spelling", ["Asset Id", "AssetID", "asset_id", "asset-id", "ASSET ID"])
+    def test_get_is_spelling_insensitive(self, spelling):
+        sot = parse_script(cue("[Type: SOT]", f"[{spelling}: CUE042]")).cues[0]
+
+        assert sot.asset_id == "CUE042"
+        assert sot.get("assetId") == "CUE042"
+
+    def test_get_default(self):
+        sot = parse_script(SOT).cues[0]
+
+        assert sot.get("Media Url") == ""
+        assert sot.get("Media Url", "none") == "none"
+
+    def test_get_returns_first_and_field_map_the_last(self):
+        sot = parse_script(cue("[Type: SOT]", "[Duration: 00:00:10]", "[Duration: 00:00:20]")).cues[0]
+
+        assert sot.duration == "00:00:10"
+        assert sot.values("duration") == ["00:00:10", "00:00:20"]
+        assert sot.field_map()["duration"] == "00:00:20"
+
+    def test_field_map_is_camel_case(self):
+        sot = parse_script(cue("[Type: SOT]", "[Media Url: /a.mp4]", "[ProcessingStatus: Complete]")).cues[0]
+
+        assert sot.field_map() == {"type": "SOT", "mediaUrl": "/a.mp4", "processingStatus": "Complete"}
+
+    def test_find(self):
+        script = parse_script(SCRIPT)
+
+        assert script.find("sot", asset_id="cue001").slug == "mayor-presser"
+        assert script.find("SOT", asset_id="CUE999") is None
+        assert script.find(attribution="mayor").type == "FSQ"
+
+
+class TestWithFields:
+
+    def test_existing_field_is_rewritten_in_place(self):
+        script = parse_script(SCRIPT)
+
+        edited = script.with_fields(script.cues[0], {"Duration": "00:01:00"})
+
+        assert edited == SCRIPT.replace("[Duration: 00:00:42]", "[Duration: 00:01:00]")
+
+    def test_missing_field_is_added_before_the_end_marker(self):
+        script = parse_script(SCRIPT)
+
+        edited = script.with_fields(script.cues[0], {"Media Url": "/media/presser.mp4"})
+
+        assert edited == SCRIPT.replace(
+            f"[Duration: 00:00:42]\n{CUE_END}", f"[Duration: 00:00:42]\n[Media Url: /media/presser.mp4]\n{CUE_END}", 1
+        )
+
+    def test_collapsed_cue_stays_collapsed(self):
+        script = parse_script(SCRIPT)
+
+        edited = script.with_fields(script.cues[1], {"Duration": "00:00:08"})
+        fsq = parse_script(edited).cues[1]
+
+        assert CUE_BEGIN_COLLAPSED in edited
+        assert fsq.collapsed and fsq.duration == "00:00:08"
+
+    def test_text_outside_the_edited_fields_is_untouched(self):
+        script = parse_script(SCRIPT)
+        sot = script.cues[0]
+
+        edited = script.with_fields(sot, {"AssetID": "CUE777"})
+        delta = len(edited) - len(SCRIPT)
+
+        assert edited[:sot.field("Asset Id").start] == SCRIPT[:sot.field("Asset Id").start]
+        assert edited[sot.field("Asset Id").end + delta:] == SCRIPT[sot.field("Asset Id").end:]
+        assert parse_script(edited).cues[0].asset_id == "CUE777"
+
+    def test_every_occurrence_of_a_field_is_rewritten(self):
+        script = parse_script(cue("[Type: SOT]", "[Duration: 1]", "[Slug: x]", "[Duration: 2]"))
+
+        edited = script.with_fields(script.cues[0], {"Duration": "3"})
+
+        assert parse_script(edited).cues[0].values("Duration") == ["3", "3"]
+        assert "[Slug: x]" in edited
+
+    def test_edit_fields_splices_several_cues(self):
+        script = parse_script(SCRIPT)
+        sot, fsq = script.cues
+
+        edited = script.edit_fields([(fsq, {"Duration": "00:00:08"}), (sot, {"Slug": "presser"})])
+        reparsed = parse_script(edited)
+
+        assert [c.slug for c in reparsed.cues] == ["presser", ""]
+        assert reparsed.cues[1].duration == "00:00:08"
+        assert reparsed.text() == script.text()
+
+
+class TestCache:
+
+    def test_repeat_parses_hit_the_cache(self):
+        first = parse_script(SCRIPT)
+        second = parse_script(SCRIPT)
+
+        assert first is second
+        assert parse_cache_info()["hits"] == 1
+        assert parse_cache_info()["misses"] == 1
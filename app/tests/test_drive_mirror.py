@@ -0,0 +1,268 @@
+"""
+Tests for the Drive metadata mirror (services/drive_mirror.py).
+
+FakeDriveApi is an in-memory Drive: a dict of files plus a change log, with
+the paging behaviour of files().list and changes().list. Mutations go through
+it (add / rename / move / trash), so each test edits "Drive" and checks that
+the mirror follows with crawl() and apply_changes().
+"""
+
+import threading
+
+import pytest
+from unittest.mock import patch
+
+from services import drive_mirror
+from services.drive_mirror import FOLDER_MIME_TYPE, DriveApi, DriveMirror
+
+
+class TokenExpired(Exception):
+    """What the real API raises for a stale changes() page token (HTTP 410/400)."""
+
+
+class FakeDriveApi(DriveApi):
+    """In-memory DriveApi; every list_children call is recorded as its parent batch."""
+
+    def __init__(self, page_size=1000):
+        self.page_size = page_size
+        self.files = {}
+        self.log = []  # change entries, in order
+        self.expired = set()  # page tokens list_changes refuses
+        self.calls = []
+        self._lock = threading.Lock()
+
+    # DriveApi
+
+    def list_children(self, parent_ids, page_token=None):
+        with self._lock:
+            self.calls.append(list(parent_ids))
+        wanted = set(parent_ids)
+        matches = sorted(
+            (f for f in self.files.values() if not f['trashed'] and wanted & set(f['parents'])),
+            key=lambda f: f['id']
+        )
+        start = int(page_token or 0)
+        end = start + self.page_size
+        return [dict(f) for f in matches[start:end]], (str(end) if end < len(matches) else None)
+
+    def start_page_token(self):
+        return str(len(self.log))
+
+    def list_changes(self, page_token):
+        if page_token in self.expired:
+            raise TokenExpired(page_token)
+        start = int(page_token)
+        end = start + self.page_size
+        response = {'changes': self.log[start:end]}
+        if end < len(self.log):
+            response['nextPageToken'] = str(end)
+        else:
+            response['newStartPageToken'] = str(len(self.log))
+        return response
+
+    # Drive edits
+
+    def _changed(self, file_id):
+        self.log.append({'fileId': file_id, 'removed': False, 'file': dict(self.files[file_id])})
+
+    def add(self, file_id, name, *parents, folder=False, size=0):
+        self.files[file_id] = {
+            'id': file_id,
+            'name': name,
+            'mimeType': FOLDER_MIME_TYPE if folder else 'video/mp4',
+            'size': str(size),
+            'parents': list(parents),
+            'trashed': False,
+        }
+        self._changed(file_id)
+
+    def rename(self, file_id, name):
+        self.files[file_id]['name'] = name
+        self._changed(file_id)
+
+    def move(self, file_id, parent_id):
+        self.files[file_id]['parents'] = [parent_id]
+        self._changed(file_id)
+
+    def trash(self, file_id):
+        self.files[file_id]['trashed'] = True
+        self._changed(file_id)
+
+
+@pytest.fixture
+def api():
+    drive = FakeDriveApi()
+    drive.add('root', 'Episode 0257', folder=True)
+    drive.add('sot', 'SOT', 'root', folder=True)
+    drive.add('gfx', 'GFX', 'root', folder=True)
+    drive.add('clip1', 'interview.mp4', 'sot', size=100)
+    drive.add('clip2', 'b-roll.mp4', 'sot', size=50)
+    drive.add('elsewhere', 'Other Show', folder=True)
+    return drive
+
+
+@pytest.fixture
+def mirror(api, tmp_path):
+    return DriveMirror(api, db_path=str(tmp_path / "mirror.sqlite3"))
+
+
+class TestCrawl:
+
+    def test_crawl_mirrors_the_tree(self, mirror):
+        assert mirror.crawl('root') == 4
+
+        assert set(mirror.path_map('root')) == {'SOT', 'GFX', 'SOT/interview.mp4', 'SOT/b-roll.mp4'}
+        nodes, total_size, file_count = mirror.tree('root')
+        assert [node['title'] for node in nodes] == ['GFX', 'SOT']
+        assert (total_size, file_count) == (150, 2)
+        assert mirror.find_child('sot', 'interview.mp4')['id'] == 'clip1'
+
+    def test_each_level_is_listed_in_parent_batches(self, api, mirror):
+        for n in range(5):
+            api.add(f'f{n}', f'Folder {n}', 'gfx', folder=True)
+            api.add(f'x{n}', f'file{n}.png', f'f{n}')
+
+        with patch.object(drive_mirror, 'PARENTS_PER_QUERY', 2):
+            mirror.crawl('root')
+
+        assert len(mirror.path_map('root')) == 4 + 10
+        assert all(len(batch) <= 2 for batch in api.calls)
+        # root, then [sot, gfx], then the five GFX subfolders as 2 + 2 + 1
+        assert sorted(len(batch) for batch in api.calls) == [1, 1, 2, 2, 2]
+
+    def test_multi_parent_file_is_mirrored_once(self, api, mirror):
+        api.add('shared', 'logo.png', 'sot', 'gfx')
+
+        with patch.object(drive_mirror, 'PARENTS_PER_QUERY', 2):
+            mirror.crawl('root')
+
+        paths = mirror.path_map('root')
+        assert [p for p, entry in paths.items() if entry['id'] == 'shared'] in (['SOT/logo.png'], ['GFX/logo.png'])
+
+    def test_crawl_follows_page_tokens(self, api, mirror):
+        api.page_size = 3
+        for n in range(10):
+            api.add(f'c{n}', f'clip{n:02d}.mp4', 'gfx')
+
+        mirror.crawl('root')
+
+        assert sum(1 for path in mirror.path_map('root') if path.startswith('GFX/')) == 10
+        # sot and gfx are listed as one batch: 12 children, 3 per page
+        assert [sorted(batch) for batch in api.calls[1:]] == [['gfx', 'sot']] * 4
+
+    def test_recrawl_replaces_the_subtree(self, api, mirror):
+        mirror.crawl('root')
+        api.files['clip2']['trashed'] = True
+
+        mirror.crawl('root')
+
+        assert 'SOT/b-roll.mp4' not in mirror.path_map('root')
+
+
+class TestApplyChanges:
+
+    def test_nothing_to_apply_before_a_crawl(self, mirror):
+        assert mirror.apply_changes() == 0
+
+    def test_rename(self, api, mirror):
+        mirror.crawl('root')
+        api.rename('clip1', 'interview-final.mp4')
+
+        assert mirror.apply_changes() == 1
+        assert 'SOT/interview-final.mp4' in mirror.path_map('root')
+        assert 'SOT/interview.mp4' not in mirror.path_map('root')
+
+    def test_added_file_and_folder_created_in_any_order(self, api, mirror):
+        mirror.crawl('root')
+        api.add('vo', 'VO', 'root', folder=True)
+        api.add('take1', 'take1.wav', 'vo')
+        # The child's change can come first: changes are per file, not per event
+        api.log[-2], api.log[-1] = api.log[-1], api.log[-2]
+
+        assert mirror.apply_changes() == 2
+        assert {'VO', 'VO/take1.wav'} <= set(mirror.path_map('root'))
+
+    def test_move_out_of_the_root_drops_the_subtree(self, api, mirror):
+        mirror.crawl('root')
+        api.move('sot', 'elsewhere')
+
+        mirror.apply_changes()
+
+        assert set(mirror.path_map('root')) == {'GFX'}
+        assert mirror.find_child('sot', 'interview.mp4') is None
+
+    def test_move_within_the_root(self, api, mirror):
+        mirror.crawl('root')
+        api.move('clip2', 'gfx')
+
+        mirror.apply_changes()
+
+        assert 'GFX/b-roll.mp4' in mirror.path_map('root')
+        assert 'SOT/b-roll.mp4' not in mirror.path_map('root')
+
+    def test_folder_moved_in_brings_its_contents(self, api, mirror):
+        api.add('archive', 'Archive', 'elsewhere', folder=True)
+        api.add('old', 'old.mp4', 'archive')
+        mirror.crawl('root')
+        api.move('archive', 'root')
+
+        mirror.apply_changes()
+
+        assert {'Archive', 'Archive/old.mp4'} <= set(mirror.path_map('root'))
+
+    def test_trash_removes_the_subtree(self, api, mirror):
+        mirror.crawl('root')
+        api.trash('sot')
+
+        mirror.apply_changes()
+
+        assert set(mirror.path_map('root')) == {'GFX'}
+
+    def test_removed_change(self, api, mirror):
+        mirror.crawl('root')
+        api.log.append({'fileId': 'clip1', 'removed': True})
+
+        assert mirror.apply_changes() == 1
+        assert 'SOT/interview.mp4' not in mirror.path_map('root')
+
+    def test_changes_outside_the_roots_are_ignored(self, api, mirror):
+        mirror.crawl('root')
+        api.add('stray', 'stray.mp4', 'elsewhere')
+
+        assert mirror.apply_changes() == 0
+
+    def test_changes_are_paged_and_the_token_advances(self, api, mirror):
+        mirror.crawl('root')
+        api.page_size = 2
+        for n in range(5):
+            api.add(f'n{n}', f'new{n}.mp4', 'gfx')
+
+        assert mirror.apply_changes() == 5
+        assert mirror.apply_changes() == 0  # nothing replayed from the old token
+
+
+class TestSync:
+
+    def test_first_sync_crawls(self, api, mirror):
+        mirror.sync('root')
+
+        assert 'SOT/interview.mp4' in mirror.path_map('root')
+
+    def test_sync_applies_changes(self, api, mirror):
+        mirror.sync('root')
+        api.rename('gfx', 'Graphics')
+
+        mirror.sync('root', max_age=0)
+
+        assert 'Graphics' in mirror.path_map('root')
+
+    def test_expired_token_recrawls(self, api, mirror):
+        mirror.sync('root')
+        api.expired.add(api.start_page_token())
+        # Drive only reports this through the expired token; a recrawl picks it up
+        api.files['clip1']['name'] = 'renamed.mp4'
+
+        mirror.sync('root', max_age=0)
+
+        assert 'SOT/renamed.mp4' in mirror.path_map('root')
+        assert 'SOT/interview.mp4' not in mirror.path_map('root')
@@ -0,0 +1,154 @@
+"""
+Tests for episode planning and creation (services/episode_scaffold.py).
+
+A blueprint template (two directories, a file and two rundown items) lives in
+a sqlite file; episodes are scaffolded under a temporary media root, so the
+tests check both the rows and the directory trees a batch leaves behind.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
+from unittest.mock import patch
+
+import models_assetid  # noqa: F401 - AssetID registry tables
+import models_v2  # noqa: F401 - registers every table
+from core.media_paths import MediaPathManager
+from database import Base
+from models.episode import Episode, RundownItem
+from models_episode import BlueprintCreate, BlueprintNode, BlueprintTemplate
+from services.episode_scaffold import EpisodeScaffoldService
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'scaffold.sqlite3'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        template = BlueprintTemplate(name="Weekly", template_type="episode", is_default=True)
+        assets = BlueprintNode(node_type="directory", name="assets", sort_order=1)
+        template.nodes = [
+            assets,
+            BlueprintNode(node_type="directory", name="video", parent=assets, sort_order=1, template=template),
+            BlueprintNode(node_type="file", name="README.md", content="# Episode", sort_order=2),
+            BlueprintNode(node_type="rundown_item", name="Cold Open", sort_order=1,
+                          rundown_item_metadata={"item_type": "segment", "duration": "00:01:00"}),
+            BlueprintNode(node_type="rundown_item", name="Interview", sort_order=2),
+        ]
+        session.add(template)
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def media_root(tmp_path):
+    return tmp_path / "media"
+
+
+@pytest.fixture
+def service(db, media_root):
+    return EpisodeScaffoldService(db, MediaPathManager(str(media_root)))
+
+
+def episodes_dir(media_root):
+    root = media_root / "episodes"
+    return sorted(path.name for path in root.iterdir()) if root.exists() else []
+
+
+class TestPlanEpisode:
+
+    def test_plan_has_no_side_effects(self, service, db, media_root):
+        plan = run(service.plan_episode(BlueprintCreate(title="Pilot")))
+
+        assert plan.episode_number == "0001"
+        assert plan.title == "Pilot"
+        assert [item["title"] for item in plan.items] == ["Cold Open", "Interview"]
+        assert plan.episode_path / "assets" / "video" in plan.directories
+        assert set(plan.files) == {plan.episode_path / "README.md", plan.episode_path / "info.md"}
+        assert db.execute(select(func.count()).select_from(Episode)).scalar() == 0
+        assert episodes_dir(media_root) == []
+
+    def test_requested_number_is_zero_padded(self, service):
+        plan = run(service.plan_episode(BlueprintCreate(episode_number="42")))
+
+        assert plan.episode_number == "0042"
+        assert plan.episode_path.name == "0042"
+
+    def test_same_number_twice_in_a_batch(self, service):
+        reserved = set()
+        run(service.plan_episode(BlueprintCreate(episode_number="0042"), reserved_numbers=reserved))
+
+        with pytest.raises(HTTPException) as excinfo:
+            run(service.plan_episode(BlueprintCreate(episode_number="42"), reserved_numbers=reserved))
+
+        assert excinfo.value.status_code == 409
+
+    def test_generated_numbers_skip_reserved_ones(self, service):
+        reserved = {"0001", "0002"}
+
+        plan = run(service.plan_episode(BlueprintCreate(), reserved_numbers=reserved))
+
+        assert plan.episode_number == "0003"
+        assert "0003" in reserved
+
+    def test_non_numeric_number(self, service):
+        with pytest.raises(HTTPException) as excinfo:
+            run(service.plan_episode(BlueprintCreate(episode_number="pilot")))
+
+        assert excinfo.value.status_code == 400
+
+    def test_existing_directory_conflicts(self, service, media_root):
+        (media_root / "episodes" / "0007").mkdir(parents=True)
+
+        with pytest.raises(HTTPException) as excinfo:
+            run(service.plan_episode(BlueprintCreate(episode_number="7")))
+
+        assert excinfo.value.status_code == 409
+
+
+class TestCreateEpisodes:
+
+    def test_batch_creates_rows_and_trees(self, service, db, media_root):
+        responses = run(service.create_episodes([BlueprintCreate(), BlueprintCreate()]))
+
+        assert [r.episode_number for r in responses] == ["0001", "0002"]
+        assert episodes_dir(media_root) == ["0001", "0002"]
+        assert (media_root / "episodes" / "0002" / "assets" / "video").is_dir()
+        assert (media_root / "episodes" / "0001" / "README.md").read_text() == "# Episode"
+        assert db.execute(select(func.count()).select_from(RundownItem)).scalar() == 4
+
+    def test_failed_batch_removes_only_its_own_trees(self, service, db, media_root):
+        plans = [run(service.plan_episode(BlueprintCreate(episode_number=n), reserved_numbers=set()))
+                 for n in ("1", "2")]
+        # Someone else creates episode 2's directory between planning and applying
+        (media_root / "episodes" / "0002" / "theirs").mkdir(parents=True)
+
+        with pytest.raises(FileExistsError):
+            run(service.apply_plans(plans))
+
+        assert episodes_dir(media_root) == ["0002"]
+        assert (media_root / "episodes" / "0002" / "theirs").is_dir()
+        assert db.execute(select(func.count()).select_from(Episode)).scalar() == 0
+
+    def test_failed_build_rolls_back_the_rows(self, service, db, media_root):
+        def broken_build(directories, files, roots=None, created=None):
+            roots[0].mkdir(parents=True)
+            created.append(roots[0])
+            raise OSError("NAS went away")
+
+        with patch.object(EpisodeScaffoldService, "_build_directories", staticmethod(broken_build)):
+            with pytest.raises(HTTPException) as excinfo:
+                run(service.create_episodes([BlueprintCreate(title="Pilot")]))
+
+        assert excinfo.value.status_code == 500
+        assert episodes_dir(media_root) == []
+        assert db.execute(select(func.count()).select_from(Episode)).scalar() == 0
+        assert db.execute(select(func.count()).select_from(RundownItem)).scalar() == 0
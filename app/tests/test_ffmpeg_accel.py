@@ -0,0 +1,161 @@
+"""
+Tests for GPU-first / CPU-failover encoding (services/ffmpeg_accel.py).
+
+ffmpeg is stubbed: each attempt's command is recorded and the stub answers
+with the exit code / stderr a saturated or broken NVENC encoder produces.
+"""
+
+import subprocess
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from services import ffmpeg_accel
+from services.ffmpeg_accel import encode_with_failover, run_encode
+
+NVENC_SATURATED = "[h264_nvenc @ 0x5581] OpenEncodeSessionEx failed: out of memory (10)"
+BAD_INPUT = "input.mp4: Invalid data found when processing input"
+
+
+def stub_ffmpeg(nvenc_stderr=None, cpu_stderr=None):
+    """A run_ffmpeg stand-in: fails an encoder when given its stderr, else succeeds."""
+    calls = []
+
+    def run(cmd, **kwargs):
+        calls.append(cmd)
+        stderr = nvenc_stderr if "h264_nvenc" in cmd else cpu_stderr
+        return subprocess.CompletedProcess(cmd, 1 if stderr else 0, stdout="", stderr=stderr or "")
+
+    run.calls = calls
+    return run
+
+
+def encoders(calls):
+    return [cmd[cmd.index("-c:v") + 1] for cmd in calls]
+
+
+@pytest.fixture
+def lease():
+    lease = MagicMock()
+    with patch.object(ffmpeg_accel, "acquire_nvenc_session", return_value=lease):
+        yield lease
+
+
+@pytest.fixture
+def no_lease():
+    with patch.object(ffmpeg_accel, "acquire_nvenc_session", return_value=None):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def auto_policy():
+    with patch.object(ffmpeg_accel, "_POLICY", "auto"):
+        yield
+
+
+def encode():
+    return run_encode(ffmpeg="ffmpeg", input_args=["-i", "in.mp4"], output_args=[], output_path="out.mp4")
+
+
+class TestRunEncode:
+
+    def test_gpu_encode_succeeds(self, lease):
+        ffmpeg = stub_ffmpeg()
+        with patch.object(ffmpeg_accel, "run_ffmpeg", ffmpeg):
+            result = encode()
+
+        assert result.ok and result.encoder == "h264_nvenc" and not result.fell_back
+        assert encoders(ffmpeg.calls) == ["h264_nvenc"]
+        lease.release.assert_called_once()
+
+    def test_nvenc_failure_falls_back_to_libx264(self, lease):
+        ffmpeg = stub_ffmpeg(nvenc_stderr=NVENC_SATURATED)
+        with patch.object(ffmpeg_accel, "run_ffmpeg", ffmpeg):
+            result = encode()
+
+        assert result.ok and result.encoder == "libx264" and result.fell_back
+        assert encoders(ffmpeg.calls) == ["h264_nvenc", "libx264"]
+        assert ffmpeg.calls[1][-1] == "out.mp4"
+        lease.release.assert_called_once()
+
+    def test_other_failure_does_not_fall_back(self, lease):
+        ffmpeg = stub_ffmpeg(nvenc_stderr=BAD_INPUT)
+        with patch.object(ffmpeg_accel, "run_ffmpeg", ffmpeg):
+            result = encode()
+
+        assert not result.ok and result.encoder == "h264_nvenc"
+        assert encoders(ffmpeg.calls) == ["h264_nvenc"]
+
+    def test_no_lease_goes_straight_to_libx264(self, no_lease):
+        ffmpeg = stub_ffmpeg()
+        with patch.object(ffmpeg_accel, "run_ffmpeg", ffmpeg):
+            result = encode()
+
+        assert result.ok and result.encoder == "libx264" and not result.fell_back
+        assert encoders(ffmpeg.calls) == ["libx264"]
+
+    def test_cpu_policy_never_leases(self):
+        ffmpeg = stub_ffmpeg()
+        with patch.object(ffmpeg_accel, "_POLICY", "cpu"), \
+             patch.object(ffmpeg_accel, "acquire_nvenc_session") as acquire, \
+             patch.object(ffmpeg_accel, "run_ffmpeg", ffmpeg):
+            result = encode()
+
+        acquire.assert_not_called()
+        assert result.encoder == "libx264"
+
+
+class TestEncodeWithFailover:
+
+    NVENC = ["-c:v", "h264_nvenc"]
+    CPU = ["-c:v", "libx264"]
+
+    @staticmethod
+    def build(video_args):
+        return ["ffmpeg", "-y", "-i", "in.mp4", *video_args, "out.mp4"]
+
+    def test_checked_runner_falls_back_on_nvenc_error(self, lease):
+        calls = []
+
+        def run(cmd):
+            calls.append(cmd)
+            if "h264_nvenc" in cmd:
+                raise subprocess.CalledProcessError(1, cmd, stderr=NVENC_SATURATED.encode())
+            return subprocess.CompletedProcess(cmd, 0)
+
+        result = encode_with_failover(self.build, self.NVENC, self.CPU, run)
+
+        assert result.returncode == 0
+        assert encoders(calls) == ["h264_nvenc", "libx264"]
+        lease.release.assert_called_once()
+
+    def test_checked_runner_reraises_other_errors(self, lease):
+        def run(cmd):
+            raise subprocess.CalledProcessError(1, cmd, stderr=BAD_INPUT.encode())
+
+        with pytest.raises(subprocess.CalledProcessError):
+            encode_with_failover(self.build, self.NVENC, self.CPU, run)
+        lease.release.assert_called_once()
+
+    def test_unchecked_runner_falls_back_on_nvenc_error(self, lease):
+        ffmpeg = stub_ffmpeg(nvenc_stderr=NVENC_SATURATED)
+
+        result = encode_with_failover(self.build, self.NVENC, self.CPU, ffmpeg)
+
+        assert result.returncode == 0
+        assert encoders(ffmpeg.calls) == ["h264_nvenc", "libx264"]
+
+    def test_unchecked_runner_returns_other_failures(self, lease):
+        ffmpeg = stub_ffmpeg(nvenc_stderr=BAD_INPUT)
+
+        result = encode_with_failover(self.build, self.NVENC, self.CPU, ffmpeg)
+
+        assert result.returncode == 1
+        assert encoders(ffmpeg.calls) == ["h264_nvenc"]
+
+    def test_no_lease_encodes_with_libx264(self, no_lease):
+        ffmpeg = stub_ffmpeg()
+
+        encode_with_failover(self.build, self.NVENC, self.CPU, ffmpeg)
+
+        assert encoders(ffmpeg.calls) == ["libx264"]
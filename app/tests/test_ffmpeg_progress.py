@@ -0,0 +1,94 @@
+"""
+Tests for run_ffmpeg (services/ffmpeg_progress.py).
+
+A fake ffmpeg (a Python script) writes `-progress` blocks on stdout and then
+keeps running, so the tests can check what happens to the child when the
+caller's side of the progress loop fails.
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+from services.ffmpeg_progress import run_ffmpeg
+
+FAKE_FFMPEG = textwrap.dedent("""\
+    #!{python}
+    import sys, time
+    with open(sys.argv[-1], "w") as f:
+        f.write(str(__import__("os").getpid()))
+    for n in range({blocks}):
+        print(f"frame={{n}}\\nout_time_us={{n * 1000000}}\\nspeed=1.0x\\nprogress=continue", flush=True)
+    print("progress=end", flush=True)
+    time.sleep({linger})
+""")
+
+
+def fake_ffmpeg(tmp_path, blocks=3, linger=0):
+    script = tmp_path / "ffmpeg.py"
+    script.write_text(FAKE_FFMPEG.format(python=sys.executable, blocks=blocks, linger=linger))
+    script.chmod(0o755)
+    pid_file = tmp_path / "pid"
+    # run_ffmpeg inserts its flags after cmd[0]; the script ignores them
+    return [str(script), str(pid_file)], pid_file
+
+
+class Reporter:
+    """Stands in for ProgressReporter: records the frame of each update."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.frames = []
+        self.recorded = []
+
+    def __call__(self, phase, progress, span):
+        if self.fail:
+            raise RuntimeError("redis publish failed")
+        self.frames.append(progress.frame)
+
+    def record(self, phase, progress, **extra):
+        self.recorded.append(phase)
+
+
+def alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+class TestRunFfmpeg:
+
+    def test_reports_progress_and_returns(self, tmp_path):
+        cmd, _ = fake_ffmpeg(tmp_path)
+        reporter = Reporter()
+
+        result = run_ffmpeg(cmd, phase="encode", reporter=reporter)
+
+        assert result.returncode == 0
+        assert result.progress.done
+        assert reporter.frames == [0, 1, 2, 2]
+        assert reporter.recorded == ["encode"]
+
+    def test_reporter_error_kills_the_child(self, tmp_path):
+        cmd, pid_file = fake_ffmpeg(tmp_path, linger=30)
+
+        started = time.monotonic()
+        with pytest.raises(RuntimeError):
+            run_ffmpeg(cmd, reporter=Reporter(fail=True))
+
+        assert time.monotonic() - started < 10
+        assert not alive(int(pid_file.read_text()))
+
+    def test_timeout_kills_the_child(self, tmp_path):
+        cmd, pid_file = fake_ffmpeg(tmp_path, linger=30)
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_ffmpeg(cmd, timeout=1)
+
+        assert not alive(int(pid_file.read_text()))
@@ -0,0 +1,109 @@
+"""
+Tests for the persistent file index (services/file_index.py).
+
+Each test indexes a small episode tree under tmp_path into its own SQLite
+file, edits the tree on disk and refreshes again.
+"""
+
+import os
+import threading
+
+import pytest
+
+from services.file_index import FileIndex
+
+
+@pytest.fixture
+def episode(tmp_path):
+    root = tmp_path / "0261"
+    for rel in ("assets/gfx/10-map.png", "assets/video/interview.mp4", "exports/0261.mov"):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * 10)
+    (root / ".stversions").mkdir()
+    (root / ".stversions" / "old.mp4").write_bytes(b"old")
+    return root
+
+
+@pytest.fixture
+def index(tmp_path):
+    return FileIndex(str(tmp_path / "index.sqlite3"))
+
+
+def paths(index, root):
+    return [entry.rel_path for entry in index.entries(root)]
+
+
+class TestRefresh:
+
+    def test_first_refresh_indexes_the_tree(self, index, episode):
+        assert index.refresh(episode) == 1
+
+        assert paths(index, episode) == ["assets/gfx/10-map.png", "assets/video/interview.mp4", "exports/0261.mov"]
+
+    def test_version_moves_only_on_change(self, index, episode):
+        index.refresh(episode)
+        assert index.refresh(episode) == 1
+
+        (episode / "exports" / "0261.mp3").write_bytes(b"mp3")
+        os.remove(episode / "assets" / "video" / "interview.mp4")
+
+        assert index.refresh(episode) == 2
+        assert paths(index, episode) == ["assets/gfx/10-map.png", "exports/0261.mov", "exports/0261.mp3"]
+
+    def test_max_age_skips_the_walk(self, index, episode):
+        index.refresh(episode)
+        (episode / "new.txt").write_text("new")
+
+        assert index.refresh(episode, max_age=60) == 1
+        assert "new.txt" not in paths(index, episode)
+
+    def test_find(self, index, episode):
+        index.refresh(episode)
+
+        assert [e.name for e in index.find(episode, "*-map.png", prefix="assets/gfx", max_age=None)] == ["10-map.png"]
+        assert index.find(episode, "*-map.png", prefix="assets", max_age=None, recursive=False) == []
+
+
+class TestConcurrency:
+
+    def test_walk_runs_without_the_lock(self, index, episode, monkeypatch):
+        index.refresh(episode)
+        (episode / "new.txt").write_text("new")
+        real_walk = FileIndex._walk
+        lookups = []
+
+        def walk(root, excluded):
+            # Another request's lookup while the walk is under way
+            lookup = threading.Thread(target=lambda: lookups.append(paths(index, episode)))
+            lookup.start()
+            lookup.join(timeout=5)
+            yield from real_walk(root, excluded)
+
+        monkeypatch.setattr(FileIndex, "_walk", staticmethod(walk))
+
+        assert index.refresh(episode) == 2
+        # Served from the previous state, not blocked behind the walk
+        assert lookups and "new.txt" not in lookups[0]
+        assert "new.txt" in paths(index, episode)
+
+    def test_older_walk_does_not_overwrite_a_newer_one(self, index, episode, monkeypatch):
+        index.refresh(episode)
+        (episode / "new.txt").write_text("new")
+        real_walk = FileIndex._walk
+        walks = []
+
+        def walk(root, excluded):
+            walks.append(root)
+            entries = list(real_walk(root, excluded))
+            if len(walks) == 1:
+                # The first walk saw new.txt; it is removed and a later refresh lands first
+                os.remove(episode / "new.txt")
+                index.refresh(episode)
+            yield from entries
+
+        monkeypatch.setattr(FileIndex, "_walk", staticmethod(walk))
+        index.refresh(episode)
+
+        assert len(walks) == 2
+        assert "new.txt" not in paths(index, episode)
@@ -0,0 +1,260 @@
+"""
+Tests for NVENC session admission control (services/nvenc_sessions.py).
+
+EncodeSessionPool runs against FakeRedis, an in-memory stand-in that
+implements the pool's Lua scripts in Python on a controllable clock, so the
+lease logic (capacity, release, expiry, renewal) is exercised without Redis
+or a GPU.
+"""
+
+import pytest
+from unittest.mock import patch
+
+from services import nvenc_sessions
+from services.nvenc_sessions import EncodeSessionPool, SessionLease
+
+
+class FakeRedis:
+    """The subset of redis-py EncodeSessionPool uses, with a settable clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.strings = {}
+        self.zsets = {}
+        self.lists = {}
+
+    # strings
+    def set(self, key, value, ex=None):
+        self.strings[key] = str(value)
+
+    def get(self, key):
+        value = self.strings.get(key)
+        return value.encode() if value is not None else None
+
+    def scan_iter(self, match="*"):
+        prefix = match.rstrip("*")
+        return [key.encode() for key in self.strings if key.startswith(prefix)]
+
+    # lists (broker queues: LPUSH on publish, pop from the right)
+    def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    def rpoplpush(self, source, destination):
+        if not self.lists.get(source):
+            return None
+        value = self.lists[source].pop()
+        self.lists.setdefault(destination, []).insert(0, value)
+        return value
+
+    # sorted sets
+    def zrem(self, key, member):
+        return int(self.zsets.get(key, {}).pop(member, None) is not None)
+
+    def eval(self, script, numkeys, *args):
+        keys, argv = args[:numkeys], args[numkeys:]
+        sessions = self.zsets.setdefault(keys[0], {})
+        if script == nvenc_sessions._ACQUIRE_SCRIPT:
+            for member in [m for m, expiry in sessions.items() if expiry <= self.now]:
+                del sessions[member]
+            capacity = int(self.strings.get(keys[1]) or 0)
+            if len(sessions) < capacity:
+                sessions[argv[1]] = self.now + float(argv[0])
+                return 1
+            return 0
+        if script == nvenc_sessions._RENEW_SCRIPT:
+            if argv[1] not in sessions:
+                return 0
+            sessions[argv[1]] = self.now + float(argv[0])
+            return 1
+        if script == nvenc_sessions._COUNT_SCRIPT:
+            return sum(1 for expiry in sessions.values() if expiry >= self.now)
+        raise AssertionError("unexpected script")
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def pool(fake_redis):
+    return EncodeSessionPool(redis_client=fake_redis, host="gpu1", capacity=2, lease_ttl=30)
+
+
+@pytest.fixture
+def no_renewal():
+    """Keep lease renewal threads from touching the fake while a test runs."""
+    with patch.object(SessionLease, "_renew_loop", lambda self: None):
+        yield
+
+
+class TestEncodeSessionPool:
+
+    def test_admits_up_to_capacity(self, pool, no_renewal):
+        first = pool.try_acquire()
+        second = pool.try_acquire()
+
+        assert first is not None and second is not None
+        assert first.lease_id != second.lease_id
+        assert pool.try_acquire() is None
+
+    def test_release_frees_a_session(self, pool, no_renewal):
+        leases = [pool.try_acquire(), pool.try_acquire()]
+        leases[0].release()
+
+        assert pool.try_acquire() is not None
+
+    def test_release_is_idempotent(self, pool, fake_redis, no_renewal):
+        lease = pool.try_acquire()
+        other = pool.try_acquire()
+        lease.release()
+        lease.release()
+
+        assert list(fake_redis.zsets["nvenc:sessions:gpu1"]) == [other.lease_id]
+
+    def test_context_manager_releases(self, pool, no_renewal):
+        with pool.try_acquire():
+            pool.try_acquire()
+            assert pool.try_acquire() is None
+        assert pool.try_acquire() is not None
+
+    def test_stale_leases_expire(self, pool, fake_redis, no_renewal):
+        pool.try_acquire()
+        pool.try_acquire()
+        assert pool.try_acquire() is None
+
+        # A killed worker never releases; its sessions free up after the TTL
+        fake_redis.now += 31
+        assert pool.try_acquire() is not None
+
+    def test_renewal_keeps_a_lease_alive(self, pool, fake_redis, no_renewal):
+        kept = pool.try_acquire()
+        pool.try_acquire()
+
+        fake_redis.now += 20
+        pool.renew(kept.lease_id)
+        fake_redis.now += 20
+
+        # The unrenewed lease has expired, the renewed one still holds a slot
+        assert pool.try_acquire() is not None
+        assert pool.try_acquire() is None
+        assert kept.lease_id in fake_redis.zsets["nvenc:sessions:gpu1"]
+
+    def test_cpu_only_host_never_leases(self, fake_redis):
+        cpu_pool = EncodeSessionPool(redis_client=fake_redis, host="cpu1", capacity=0)
+
+        assert cpu_pool.try_acquire() is None
+        assert fake_redis.strings == {}
+
+    def test_acquire_waits_for_a_free_session(self, pool, no_renewal):
+        pool.try_acquire()
+        pool.try_acquire()
+
+        with patch("services.nvenc_sessions.time.sleep") as sleep:
+            assert pool.acquire(wait=0) is None
+            sleep.assert_not_called()
+
+    def test_utilization(self, pool, fake_redis, no_renewal):
+        EncodeSessionPool(redis_client=fake_redis, host="gpu2", capacity=3).register()
+        pool.try_acquire()
+
+        hosts = pool.utilization()
+
+        assert hosts["gpu1"] == {"capacity": 2, "in_use": 1, "free": 1, "utilization": 0.5}
+        assert hosts["gpu2"]["free"] == 3
+        assert pool.free_sessions() == 4
+
+
+class TestAcquireNvencSession:
+
+    def test_cpu_only_host_gets_none(self):
+        with patch.object(nvenc_sessions, "get_session_pool", return_value=EncodeSessionPool(capacity=0)):
+            assert nvenc_sessions.acquire_nvenc_session(wait=0) is None
+
+    def test_redis_down_fails_open(self):
+        class DownRedis:
+            def set(self, *args, **kwargs):
+                raise ConnectionError("redis unreachable")
+
+        pool = EncodeSessionPool(redis_client=DownRedis(), host="gpu1", capacity=2)
+        with patch.object(nvenc_sessions, "get_session_pool", return_value=pool):
+            lease = nvenc_sessions.acquire_nvenc_session(wait=0)
+
+        assert lease is not None
+        assert not lease.managed
+        lease.release()
+
+    def test_saturated_host_gets_none(self, pool, no_renewal):
+        pool.try_acquire()
+        pool.try_acquire()
+        with patch.object(nvenc_sessions, "get_session_pool", return_value=pool):
+            assert nvenc_sessions.acquire_nvenc_session(wait=0) is None
+
+
+@pytest.fixture
+def routing(fake_redis):
+    """A cluster view over fake_redis, one live nvenc worker, no refresher thread."""
+    view = EncodeSessionPool(redis_client=fake_redis, host="api", capacity=0)
+    with patch.object(nvenc_sessions, "get_cluster_view", return_value=view), \
+            patch.object(nvenc_sessions, "_ensure_routing_refresher"), \
+            patch("services.worker_capabilities.workers_with", return_value=["gpu-worker@gpu1"]) as workers_with:
+        yield workers_with
+
+
+class TestGpuRouting:
+
+    def test_burst_fills_the_free_sessions_then_spills_to_cpu(self, pool, routing):
+        pool.register()
+        nvenc_sessions.refresh_routing()
+
+        assert [nvenc_sessions.claim_gpu_slot() for _ in range(5)] == [True, True, False, False, False]
+
+    def test_gpu_backlog_counts_against_free_sessions(self, pool, fake_redis, routing):
+        pool.register()
+        fake_redis.lists["media_gpu"] = ["queued-encode"]
+
+        assert nvenc_sessions.refresh_routing()["queued"] == 1
+        assert [nvenc_sessions.claim_gpu_slot() for _ in range(3)] == [True, False, False]
+
+    def test_refresh_resets_the_routed_count(self, pool, fake_redis, no_renewal, routing):
+        pool.register()
+        nvenc_sessions.refresh_routing()
+        assert nvenc_sessions.claim_gpu_slot()
+        # The routed encode started and holds a lease
+        pool.try_acquire()
+
+        nvenc_sessions.refresh_routing()
+
+        assert [nvenc_sessions.claim_gpu_slot() for _ in range(2)] == [True, False]
+
+    def test_no_nvenc_worker_routes_to_cpu(self, pool, routing):
+        pool.register()
+        routing.return_value = []
+        nvenc_sessions.refresh_routing()
+
+        assert not nvenc_sessions.claim_gpu_slot()
+
+    def test_stale_snapshot_routes_to_cpu(self, pool, routing):
+        pool.register()
+        nvenc_sessions.refresh_routing()
+
+        with patch.object(nvenc_sessions.time, "monotonic", return_value=nvenc_sessions._routing["at"] + 60):
+            assert not nvenc_sessions.claim_gpu_slot()
+
+
+class TestRequeueStrandedGpuTasks:
+
+    def test_backlog_moves_to_media_when_no_gpu_host_is_registered(self, fake_redis):
+        fake_redis.lists["media_gpu"] = ["newest", "oldest"]
+        fake_redis.lists["media"] = ["cpu-task"]
+
+        assert nvenc_sessions.requeue_stranded_gpu_tasks(fake_redis) == 2
+        assert fake_redis.lists["media_gpu"] == []
+        assert fake_redis.lists["media"] == ["newest", "oldest", "cpu-task"]
+
+    def test_backlog_stays_while_a_gpu_host_is_registered(self, pool, fake_redis):
+        pool.register()
+        fake_redis.lists["media_gpu"] = ["encode"]
+
+        assert nvenc_sessions.requeue_stranded_gpu_tasks(fake_redis) == 0
+        assert fake_redis.lists["media_gpu"] == ["encode"]
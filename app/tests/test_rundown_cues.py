@@ -0,0 +1,240 @@
+"""
+Tests for the stored cue rows (services/rundown_cues.py).
+
+Scripts are built with the same markers as tests/test_cue_parser.py. The
+hook tests save RundownItems through a Session on a sqlite file (with real
+SAVEPOINTs), so the after_flush hooks run as they do on a save.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event, insert, select, update
+from sqlalchemy.orm import Session
+from unittest.mock import patch
+
+import models_v2  # noqa: F401 - registers every table (and both flush hooks)
+from database import Base
+from models.episode import Rundown, RundownItem, RundownItemCue
+from services import rundown_cues
+from services.cue_parser import CUE_BEGIN, CUE_BEGIN_COLLAPSED, CUE_END, clear_parse_cache
+from services.rundown_cues import cue_rows, find_cues, scripts_written
+
+_cues = RundownItemCue.__table__
+_items = RundownItem.__table__
+
+
+def cue(*fields, collapsed=False):
+    begin = CUE_BEGIN_COLLAPSED if collapsed else CUE_BEGIN
+    return "\n".join([begin, *fields, CUE_END])
+
+
+def sot(asset_id, status=None):
+    fields = ["[Type: SOT]", f"[Slug: {asset_id.lower()}]", f"[Asset Id: {asset_id}]", "[Duration: 00:00:42]"]
+    if status:
+        fields.append(f"[ProcessingStatus: {status}]")
+    return cue(*fields)
+
+
+SOT = sot("CUE001", "Phase 6: Normalizing")
+FSQ = cue("[Type: FSQ]", "[Quote: \"We will not yield.\"]", "[Attribution: Mayor]", collapsed=True)
+SCRIPT = f"<p>Good evening.</p>\n{SOT}\n<p>In other news.</p>\n{FSQ}"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_parse_cache()
+    yield
+    clear_parse_cache()
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'cues.sqlite3'}")
+
+    # pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("INSERT INTO rundowns (id, asset_id, episode_id, name) VALUES (1, 'R1', 1, 'Main')")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    with Session(engine) as session:
+        yield session
+
+
+def item(name, script, order=10, rundown_id=1):
+    return RundownItem(asset_id=name, rundown_id=rundown_id, item_type="segment", title=name, slug=name.lower(),
+                       order_in_rundown=order, script_content=script, is_test_data=False)
+
+
+def stored(db, item_id):
+    return db.execute(
+        select(_cues.c.position, _cues.c.cue_type, _cues.c.asset_id).where(_cues.c.item_id == item_id)
+        .order_by(_cues.c.position)
+    ).all()
+
+
+class TestCueRows:
+
+    def test_one_row_per_cue_in_script_order(self):
+        rows = cue_rows(7, SCRIPT)
+
+        assert [(r["item_id"], r["position"], r["cue_type"]) for r in rows] == [(7, 0, "SOT"), (7, 1, "FSQ")]
+        assert [r["collapsed"] for r in rows] == [False, True]
+
+    def test_named_fields(self):
+        row = cue_rows(7, SCRIPT)[0]
+
+        assert (row["slug"], row["asset_id"], row["duration"]) == ("cue001", "CUE001", "00:00:42")
+        assert row["processing_status"] == "Phase 6: Normalizing"
+        assert row["media_url"] is None
+        assert row["fields"]["assetId"] == "CUE001"
+
+    def test_span_is_the_block_in_characters(self):
+        # Multi-byte text before the cue: the span counts characters, not bytes
+        script = f"<p>Café — ¡olé!</p>\n{SOT}"
+
+        row = cue_rows(7, script)[0]
+
+        assert script[row["span_start"]:row["span_end"]] == SOT
+
+    def test_type_is_upper_cased_and_clipped(self):
+        row = cue_rows(7, cue("[Type: sot]", f"[Slug: {'x' * 300}]"))[0]
+
+        assert row["cue_type"] == "SOT"
+        assert len(row["slug"]) == 255
+
+    def test_no_cues(self):
+        assert cue_rows(7, None) == []
+        assert cue_rows(7, "<p>Just words.</p>") == []
+
+
+class TestMaintainCues:
+
+    def test_new_item(self, db):
+        new = item("A", SCRIPT)
+        db.add(new)
+        db.commit()
+
+        assert stored(db, new.id) == [(0, "SOT", "CUE001"), (1, "FSQ", None)]
+
+    def test_new_item_without_a_script(self, db):
+        new = item("A", None)
+        db.add(new)
+        db.commit()
+
+        assert stored(db, new.id) == []
+
+    def test_edited_script_replaces_the_rows(self, db):
+        existing = item("A", SCRIPT)
+        db.add(existing)
+        db.commit()
+
+        existing.script_content = f"{FSQ}\n{sot('CUE002')}\n{sot('CUE003')}"
+        db.commit()
+
+        assert stored(db, existing.id) == [(0, "FSQ", None), (1, "SOT", "CUE002"), (2, "SOT", "CUE003")]
+
+    def test_other_edits_leave_the_rows_alone(self, db):
+        existing = item("A", SCRIPT)
+        db.add(existing)
+        db.commit()
+
+        with patch.object(rundown_cues, "scripts_written") as written:
+            existing.title = "Renamed"
+            db.commit()
+
+        written.assert_not_called()
+        assert len(stored(db, existing.id)) == 2
+
+    def test_deleting_the_script_deletes_the_rows(self, db):
+        existing = item("A", SCRIPT)
+        db.add(existing)
+        db.commit()
+
+        existing.script_content = None
+        db.commit()
+
+        assert stored(db, existing.id) == []
+
+
+class TestScriptsWritten:
+
+    def test_raw_update_is_mirrored(self, db):
+        existing = item("A", "<p>No cues yet.</p>")
+        db.add(existing)
+        db.commit()
+
+        db.execute(update(_items).where(_items.c.id == existing.id).values(script_content=SCRIPT))
+        scripts_written(db.connection(), {existing.id: SCRIPT})
+        db.commit()
+
+        assert len(stored(db, existing.id)) == 2
+
+    def test_failure_rolls_back_only_its_savepoint(self, db):
+        existing = item("A", SCRIPT)
+        db.add(existing)
+        db.commit()
+
+        def broken_rows(item_id, content, now=None):
+            return [dict(row, span_end=None) for row in cue_rows(item_id, content, now)]
+
+        conn = db.connection()
+        conn.execute(update(_items).where(_items.c.id == existing.id).values(title="Kept"))
+        # The DELETE of A's rows runs, then the INSERT fails (span_end is NOT NULL)
+        with patch.object(rundown_cues, "cue_rows", broken_rows):
+            scripts_written(conn, {existing.id: FSQ})
+        db.commit()
+
+        assert len(stored(db, existing.id)) == 2
+        assert db.execute(select(_items.c.title).where(_items.c.id == existing.id)).scalar() == "Kept"
+
+    def test_nothing_to_write(self, db):
+        scripts_written(db.connection(), {})
+
+        assert db.execute(select(_cues)).all() == []
+
+
+class TestFindCues:
+
+    @pytest.fixture
+    def episode(self, db):
+        # Rundown 2 belongs to another episode: its cues never show up
+        db.execute(insert(Rundown).values(id=2, asset_id="R2", episode_id=2, name="Other"))
+        db.add_all([
+            item("A", f"{sot('RUN', 'Phase 6: Normalizing')}\n{FSQ}", order=10),
+            item("B", f"{sot('DONE', 'Complete')}\n{sot('FAILED', '❌ Failed: no audio')}", order=20),
+            item("C", sot("NEW"), order=30),
+            item("X", sot("ELSEWHERE", "Phase 3: Transcribing"), rundown_id=2),
+        ])
+        db.commit()
+
+    def test_running_order(self, db, episode):
+        cues = find_cues(db, 1)
+
+        assert [(c["item_asset_id"], c["position"], c["type"]) for c in cues] == [
+            ("A", 0, "SOT"), ("A", 1, "FSQ"), ("B", 0, "SOT"), ("B", 1, "SOT"), ("C", 0, "SOT")
+        ]
+        assert cues[0]["span"][0] == 0
+
+    def test_processing(self, db, episode):
+        assert [c["asset_id"] for c in find_cues(db, 1, processing=True)] == ["RUN"]
+
+    def test_not_processing(self, db, episode):
+        assert [c["asset_id"] for c in find_cues(db, 1, cue_type="sot", processing=False)] == [
+            "DONE", "FAILED", "NEW"
+        ]
+
+    def test_by_type_and_asset(self, db, episode):
+        assert [c["item_asset_id"] for c in find_cues(db, 1, cue_type="fsq")] == ["A"]
+        assert [c["processing_status"] for c in find_cues(db, 1, asset_id="DONE")] == ["Complete"]
@@ -0,0 +1,192 @@
+"""
+Tests for gap-numbered rundown ordering (services/rundown_order.py).
+
+Each test gets a fresh in-memory sqlite rundown_items table, so writes go
+through the executemany path of write_orders. Items are named by their
+asset_id ("A", "B", ...) and checked as (asset_id, order) in running order.
+"""
+
+import pytest
+from sqlalchemy import create_engine, select
+from unittest.mock import patch
+
+from services.rundown_order import (
+    ORDER_GAP, apply_orders, current_orders, has_ties, move_item, order_between, renumber_rundown
+)
+from models.episode import RundownItem
+
+_items = RundownItem.__table__
+RUNDOWN = 1
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    _items.create(engine)
+    with engine.begin() as connection:
+        yield connection
+    engine.dispose()
+
+
+@pytest.fixture
+def add(conn):
+    """add("A", 10) -> the new item's id."""
+
+    def add_item(name, order, rundown_id=RUNDOWN):
+        return conn.execute(_items.insert().values(
+            asset_id=name, rundown_id=rundown_id, item_type="segment", title=name, slug=name.lower(),
+            order_in_rundown=order, is_test_data=False
+        )).inserted_primary_key[0]
+
+    return add_item
+
+
+@pytest.fixture
+def ids(add):
+    """A..E at 10..50."""
+    return {name: add(name, (n + 1) * ORDER_GAP) for n, name in enumerate("ABCDE")}
+
+
+def running_order(conn, rundown_id=RUNDOWN):
+    names = dict(conn.execute(select(_items.c.id, _items.c.asset_id)).all())
+    return [(names[item_id], order) for item_id, order in current_orders(conn, rundown_id)]
+
+
+class TestOrderBetween:
+
+    def test_midpoint(self):
+        assert order_between(10, 20) == 15
+        assert order_between(None, 10) == 5
+
+    def test_end_of_rundown(self):
+        assert order_between(50, None) == 60
+        assert order_between(None, None) == ORDER_GAP
+
+    def test_no_room(self):
+        assert order_between(10, 11) is None
+        assert order_between(10, 10) is None
+
+
+class TestMoveItem:
+
+    def test_move_takes_the_midpoint(self, conn, ids):
+        result = move_item(conn, RUNDOWN, ids["E"], after_id=ids["A"])
+
+        assert result == {"order": 15, "orders": {ids["E"]: 15}, "renumbered": False}
+        assert running_order(conn) == [("A", 10), ("E", 15), ("B", 20), ("C", 30), ("D", 40)]
+
+    def test_move_to_the_top_and_before(self, conn, ids):
+        move_item(conn, RUNDOWN, ids["C"])
+        move_item(conn, RUNDOWN, ids["E"], before_id=ids["B"])
+
+        assert running_order(conn) == [("C", 5), ("A", 10), ("E", 15), ("B", 20), ("D", 40)]
+
+    def test_move_in_place_writes_nothing(self, conn, ids):
+        result = move_item(conn, RUNDOWN, ids["C"], after_id=ids["B"])
+
+        assert result == {"order": 30, "orders": {}, "renumbered": False}
+
+    def test_exhausted_gap_renumbers_only_what_changes(self, conn, ids):
+        # 10, 15, 17, 18: no number left between 17 and 18
+        move_item(conn, RUNDOWN, ids["E"], after_id=ids["A"])
+        move_item(conn, RUNDOWN, ids["D"], after_id=ids["E"])
+        move_item(conn, RUNDOWN, ids["C"], after_id=ids["D"])
+        assert running_order(conn)[:4] == [("A", 10), ("E", 15), ("D", 17), ("C", 18)]
+
+        result = move_item(conn, RUNDOWN, ids["B"], after_id=ids["D"])
+
+        assert result["renumbered"]
+        assert running_order(conn) == [("A", 10), ("E", 20), ("D", 30), ("B", 40), ("C", 50)]
+        assert ids["A"] not in result["orders"]
+        assert result["order"] == 40
+
+    def test_taken_number_renumbers(self, conn, ids, add):
+        # A concurrent move takes 15, the midpoint of A and B, after this
+        # move read the rundown
+        stale = current_orders(conn, RUNDOWN)
+        add("X", 15)
+
+        with patch("services.rundown_order.current_orders", return_value=stale):
+            result = move_item(conn, RUNDOWN, ids["E"], after_id=ids["A"])
+
+        assert result["renumbered"]
+        # Only the rows it read are renumbered; the concurrent X keeps its key
+        assert running_order(conn) == [("A", 10), ("X", 15), ("E", 20), ("B", 30), ("C", 40), ("D", 50)]
+        assert not has_ties(conn, RUNDOWN)
+
+    def test_unknown_item(self, conn, ids):
+        with pytest.raises(ValueError):
+            move_item(conn, RUNDOWN, ids["A"], after_id=999)
+        with pytest.raises(ValueError):
+            move_item(conn, RUNDOWN, ids["A"], after_id=ids["A"])
+
+
+class TestApplyOrders:
+
+    def test_unchanged_sequence_writes_nothing(self, conn, ids):
+        # The UI renumbers 1, 2, 3, ... but the running order is the same
+        requested = {ids[name]: n for n, name in enumerate("ABCDE", start=1)}
+
+        assert apply_orders(conn, RUNDOWN, requested) == {"orders": {}, "renumbered": False}
+        assert running_order(conn) == [("A", 10), ("B", 20), ("C", 30), ("D", 40), ("E", 50)]
+
+    def test_single_displaced_item_moves_one_row(self, conn, ids):
+        # Drag D between A and B, sent as a full (index + 1) * 10 renumbering
+        requested = {ids[name]: (n + 1) * 10 for n, name in enumerate("ADBCE")}
+
+        result = apply_orders(conn, RUNDOWN, requested)
+
+        assert result == {"orders": {ids["D"]: 15}, "renumbered": False}
+        assert running_order(conn) == [("A", 10), ("D", 15), ("B", 20), ("C", 30), ("E", 50)]
+
+    def test_items_not_sent_keep_their_order(self, conn, ids):
+        result = apply_orders(conn, RUNDOWN, {ids["A"]: 45})
+
+        assert result["orders"] == {ids["A"]: 45}
+        assert [name for name, _ in running_order(conn)] == ["B", "C", "D", "A", "E"]
+
+    def test_shuffle_renumbers_in_the_requested_sequence(self, conn, ids):
+        requested = {ids[name]: n for n, name in enumerate("EDCBA")}
+
+        result = apply_orders(conn, RUNDOWN, requested)
+
+        assert result["renumbered"]
+        assert running_order(conn) == [("E", 10), ("D", 20), ("C", 30), ("B", 40), ("A", 50)]
+        assert ids["C"] not in result["orders"]  # already at 30
+
+    def test_tie_is_ranked_by_id(self, conn, ids):
+        # E and B both sent as 20: B (the lower id) first, then E
+        result = apply_orders(conn, RUNDOWN, {ids["E"]: 20})
+
+        assert [name for name, _ in running_order(conn)] == ["A", "B", "E", "C", "D"]
+        assert not result["renumbered"]
+        assert not has_ties(conn, RUNDOWN)
+
+
+class TestTies:
+
+    def test_has_ties(self, conn, ids, add):
+        assert not has_ties(conn, RUNDOWN)
+
+        add("X", 20)
+
+        assert has_ties(conn, RUNDOWN)
+
+    def test_ties_in_other_rundowns_do_not_count(self, conn, ids, add):
+        add("X", 10, rundown_id=2)
+        add("Y", 10, rundown_id=2)
+
+        assert not has_ties(conn, RUNDOWN)
+        assert has_ties(conn, 2)
+
+    def test_renumber_breaks_a_tie_by_id(self, conn, ids, add):
+        add("X", 20)
+
+        written = renumber_rundown(conn, RUNDOWN)
+
+        assert running_order(conn) == [("A", 10), ("B", 20), ("X", 30), ("C", 40), ("D", 50), ("E", 60)]
+        assert written == 4
+        assert not has_ties(conn, RUNDOWN)
+
+    def test_renumber_of_an_even_rundown_writes_nothing(self, conn, ids):
+        assert renumber_rundown(conn, RUNDOWN) == 0
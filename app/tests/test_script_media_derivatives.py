@@ -0,0 +1,84 @@
+"""
+Tests for print derivatives of script media (services/script_media_derivatives.py).
+"""
+
+import os
+import time
+
+import pytest
+from PIL import Image
+
+from services.script_media_derivatives import PRUNE_AFTER, derivative_path, ensure_derivatives
+
+
+@pytest.fixture
+def assets(tmp_path):
+    root = tmp_path / "assets"
+    root.mkdir()
+    paths = []
+    for name, size in [("map.png", (3200, 1800)), ("logo.jpg", (400, 300))]:
+        Image.new("RGB", size, (200, 30, 30)).save(root / name)
+        paths.append(root / name)
+    return paths
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / "resources" / "media"
+
+
+def age(path, seconds):
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+class TestEnsureDerivatives:
+
+    def test_builds_print_sized_jpegs(self, assets, cache_dir):
+        result = ensure_derivatives(assets, cache_dir, max_px=800)
+
+        with Image.open(result[assets[0]]) as img:
+            assert (img.format, max(img.size)) == ("JPEG", 800)
+        # Already a small JPEG: the bytes are copied as-is
+        assert result[assets[1]].read_bytes() == assets[1].read_bytes()
+
+    def test_reuse_touches_the_derivative(self, assets, cache_dir):
+        dest = ensure_derivatives(assets, cache_dir)[assets[0]]
+        age(dest, 2 * PRUNE_AFTER)
+
+        assert ensure_derivatives(assets, cache_dir)[assets[0]] == dest
+        assert dest.stat().st_mtime > time.time() - 60
+
+    def test_recently_used_derivative_is_kept(self, assets, cache_dir):
+        # Another preset's render used map.png a moment ago and may still be reading it
+        other = ensure_derivatives(assets, cache_dir)[assets[0]]
+
+        ensure_derivatives(assets[1:], cache_dir)
+
+        assert other.exists()
+
+    def test_stale_derivative_is_pruned(self, assets, cache_dir):
+        old = ensure_derivatives(assets, cache_dir)[assets[0]]
+        age(old, PRUNE_AFTER + 60)
+
+        ensure_derivatives(assets[1:], cache_dir)
+
+        assert not old.exists()
+
+    def test_edited_source_gets_a_new_derivative(self, assets, cache_dir):
+        first = ensure_derivatives(assets, cache_dir)[assets[0]]
+        Image.new("RGB", (1000, 1000), (0, 0, 255)).save(assets[0])
+
+        second = ensure_derivatives(assets, cache_dir)[assets[0]]
+
+        assert second != first
+        assert second == derivative_path(assets[0], cache_dir)
+
+    def test_unreadable_source_maps_to_none(self, assets, cache_dir, tmp_path):
+        missing = tmp_path / "assets" / "gone.png"
+        broken = tmp_path / "assets" / "broken.png"
+        broken.write_bytes(b"not an image")
+
+        result = ensure_derivatives([missing, broken], cache_dir)
+
+        assert result == {missing: None, broken: None}
@@ -0,0 +1,85 @@
+"""
+Tests for the host script render manifest (services/script_render_cache.py).
+"""
+
+import os
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from services import script_render_cache
+from services.script_render_cache import (
+    GENERATOR_MODULES, SegmentFragmentCache, _generator_fingerprint, get_cached_render, store_render
+)
+
+
+@pytest.fixture
+def output_path(tmp_path):
+    path = tmp_path / "scripts" / "current"
+    path.mkdir(parents=True)
+    (path / "host.html").write_text("<html></html>")
+    return path
+
+
+class TestManifest:
+
+    def test_round_trip(self, output_path):
+        store_render(output_path, "host", "k1", {"html_path": str(output_path / "host.html")})
+
+        assert get_cached_render(output_path, "host", "k1")["cached"] is True
+        assert get_cached_render(output_path, "host", "k2") is None
+
+    def test_missing_artifact_is_a_miss(self, output_path):
+        store_render(output_path, "host", "k1", {"html_path": str(output_path / "gone.html")})
+
+        assert get_cached_render(output_path, "host", "k1") is None
+
+    def test_concurrent_stores_leave_a_whole_manifest(self, output_path):
+        errors = []
+
+        def render(n):
+            try:
+                for _ in range(20):
+                    store_render(output_path, f"preset{n}", f"k{n}", {"n": n})
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=render, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert script_render_cache._read_manifest(output_path)  # parses
+        assert sorted(os.listdir(output_path)) == [".render_cache.json", "host.html"]
+
+    def test_fragment_cache_save(self, output_path):
+        cache = SegmentFragmentCache(output_path, "host")
+        cache.put(cache.key("seg", 1), "<p>one</p>")
+        cache.save()
+
+        reloaded = SegmentFragmentCache(output_path, "host")
+        assert reloaded.get(reloaded.key("seg", 1)) == "<p>one</p>"
+        assert not [name for name in os.listdir(output_path) if name.endswith(".tmp")]
+
+
+class TestGeneratorFingerprint:
+
+    @pytest.mark.parametrize("module", GENERATOR_MODULES)
+    def test_each_generator_module_counts(self, module, monkeypatch):
+        before = _generator_fingerprint()
+        assert before.count("=") == len(GENERATOR_MODULES)
+        real_stat = os.stat
+
+        def stat(path, *args, **kwargs):
+            result = real_stat(path, *args, **kwargs)
+            if Path(path).name == f"{module}.py":
+                return SimpleNamespace(st_mtime_ns=result.st_mtime_ns + 1, st_size=result.st_size)
+            return result
+
+        monkeypatch.setattr(script_render_cache.os, "stat", stat)
+
+        assert _generator_fingerprint() != before
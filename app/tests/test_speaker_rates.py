@@ -0,0 +1,78 @@
+"""
+Tests for the reading-rate model (services/speaker_rates.py).
+
+The model is loaded from speakers and speaker_rate_measurements tables on a
+sqlite file; measurements are inserted directly, as rows recorded before a
+validation change would be.
+"""
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+import models_v2  # noqa: F401 - registers every table
+from database import Base
+from models.production import Speaker, SpeakerRateMeasurement
+from services.speaker_rates import DEFAULT_WPM, MIN_WPM, SpeakerRateModel, record_measurement
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'rates.sqlite3'}")
+    Base.metadata.create_all(engine, tables=[Speaker.__table__, SpeakerRateMeasurement.__table__])
+    with engine.begin() as conn:
+        conn.execute(insert(Speaker).values(id=1, name="Ana Host", slug="ana", wpm=160))
+        conn.execute(insert(Speaker).values(id=2, name="Ben Guest", slug="ben", wpm=0))
+    yield engine
+    engine.dispose()
+
+
+def measure(conn, speaker_id, words, seconds, segment_type=None):
+    conn.execute(insert(SpeakerRateMeasurement).values(
+        speaker_id=speaker_id, word_count=words, duration_seconds=seconds,
+        wpm=words / seconds * 60, segment_type=segment_type, source="audio_analysis",
+    ))
+
+
+class TestModel:
+
+    def test_rate_weights_by_length(self, engine):
+        with engine.begin() as conn:
+            measure(conn, 1, 300, 120)  # 150 wpm over two minutes
+            measure(conn, 1, 30, 6)     # 300 wpm over six seconds
+            model = SpeakerRateModel.load(conn)
+
+        assert model.rate(1).wpm == pytest.approx(330 / 126 * 60)
+        assert model.rate(1).samples == 2
+
+    def test_fallback_to_the_speaker_and_the_default(self, engine):
+        with engine.connect() as conn:
+            model = SpeakerRateModel.load(conn)
+
+        assert model.rate(1).wpm == 160
+        assert model.rate(2).wpm == DEFAULT_WPM  # wpm 0 means never measured
+        assert model.rate(None).wpm == DEFAULT_WPM
+
+    def test_zero_word_measurements_are_floored(self, engine):
+        with engine.begin() as conn:
+            measure(conn, 1, 0, 30)
+            measure(conn, 1, 0, 10, segment_type="promo")
+            model = SpeakerRateModel.load(conn)
+
+        assert model.rate(1).wpm == MIN_WPM
+        assert model.rate(1, "promo").wpm >= MIN_WPM
+
+
+class TestRecordMeasurement:
+
+    def test_records_and_computes_wpm(self, engine):
+        with Session(engine) as db:
+            measurement = record_measurement(db, 1, 150, 60.0, source="read_timer")
+
+        assert measurement.wpm == 150
+
+    @pytest.mark.parametrize("words, seconds", [(0, 30.0), (100, 0.0), (None, 30.0)])
+    def test_empty_reading_is_skipped(self, engine, words, seconds):
+        with Session(engine) as db:
+            assert record_measurement(db, 1, words, seconds, source="read_timer") is None
+            assert not db.new
@@ -102,6 +102,7 @@ class GenerateMp3Request(BaseModel):
     profile_id: Optional[int] = None
     bitrate: str = "192k"
     source_file: Optional[str] = None  # Override auto-detected source file
+    all_profiles: bool = False  # Export every active MP3 profile from one decode
 
 
 # ============================================================================
@@ -446,7 +447,7 @@ async def generate_mp3(
 
     try:
         task = generate_episode_mp3.apply_async(
-            args=[request.episode, request.profile_id, request.bitrate, request.source_file],
+            args=[request.episode, request.profile_id, request.bitrate, request.source_file, request.all_profiles],
             queue='media'
         )
 
@@ -235,9 +235,6 @@ async def process_vo_endpoint(
                 request.trim_end,
                 request.asset_id
             ],
-            queue='media',
-            routing_key='media',
-            exchange='media'
         )
 
         job.celery_task_id = task.id
@@ -16,6 +16,7 @@ from database import get_db
 from auth.utils import get_current_user
 from models_speakers import Speaker
 from models_user import User
+from services.speaker_rates import record_measurement
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +102,10 @@ async def upload_voice_sample(
             speaker.wpm_max = min(calculated_wpm * 1.15, 250)
             speaker.voice_sample_path = file_path
 
+        if reading_duration_seconds > 0:
+            db.flush()
+            record_measurement(db, speaker.id, word_count, reading_duration_seconds, source="voice_sample")
+
         db.commit()
         db.refresh(speaker)
 
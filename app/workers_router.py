@@ -3,13 +3,17 @@ Worker Monitoring API Router
 
 Provides real-time information about active Celery workers across platforms.
 Displays which workers are online, their platform, current tasks, and statistics.
+All endpoints read the shared background snapshot from services/worker_inspector
+instead of broadcasting their own inspect() calls.
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Dict, Optional
 from pydantic import BaseModel
-from celery_app import celery_app
 from auth.router import get_current_user_or_key
+from services.worker_capabilities import capability_tags
+from services.worker_inspector import current_snapshot, get_worker_inspector, worker_platform
 
 router = APIRouter(prefix="/api/workers", tags=["Worker Monitoring"])
 
@@ -23,6 +27,7 @@ class WorkerInfo(BaseModel):
     active_tasks: int
     queue: str
     capabilities: List[str]  # ["ffmpeg", "nvenc", "vaapi", etc.]
+    capability_profile: Optional[Dict] = None  # as published by the worker (None = not published)
     stats: Optional[Dict] = None
 
 
@@ -32,6 +37,23 @@ class WorkerStatusResponse(BaseModel):
     online_workers: int
     workers: List[WorkerInfo]
     queue_depth: int
+    snapshot_at: Optional[str] = None
+    snapshot_age_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+def _worker_capabilities(platform: str, profile: Optional[Dict] = None) -> List[str]:
+    if profile:
+        return capability_tags(profile)
+    # Worker predates capability publishing: guess from the platform
+    capabilities = ["ffmpeg"]
+    if platform == "Windows":
+        capabilities.append("nvenc")  # Assume NVENC on Windows
+        capabilities.append("windows-native")
+    else:
+        capabilities.append("vaapi")  # Assume VAAPI on Linux
+        capabilities.append("whisper")  # Whisper typically on Linux
+    return capabilities
 
 
 @router.get("/status", response_model=WorkerStatusResponse)
@@ -43,73 +65,47 @@ async def get_worker_status(current_user=Depends(get_current_user_or_key)):
     - Platform (Linux/Windows)
     - Active task count
     - Worker capabilities (GPU encoding, etc.)
-    - Queue depth
+    - Queue depth (messages waiting in the broker, all queues)
 
-    Useful for monitoring cross-platform worker distribution.
+    Served from the background inspector snapshot (see services/worker_inspector).
+    Workers that stopped answering within the last hour are listed as offline.
     """
     try:
-        inspector = celery_app.control.inspect()
-
-        # Get active workers
-        active_workers = inspector.active()
-        registered = inspector.registered()
-        stats = inspector.stats()
-
-        if not active_workers:
-            return WorkerStatusResponse(
-                total_workers=0,
-                online_workers=0,
-                workers=[],
-                queue_depth=0
-            )
+        snapshot = await current_snapshot()
 
         workers_list = []
-
-        for worker_name in active_workers.keys():
+        for worker_name in sorted(snapshot.last_seen):
             # Parse worker info from name
             # Format: "windows-PCNAME@hostname" or "kairo@hostname"
-            platform = "Windows" if "windows" in worker_name.lower() else "Linux"
-
-            # Get active tasks for this worker
-            active_task_count = len(active_workers.get(worker_name, []))
+            platform = worker_platform(worker_name)
+            active_task_count = len(snapshot.active.get(worker_name, []))
 
-            # Determine status
-            if active_task_count > 0:
+            if worker_name not in snapshot.ping and worker_name not in snapshot.active:
+                status = "offline"
+            elif active_task_count > 0:
                 status = "busy"
             else:
                 status = "online"
 
-            # Get worker stats
-            worker_stats = stats.get(worker_name, {}) if stats else {}
-
-            # Determine capabilities
-            capabilities = ["ffmpeg"]
-            if platform == "Windows":
-                capabilities.append("nvenc")  # Assume NVENC on Windows
-                capabilities.append("windows-native")
-            else:
-                capabilities.append("vaapi")  # Assume VAAPI on Linux
-                capabilities.append("whisper")  # Whisper typically on Linux
-
+            queues = snapshot.worker_queues(worker_name)
             workers_list.append(WorkerInfo(
                 name=worker_name,
                 hostname=worker_name.split('@')[-1] if '@' in worker_name else worker_name,
                 platform=platform,
                 status=status,
                 active_tasks=active_task_count,
-                queue="media",  # All workers use media queue
-                capabilities=capabilities,
-                stats=worker_stats
+                queue=",".join(queues) if queues else "media",
+                capabilities=_worker_capabilities(platform, snapshot.capabilities.get(worker_name)),
+                capability_profile=snapshot.capabilities.get(worker_name),
+                stats=snapshot.stats.get(worker_name, {})
             ))
 
-        # Get queue depth (approximate from active tasks)
-        total_active = sum(w.active_tasks for w in workers_list)
-
         return WorkerStatusResponse(
             total_workers=len(workers_list),
             online_workers=len([w for w in workers_list if w.status != "offline"]),
             workers=workers_list,
-            queue_depth=total_active
+            queue_depth=sum(snapshot.queue_depths.values()),
+            **snapshot.meta()
         )
 
     except Exception as e:
@@ -124,16 +120,11 @@ async def get_active_tasks(current_user=Depends(get_current_user_or_key)):
     Returns detailed information about what each worker is currently processing.
     """
     try:
-        inspector = celery_app.control.inspect()
-        active = inspector.active()
-
-        if not active:
-            return {"active_tasks": [], "total": 0}
+        snapshot = await current_snapshot()
 
         all_tasks = []
-
-        for worker_name, tasks in active.items():
-            platform = "Windows" if "windows" in worker_name.lower() else "Linux"
+        for worker_name, tasks in snapshot.active.items():
+            platform = worker_platform(worker_name)
 
             for task in tasks:
                 all_tasks.append({
@@ -141,13 +132,15 @@ async def get_active_tasks(current_user=Depends(get_current_user_or_key)):
                     "platform": platform,
                     "task_id": task.get("id"),
                     "task_name": task.get("name"),
+                    "queue": (task.get("delivery_info") or {}).get("routing_key"),
                     "args": task.get("args", []),
                     "time_start": task.get("time_start")
                 })
 
         return {
             "active_tasks": all_tasks,
-            "total": len(all_tasks)
+            "total": len(all_tasks),
+            **snapshot.meta()
         }
 
     except Exception as e:
@@ -162,19 +155,12 @@ async def get_worker_stats(current_user=Depends(get_current_user_or_key)):
     Includes completed task counts, execution times, and resource usage.
     """
     try:
-        inspector = celery_app.control.inspect()
-        stats = inspector.stats()
-
-        if not stats:
-            return {"workers": {}, "total_workers": 0}
+        snapshot = await current_snapshot()
 
         workers_stats = {}
-
-        for worker_name, worker_info in stats.items():
-            platform = "Windows" if "windows" in worker_name.lower() else "Linux"
-
+        for worker_name, worker_info in snapshot.stats.items():
             workers_stats[worker_name] = {
-                "platform": platform,
+                "platform": worker_platform(worker_name),
                 "pool": worker_info.get("pool", {}).get("implementation"),
                 "max_concurrency": worker_info.get("pool", {}).get("max-concurrency"),
                 "total_tasks": worker_info.get("total", {}),
@@ -183,7 +169,8 @@ async def get_worker_stats(current_user=Depends(get_current_user_or_key)):
 
         return {
             "workers": workers_stats,
-            "total_workers": len(workers_stats)
+            "total_workers": len(workers_stats),
+            **snapshot.meta()
         }
 
     except Exception as e:
@@ -195,27 +182,24 @@ async def ping_workers(current_user=Depends(get_current_user_or_key)):
     """
     Ping all workers to check if they're responsive.
 
-    Returns a list of workers that responded to the ping.
+    Takes a fresh inspector snapshot (shared with every other endpoint) and
+    returns the workers that responded.
     """
     try:
-        inspector = celery_app.control.inspect()
-        ping_result = inspector.ping()
-
-        if not ping_result:
-            return {"responsive_workers": [], "total": 0}
+        snapshot = await run_in_threadpool(get_worker_inspector().refresh)
 
         responsive = []
-        for worker_name, pong in ping_result.items():
-            platform = "Windows" if "windows" in worker_name.lower() else "Linux"
+        for worker_name, pong in snapshot.ping.items():
             responsive.append({
                 "worker": worker_name,
-                "platform": platform,
+                "platform": worker_platform(worker_name),
                 "response": pong
             })
 
         return {
             "responsive_workers": responsive,
-            "total": len(responsive)
+            "total": len(responsive),
+            **snapshot.meta()
         }
 
     except Exception as e:
@@ -230,22 +214,15 @@ async def get_platform_summary(current_user=Depends(get_current_user_or_key)):
     Shows how many Linux vs Windows workers are active and their task counts.
     """
     try:
-        inspector = celery_app.control.inspect()
-        active = inspector.active()
-
-        if not active:
-            return {
-                "Linux": {"workers": 0, "active_tasks": 0},
-                "Windows": {"workers": 0, "active_tasks": 0}
-            }
+        snapshot = await current_snapshot()
 
         platform_stats = {
             "Linux": {"workers": 0, "active_tasks": 0},
             "Windows": {"workers": 0, "active_tasks": 0}
         }
 
-        for worker_name, tasks in active.items():
-            platform = "Windows" if "windows" in worker_name.lower() else "Linux"
+        for worker_name, tasks in snapshot.active.items():
+            platform = worker_platform(worker_name)
             platform_stats[platform]["workers"] += 1
             platform_stats[platform]["active_tasks"] += len(tasks)
 
@@ -253,3 +230,43 @@ async def get_platform_summary(current_user=Depends(get_current_user_or_key)):
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get platform summary: {str(e)}")
+
+
+@router.get("/queues")
+async def get_queue_status(current_user=Depends(get_current_user_or_key)):
+    """
+    Per-queue depth, wait latency and consumers, with recent trend points.
+
+    - depth: messages waiting in the broker
+    - reserved: messages prefetched by workers but not started
+    - latency_seconds: mean wait (registration to start) of tasks running now
+    - history: one point per inspector pass (oldest first)
+    """
+    try:
+        snapshot = await current_snapshot()
+
+        reserved: Dict[str, int] = {}
+        for tasks in snapshot.reserved.values():
+            for task in tasks:
+                queue = (task.get("delivery_info") or {}).get("routing_key")
+                if queue:
+                    reserved[queue] = reserved.get(queue, 0) + 1
+
+        queues = []
+        for name, depth in sorted(snapshot.queue_depths.items()):
+            queues.append({
+                "name": name,
+                "depth": depth,
+                "reserved": reserved.get(name, 0),
+                "latency_seconds": snapshot.queue_latency.get(name),
+                "consumers": sorted(w for w in snapshot.active_queues if name in snapshot.worker_queues(w)),
+            })
+
+        return {
+            "queues": queues,
+            "history": get_worker_inspector().history(),
+            **snapshot.meta()
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get queue status: {str(e)}")
@@ -10,6 +10,7 @@ from database import get_db
 from auth.utils import get_current_user_or_key
 from models_speakers import Speaker
 from models_user import User
+from services.speaker_rates import get_rate_model, record_measurement
 import logging
 import tempfile
 import os
@@ -24,6 +25,7 @@ router = APIRouter(prefix="/api/wpm-audio", tags=["WPM Audio Analysis"])
 async def analyze_audio_wpm(
     audio_file: UploadFile = File(...),
     speaker_id: Optional[int] = Form(None),
+    segment_type: Optional[str] = Form(None),
     current_user: dict = Depends(get_current_user_or_key),
     db: Session = Depends(get_db)
 ):
@@ -36,7 +38,9 @@ async def analyze_audio_wpm(
     3. Count words in transcript
     4. Calculate duration from audio file
     5. Calculate WPM = words / (duration_seconds / 60)
-    6. Update speaker profile with new WPM measurement
+    6. Update speaker profile with new WPM measurement, and keep the
+       measurement (tagged with segment_type, e.g. 'segment', 'promo', 'fsq')
+       for the speaker rate model used by duration estimates
 
     Returns:
         {
@@ -98,6 +102,8 @@ async def analyze_audio_wpm(
                 speaker.wpm = calculated_wpm
                 speaker.wpm_min = wpm_min
                 speaker.wpm_max = wpm_max
+                record_measurement(db, speaker.id, word_count, duration_seconds,
+                                   source="audio_analysis", segment_type=segment_type)
                 db.commit()
                 speaker_updated = True
                 logger.info(f"Updated speaker {speaker.name} with WPM: {calculated_wpm}")
@@ -294,15 +300,20 @@ async def get_speaker_measurements(
     """
     Get WPM measurement history for a speaker
 
-    TODO: Implement measurement history table to track multiple measurements over time
-    For now, just returns current speaker WPM settings
+    Also returns the rate the duration estimates use for this speaker: the
+    aggregate of these measurements (with spread), overall and per segment type.
     """
+    from models_v2 import SpeakerRateMeasurement
 
     speaker = db.query(Speaker).filter(Speaker.id == speaker_id).first()
 
     if not speaker:
         raise HTTPException(status_code=404, detail="Speaker not found")
 
+    measurements = db.query(SpeakerRateMeasurement).filter(
+        SpeakerRateMeasurement.speaker_id == speaker_id
+    ).order_by(SpeakerRateMeasurement.created_at.desc()).all()
+
     return {
         "success": True,
         "speaker": speaker.name,
@@ -311,5 +322,16 @@ async def get_speaker_measurements(
             "min": speaker.wpm_min,
             "max": speaker.wpm_max
         },
-        "measurements": []  # TODO: Add historical measurements
+        "rate_model": get_rate_model(db.connection()).describe(speaker_id),
+        "measurements": [
+            {
+                "wpm": round(m.wpm, 1),
+                "word_count": m.word_count,
+                "duration_seconds": round(m.duration_seconds, 1),
+                "segment_type": m.segment_type,
+                "source": m.source,
+                "created_at": m.created_at.isoformat() if m.created_at else None
+            }
+            for m in measurements
+        ]
     }
@@ -9,14 +9,18 @@ Usage:
     python render_fsq_png.py --episode=0241
     python render_fsq_png.py --json="file.json" --output="custom_dir"
     python render_fsq_png.py --json="file.json" --font-family=serif --box-opacity=85
+    python render_fsq_png.py --episode=0241 --workers=4
 """
 
 import argparse
 import sys
 import json
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Tuple, Optional
 from PIL import Image, ImageDraw, ImageFont
 import re
 
@@ -52,6 +56,77 @@ FONT_PATHS = {
     ]
 }
 
+# Size word widths are measured at before being scaled to other sizes
+REFERENCE_FONT_SIZE = 100
+
+# Shared 1x1 canvas for textbbox measurements
+_MEASURE_DRAW = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+
+
+@lru_cache(maxsize=8)
+def _resolve_font_path(font_paths: Tuple[str, ...]) -> Optional[str]:
+    """First font in the family that exists and loads, or None for PIL's default."""
+    for font_path in font_paths:
+        try:
+            if os.path.exists(font_path):
+                ImageFont.truetype(font_path, REFERENCE_FONT_SIZE)
+                return font_path
+        except OSError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=128)
+def _load_truetype(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Font objects keyed by (path, size) - avoids re-reading the TTF on every lookup."""
+    return ImageFont.truetype(font_path, size)
+
+
+class WordWidthCache:
+    """
+    Per-word advance widths.
+
+    exact() measures a word at the font's own size (cached per font/size/word).
+    estimate() measures once at REFERENCE_FONT_SIZE and scales linearly, which
+    is accurate to a pixel or so and lets the font-size search try many sizes
+    without measuring every word at each one.
+    """
+
+    def __init__(self):
+        self._widths: Dict[Tuple, float] = {}
+
+    def exact(self, font: ImageFont.ImageFont, word: str) -> float:
+        key = (getattr(font, 'path', None), getattr(font, 'size', None), word)
+        width = self._widths.get(key)
+        if width is None:
+            width = font.getlength(word)
+            self._widths[key] = width
+        return width
+
+    def estimate(self, font_path: str, size: int, word: str) -> float:
+        reference = _load_truetype(font_path, REFERENCE_FONT_SIZE)
+        return self.exact(reference, word) * size / REFERENCE_FONT_SIZE
+
+
+_word_widths = WordWidthCache()
+
+
+_line_heights: Dict[Tuple, int] = {}
+
+
+def _line_height(font: ImageFont.ImageFont) -> int:
+    """Height with descenders ("Wy"), cached per (path, size)."""
+    key = (getattr(font, 'path', None), getattr(font, 'size', None))
+    if key not in _line_heights:
+        bbox = _MEASURE_DRAW.textbbox((0, 0), "Wy", font=font)
+        _line_heights[key] = bbox[3] - bbox[1]
+    return _line_heights[key]
+
+
+def _render_job(renderer: "FSQPNGRenderer", quote_data: Dict, output_path: Path) -> bool:
+    """Process-pool entry point for FSQPNGRenderer.render_batch."""
+    return renderer.render_quote_png(quote_data, output_path)
+
 
 class FSQPNGRenderer:
     """
@@ -125,68 +200,89 @@ class FSQPNGRenderer:
         self.error_count = 0
 
     def load_font(self, size: int) -> ImageFont.ImageFont:
-        """Load font from configured family."""
-        for font_path in self.font_paths:
-            try:
-                if os.path.exists(font_path):
-                    return ImageFont.truetype(font_path, size)
-            except OSError:
-                continue
+        """Load font from configured family (cached by path and size)."""
+        font_path = _resolve_font_path(tuple(self.font_paths))
+        if font_path:
+            return _load_truetype(font_path, size)
 
         # Fallback to default font
-        try:
-            return ImageFont.load_default()
-        except:
-            # Ultimate fallback
-            return ImageFont.load_default()
+        return ImageFont.load_default()
 
     def get_text_dimensions(self, text: str, font: ImageFont.ImageFont) -> Tuple[int, int]:
         """Get text dimensions using textbbox."""
-        # Create temporary draw object for measurement
-        temp_img = Image.new('RGBA', (1, 1))
-        temp_draw = ImageDraw.Draw(temp_img)
-
-        bbox = temp_draw.textbbox((0, 0), text, font=font)
+        bbox = _MEASURE_DRAW.textbbox((0, 0), text, font=font)
         width = bbox[2] - bbox[0]
         height = bbox[3] - bbox[1]
         return width, height
 
-    def wrap_text_to_fit(self, text: str, font: ImageFont.ImageFont, max_width: int) -> List[str]:
-        """Wrap text to fit within max_width, respecting explicit line breaks."""
-        # First split by explicit line breaks
-        paragraphs = text.split('\n')
+    def _wrap(self, text: str, measure: Callable[[str], float], max_width: int) -> List[str]:
+        """
+        Greedy word wrap, respecting explicit line breaks.
+
+        Line widths are accumulated from per-word widths (word + space + word...)
+        rather than re-measuring the whole growing line for every word.
+        """
+        space_width = measure(' ')
         lines = []
 
-        for paragraph in paragraphs:
+        for paragraph in text.split('\n'):
             paragraph = paragraph.strip()
             if not paragraph:
                 # Empty line - add blank line
                 lines.append('')
                 continue
 
-            # Wrap each paragraph normally
-            words = paragraph.split()
             current_line = []
+            current_width = 0.0
 
-            for word in words:
-                test_line = ' '.join(current_line + [word])
-                line_width, _ = self.get_text_dimensions(test_line, font)
+            for word in paragraph.split():
+                word_width = measure(word)
+                line_width = current_width + space_width + word_width if current_line else word_width
 
                 if line_width <= max_width:
                     current_line.append(word)
+                    current_width = line_width
+                elif current_line:
+                    lines.append(' '.join(current_line))
+                    current_line = [word]
+                    current_width = word_width
                 else:
-                    if current_line:
-                        lines.append(' '.join(current_line))
-                        current_line = [word]
-                    else:
-                        # Single word is too long, force it
-                        lines.append(word)
+                    # Single word is too long, force it
+                    lines.append(word)
 
             if current_line:
                 lines.append(' '.join(current_line))
 
         return lines
 
+    def wrap_text_to_fit(self, text: str, font: ImageFont.ImageFont, max_width: int) -> List[str]:
+        """Wrap text to fit within max_width, respecting explicit line breaks."""
+        return self._wrap(text, lambda word: _word_widths.exact(font, word), max_width)
+
+    def _quote_height(self, lines: List[str], line_height: float) -> float:
+        """Total quote block height with reduced spacing for paragraph breaks."""
+        line_spacing_mult = 1 + (self.line_spacing_percent / 100)
+        total_height = 0
+        for line in lines:
+            if line.strip():  # Non-empty line
+                total_height += line_height * line_spacing_mult
+            else:  # Empty line (paragraph break)
+                total_height += line_height * line_spacing_mult * 0.6  # Reduced paragraph spacing
+        return total_height
+
+    def _fits(self, quote_text: str, size: int, target_width: int, quote_space: int, estimate: bool) -> bool:
+        """Does the quote fit at this size? estimate=True uses scaled reference metrics."""
+        font_path = _resolve_font_path(tuple(self.font_paths))
+        if estimate and font_path:
+            reference = _load_truetype(font_path, REFERENCE_FONT_SIZE)
+            lines = self._wrap(quote_text, lambda word: _word_widths.estimate(font_path, size, word), target_width)
+            line_height = _line_height(reference) * size / REFERENCE_FONT_SIZE
+        else:
+            font = self.load_font(size)
+            lines = self.wrap_text_to_fit(quote_text, font, target_width)
+            line_height = _line_height(font)
+        return self._quote_height(lines, line_height) <= quote_space
+
     def calculate_optimal_font_size(self, quote_text: str, attribution: str,
                                   target_width: int, target_height: int) -> Tuple[int, int]:
         """Calculate optimal font sizes for quote and attribution."""
@@ -205,33 +301,26 @@ class FSQPNGRenderer:
         attribution_space = int(target_height * 0.12)
         quote_space = target_height - attribution_space
 
-        # Line spacing multiplier from percentage
-        line_spacing_mult = 1 + (self.line_spacing_percent / 100)
-
-        # Binary search for optimal quote font size
+        # Binary search for optimal quote font size on scaled metrics
         min_size, max_size = self.min_font_size, self.max_font_size
         best_quote_size = min_size
 
         while min_size <= max_size:
             mid_size = (min_size + max_size) // 2
-            font = self.load_font(mid_size)
-
-            lines = self.wrap_text_to_fit(quote_text, font, target_width)
-            line_height = self.get_text_dimensions("Wy", font)[1]  # Height with descenders
-            # Calculate total height with mixed line spacing
-            total_height = 0
-            for line in lines:
-                if line.strip():  # Non-empty line
-                    total_height += line_height * line_spacing_mult
-                else:  # Empty line (paragraph break)
-                    total_height += line_height * line_spacing_mult * 0.6  # Reduced paragraph spacing
-
-            if total_height <= quote_space:
+            if self._fits(quote_text, mid_size, target_width, quote_space, estimate=True):
                 best_quote_size = mid_size
                 min_size = mid_size + 1
             else:
                 max_size = mid_size - 1
 
+        # Confirm with exact metrics; scaling can be off by a pixel near the edge
+        while best_quote_size > self.min_font_size and not self._fits(
+                quote_text, best_quote_size, target_width, quote_space, estimate=False):
+            best_quote_size -= 1
+        while best_quote_size < self.max_font_size and self._fits(
+                quote_text, best_quote_size + 1, target_width, quote_space, estimate=False):
+            best_quote_size += 1
+
         # Attribution font size
         if self.fixed_attribution_size is not None:
             attribution_size = self.fixed_attribution_size
@@ -285,7 +374,7 @@ class FSQPNGRenderer:
 
             # Wrap quote text
             quote_lines = self.wrap_text_to_fit(quote_text, quote_font, self.content_width)
-            line_height = int(self.get_text_dimensions("Wy", quote_font)[1] * line_spacing_mult)
+            line_height = int(_line_height(quote_font) * line_spacing_mult)
             paragraph_break_height = int(line_height * 0.6)  # 40% reduction for paragraph breaks
 
             # Calculate attribution dimensions
@@ -349,8 +438,42 @@ class FSQPNGRenderer:
             self.error_count += 1
             return False
 
-    def process_json_file(self, json_path: Path, output_dir: Path) -> bool:
-        """Process FSQ JSON file and render all quotes as PNGs."""
+    def render_batch(self, jobs: List[Tuple[Dict, Path]], workers: Optional[int] = None) -> int:
+        """
+        Render many quotes, in parallel across processes when there is more than one.
+
+        Args:
+            jobs: (quote_data, output_path) pairs
+            workers: Process count (default: one per CPU core, capped at len(jobs))
+
+        Returns:
+            Number of quotes rendered successfully
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(jobs))
+
+        # Celery prefork workers are daemonic and can't spawn a pool of their own
+        if workers <= 1 or multiprocessing.current_process().daemon:
+            return sum(self.render_quote_png(quote_data, output_path) for quote_data, output_path in jobs)
+
+        print(f"⚡ Rendering {len(jobs)} quotes across {workers} processes")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(
+                _render_job,
+                [self] * len(jobs),
+                [quote_data for quote_data, _ in jobs],
+                [output_path for _, output_path in jobs],
+            ))
+
+        # Counters were incremented in the worker processes' copies
+        succeeded = sum(results)
+        self.rendered_count += succeeded
+        self.error_count += len(results) - succeeded
+        return succeeded
+
+    def collect_jobs(self, json_path: Path, output_dir: Path) -> Optional[List[Tuple[Dict, Path]]]:
+        """Load an FSQ JSON file into (quote_data, output_path) render jobs. None on error."""
         try:
             print(f"📖 Loading JSON: {json_path}")
 
@@ -363,46 +486,52 @@ class FSQPNGRenderer:
             else:
                 quotes = data.get('quotes', [])
 
-            metadata = data.get('metadata', {}) if isinstance(data, dict) else {}
-
             print(f"📊 Found {len(quotes)} quotes to render")
             print(f"📁 Output directory: {output_dir}")
 
-            if not quotes:
-                print("⚠️  No quotes found in JSON file")
-                return True
-
-            # Create output directory
-            output_dir.mkdir(parents=True, exist_ok=True)
-
-            # Render each quote
+            jobs = []
             for i, quote_data in enumerate(quotes, 1):
-                print(f"\n🎨 Rendering quote {i}/{len(quotes)}")
-
                 # Generate output filename
                 slug = quote_data.get('slug', quote_data.get('id', f'quote_{i}'))
                 clean_slug = re.sub(r'[^\w\-]', '', str(slug).replace(' ', '-'))
                 output_filename = f"fsq_{clean_slug}.png"
-                output_path = output_dir / output_filename
-
-                self.render_quote_png(quote_data, output_path)
-
-            # Print summary
-            print(f"\n📊 Rendering Summary:")
-            print(f"   Quotes processed: {len(quotes)}")
-            print(f"   Successfully rendered: {self.rendered_count}")
-            print(f"   Errors: {self.error_count}")
-
-            return self.error_count == 0
+                jobs.append((quote_data, output_dir / output_filename))
+            return jobs
 
         except Exception as e:
             print(f"❌ Error processing JSON file: {e}")
             import traceback
             traceback.print_exc()
+            return None
+
+    def _render_jobs(self, jobs: List[Tuple[Dict, Path]], workers: Optional[int]) -> bool:
+        if not jobs:
+            print("⚠️  No quotes found in JSON file")
+            return True
+
+        for output_dir in {output_path.parent for _, output_path in jobs}:
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+        self.render_batch(jobs, workers)
+
+        # Print summary
+        print(f"\n📊 Rendering Summary:")
+        print(f"   Quotes processed: {len(jobs)}")
+        print(f"   Successfully rendered: {self.rendered_count}")
+        print(f"   Errors: {self.error_count}")
+
+        return self.error_count == 0
+
+    def process_json_file(self, json_path: Path, output_dir: Path, workers: Optional[int] = None) -> bool:
+        """Process FSQ JSON file and render all quotes as PNGs."""
+        jobs = self.collect_jobs(json_path, output_dir)
+        if jobs is None:
             return False
+        return self._render_jobs(jobs, workers)
 
-    def process_episode(self, episode_number: str, output_dir: Optional[Path] = None) -> bool:
-        """Find and process FSQ JSON files for an episode."""
+    def process_episode(self, episode_number: str, output_dir: Optional[Path] = None,
+                        workers: Optional[int] = None) -> bool:
+        """Find and process FSQ JSON files for an episode (all cards rendered as one parallel batch)."""
         # Normalize episode number
         if len(episode_number) < 4:
             episode_number = episode_number.zfill(4)
@@ -430,12 +559,16 @@ class FSQPNGRenderer:
             output_dir = episode_path / "assets" / "quotes"
 
         success = True
+        jobs = []
         for json_file in json_files:
             print(f"\n📄 Processing: {json_file.name}")
-            if not self.process_json_file(json_file, output_dir):
+            file_jobs = self.collect_jobs(json_file, output_dir)
+            if file_jobs is None:
                 success = False
+            else:
+                jobs.extend(file_jobs)
 
-        return success
+        return self._render_jobs(jobs, workers) and success
 
     def render_single(
         self,
@@ -494,6 +627,7 @@ Style Parameters:
   --attribution-size Fixed attribution font size in px, or 'auto' (default: auto)
   --min-font-size    Minimum quote font size in px (default: 12)
   --max-font-size    Maximum quote font size in px (default: 200)
+  --workers          Parallel render processes (default: one per CPU core)
         """
     )
 
@@ -580,6 +714,13 @@ Style Parameters:
         help='Maximum quote font size in px (default: 200)'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Parallel render processes (default: one per CPU core)'
+    )
+
     args = parser.parse_args()
 
     # Parse attribution size with error handling
@@ -619,7 +760,7 @@ Style Parameters:
     try:
         if args.episode:
             output_dir = Path(args.output) if args.output else None
-            success = renderer.process_episode(args.episode, output_dir)
+            success = renderer.process_episode(args.episode, output_dir, workers=args.workers)
         elif args.json:
             json_path = Path(args.json)
             if not json_path.exists():
@@ -631,7 +772,7 @@ Style Parameters:
             else:
                 output_dir = json_path.parent / "rendered_pngs"
 
-            success = renderer.process_json_file(json_path, output_dir)
+            success = renderer.process_json_file(json_path, output_dir, workers=args.workers)
         else:
             print("❌ No episode or JSON file specified")
             sys.exit(1)